@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Per-request dependency overhead benchmark.
+
+Serves two identical endpoints, one resolving JobUseCases/UserUseCases the old way (new
+repositories, CeleryQueueService and FakeAIService on every request) and one taking them from
+the process container, and reports the cost per request of each. No MongoDB or Redis server is
+needed: the Motor client is created but never used.
+
+    python -m benchmarks.dependency_overhead --requests 5000 [--debug-logging]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_PORT", "0")
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from src.application.use_cases import JobUseCases, UserUseCases
+from src.config.settings import settings
+from src.container import Container, get_container, set_container
+from src.infrastructure.cache import job_cache, user_cache
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.external.fake_ai_service import FakeAIService
+from src.infrastructure.queue.celery_queue_service import CeleryQueueService
+from src.infrastructure.repositories import (
+    CachedJobRepository,
+    CachedUserRepository,
+    MongoJobRepository,
+    MongoJobStatsRepository,
+    MongoUserRepository,
+)
+from src.infrastructure.storage.gridfs_output_store import GridFSOutputStore
+from src.presentation.api.job_routes import get_job_use_cases
+from src.presentation.api.user_routes import get_user_use_cases
+
+
+def legacy_job_use_cases() -> JobUseCases:
+    """What job_routes.get_job_use_cases did before the container"""
+    job_stats = MongoJobStatsRepository()
+    job_repository = MongoJobRepository(stats=job_stats)
+    if settings.job_cache_enabled:
+        job_repository = CachedJobRepository(job_repository, job_cache)
+    return JobUseCases(
+        job_repository,
+        CeleryQueueService(),
+        FakeAIService(),
+        output_store=GridFSOutputStore(),
+        output_inline_max_bytes=settings.output_inline_max_bytes,
+        output_preview_chars=settings.output_preview_chars,
+        job_stats=job_stats,
+    )
+
+
+def legacy_user_use_cases() -> UserUseCases:
+    user_repository = MongoUserRepository()
+    if settings.user_cache_enabled:
+        user_repository = CachedUserRepository(user_repository, user_cache)
+    return UserUseCases(user_repository)
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy")
+    async def legacy(jobs: JobUseCases = Depends(legacy_job_use_cases), users: UserUseCases = Depends(legacy_user_use_cases)):
+        return {}
+
+    @app.get("/container")
+    async def container(jobs: JobUseCases = Depends(get_job_use_cases), users: UserUseCases = Depends(get_user_use_cases)):
+        return {}
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> Dict[str, float]:
+    for _ in range(min(100, requests)):  # warm-up
+        (await client.get(path)).raise_for_status()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        (await client.get(path)).raise_for_status()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    return {"rps": requests / elapsed, "us_per_request": elapsed / requests * 1e6, "cpu_us_per_request": cpu / requests * 1e6}
+
+
+def measure_construction(builder, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        builder()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.debug_logging:
+        logging.basicConfig(level=logging.DEBUG, stream=open(os.devnull, "w"))
+    settings.artifact_url_signing = False  # keep the S3 client out of the comparison
+    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+    set_container(Container())
+    try:
+        print(f"construct  legacy {measure_construction(lambda: (legacy_job_use_cases(), legacy_user_use_cases()), args.requests):8.1f} us"
+              f"   container {measure_construction(lambda: (get_container().job_use_cases, get_container().user_use_cases), args.requests):8.3f} us")
+        results = {}
+        async with httpx.AsyncClient(app=make_app(), base_url="http://bench") as client:
+            for label in ("legacy", "container"):
+                results[label] = await measure(client, f"/{label}", args.requests)
+        for label, r in results.items():
+            print(f"{label:10s} {r['rps']:9.1f} req/s  {r['us_per_request']:8.1f} us/req  {r['cpu_us_per_request']:8.1f} cpu-us/req")
+        saved = results["legacy"]["cpu_us_per_request"] - results["container"]["cpu_us_per_request"]
+        print(f"saved      {saved:.1f} cpu-us per request")
+    finally:
+        set_container(None)
+        await MongoDB.close_mongo_connection()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--debug-logging", action="store_true", help="enable DEBUG logging (to /dev/null), as with DEBUG=true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+GET /api/v1/jobs/ serialization benchmark.
+
+Serves the real job router and JobUseCases over an in-memory repository that returns the
+same documents Mongo would, and compares the validated path (Job -> JobResponse ->
+response_model) with the trusted fast path (documents -> orjson bytes).
+
+    python -m benchmarks.job_serialization --jobs 100 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_PORT", "0")
+
+import httpx
+from bson import ObjectId
+from fastapi import FastAPI
+
+from src.application.use_cases.job_use_cases import JobUseCases
+from src.config.settings import settings
+from src.domain.entities import Job
+from src.presentation.api.job_routes import JobContext, get_job_context, router as job_router
+
+
+class InMemoryJobRepository:
+    """Returns fresh copies of pre-built documents, as a Motor cursor would."""
+
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self._docs = docs
+
+    def _page(self, limit: int) -> List[Dict[str, Any]]:
+        return [dict(doc) for doc in self._docs[:limit]]
+
+    async def get_by_user_id(self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False):
+        return [Job(**doc) for doc in self._page(limit)]
+
+    async def get_documents_by_user_id(self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False):
+        return self._page(limit)
+
+
+def make_documents(count: int, text_size: int) -> List[Dict[str, Any]]:
+    base = datetime(2024, 1, 1)
+    docs = []
+    for i in range(count):
+        created = base + timedelta(minutes=i)
+        docs.append({
+            "_id": ObjectId(),
+            "user_id": "bench-user",
+            "session_id": f"session-{i % 7}",
+            "job_type": "text_generation",
+            "status": "completed",
+            "input_data": {"prompt": "p" * (text_size // 4), "max_tokens": 256},
+            "output_data": {"generated_text": "g" * text_size, "tokens_used": random.randint(50, 256), "model": "fake-gpt"},
+            "artifact_url": None,
+            "error_message": None,
+            "created_at": created,
+            "updated_at": created,
+            "started_at": created,
+            "completed_at": created,
+        })
+    return docs
+
+
+async def measure(client: httpx.AsyncClient, limit: int, requests: int) -> Dict[str, float]:
+    url = f"/api/v1/jobs/?limit={limit}"
+    for _ in range(min(50, requests)):  # warm-up
+        (await client.get(url)).raise_for_status()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        (await client.get(url)).raise_for_status()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    return {"rps": requests / elapsed, "ms_per_request": elapsed / requests * 1000, "cpu_ms_per_request": cpu / requests * 1000}
+
+
+async def run(args: argparse.Namespace) -> None:
+    docs = make_documents(args.jobs, args.text_size)
+    use_cases = JobUseCases(InMemoryJobRepository(docs), queue_service=None, ai_service=None)
+    app = FastAPI()
+    app.dependency_overrides[get_job_context] = lambda: JobContext(user_id="bench-user", use_cases=use_cases)
+    app.include_router(job_router, prefix="/api/v1")
+
+    results = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for label, fast in (("validated", False), ("fast_json", True)):
+            settings.fast_json_responses = fast
+            results[label] = await measure(client, args.jobs, args.requests)
+
+    for label, r in results.items():
+        print(f"{label:10s} {r['rps']:9.1f} req/s  {r['ms_per_request']:7.3f} ms/req  {r['cpu_ms_per_request']:7.3f} cpu-ms/req")
+    print(f"speedup    {results['fast_json']['rps'] / results['validated']['rps']:.2f}x ({args.jobs} jobs per response)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100, help="jobs per response (page size)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--text-size", type=int, default=2000, help="characters of generated text per job")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
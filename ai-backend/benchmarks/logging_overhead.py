@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Logging overhead benchmark.
+
+Serves the real POST /api/v1/jobs/ route and JobUseCases over an in-memory repository and queue
+(each request logs about six DEBUG records along the way) and reports requests per second with:
+
+    off              root at WARNING, no handlers: the floor
+    sync_debug       DEBUG through a plain StreamHandler writing to a file in the request thread
+    queued_debug     DEBUG through configure_logging (formatting and I/O on the listener thread)
+    queued_sampled   as above with LOG_SAMPLE_PER_SECOND applied
+    queued_info      configure_logging at INFO, the production default
+
+Log output goes to a temporary file; ``--write-latency-us`` adds a sleep to every flush to model
+stderr backed by a slow pipe (a container log driver under load).
+
+    python -m benchmarks.logging_overhead --requests 3000 [--write-latency-us 200]
+"""
+import argparse
+import asyncio
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_PORT", "0")
+
+import httpx
+from fastapi import FastAPI
+
+from src.application.use_cases.job_use_cases import JobUseCases
+from src.config.logging_config import DEFAULT_FORMAT, configure_logging, get_logging_metrics, parse_levels, stop_logging
+from src.config.settings import settings
+from src.domain.entities import Job, JobCreate
+from src.presentation.api.job_routes import JobContext, get_job_context, router as job_router
+
+logger = logging.getLogger("benchmarks.logging_overhead")
+
+
+class InMemoryJobRepository:
+    async def create(self, job_data: JobCreate) -> Job:
+        return Job(**job_data.model_dump())
+
+
+class InMemoryQueueService:
+    """Logs what CeleryQueueService logs per enqueue, without a broker"""
+
+    async def enqueue_job(self, job_id: str, job_data: Dict[str, Any]) -> bool:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[InMemoryQueueService.enqueue_job] enqueue job_id=%s keys=%s", job_id, list(job_data.keys()))
+        logger.debug("[InMemoryQueueService.enqueue_job] enqueued job_id=%s", job_id)
+        return True
+
+
+class SlowFile(io.TextIOWrapper):
+    """Text file whose flush blocks for ``latency`` seconds"""
+
+    latency = 0.0
+
+    def flush(self) -> None:
+        super().flush()
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def reset_logging() -> None:
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+async def measure(client: httpx.AsyncClient, requests: int, prompt_size: int) -> Dict[str, float]:
+    body = {"job_type": "text_generation", "input_data": {"prompt": "p" * prompt_size, "max_tokens": 256}}
+    for _ in range(min(50, requests)):  # warm-up
+        (await client.post("/api/v1/jobs/", json=body)).raise_for_status()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        (await client.post("/api/v1/jobs/", json=body)).raise_for_status()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    return {"rps": requests / elapsed, "ms_per_request": elapsed / requests * 1000, "cpu_ms_per_request": cpu / requests * 1000}
+
+
+async def run(args: argparse.Namespace) -> None:
+    use_cases = JobUseCases(InMemoryJobRepository(), InMemoryQueueService(), ai_service=None)
+    app = FastAPI()
+    app.dependency_overrides[get_job_context] = lambda: JobContext(user_id="bench-user", use_cases=use_cases)
+    app.include_router(job_router, prefix="/api/v1")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def sink(name: str) -> SlowFile:
+            stream = SlowFile(open(os.path.join(tmp, f"{name}.log"), "wb"))
+            stream.latency = args.write_latency_us / 1e6
+            return stream
+
+        def off() -> None:
+            logging.getLogger().setLevel(logging.WARNING)
+
+        def sync_debug() -> None:
+            handler = logging.StreamHandler(sink("sync"))
+            handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+            logging.getLogger().addHandler(handler)
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        def queued(level: str, sample: float, name: str):
+            return lambda: configure_logging(level=level, sample_per_second=sample, stream=sink(name))
+
+        modes = (
+            ("off", off),
+            ("sync_debug", sync_debug),
+            ("queued_debug", queued("DEBUG", 0, "queued")),
+            ("queued_sampled", queued("DEBUG", args.sample_per_second, "sampled")),
+            ("queued_info", queued("INFO", 0, "info")),
+        )
+        # Same per-logger levels (httpx=WARNING, ...) in every mode
+        for name, level in parse_levels(settings.log_levels).items():
+            logging.getLogger(name).setLevel(level)
+        results = {}
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            for label, setup in modes:
+                reset_logging()
+                setup()
+                results[label] = await measure(client, args.requests, args.prompt_size)
+                results[label]["sampled_out"] = get_logging_metrics()["sampled_out"] if label.startswith("queued") else 0
+        reset_logging()
+
+    for label, r in results.items():
+        print(
+            f"{label:15s} {r['rps']:9.1f} req/s  {r['ms_per_request']:7.3f} ms/req  "
+            f"{r['cpu_ms_per_request']:7.3f} cpu-ms/req  sampled_out={r['sampled_out']}"
+        )
+    print(f"queued_debug vs sync_debug  {results['queued_debug']['rps'] / results['sync_debug']['rps']:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--prompt-size", type=int, default=2000, help="characters of prompt per job")
+    parser.add_argument("--sample-per-second", type=float, default=20.0)
+    parser.add_argument("--write-latency-us", type=float, default=0.0, help="sleep per flushed record")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Request middleware overhead benchmark.
+
+Serves the same small JSON endpoint with no middleware, with the previous ``@app.middleware("http")``
+request logger and with RequestMetricsMiddleware, and reports requests per second and CPU per
+request for each. ``--concurrency`` requests are kept in flight.
+
+    python -m benchmarks.request_middleware --requests 5000 --concurrency 16
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_PORT", "0")
+
+import httpx
+from fastapi import FastAPI, Request
+
+from src.presentation.api.request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+
+def make_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return {"id": job_id, "status": "completed"}
+
+    if middleware == "function":
+        # main.exception_logging_middleware before this change
+        @app.middleware("http")
+        async def exception_logging_middleware(request: Request, call_next):
+            logging.debug("[middleware] START | %s %s", request.method, request.url.path)
+            try:
+                response = await call_next(request)
+                logging.debug("[middleware] END | %s %s -> %s", request.method, request.url.path, response.status_code)
+                return response
+            except Exception:
+                logging.exception("[middleware] EXCEPTION | method=%s path=%s", request.method, request.url.path)
+                raise
+    elif middleware == "asgi":
+        app.add_middleware(RequestMetricsMiddleware, metrics=RequestMetrics())
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> Dict[str, float]:
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        async def worker(count: int) -> None:
+            for i in range(count):
+                (await client.get(f"/api/v1/jobs/job-{i}")).raise_for_status()
+
+        await asyncio.gather(*(worker(20) for _ in range(concurrency)))  # warm-up
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+    done = requests // concurrency * concurrency
+    return {"rps": done / elapsed, "cpu_us_per_request": cpu / done * 1e6}
+
+
+async def run(args: argparse.Namespace) -> None:
+    results = {}
+    for label in ("none", "function", "asgi"):
+        results[label] = await measure(make_app(label), args.requests, args.concurrency)
+    for label, r in results.items():
+        print(f"{label:9s} {r['rps']:9.1f} req/s  {r['cpu_us_per_request']:8.1f} cpu-us/req")
+    print(f"asgi vs function  {results['asgi']['rps'] / results['function']['rps']:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+WebSocket fan-out load test.
+
+Starts the WebSocket API in-process under uvicorn, opens thousands of ``/ws/{user_id}``
+clients and drives job status events through ``SimpleJobNotifier`` ->
+``RedisNotificationSubscriber`` -> ``notify_job_status_update``. Reports publish-to-receive
+latency percentiles, memory per connection and CPU per delivered message.
+
+Runs fully offline with an in-process pub/sub stand-in; pass ``--redis-url`` to use a
+local Redis instead.
+
+    python -m benchmarks.websocket_fanout --clients 5000 --events 20000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# Settings require these; the benchmark injects its own clients so values are placeholders
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_PORT", "0")
+
+import uvicorn
+import websockets
+from fastapi import FastAPI
+
+from src.infrastructure.events.redis_notification_subscriber import RedisNotificationSubscriber
+from src.infrastructure.events.simple_job_notifier import SimpleJobNotifier
+from src.presentation.websocket.connection_manager import manager
+from src.presentation.websocket.websocket_routes import router as websocket_router
+
+BENCH_PREFIX = "bench:"
+
+
+class InMemoryPubSub:
+    """Minimal stand-in for the redis-py pub/sub surface used by the notifier and subscriber.
+
+    ``publish`` is thread-safe (it is called from notifier threads); subscribers receive
+    messages on the event loop that subscribed.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List["_InMemorySubscription"]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, data: str) -> int:
+        with self._lock:
+            subs = list(self._subscribers.get(channel, ()))
+        for sub in subs:
+            sub.deliver(channel, data)
+        return len(subs)
+
+    def pubsub(self) -> "_InMemorySubscription":
+        return _InMemorySubscription(self)
+
+    async def close(self) -> None:
+        pass
+
+    def _register(self, channel: str, sub: "_InMemorySubscription") -> None:
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(sub)
+
+    def _unregister(self, channel: str, sub: "_InMemorySubscription") -> None:
+        with self._lock:
+            subs = self._subscribers.get(channel, [])
+            if sub in subs:
+                subs.remove(sub)
+
+
+class _InMemorySubscription:
+    def __init__(self, hub: InMemoryPubSub):
+        self._hub = hub
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._channels: List[str] = []
+
+    def deliver(self, channel: str, data: str) -> None:
+        message = {"type": "message", "channel": channel, "data": data}
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+
+    async def subscribe(self, channel: str) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._channels.append(channel)
+        self._hub._register(channel, self)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def unsubscribe(self, channel: str) -> None:
+        self._hub._unregister(channel, self)
+
+    async def close(self) -> None:
+        for channel in self._channels:
+            self._hub._unregister(channel, self)
+
+
+class _QuietServer(uvicorn.Server):
+    """Leave SIGINT/SIGTERM to the benchmark process"""
+
+    def install_signal_handlers(self) -> None:
+        pass
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _raise_fd_limit(needed: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_app(subscriber: RedisNotificationSubscriber) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await subscriber.start()
+        yield
+        await subscriber.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(websocket_router)
+    return app
+
+
+class FanoutClient:
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.latencies: List[float] = []
+        self._ws = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def connect(self, base_url: str) -> None:
+        self._ws = await websockets.connect(
+            f"{base_url}/ws/{self.user_id}?token=clerk_bench",
+            ping_interval=None,
+            max_queue=None,
+        )
+        await self._ws.recv()  # welcome message
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        try:
+            async for raw in self._ws:
+                received = time.perf_counter()
+                message = json.loads(raw)
+                text = message.get("message") or ""
+                if message.get("type") == "job_status_update" and text.startswith(BENCH_PREFIX):
+                    self.latencies.append(received - float(text[len(BENCH_PREFIX):]))
+        except websockets.ConnectionClosed:
+            pass
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await self._reader
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.redis_url:
+        import redis
+        from redis.asyncio import Redis
+
+        publisher = redis.from_url(args.redis_url, decode_responses=True)
+        subscriber_client = Redis.from_url(args.redis_url, decode_responses=True)
+        backend = f"redis ({args.redis_url})"
+    else:
+        publisher = subscriber_client = InMemoryPubSub()
+        backend = "in-process stand-in"
+    SimpleJobNotifier.use_client(publisher)
+
+    subscriber = RedisNotificationSubscriber(redis=subscriber_client)
+    app = build_app(subscriber)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    config = uvicorn.Config(app, log_level="warning", lifespan="on", backlog=4096, ws_ping_interval=None)
+    server = _QuietServer(config)
+    server_task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    users = [f"bench-user-{i}" for i in range(args.users or args.clients)]
+    clients = [FanoutClient(users[i % len(users)]) for i in range(args.clients)]
+    sockets_per_user: Dict[str, int] = {}
+    for client in clients:
+        sockets_per_user[client.user_id] = sockets_per_user.get(client.user_id, 0) + 1
+
+    rss_before = _rss_bytes()
+    connect_started = time.perf_counter()
+    gate = asyncio.Semaphore(args.connect_concurrency)
+
+    async def connect(client: FanoutClient) -> None:
+        async with gate:
+            await client.connect(f"ws://127.0.0.1:{port}")
+
+    await asyncio.gather(*(connect(c) for c in clients))
+    connect_seconds = time.perf_counter() - connect_started
+    rss_after_connect = _rss_bytes()
+
+    targets = [random.choice(users) for _ in range(args.events)]
+    expected = sum(sockets_per_user[u] for u in targets)
+    interval = 1.0 / args.rate if args.rate else 0.0
+
+    def publish_events(chunk: List[str]) -> None:
+        next_at = time.perf_counter()
+        for user_id in chunk:
+            if interval:
+                next_at += interval * args.publishers
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            SimpleJobNotifier.notify_job_status_sync(
+                user_id=user_id,
+                job_id=f"job-{random.getrandbits(32):08x}",
+                status="completed",
+                message=f"{BENCH_PREFIX}{time.perf_counter()}",
+            )
+
+    loop = asyncio.get_running_loop()
+    cpu_before = _cpu_seconds()
+    publish_started = time.perf_counter()
+    chunks = [targets[i::args.publishers] for i in range(args.publishers)]
+    with ThreadPoolExecutor(max_workers=args.publishers) as pool:
+        await asyncio.gather(*(loop.run_in_executor(pool, publish_events, chunk) for chunk in chunks))
+
+    deadline = time.perf_counter() + args.timeout
+    while sum(len(c.latencies) for c in clients) < expected and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    delivery_seconds = time.perf_counter() - publish_started
+    cpu_used = _cpu_seconds() - cpu_before
+
+    latencies = sorted(l for c in clients for l in c.latencies)
+    delivered = len(latencies)
+    subscriber_metrics = subscriber.get_metrics()
+    live_sockets = manager.get_total_connections()
+
+    await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+    server.should_exit = True
+    await server_task
+    SimpleJobNotifier.use_client(None)
+
+    ms = 1000.0
+    return {
+        "backend": backend,
+        "clients": args.clients,
+        "users": len(users),
+        "live_sockets": live_sockets,
+        "connect_seconds": round(connect_seconds, 3),
+        "events_published": args.events,
+        "messages_expected": expected,
+        "messages_delivered": delivered,
+        "delivery_seconds": round(delivery_seconds, 3),
+        "messages_per_second": round(delivered / delivery_seconds, 1) if delivery_seconds else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * ms, 3),
+            "p90": round(_percentile(latencies, 90) * ms, 3),
+            "p99": round(_percentile(latencies, 99) * ms, 3),
+            "max": round((latencies[-1] if latencies else 0.0) * ms, 3),
+        },
+        # Client and server share this process, so both figures include the client side
+        "memory_per_connection_kb": round((rss_after_connect - rss_before) / max(1, args.clients) / 1024, 2),
+        "cpu_us_per_message": round(cpu_used / delivered * 1e6, 2) if delivered else None,
+        "subscriber": subscriber_metrics,
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    latency = report["latency_ms"]
+    print(f"backend               {report['backend']}")
+    print(f"clients / users       {report['clients']} / {report['users']} (live sockets {report['live_sockets']})")
+    print(f"connect time          {report['connect_seconds']}s")
+    print(f"delivered / expected  {report['messages_delivered']} / {report['messages_expected']}"
+          f" in {report['delivery_seconds']}s ({report['messages_per_second']} msg/s)")
+    print(f"latency ms            p50={latency['p50']} p90={latency['p90']} p99={latency['p99']} max={latency['max']}")
+    print(f"memory per connection {report['memory_per_connection_kb']} KiB (client + server)")
+    print(f"cpu per message       {report['cpu_us_per_message']} us (client + server)")
+    sub = report["subscriber"]
+    print(f"subscriber            dropped={sub['dropped']} failed={sub['failed']} lag_max={sub['lag_seconds_max']:.4f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=2000, help="WebSocket connections to open")
+    parser.add_argument("--users", type=int, default=0, help="distinct user ids (default: one per client)")
+    parser.add_argument("--events", type=int, default=10000, help="job status events to publish")
+    parser.add_argument("--publishers", type=int, default=4, help="publisher threads (simulated workers)")
+    parser.add_argument("--rate", type=float, default=0.0, help="total events/second (0 = unthrottled)")
+    parser.add_argument("--connect-concurrency", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for deliveries")
+    parser.add_argument("--redis-url", default=None, help="use a local Redis instead of the in-process stand-in")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    _raise_fd_limit(args.clients * 2 + 1024)
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
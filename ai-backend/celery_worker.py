@@ -7,7 +7,9 @@ import sys
 import asyncio
 from src.infrastructure.queue.celery_queue_service import celery_app
 from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.indexes import ensure_indexes
 from src.config.settings import settings
+from src.config.logging_config import configure_logging
 import logging
 
 # Add src to Python path
@@ -15,15 +17,16 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 
 async def init_database():
-    """Initialize database connection for worker"""
+    """Initialize database connection for worker and make sure required indexes exist"""
     await MongoDB.ensure_connection(settings.mongodb_url, settings.database_name)
+    await ensure_indexes(MongoDB.get_database())
 
 
 if __name__ == '__main__':
     # Configure logging
-    if settings.debug:
-        logging.basicConfig(level=logging.DEBUG, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
-        logging.debug("[celery_worker] Debug logging configured")
+    # Pool processes inherit the queue handler; their listener threads are restarted after fork
+    configure_logging()
+    logging.debug("[celery_worker] Logging configured")
 
     # Initialize database connection
     asyncio.run(init_database())
@@ -1,38 +1,69 @@
-from fastapi import FastAPI, Security, Request
+from fastapi import Depends, FastAPI, Security, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from contextlib import asynccontextmanager
 from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.indexes import ensure_indexes_in_background
+from src.infrastructure.database.job_archiver import JobArchiver, archive_in_background
+from src.infrastructure.database.mongo_metrics import mongo_metrics
+from src.infrastructure.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics_registry
+from src.infrastructure.tracing import configure_tracing
 from src.presentation.api.user_routes import router as user_router
 from src.presentation.api.job_routes import router as job_router
+from src.presentation.api.artifact_routes import router as artifact_router
+from src.presentation.api.request_metrics import RequestMetricsMiddleware, request_metrics
 from src.presentation.websocket.websocket_routes import router as websocket_router
+from src.presentation.websocket.connection_manager import manager as websocket_manager
 from src.infrastructure.events.redis_notification_subscriber import RedisNotificationSubscriber
+from src.infrastructure.events.mongo_change_stream_subscriber import MongoChangeStreamSubscriber
+from src.infrastructure.cache import job_cache, user_cache, presigned_url_cache
+from src.container import Container, set_container
 from src.config.settings import settings
+from src.config.logging_config import configure_logging, get_logging_metrics
 import logging
-from src.config.auth import security
+from src.config.auth import require_diagnostics_access, security
 from fastapi.responses import JSONResponse
 import traceback
 
 
 # Global notification subscriber
-notification_subscriber = RedisNotificationSubscriber()
+if settings.notification_backend == "change_stream":
+    notification_subscriber = MongoChangeStreamSubscriber()
+else:
+    notification_subscriber = RedisNotificationSubscriber()
+# Status events invalidate cached active jobs in this process
+notification_subscriber.add_listener(job_cache.on_status_event)
+# Counters these components already keep are read at scrape time
+metrics_registry.add_collector(request_metrics.collect)
+metrics_registry.add_collector(notification_subscriber.dispatcher.collect)
+metrics_registry.add_collector(websocket_manager.collect)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    if settings.debug:
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format="%(asctime)s %(levelname)s %(name)s - %(message)s",
-        )
-        logging.getLogger("uvicorn").setLevel(logging.INFO)
-        logging.debug("[main.lifespan] Debug logging configured")
+    configure_logging()
+    logging.debug("[main.lifespan] Logging configured")
+    configure_tracing()
     await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+    app.state.container = Container()
+    set_container(app.state.container)
+    index_task = ensure_indexes_in_background(MongoDB.get_database())
+    app.state.job_archiver = JobArchiver(MongoDB.get_database())
+    archive_task = None
+    if settings.job_archive_interval_seconds > 0:
+        archive_task = archive_in_background(app.state.job_archiver, settings.job_archive_interval_seconds)
     await notification_subscriber.start()
     yield
     # Shutdown
+    if not index_task.done():
+        index_task.cancel()
+    if archive_task is not None:
+        archive_task.cancel()
     await notification_subscriber.stop()
+    await job_cache.close()
+    await app.state.container.close()
+    set_container(None)
     await MongoDB.close_mongo_connection()
 
 
@@ -44,17 +75,8 @@ app = FastAPI(
     swagger_ui_parameters={"persistAuthorization": True},
 )
 
-# Log requests and unhandled exceptions to help diagnose 500 errors
-@app.middleware("http")
-async def exception_logging_middleware(request: Request, call_next):
-    logging.debug("[middleware] START | %s %s", request.method, request.url.path)
-    try:
-        response = await call_next(request)
-        logging.debug("[middleware] END | %s %s -> %s", request.method, request.url.path, response.status_code)
-        return response
-    except Exception:
-        logging.exception("[middleware] EXCEPTION | method=%s path=%s", request.method, request.url.path)
-        raise
+# Per-route latency, in-flight and error counts; logs 5xx responses and slow requests only
+app.add_middleware(RequestMetricsMiddleware)
 
 # Global catch-all exception handler to ensure we always see error details in DEBUG
 @app.exception_handler(Exception)
@@ -86,6 +108,7 @@ app.add_middleware(
 app.include_router(user_router, prefix="/api/v1")
 app.include_router(job_router, prefix="/api/v1")
 app.include_router(websocket_router)
+app.include_router(artifact_router)
 
 
 @app.get("/")
@@ -98,6 +121,27 @@ async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
 
+@app.get("/stats", dependencies=[Depends(require_diagnostics_access)])
+async def stats():
+    """In-process runtime metrics for diagnostics"""
+    return {
+        "notifications": notification_subscriber.get_metrics(),
+        "job_cache": job_cache.get_metrics(),
+        "user_cache": user_cache.get_metrics(),
+        "presigned_urls": presigned_url_cache.get_metrics(),
+        "job_archiver": app.state.job_archiver.get_metrics() if hasattr(app.state, "job_archiver") else None,
+        "mongo": mongo_metrics.get_metrics(),
+        "logging": get_logging_metrics(),
+        "requests": request_metrics.get_metrics(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_diagnostics_access)])
+async def metrics():
+    """Prometheus scrape endpoint (per process; scrape every API worker)"""
+    return Response(metrics_registry.render(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
+
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     # Return 204 No Content to avoid 404 logs when browsers request /favicon.ico
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Operational commands for the AI backend database.
+
+    python manage.py archive-jobs [--older-than-days 30] [--batch-size 500] [--max-batches 100] [--dry-run]
+    python manage.py rebuild-job-stats
+    python manage.py dedupe-active-jobs [--dry-run]
+    python manage.py show-trace (--job-id ID | --trace-id ID) [--file traces.jsonl]
+"""
+import argparse
+import asyncio
+import logging
+
+from src.config.logging_config import configure_logging
+from src.config.settings import settings
+from src.infrastructure.database.indexes import ACTIVE_SESSION_INDEX, ensure_indexes, fail_duplicate_active_jobs
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.job_archiver import JobArchiver
+from src.infrastructure.repositories import MongoJobStatsRepository
+from src.infrastructure.tracing import format_trace, read_spans
+
+
+async def archive_jobs(args: argparse.Namespace) -> None:
+    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+    try:
+        archiver = JobArchiver(
+            MongoDB.get_database(),
+            archive_after_days=args.older_than_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+        )
+        eligible = await archiver.count_eligible()
+        print(f"eligible jobs: {eligible}")
+        if args.dry_run or not eligible:
+            return
+        moved = await archiver.archive_once()
+        print(f"archived jobs: {moved}")
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+async def rebuild_job_stats(args: argparse.Namespace) -> None:
+    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+    try:
+        written = await MongoJobStatsRepository(MongoDB.get_database()).rebuild()
+        print(f"counter documents written: {written}")
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+async def dedupe_active_jobs(args: argparse.Namespace) -> None:
+    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+    try:
+        database = MongoDB.get_database()
+        failed = await fail_duplicate_active_jobs(database, dry_run=args.dry_run)
+        print(f"duplicate active jobs{' (dry run)' if args.dry_run else ' failed'}: {failed}")
+        if args.dry_run:
+            return
+        if failed:
+            written = await MongoJobStatsRepository(database).rebuild()
+            print(f"counter documents written: {written}")
+        ensured = await ensure_indexes(database)
+        print(f"{ACTIVE_SESSION_INDEX}: {'ok' if ACTIVE_SESSION_INDEX in ensured.get('jobs', []) else 'FAILED (see log)'}")
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+async def show_trace(args: argparse.Namespace) -> None:
+    spans = read_spans(args.file or settings.trace_file_path)
+    if args.trace_id:
+        trace_ids = [args.trace_id]
+    else:
+        trace_ids = sorted({s["trace_id"] for s in spans if s["attributes"].get("job_id") == args.job_id})
+    if not trace_ids:
+        print("no spans found")
+    for trace_id in trace_ids:
+        print(f"trace {trace_id}")
+        print(format_trace(s for s in spans if s["trace_id"] == trace_id))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    archive = subparsers.add_parser("archive-jobs", help="move old terminal jobs to the jobs_archive collection")
+    archive.add_argument("--older-than-days", type=int, default=None, help="default: JOB_ARCHIVE_AFTER_DAYS")
+    archive.add_argument("--batch-size", type=int, default=None, help="default: JOB_ARCHIVE_BATCH_SIZE")
+    archive.add_argument("--max-batches", type=int, default=None, help="default: JOB_ARCHIVE_MAX_BATCHES")
+    archive.add_argument("--dry-run", action="store_true", help="only count eligible jobs")
+    archive.set_defaults(handler=archive_jobs)
+
+    rebuild = subparsers.add_parser("rebuild-job-stats", help="recompute the job_counters collection from all jobs")
+    rebuild.set_defaults(handler=rebuild_job_stats)
+
+    dedupe = subparsers.add_parser(
+        "dedupe-active-jobs",
+        help="fail all but the newest active job per session, then build the one-active-job-per-session index",
+    )
+    dedupe.add_argument("--dry-run", action="store_true", help="only count duplicate active jobs")
+    dedupe.set_defaults(handler=dedupe_active_jobs)
+
+    trace = subparsers.add_parser("show-trace", help="print one job's spans from a TRACE_EXPORTER=file trace file")
+    target = trace.add_mutually_exclusive_group(required=True)
+    target.add_argument("--job-id", help="every trace with a span for this job")
+    target.add_argument("--trace-id")
+    trace.add_argument("--file", default=None, help="default: TRACE_FILE_PATH")
+    trace.set_defaults(handler=show_trace)
+
+    args = parser.parse_args()
+    configure_logging()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from .user_dto import UserResponse, UserCreateRequest, UserUpdateRequest
-from .job_dto import JobCreateRequest, JobResponse, JobStatusUpdate
+from .job_dto import JobCreateRequest, JobResponse, JobStatusUpdate, JobSummary, JobStatsResponse
 
 __all__ = [
     "UserResponse",
@@ -7,5 +7,7 @@ __all__ = [
     "UserUpdateRequest",
     "JobCreateRequest",
     "JobResponse",
-    "JobStatusUpdate"
+    "JobStatusUpdate",
+    "JobSummary",
+    "JobStatsResponse"
 ]
@@ -1,6 +1,6 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
 from src.domain.entities import JobType, JobStatus
 
 
@@ -18,6 +18,8 @@ class JobResponse(BaseModel):
     status: JobStatus
     input_data: Dict[str, Any]
     output_data: Optional[Dict[str, Any]] = None
+    # Set when output_data is only a preview; the full payload is at GET /jobs/{id}/output
+    output_ref: Optional[Dict[str, Any]] = None
     artifact_url: Optional[str] = None
     error_message: Optional[str] = None
     created_at: datetime
@@ -26,9 +28,60 @@ class JobResponse(BaseModel):
     completed_at: Optional[datetime] = None
 
 
+# Fields a JobSummary may carry; heavy payloads (input/output data) are deliberately excluded
+JOB_SUMMARY_SELECTABLE_FIELDS: Tuple[str, ...] = (
+    "user_id",
+    "session_id",
+    "job_type",
+    "status",
+    "artifact_url",
+    "error_message",
+    "created_at",
+    "updated_at",
+    "started_at",
+    "completed_at",
+)
+# Returned when no explicit fields= selection is made
+JOB_SUMMARY_DEFAULT_FIELDS: Tuple[str, ...] = (
+    "session_id",
+    "job_type",
+    "status",
+    "created_at",
+    "updated_at",
+    "started_at",
+    "completed_at",
+)
+
+
+class JobSummary(BaseModel):
+    """Lightweight job listing entry; only selected fields are set (id and created_at always are)."""
+    id: str
+    created_at: datetime
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
+    job_type: Optional[JobType] = None
+    status: Optional[JobStatus] = None
+    artifact_url: Optional[str] = None
+    error_message: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
 class JobStatusUpdate(BaseModel):
     job_id: str
     status: JobStatus
     session_id: str | None = None
     message: Optional[str] = None
     progress: Optional[int] = None
+
+
+class JobStatsResponse(BaseModel):
+    """Job counters: active jobs right now, plus jobs created/completed/failed on ``day`` (UTC)."""
+    user_id: Optional[str] = None  # None for the all-users view
+    day: date
+    pending: int = 0
+    processing: int = 0
+    created: int = 0
+    completed: int = 0
+    failed: int = 0
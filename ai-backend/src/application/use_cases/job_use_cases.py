@@ -1,55 +1,75 @@
+from typing import Optional, List, Sequence, Dict, Any, AsyncIterator, Awaitable, Callable, Tuple, TypeVar
+from datetime import date, datetime, timezone
+from src.domain.repositories import JobRepository, ActiveJobConflictError, JobStatsRepository
+from src.domain.entities import Job, JobCreate, JobUpdate, JobStatus
+from src.domain.services import QueueService, AIService, OutputStore, OutputNotFoundError, StorageService
+from src.domain.services.output_store import OUTPUT_CONTENT_TYPE, encode_output, offload_output
+from src.domain.services.tracing import start_span
+from src.application.dto import JobCreateRequest, JobResponse, JobSummary, JobStatsResponse
+from src.application.dto.job_dto import JOB_SUMMARY_DEFAULT_FIELDS, JOB_SUMMARY_SELECTABLE_FIELDS
+# Removed manual event publishing - using Celery's built-in events instead
+import asyncio
+import logging
+
+ResponseT = TypeVar("ResponseT", JobResponse, JobSummary)
+
+
 class ActiveJobExistsError(Exception):
     """Raised when there's already an active job for the same user session."""
-    def __init__(self, existing_job_id: str):
+    def __init__(self, existing_job_id: Optional[str]):
         super().__init__(f"Active job already exists: {existing_job_id}")
         self.existing_job_id = existing_job_id
 
-from typing import Optional, List
-from datetime import datetime, timezone
-from src.domain.repositories import JobRepository
-from src.domain.entities import Job, JobCreate, JobUpdate, JobStatus
-from src.domain.services import QueueService, AIService
-from src.application.dto import JobCreateRequest, JobResponse
-# Removed manual event publishing - using Celery's built-in events instead
-import logging
-
 
 class EnqueueJobError(Exception):
     """Raised when a job cannot be enqueued to the queue backend."""
     pass
 
 
+class InvalidJobFieldsError(ValueError):
+    """Raised when a summary field selection names fields that cannot be selected."""
+    def __init__(self, fields: Sequence[str]):
+        super().__init__(
+            f"Unknown or non-selectable fields: {', '.join(fields)}. "
+            f"Allowed: id, {', '.join(JOB_SUMMARY_SELECTABLE_FIELDS)}"
+        )
+        self.fields = list(fields)
+
+
 class JobUseCases:
     def __init__(
         self, 
         job_repository: JobRepository, 
         queue_service: QueueService,
-        ai_service: AIService
+        ai_service: AIService,
+        output_store: Optional[OutputStore] = None,
+        output_inline_max_bytes: int = 0,
+        output_preview_chars: int = 512,
+        job_stats: Optional[JobStatsRepository] = None,
+        storage_service: Optional[StorageService] = None,
     ):
         self.job_repository = job_repository
         self.queue_service = queue_service
         self.ai_service = ai_service
+        # Outputs above output_inline_max_bytes go to output_store; 0 (or no store) keeps them inline
+        self.output_store = output_store
+        self.output_inline_max_bytes = output_inline_max_bytes
+        self.output_preview_chars = output_preview_chars
+        self.job_stats = job_stats
+        # When set, stored artifact references are returned as presigned URLs
+        self.storage_service = storage_service
         self.logger = logging.getLogger(__name__)
 
     async def create_job(self, user_id: str, job_request: JobCreateRequest) -> JobResponse:
-        self.logger.debug(
-            "[JobUseCases.create_job] user_id=%s job_type=%s payload_keys=%s",
-            user_id,
-            job_request.job_type,
-            list(job_request.input_data.keys()) if job_request.input_data else [],
-        )
-        # Enforce single active job per session if session_id is provided
-        session_id = getattr(job_request, "session_id", None)
-        if session_id:
-            existing = await self.job_repository.get_active_by_user_session(user_id, session_id)
-            if existing:
-                self.logger.debug(
-                    "[JobUseCases.create_job] active job exists user_id=%s session_id=%s job_id=%s",
-                    user_id,
-                    session_id,
-                    str(existing.id),
-                )
-                raise ActiveJobExistsError(str(existing.id))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "[JobUseCases.create_job] user_id=%s job_type=%s payload_keys=%s",
+                user_id,
+                job_request.job_type,
+                list(job_request.input_data.keys()) if job_request.input_data else [],
+            )
+        # At most one active job per session; the repository enforces it atomically on insert
+        session_id = getattr(job_request, "session_id", None) or None
         job_data = JobCreate(
             user_id=user_id,
             session_id=session_id,
@@ -57,7 +77,17 @@ class JobUseCases:
             input_data=job_request.input_data
         )
         
-        job = await self.job_repository.create(job_data)
+        try:
+            with start_span("job.insert"):
+                job = await self.job_repository.create(job_data)
+        except ActiveJobConflictError as e:
+            self.logger.debug(
+                "[JobUseCases.create_job] active job exists user_id=%s session_id=%s job_id=%s",
+                user_id,
+                session_id,
+                e.existing_job_id,
+            )
+            raise ActiveJobExistsError(e.existing_job_id) from e
         self.logger.debug("[JobUseCases.create_job] created job id=%s", str(job.id))
 
         # Enqueue job for processing - include user_id and session_id for event monitoring
@@ -68,7 +98,9 @@ class JobUseCases:
                 "job_type": job.job_type.value,
                 "input_data": job.input_data,
                 "user_id": user_id,
-                "session_id": session_id
+                "session_id": session_id,
+                # Lets the worker measure queue wait and end-to-end latency without reading the job
+                "created_at": (job.created_at if job.created_at.tzinfo else job.created_at.replace(tzinfo=timezone.utc)).timestamp(),
             }
         )
         self.logger.debug("[JobUseCases.create_job] enqueue_ok=%s job_id=%s", enqueue_ok, str(job.id))
@@ -89,17 +121,68 @@ class JobUseCases:
     async def get_job_by_id(self, job_id: str) -> Optional[JobResponse]:
         self.logger.debug("[JobUseCases.get_job_by_id] job_id=%s", job_id)
         job = await self.job_repository.get_by_id(job_id)
-        return self._to_response(job) if job else None
+        return await self._sign_artifact_url(self._to_response(job)) if job else None
+
+    async def get_user_jobs(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[JobResponse]:
+        self.logger.debug(
+            "[JobUseCases.get_user_jobs] user_id=%s skip=%s limit=%s cursor=%s include_archived=%s",
+            user_id, skip, limit, cursor, include_archived,
+        )
+        jobs = await self.job_repository.get_by_user_id(user_id, skip, limit, cursor, include_archived=include_archived)
+        return await self._sign_artifact_urls([self._to_response(job) for job in jobs])
+
+    async def get_user_job_documents(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Hot path for listings: raw documents from our own database, returned without re-validation.
 
-    async def get_user_jobs(self, user_id: str, skip: int = 0, limit: int = 100) -> List[JobResponse]:
-        self.logger.debug("[JobUseCases.get_user_jobs] user_id=%s skip=%s limit=%s", user_id, skip, limit)
-        jobs = await self.job_repository.get_by_user_id(user_id, skip, limit)
-        return [self._to_response(job) for job in jobs]
+        Callers serialize them directly (see presentation.api.serialization); the shape matches JobResponse.
+        """
+        self.logger.debug(
+            "[JobUseCases.get_user_job_documents] user_id=%s skip=%s limit=%s cursor=%s include_archived=%s",
+            user_id, skip, limit, cursor, include_archived,
+        )
+        docs = await self.job_repository.get_documents_by_user_id(user_id, skip, limit, cursor, include_archived=include_archived)
+        if self.storage_service is None:
+            return docs
+        # Copies: the documents may be shared with the job cache, which must keep the stored reference
+        signed = await asyncio.gather(*(self._signed_url(doc.get("artifact_url")) for doc in docs))
+        return [{**doc, "artifact_url": url} if url != doc.get("artifact_url") else doc for doc, url in zip(docs, signed)]
+
+    async def get_user_job_summaries(
+        self,
+        user_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[JobSummary]:
+        """Projected job listing: only the selected fields are read from Mongo and returned."""
+        # id is always returned, so naming it is accepted and needs no projection
+        selected = [f for f in fields if f != "id"] if fields else list(JOB_SUMMARY_DEFAULT_FIELDS)
+        unknown = [f for f in selected if f not in JOB_SUMMARY_SELECTABLE_FIELDS]
+        if unknown:
+            raise InvalidJobFieldsError(unknown)
+        self.logger.debug("[JobUseCases.get_user_job_summaries] user_id=%s limit=%s fields=%s", user_id, limit, selected)
+        docs = await self.job_repository.get_summaries_by_user_id(user_id, selected, limit, cursor)
+        summaries = [
+            JobSummary(id=str(doc["_id"]), created_at=doc["created_at"], **{f: doc.get(f) for f in selected if f != "created_at"})
+            for doc in docs
+        ]
+        return await self._sign_artifact_urls(summaries) if "artifact_url" in selected else summaries
 
-    async def get_jobs_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100) -> List[JobResponse]:
-        self.logger.debug("[JobUseCases.get_jobs_by_status] status=%s skip=%s limit=%s", status, skip, limit)
-        jobs = await self.job_repository.get_by_status(status, skip, limit)
-        return [self._to_response(job) for job in jobs]
+    async def get_job_stats(self, user_id: Optional[str], day: Optional[date] = None) -> JobStatsResponse:
+        """Materialized counters for one user, or across all users when ``user_id`` is None."""
+        day = day or datetime.now(timezone.utc).date()
+        self.logger.debug("[JobUseCases.get_job_stats] user_id=%s day=%s", user_id, day)
+        counters = await self.job_stats.get_stats(user_id, day)
+        return JobStatsResponse(user_id=user_id, day=day, **counters)
+
+    async def get_jobs_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[JobResponse]:
+        self.logger.debug("[JobUseCases.get_jobs_by_status] status=%s skip=%s limit=%s cursor=%s", status, skip, limit, cursor)
+        jobs = await self.job_repository.get_by_status(status, skip, limit, cursor)
+        return await self._sign_artifact_urls([self._to_response(job) for job in jobs])
 
     async def update_job_status(
         self, 
@@ -117,26 +200,55 @@ class JobUseCases:
             bool(artifact_url),
             bool(error_message),
         )
-        update_data = JobUpdate(
-            status=status,
-            output_data=output_data,
-            artifact_url=artifact_url,
-            error_message=error_message
-        )
-        
-        if status == JobStatus.PROCESSING:
-            update_data.started_at = datetime.now(timezone.utc)
-        elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-            update_data.completed_at = datetime.now(timezone.utc)
-        
-        job = await self.job_repository.update(job_id, update_data)
+        with start_span("job.status_write", job_id=job_id, status=status.value):
+            output_data, output_ref = await offload_output(
+                self.output_store, job_id, output_data, self.output_inline_max_bytes, self.output_preview_chars
+            )
+            update_data = JobUpdate(
+                status=status,
+                output_data=output_data,
+                output_ref=output_ref,
+                artifact_url=artifact_url,
+                error_message=error_message
+            )
+
+            if status == JobStatus.PROCESSING:
+                update_data.started_at = datetime.now(timezone.utc)
+            elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+                update_data.completed_at = datetime.now(timezone.utc)
+
+            job = await self.job_repository.update(job_id, update_data)
+            if job is None and output_ref:
+                # Nothing references the uploaded output
+                await self.output_store.delete(output_ref)
         if job:
             self.logger.debug("[JobUseCases.update_job_status] updated job_id=%s new_status=%s", job_id, job.status)
             # Events are now automatically handled by Celery's built-in event system
-        return self._to_response(job) if job else None
+        return await self._sign_artifact_url(self._to_response(job)) if job else None
+
+    async def open_job_output(self, job: JobResponse) -> Tuple[str, AsyncIterator[bytes]]:
+        """Full output of a job as ``(content_type, chunks)``, streamed from the output store when offloaded.
 
-    async def process_job(self, job_id: str) -> bool:
-        """Process a job using AI service"""
+        The first chunk is read before returning so a missing file raises OutputNotFoundError here
+        rather than midway through a response.
+        """
+        if not job.output_ref:
+            if job.output_data is None:
+                raise OutputNotFoundError(f"Job {job.id} has no output")
+            return OUTPUT_CONTENT_TYPE, _single_chunk(encode_output(job.output_data))
+        if self.output_store is None:
+            raise OutputNotFoundError(f"No output store configured for job {job.id}")
+
+        self.logger.debug("[JobUseCases.open_job_output] job_id=%s ref=%s", job.id, job.output_ref)
+        chunks = self.output_store.stream(job.output_ref)
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = b""
+        return job.output_ref.get("content_type", OUTPUT_CONTENT_TYPE), _prepend(first, chunks)
+
+    async def process_job(self, job_id: str, on_processing: Optional[Callable[[], Awaitable[None]]] = None) -> bool:
+        """Process a job using AI service; ``on_processing`` runs once the PROCESSING status is written"""
         self.logger.debug("[JobUseCases.process_job] start job_id=%s", job_id)
         job = await self.job_repository.get_by_id(job_id)
         if not job:
@@ -146,10 +258,13 @@ class JobUseCases:
         try:
             # Update status to processing
             await self.update_job_status(job_id, JobStatus.PROCESSING)
+            if on_processing is not None:
+                await on_processing()
             
             # Generate AI content
             self.logger.debug("[JobUseCases.process_job] calling AI service job_type=%s", job.job_type)
-            result = await self.ai_service.generate(job.job_type, job.input_data)
+            with start_span("ai.generate", job_id=job_id, job_type=job.job_type.value):
+                result = await self.ai_service.generate(job.job_type, job.input_data)
             self.logger.debug(
                 "[JobUseCases.process_job] AI result received job_id=%s keys=%s",
                 job_id,
@@ -176,6 +291,25 @@ class JobUseCases:
             )
             return False
 
+    async def _signed_url(self, artifact_url: Optional[str]) -> Optional[str]:
+        """Presigned URL for a stored artifact reference; the reference itself if signing fails"""
+        if not artifact_url or self.storage_service is None:
+            return artifact_url
+        try:
+            return await self.storage_service.generate_presigned_url(artifact_url)
+        except Exception as e:
+            self.logger.warning("[JobUseCases._signed_url] signing failed url=%s error=%s", artifact_url, e)
+            return artifact_url
+
+    async def _sign_artifact_url(self, job: ResponseT) -> ResponseT:
+        job.artifact_url = await self._signed_url(job.artifact_url)
+        return job
+
+    async def _sign_artifact_urls(self, jobs: List[ResponseT]) -> List[ResponseT]:
+        if self.storage_service is not None:
+            await asyncio.gather(*(self._sign_artifact_url(job) for job in jobs if job.artifact_url))
+        return jobs
+
     def _to_response(self, job: Job) -> JobResponse:
         return JobResponse(
             id=str(job.id),
@@ -185,6 +319,7 @@ class JobUseCases:
             status=job.status,
             input_data=job.input_data,
             output_data=job.output_data,
+            output_ref=job.output_ref,
             artifact_url=job.artifact_url,
             error_message=job.error_message,
             created_at=job.created_at,
@@ -192,3 +327,13 @@ class JobUseCases:
             started_at=job.started_at,
             completed_at=job.completed_at
         )
+
+
+async def _single_chunk(payload: bytes) -> AsyncIterator[bytes]:
+    yield payload
+
+
+async def _prepend(first: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield first
+    async for chunk in rest:
+        yield chunk
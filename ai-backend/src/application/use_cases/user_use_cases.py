@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from src.domain.repositories import UserRepository
 from src.domain.entities import User, UserCreate, UserUpdate
 from src.application.dto import UserResponse, UserCreateRequest, UserUpdateRequest
@@ -23,6 +23,17 @@ class UserUseCases:
         user = await self.user_repository.create(user_data)
         return self._to_response(user)
 
+    async def provision_user(self, user_request: UserCreateRequest) -> Tuple[UserResponse, bool]:
+        """Return the user for this clerk_id, creating it (or re-linking a user with the same email)
+        if needed. The flag is True when a new user was created."""
+        user_data = UserCreate(
+            clerk_id=user_request.clerk_id,
+            email=user_request.email,
+            name=user_request.name
+        )
+        user, created = await self.user_repository.provision(user_data)
+        return self._to_response(user), created
+
     async def get_user_by_clerk_id(self, clerk_id: str) -> Optional[UserResponse]:
         user = await self.user_repository.get_by_clerk_id(clerk_id)
         return self._to_response(user) if user else None
@@ -46,8 +57,8 @@ class UserUseCases:
         user = await self.user_repository.update(user_id, user_data)
         return self._to_response(user) if user else None
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
-        users = await self.user_repository.list_users(skip, limit)
+    async def list_users(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[UserResponse]:
+        users = await self.user_repository.list_users(skip, limit, cursor)
         return [self._to_response(user) for user in users]
 
     def _to_response(self, user: User) -> UserResponse:
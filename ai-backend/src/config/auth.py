@@ -1,31 +1,19 @@
-from fastapi import HTTPException, Depends, Security, status
+from fastapi import HTTPException, Depends, Request, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt, jwk
 from jose.utils import base64url_decode
 from typing import Optional, Dict, Any
+import hmac
 import httpx
+import ipaddress
 from .settings import settings
+from src.domain.services.tracing import start_span
 import logging
 import time
 
 
+# Level comes from LOG_LEVEL / LOG_LEVELS (e.g. LOG_LEVELS=src.config.auth=DEBUG), see logging_config
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-
-# Ensure DEBUG logs are emitted even if root/uvicorn handlers filter them.
-# Avoid duplicate handlers on reload and stop propagation to root.
-# Force any pre-attached handlers (e.g., from Uvicorn) to DEBUG
-for _h in logger.handlers:
-    _h.setLevel(logging.DEBUG)
-
-# Add our own handler once
-if not any(getattr(h, "_auth_debug", False) for h in logger.handlers):
-    _handler = logging.StreamHandler()
-    _handler.setLevel(logging.DEBUG)
-    _handler.setFormatter(logging.Formatter("%(levelname)s %(name)s - %(message)s"))
-    setattr(_handler, "_auth_debug", True)
-    logger.addHandler(_handler)
-logger.propagate = False
 
 # Use auto_error=False so we can intercept missing headers and log them before FastAPI raises
 security = HTTPBearer(auto_error=False)
@@ -171,11 +159,12 @@ class ClerkAuth:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token claims")
 
             user_data = {**claims, "user_id": user_id}
-            logger.debug(
-                "[ClerkAuth.verify_clerk_token] Verification OK | user_id=%s keys=%s",
-                user_id,
-                list(user_data.keys()) if isinstance(user_data, dict) else type(user_data).__name__,
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[ClerkAuth.verify_clerk_token] Verification OK | user_id=%s keys=%s",
+                    user_id,
+                    list(user_data.keys()) if isinstance(user_data, dict) else type(user_data).__name__,
+                )
             return user_data
         except HTTPException:
             raise
@@ -220,11 +209,13 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
             # Never fail auth due to bypass branch errors; proceed to normal verification
             logger.debug("[get_current_user] Dev bypass check error: %s", e)
 
-        user_data = await clerk_auth.verify_clerk_token(token)
-        logger.debug(
-            "[get_current_user] Verified user | keys=%s",
-            list(user_data.keys()) if isinstance(user_data, dict) else type(user_data).__name__,
-        )
+        with start_span("auth.verify_token"):
+            user_data = await clerk_auth.verify_clerk_token(token)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[get_current_user] Verified user | keys=%s",
+                list(user_data.keys()) if isinstance(user_data, dict) else type(user_data).__name__,
+            )
         return user_data
     except HTTPException as he:
         logger.warning("[get_current_user] Auth failed | status=%s detail=%s", he.status_code, he.detail)
@@ -247,3 +238,40 @@ async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials]
         return await get_current_user(credentials)
     except:
         return None
+
+
+def _client_allowed(host: Optional[str]) -> bool:
+    if not host:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    for entry in settings.diagnostics_allowed_ips.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            if address in ipaddress.ip_network(entry, strict=False):
+                return True
+        except ValueError:
+            logger.warning("[require_diagnostics_access] ignoring invalid DIAGNOSTICS_ALLOWED_IPS entry=%s", entry)
+    return False
+
+
+async def require_diagnostics_access(
+    request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> None:
+    """Guard for /stats and /metrics: an allowed client address or the DIAGNOSTICS_TOKEN bearer token.
+
+    The address is the direct peer, so behind a proxy allow the proxy only if it is not public,
+    or use the token.
+    """
+    token = settings.diagnostics_token
+    if token and credentials and hmac.compare_digest(credentials.credentials.encode(), token.encode()):
+        return
+    host = request.client.host if request.client else None
+    if _client_allowed(host):
+        return
+    logger.warning("[require_diagnostics_access] denied path=%s client=%s", request.url.path, host)
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
@@ -7,6 +7,13 @@ class Settings(BaseSettings):
     # Database
     mongodb_url: str = Field(..., validation_alias=AliasChoices("MONGODB_URL", "mongodb_url"))
     database_name: str = Field("ai_backend", validation_alias=AliasChoices("DATABASE_NAME", "database_name"))
+    # Connection pool and wire compression (keyword options override the same options in MONGODB_URL).
+    # Pool limits apply per client: every MongoClient in a process has its own pool.
+    mongo_max_pool_size: int = Field(100, validation_alias=AliasChoices("MONGO_MAX_POOL_SIZE", "mongo_max_pool_size"))  # per client; the API process runs one
+    mongo_min_pool_size: int = Field(0, validation_alias=AliasChoices("MONGO_MIN_POOL_SIZE", "mongo_min_pool_size"))
+    mongo_max_idle_time_ms: Optional[int] = Field(None, validation_alias=AliasChoices("MONGO_MAX_IDLE_TIME_MS", "mongo_max_idle_time_ms"))  # None keeps idle connections
+    mongo_wait_queue_timeout_ms: Optional[int] = Field(None, validation_alias=AliasChoices("MONGO_WAIT_QUEUE_TIMEOUT_MS", "mongo_wait_queue_timeout_ms"))  # fail fast when the pool is exhausted
+    mongo_compressors: str = Field("", validation_alias=AliasChoices("MONGO_COMPRESSORS", "mongo_compressors"))  # e.g. "zstd,zlib"; zstd needs the zstandard package
     
     # Redis/Queue
     redis_url: str = Field(..., validation_alias=AliasChoices("REDIS_URL", "redis_url"))
@@ -21,9 +28,20 @@ class Settings(BaseSettings):
     # Storage
     aws_access_key_id: Optional[str] = Field(None, validation_alias=AliasChoices("AWS_ACCESS_KEY_ID", "aws_access_key_id"))
     aws_secret_access_key: Optional[str] = Field(None, validation_alias=AliasChoices("AWS_SECRET_ACCESS_KEY", "aws_secret_access_key"))
+    storage_backend: str = Field("s3", validation_alias=AliasChoices("STORAGE_BACKEND", "storage_backend"))  # "s3", "local" or "fake"
+    local_storage_root: str = Field("./data/artifacts", validation_alias=AliasChoices("LOCAL_STORAGE_ROOT", "local_storage_root"))
+    local_storage_base_url: str = Field("http://localhost:8000", validation_alias=AliasChoices("LOCAL_STORAGE_BASE_URL", "local_storage_base_url"))  # public URL of this API, for signed download links
+    local_storage_signing_key: Optional[str] = Field(None, validation_alias=AliasChoices("LOCAL_STORAGE_SIGNING_KEY", "local_storage_signing_key"))  # defaults to JWT_SECRET_KEY
     s3_bucket_name: str = Field("ai-backend-artifacts", validation_alias=AliasChoices("S3_BUCKET_NAME", "s3_bucket_name"))
     s3_region: str = Field("us-east-1", validation_alias=AliasChoices("S3_REGION", "s3_region"))
     s3_endpoint_url: Optional[str] = Field(None, validation_alias=AliasChoices("S3_ENDPOINT_URL", "s3_endpoint_url"))  # For MinIO
+    s3_max_pool_connections: int = Field(50, validation_alias=AliasChoices("S3_MAX_POOL_CONNECTIONS", "s3_max_pool_connections"))  # concurrent S3 requests per process
+    s3_multipart_part_size_mb: int = Field(8, validation_alias=AliasChoices("S3_MULTIPART_PART_SIZE_MB", "s3_multipart_part_size_mb"))  # streaming upload part size (S3 minimum is 5)
+    s3_multipart_concurrency: int = Field(4, validation_alias=AliasChoices("S3_MULTIPART_CONCURRENCY", "s3_multipart_concurrency"))  # parts in flight per streaming upload
+    s3_content_addressed_keys: bool = Field(False, validation_alias=AliasChoices("S3_CONTENT_ADDRESSED_KEYS", "s3_content_addressed_keys"))  # dedupe artifacts by SHA-256 with reference counts
+    artifact_url_signing: bool = Field(True, validation_alias=AliasChoices("ARTIFACT_URL_SIGNING", "artifact_url_signing"))  # return presigned artifact URLs in job responses
+    presigned_url_expires_seconds: int = Field(3600, validation_alias=AliasChoices("PRESIGNED_URL_EXPIRES_SECONDS", "presigned_url_expires_seconds"))
+    presigned_url_cache_max_entries: int = Field(10000, validation_alias=AliasChoices("PRESIGNED_URL_CACHE_MAX_ENTRIES", "presigned_url_cache_max_entries"))
     
     # Authentication
     clerk_secret_key: str = Field("", validation_alias=AliasChoices("CLERK_SECRET_KEY", "clerk_secret_key"))
@@ -33,18 +51,67 @@ class Settings(BaseSettings):
     dev_auth_bypass: bool = Field(False, validation_alias=AliasChoices("DEV_AUTH_BYPASS", "dev_auth_bypass"))
     dev_bearer_token: Optional[str] = Field(None, validation_alias=AliasChoices("DEV_BEARER_TOKEN", "dev_bearer_token"))
     dev_fake_user_id: Optional[str] = Field(None, validation_alias=AliasChoices("DEV_FAKE_USER_ID", "dev_fake_user_id"))
+    # Users allowed to read cross-user views such as GET /jobs/stats?all_users=true (comma-separated user ids)
+    admin_user_ids: str = Field("", validation_alias=AliasChoices("ADMIN_USER_IDS", "admin_user_ids"))
+    # /stats and /metrics: served to these client addresses (IPs or CIDRs, comma-separated) or to a matching bearer token
+    diagnostics_allowed_ips: str = Field("127.0.0.1,::1", validation_alias=AliasChoices("DIAGNOSTICS_ALLOWED_IPS", "diagnostics_allowed_ips"))
+    diagnostics_token: Optional[str] = Field(None, validation_alias=AliasChoices("DIAGNOSTICS_TOKEN", "diagnostics_token"))
     jwt_secret_key: str = Field("your-secret-key-change-in-production", validation_alias=AliasChoices("JWT_SECRET_KEY", "jwt_secret_key"))
     jwt_algorithm: str = Field("HS256", validation_alias=AliasChoices("JWT_ALGORITHM", "jwt_algorithm"))
     jwt_expire_minutes: int = Field(30, validation_alias=AliasChoices("JWT_EXPIRE_MINUTES", "jwt_expire_minutes"))
     
+    # Outputs larger than this (JSON bytes) are stored in GridFS; the job keeps a preview and output_ref
+    output_inline_max_bytes: int = Field(16384, validation_alias=AliasChoices("OUTPUT_INLINE_MAX_BYTES", "output_inline_max_bytes"))  # 0 disables offload
+    output_preview_chars: int = Field(512, validation_alias=AliasChoices("OUTPUT_PREVIEW_CHARS", "output_preview_chars"))
+    
+    # Job archival (see JobArchiver): terminal jobs older than this move from `jobs` to `jobs_archive`
+    job_archive_after_days: int = Field(30, validation_alias=AliasChoices("JOB_ARCHIVE_AFTER_DAYS", "job_archive_after_days"))
+    job_archive_batch_size: int = Field(500, validation_alias=AliasChoices("JOB_ARCHIVE_BATCH_SIZE", "job_archive_batch_size"))
+    job_archive_max_batches: int = Field(100, validation_alias=AliasChoices("JOB_ARCHIVE_MAX_BATCHES", "job_archive_max_batches"))  # per run
+    job_archive_interval_seconds: int = Field(3600, validation_alias=AliasChoices("JOB_ARCHIVE_INTERVAL_SECONDS", "job_archive_interval_seconds"))  # 0 disables the in-process loop
+    
     # API
     api_host: str = Field("0.0.0.0", validation_alias=AliasChoices("API_HOST", "api_host"))
     api_port: int = Field(..., validation_alias=AliasChoices("API_PORT", "api_port"))
     debug: bool = Field(True, validation_alias=AliasChoices("DEBUG", "debug"))
+    # Logging (see config/logging_config.py): formatting and output happen on a background thread
+    log_level: Optional[str] = Field(None, validation_alias=AliasChoices("LOG_LEVEL", "log_level"))  # default: DEBUG when DEBUG=true, else INFO
+    log_levels: str = Field("uvicorn=INFO,pymongo=WARNING,httpx=WARNING", validation_alias=AliasChoices("LOG_LEVELS", "log_levels"))  # per-logger overrides, "name=LEVEL,..."
+    log_sample_per_second: float = Field(20.0, validation_alias=AliasChoices("LOG_SAMPLE_PER_SECOND", "log_sample_per_second"))  # max DEBUG records per call site per second; 0 = no sampling
+    log_queue_size: int = Field(10000, validation_alias=AliasChoices("LOG_QUEUE_SIZE", "log_queue_size"))  # records beyond this are dropped, never block
+    log_queued_loggers: str = Field("uvicorn,uvicorn.access", validation_alias=AliasChoices("LOG_QUEUED_LOGGERS", "log_queued_loggers"))  # loggers with their own handlers to move off-thread too
+    # Request metrics (see RequestMetricsMiddleware): only errors and requests slower than this are logged
+    request_slow_threshold_ms: float = Field(1000.0, validation_alias=AliasChoices("REQUEST_SLOW_THRESHOLD_MS", "request_slow_threshold_ms"))  # 0 disables slow-request logs
+    # Celery worker processes serve /metrics on the first free port from WORKER_METRICS_PORT (0 = off)
+    worker_metrics_port: int = Field(0, validation_alias=AliasChoices("WORKER_METRICS_PORT", "worker_metrics_port"))
+    worker_metrics_port_attempts: int = Field(16, validation_alias=AliasChoices("WORKER_METRICS_PORT_ATTEMPTS", "worker_metrics_port_attempts"))  # one port per pool process
+    # Tracing (see domain/services/tracing.py): one job's spans from route to WebSocket push share a trace id
+    trace_exporter: str = Field("none", validation_alias=AliasChoices("TRACE_EXPORTER", "trace_exporter"))  # none | memory | file
+    trace_file_path: str = Field("traces.jsonl", validation_alias=AliasChoices("TRACE_FILE_PATH", "trace_file_path"))  # JSON lines; API and workers can share it
+    trace_memory_max_spans: int = Field(10000, validation_alias=AliasChoices("TRACE_MEMORY_MAX_SPANS", "trace_memory_max_spans"))
+    # Serialize trusted Mongo documents straight to JSON on hot listing routes (skips pydantic re-validation)
+    fast_json_responses: bool = Field(True, validation_alias=AliasChoices("FAST_JSON_RESPONSES", "fast_json_responses"))
+    # Job read cache (see JobCache): terminal jobs stay cached until evicted, active jobs until their next status event
+    job_cache_enabled: bool = Field(True, validation_alias=AliasChoices("JOB_CACHE_ENABLED", "job_cache_enabled"))
+    job_cache_max_entries: int = Field(10000, validation_alias=AliasChoices("JOB_CACHE_MAX_ENTRIES", "job_cache_max_entries"))  # per process
+    job_cache_active_ttl_seconds: float = Field(30.0, validation_alias=AliasChoices("JOB_CACHE_ACTIVE_TTL_SECONDS", "job_cache_active_ttl_seconds"))  # staleness bound if an event is lost
+    job_cache_redis_ttl_seconds: int = Field(604800, validation_alias=AliasChoices("JOB_CACHE_REDIS_TTL_SECONDS", "job_cache_redis_ttl_seconds"))  # shared tier for terminal jobs; 0 disables it
+    # User cache (see UserCache): clerk_id lookups for /users/me and provisioning; other API processes see updates after the TTL
+    user_cache_enabled: bool = Field(True, validation_alias=AliasChoices("USER_CACHE_ENABLED", "user_cache_enabled"))
+    user_cache_max_entries: int = Field(10000, validation_alias=AliasChoices("USER_CACHE_MAX_ENTRIES", "user_cache_max_entries"))  # per process
+    user_cache_ttl_seconds: float = Field(60.0, validation_alias=AliasChoices("USER_CACHE_TTL_SECONDS", "user_cache_ttl_seconds"))
     
     # WebSocket
     websocket_host: str = Field("0.0.0.0", validation_alias=AliasChoices("WEBSOCKET_HOST", "websocket_host"))
     websocket_port: int = Field(8001, validation_alias=AliasChoices("WEBSOCKET_PORT", "websocket_port"))
+    # Notification fan-out (see NotificationDispatcher)
+    notification_dispatchers: int = Field(8, validation_alias=AliasChoices("NOTIFICATION_DISPATCHERS", "notification_dispatchers"))
+    notification_queue_size: int = Field(1000, validation_alias=AliasChoices("NOTIFICATION_QUEUE_SIZE", "notification_queue_size"))  # per dispatcher
+    notification_overload_policy: str = Field("drop_oldest", validation_alias=AliasChoices("NOTIFICATION_OVERLOAD_POLICY", "notification_overload_policy"))  # block | drop_oldest | drop_newest
+    # Where status pushes come from: "redis" (worker publishes) or "change_stream" (tail `jobs`; needs a replica set)
+    notification_backend: str = Field("redis", validation_alias=AliasChoices("NOTIFICATION_BACKEND", "notification_backend"))
+    change_stream_resume_key: Optional[str] = Field(None, validation_alias=AliasChoices("CHANGE_STREAM_RESUME_KEY", "change_stream_resume_key"))  # default: a leased <hostname>#<n> slot per process
+    change_stream_token_save_interval_seconds: float = Field(1.0, validation_alias=AliasChoices("CHANGE_STREAM_TOKEN_SAVE_INTERVAL_SECONDS", "change_stream_token_save_interval_seconds"))
     
     # Pydantic v2 settings config
     model_config = SettingsConfigDict(
@@ -0,0 +1,100 @@
+"""
+Service Container - Process-wide service instances, built once at startup and shared by every request
+"""
+import logging
+import threading
+from typing import Optional
+
+from src.application.use_cases import JobUseCases, UserUseCases
+from src.config.settings import settings
+from src.domain.repositories import JobRepository, JobStatsRepository, UserRepository
+from src.domain.services import AIService, OutputStore, QueueService, StorageService
+from src.infrastructure.cache import job_cache, user_cache
+from src.infrastructure.external.fake_ai_service import FakeAIService
+from src.infrastructure.queue.celery_queue_service import CeleryQueueService
+from src.infrastructure.repositories import (
+    CachedJobRepository,
+    CachedUserRepository,
+    MongoJobRepository,
+    MongoJobStatsRepository,
+    MongoUserRepository,
+)
+from src.infrastructure.storage.gridfs_output_store import GridFSOutputStore
+from src.infrastructure.storage.storage_factory import close_storage_service, get_storage_service
+
+logger = logging.getLogger(__name__)
+
+
+class Container:
+    """Repositories, services and use cases wired together once per process.
+
+    Everything held here is stateless per request (or guards its own state), so one instance is
+    shared by all requests on the event loop and by worker threads submitting to it. Built in
+    the API lifespan and in the Celery worker runtime, after MongoDB is connected. Tests replace
+    it with ``set_container`` or swap individual attributes.
+    """
+
+    def __init__(
+        self,
+        job_repository: Optional[JobRepository] = None,
+        job_stats: Optional[JobStatsRepository] = None,
+        user_repository: Optional[UserRepository] = None,
+        queue_service: Optional[QueueService] = None,
+        ai_service: Optional[AIService] = None,
+        output_store: Optional[OutputStore] = None,
+        storage_service: Optional[StorageService] = None,
+    ):
+        self.job_stats = job_stats or MongoJobStatsRepository()
+        self.output_store = output_store or GridFSOutputStore()
+        if job_repository is None:
+            job_repository = MongoJobRepository(stats=self.job_stats, output_store=self.output_store)
+            if settings.job_cache_enabled:
+                job_repository = CachedJobRepository(job_repository, job_cache)
+        self.job_repository = job_repository
+        if user_repository is None:
+            user_repository = MongoUserRepository()
+            if settings.user_cache_enabled:
+                user_repository = CachedUserRepository(user_repository, user_cache)
+        self.user_repository = user_repository
+        self.queue_service = queue_service or CeleryQueueService()
+        self.ai_service = ai_service or FakeAIService()
+        if storage_service is None and settings.artifact_url_signing:
+            storage_service = get_storage_service()
+        self.storage_service = storage_service
+
+        self.job_use_cases = JobUseCases(
+            self.job_repository,
+            self.queue_service,
+            self.ai_service,
+            output_store=self.output_store,
+            output_inline_max_bytes=settings.output_inline_max_bytes,
+            output_preview_chars=settings.output_preview_chars,
+            job_stats=self.job_stats,
+            storage_service=self.storage_service,
+        )
+        self.user_use_cases = UserUseCases(self.user_repository)
+        logger.debug("[Container] built storage=%s", type(self.storage_service).__name__)
+
+    async def close(self) -> None:
+        await close_storage_service()
+
+
+_container: Optional[Container] = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> Container:
+    """The process container; built on first use if startup did not build it"""
+    global _container
+    if _container is None:
+        with _container_lock:
+            if _container is None:
+                _container = Container()
+    return _container
+
+
+def set_container(container: Optional[Container]) -> None:
+    """Install a container (startup, tests); None drops it so the next ``get_container`` rebuilds"""
+    global _container
+    with _container_lock:
+        _container = container
@@ -1,5 +1,5 @@
 from .user import User, UserCreate, UserUpdate
-from .job import Job, JobCreate, JobUpdate, JobStatus, JobType
+from .job import Job, JobCreate, JobUpdate, JobStatus, JobType, ACTIVE_JOB_STATUSES, TERMINAL_JOB_STATUSES
 
 __all__ = [
     "User",
@@ -9,5 +9,7 @@ __all__ = [
     "JobCreate",
     "JobUpdate", 
     "JobStatus",
-    "JobType"
+    "JobType",
+    "ACTIVE_JOB_STATUSES",
+    "TERMINAL_JOB_STATUSES"
 ]
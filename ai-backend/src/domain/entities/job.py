@@ -13,6 +13,11 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+# Statuses a job can still leave; everything else is terminal
+ACTIVE_JOB_STATUSES = (JobStatus.PENDING, JobStatus.PROCESSING)
+TERMINAL_JOB_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+
+
 class JobType(str, Enum):
     AUDIO_GENERATION = "audio_generation"
     TEXT_GENERATION = "text_generation"
@@ -26,7 +31,8 @@ class Job(BaseModel):
     job_type: JobType = Field(..., description="Type of AI job")
     status: JobStatus = Field(default=JobStatus.PENDING)
     input_data: Dict[str, Any] = Field(..., description="Input parameters for the job")
-    output_data: Optional[Dict[str, Any]] = Field(None, description="Job results")
+    output_data: Optional[Dict[str, Any]] = Field(None, description="Job results (a preview when output_ref is set)")
+    output_ref: Optional[Dict[str, Any]] = Field(None, description="Reference to the full output when stored out of line")
     artifact_url: Optional[str] = Field(None, description="URL to generated artifact")
     error_message: Optional[str] = Field(None, description="Error message if job failed")
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -50,6 +56,7 @@ class JobCreate(BaseModel):
 class JobUpdate(BaseModel):
     status: Optional[JobStatus] = None
     output_data: Optional[Dict[str, Any]] = None
+    output_ref: Optional[Dict[str, Any]] = None
     artifact_url: Optional[str] = None
     error_message: Optional[str] = None
     started_at: Optional[datetime] = None
@@ -1,7 +1,17 @@
 from .user_repository import UserRepository
-from .job_repository import JobRepository
+from .job_repository import JobRepository, ActiveJobConflictError
+from .job_stats_repository import JobStatsRepository
+from .artifact_ref_repository import ArtifactRefRepository
+from .pagination import InvalidCursorError, encode_cursor, decode_cursor, next_cursor
 
 __all__ = [
     "UserRepository",
-    "JobRepository"
+    "JobRepository",
+    "ActiveJobConflictError",
+    "JobStatsRepository",
+    "ArtifactRefRepository",
+    "InvalidCursorError",
+    "encode_cursor",
+    "decode_cursor",
+    "next_cursor"
 ]
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+
+class ArtifactRefRepository(ABC):
+    """Reference counts for stored artifacts shared between jobs (content-addressed storage)."""
+
+    @abstractmethod
+    async def acquire(self, artifact_id: str) -> int:
+        """Add a reference and return the new count (1 means this is the first referrer)."""
+        pass
+
+    @abstractmethod
+    async def release(self, artifact_id: str) -> int:
+        """Drop a reference and return the remaining count.
+
+        At zero the count itself is removed; the caller then deletes the stored object.
+        """
+        pass
@@ -1,19 +1,49 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Sequence
 from ..entities import Job, JobCreate, JobUpdate, JobStatus
 
 
+class ActiveJobConflictError(Exception):
+    """Raised by create when the user session already has an active job."""
+    def __init__(self, existing_job_id: Optional[str]):
+        super().__init__(f"Active job already exists: {existing_job_id}")
+        self.existing_job_id = existing_job_id
+
+
 class JobRepository(ABC):
     @abstractmethod
     async def create(self, job_data: JobCreate) -> Job:
+        """Insert a pending job. The store enforces at most one active job per (user_id, session_id)
+        and raises ActiveJobConflictError when the new job would be a second one."""
         pass
 
     @abstractmethod
     async def get_by_id(self, job_id: str) -> Optional[Job]:
+        """Look up a job in the hot store, falling back to the archive."""
+        pass
+
+    @abstractmethod
+    async def get_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[Job]:
+        """Newest-first jobs for a user. When ``cursor`` is given, ``skip`` is ignored.
+
+        Only recent jobs are returned unless ``include_archived`` asks for the full history.
+        """
+        pass
+
+    @abstractmethod
+    async def get_documents_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Same page as get_by_user_id, as raw stored documents (no entity validation)."""
         pass
 
     @abstractmethod
-    async def get_by_user_id(self, user_id: str, skip: int = 0, limit: int = 100) -> List[Job]:
+    async def get_summaries_by_user_id(
+        self, user_id: str, fields: Sequence[str], limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Newest-first raw documents for a user projected to ``fields`` plus ``_id`` and ``created_at``."""
         pass
 
     @abstractmethod
@@ -22,7 +52,7 @@ class JobRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100) -> List[Job]:
+    async def get_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Job]:
         pass
 
     @abstractmethod
@@ -34,5 +64,5 @@ class JobRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_jobs(self, skip: int = 0, limit: int = 100) -> List[Job]:
+    async def list_jobs(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Job]:
         pass
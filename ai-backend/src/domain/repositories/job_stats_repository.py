@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Dict, Optional
+
+
+class JobStatsRepository(ABC):
+    """Materialized job counters: active jobs per user and per-day transition counts."""
+
+    @abstractmethod
+    async def record_transition(
+        self, user_id: str, old_status: Optional[str], new_status: str, at: Optional[datetime] = None
+    ) -> None:
+        """Apply one status change (``old_status`` None means the job was just created)."""
+        pass
+
+    @abstractmethod
+    async def get_stats(self, user_id: Optional[str], day: date) -> Dict[str, int]:
+        """Counters for one user (all users when ``user_id`` is None): pending, processing,
+        and created/completed/failed on ``day`` (UTC)."""
+        pass
@@ -0,0 +1,49 @@
+import base64
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Sequence, Tuple
+from bson import ObjectId
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+def _to_epoch_millis(value: datetime) -> int:
+    # Mongo stores datetimes with millisecond precision as UTC; naive values are UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(milliseconds=1)
+
+
+def encode_cursor(created_at: datetime, object_id: Any) -> str:
+    """Encode a (created_at, _id) position into an opaque, URL-safe token."""
+    raw = f"{_to_epoch_millis(created_at)}:{object_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    """Decode a token produced by encode_cursor back into (created_at, _id)."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        millis, oid = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").split(":", 1)
+        return _EPOCH + timedelta(milliseconds=int(millis)), ObjectId(oid)
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {token!r}") from e
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after ``items``, or None when this was the last page.
+
+    Items are either raw documents (``_id``/``created_at`` keys) or objects with
+    ``id`` and ``created_at`` attributes (entities or response DTOs).
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last["created_at"], last["_id"])
+    return encode_cursor(last.created_at, last.id)
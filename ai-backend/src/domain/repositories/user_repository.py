@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from ..entities import User, UserCreate, UserUpdate
 
 
@@ -8,6 +8,15 @@ class UserRepository(ABC):
     async def create(self, user_data: UserCreate) -> User:
         pass
 
+    @abstractmethod
+    async def provision(self, user_data: UserCreate) -> Tuple[User, bool]:
+        """Idempotently ensure a user exists for ``user_data.clerk_id`` in one atomic write.
+
+        Returns the user matching the clerk_id, else the one with the same email re-linked to the
+        new clerk_id, else a newly created user; the flag is True only when the user was created.
+        """
+        pass
+
     @abstractmethod
     async def get_by_id(self, user_id: str) -> Optional[User]:
         pass
@@ -29,5 +38,6 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def list_users(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+        """Newest-first users. When ``cursor`` is given, ``skip`` is ignored."""
         pass
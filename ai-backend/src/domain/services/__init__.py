@@ -1,7 +1,16 @@
 from .ai_service import AIService, StorageService, QueueService
+from .output_store import OutputStore, OutputNotFoundError
+from .byte_source import ByteSource, iter_chunks
+from .tracing import Span, SpanExporter
 
 __all__ = [
     "AIService",
     "StorageService", 
-    "QueueService"
+    "QueueService",
+    "OutputStore",
+    "OutputNotFoundError",
+    "ByteSource",
+    "iter_chunks",
+    "Span",
+    "SpanExporter",
 ]
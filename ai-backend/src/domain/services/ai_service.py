@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from ..entities import JobType
+from .byte_source import ByteSource, read_all
 
 
 class AIService(ABC):
@@ -21,6 +22,31 @@ class StorageService(ABC):
         """Delete artifact from storage"""
         pass
 
+    async def upload_artifact_stream(self, source: ByteSource, file_name: str, content_type: str) -> str:
+        """Upload an artifact from an async byte iterator or file object and return URL.
+
+        The default reads the whole source into memory; backends that can stream override it.
+        """
+        return await self.upload_artifact(await read_all(source), file_name, content_type)
+
+    async def generate_presigned_url(self, artifact_url: str, method: str = "GET", expires_in: Optional[int] = None) -> str:
+        """Time-limited URL for reading (GET) or overwriting (PUT) a stored artifact.
+
+        Backends whose URLs are already directly usable return ``artifact_url`` unchanged, as does
+        any backend for URLs it did not issue.
+        """
+        return artifact_url
+
+    async def generate_upload_url(
+        self, file_name: str, content_type: str, expires_in: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """Reserve a new artifact and return ``(artifact_url, upload_url)`` for a direct client PUT"""
+        raise NotImplementedError(f"{type(self).__name__} does not support direct uploads")
+
+    async def close(self) -> None:
+        """Release pooled connections; a no-op for backends without any"""
+        pass
+
 
 class QueueService(ABC):
     @abstractmethod
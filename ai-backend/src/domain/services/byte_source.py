@@ -0,0 +1,33 @@
+import asyncio
+import inspect
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Union
+
+# Streaming input for uploads: an async iterable of byte chunks, or a (sync or async) file object
+ByteSource = Union[AsyncIterable[bytes], BinaryIO]
+
+
+async def iter_chunks(source: ByteSource, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Yield the source's bytes in order; file objects are read ``chunk_size`` at a time.
+
+    Blocking ``read`` calls on sync file objects run in a worker thread so the event loop never waits
+    on disk. Chunks from an async iterable are passed through as they come.
+    """
+    read = getattr(source, "read", None)
+    if read is None:
+        async for chunk in source:
+            if chunk:
+                yield chunk
+        return
+    while True:
+        chunk = read(chunk_size)
+        if inspect.isawaitable(chunk):
+            chunk = await chunk
+        elif chunk:
+            await asyncio.sleep(0)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def read_all(source: ByteSource) -> bytes:
+    return b"".join([chunk async for chunk in iter_chunks(source)])
@@ -0,0 +1,56 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+OUTPUT_CONTENT_TYPE = "application/json"
+
+
+class OutputNotFoundError(LookupError):
+    """Raised when a job has no output or its stored output no longer exists."""
+    pass
+
+
+class OutputStore(ABC):
+    """Out-of-line storage for job outputs too large to keep on the job document."""
+
+    @abstractmethod
+    async def save(self, job_id: str, payload: bytes, content_type: str = OUTPUT_CONTENT_TYPE) -> Dict[str, Any]:
+        """Store the payload and return the reference to keep on the job (``output_ref``)"""
+        pass
+
+    @abstractmethod
+    def stream(self, output_ref: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """Yield the stored payload in chunks"""
+        pass
+
+    @abstractmethod
+    async def delete(self, output_ref: Dict[str, Any]) -> bool:
+        pass
+
+
+def encode_output(output_data: Dict[str, Any]) -> bytes:
+    return json.dumps(output_data, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def preview_output(value: Any, max_chars: int) -> Any:
+    """Same shape as ``value`` with long strings cut to ``max_chars`` and long lists to 10 items"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars] + "…"
+    if isinstance(value, dict):
+        return {key: preview_output(item, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [preview_output(item, max_chars) for item in value[:10]]
+    return value
+
+
+async def offload_output(
+    store: Optional[OutputStore], job_id: str, output_data: Optional[Dict[str, Any]], inline_max_bytes: int, preview_chars: int
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Return ``(output_data, output_ref)`` to persist: the payload itself when small, else a preview and a reference"""
+    if store is None or not output_data or inline_max_bytes <= 0:
+        return output_data, None
+    payload = encode_output(output_data)
+    if len(payload) <= inline_max_bytes:
+        return output_data, None
+    output_ref = await store.save(job_id, payload)
+    return preview_output(output_data, preview_chars), output_ref
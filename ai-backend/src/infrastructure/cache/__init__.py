@@ -0,0 +1,14 @@
+from .lru_cache import LRUCache
+from .job_cache import JobCache, job_cache
+from .user_cache import UserCache, user_cache
+from .presigned_url_cache import PresignedUrlCache, presigned_url_cache
+
+__all__ = [
+    "LRUCache",
+    "JobCache",
+    "job_cache",
+    "UserCache",
+    "user_cache",
+    "PresignedUrlCache",
+    "presigned_url_cache",
+]
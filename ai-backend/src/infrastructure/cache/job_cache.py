@@ -0,0 +1,159 @@
+"""
+Job Cache - Two-tier (per-process LRU + shared Redis) cache for job reads
+"""
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+from redis.asyncio import Redis
+
+from src.config.settings import settings
+from src.domain.entities import Job, ACTIVE_JOB_STATUSES
+from src.infrastructure.cache.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "job_cache:v1:"
+
+# How long an invalidation is remembered; must outlive any in-flight Mongo read
+_TOMBSTONE_SECONDS = 60.0
+
+
+class JobCache:
+    """Read-through cache for single jobs.
+
+    Terminal jobs never change again, so they stay in the local LRU until evicted and are shared
+    across API processes through Redis. Active (pending/processing) jobs are only cached locally,
+    for at most ``active_ttl`` seconds, and are dropped as soon as a status event for the job
+    arrives (see ``on_status_event``); the TTL only bounds staleness if an event is lost.
+
+    A read that started before an invalidation for the same job is not stored, so a slow Mongo
+    read can never re-populate the cache with the pre-update document.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        active_ttl: Optional[float] = None,
+        redis_ttl: Optional[int] = None,
+        redis: Optional[Redis] = None,
+    ):
+        self._max_entries = max_entries or settings.job_cache_max_entries
+        self._active_ttl = settings.job_cache_active_ttl_seconds if active_ttl is None else active_ttl
+        self._redis_ttl = settings.job_cache_redis_ttl_seconds if redis_ttl is None else redis_ttl
+        self._local: LRUCache[Job] = LRUCache(self._max_entries)
+        self._tombstones: LRUCache[float] = LRUCache(self._max_entries)
+        self._redis: Optional[Redis] = redis
+        # Metrics (mutated only from the event loop thread)
+        self._hits_local = 0
+        self._hits_redis = 0
+        self._misses = 0
+        self._stores = 0
+        self._stale_skipped = 0
+        self._invalidations = 0
+        self._redis_errors = 0
+
+    @property
+    def redis_enabled(self) -> bool:
+        return self._redis_ttl > 0
+
+    def _get_redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(settings.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return self._redis
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception:
+                pass
+            self._redis = None
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Cached job, or None on a miss in both tiers"""
+        job = self._local.get(job_id)
+        if job is not None:
+            self._hits_local += 1
+            return job
+
+        if self.redis_enabled:
+            try:
+                raw = await self._get_redis().get(REDIS_KEY_PREFIX + job_id)
+            except Exception as e:
+                self._redis_errors += 1
+                logger.warning("[JobCache.get] redis error job_id=%s error=%s", job_id, e)
+                raw = None
+            if raw is not None:
+                job = Job(**json.loads(raw))
+                self._hits_redis += 1
+                self._local.set(job_id, job)
+                return job
+
+        self._misses += 1
+        return None
+
+    async def put(self, job: Job, read_started: float) -> None:
+        """Store a job read from the database; ``read_started`` is time.monotonic() taken before the read"""
+        job_id = str(job.id)
+        invalidated_at = self._tombstones.get(job_id)
+        if invalidated_at is not None and invalidated_at >= read_started:
+            self._stale_skipped += 1
+            return
+
+        self._stores += 1
+        if job.status in ACTIVE_JOB_STATUSES:
+            if self._active_ttl > 0:
+                self._local.set(job_id, job, ttl=self._active_ttl)
+            return
+
+        self._local.set(job_id, job)
+        if self.redis_enabled:
+            try:
+                await self._get_redis().set(REDIS_KEY_PREFIX + job_id, job.model_dump_json(by_alias=True), ex=self._redis_ttl)
+            except Exception as e:
+                self._redis_errors += 1
+                logger.warning("[JobCache.put] redis error job_id=%s error=%s", job_id, e)
+
+    def invalidate(self, job_id: str) -> None:
+        """Drop the local entry; used for status transitions, which never touch terminal (shared) entries"""
+        self._invalidations += 1
+        self._local.pop(job_id)
+        self._tombstones.set(job_id, time.monotonic(), ttl=_TOMBSTONE_SECONDS)
+
+    async def discard(self, job_id: str) -> None:
+        """Drop a job from both tiers; used when this process rewrites or deletes a job"""
+        self.invalidate(job_id)
+        if self.redis_enabled:
+            try:
+                await self._get_redis().delete(REDIS_KEY_PREFIX + job_id)
+            except Exception as e:
+                self._redis_errors += 1
+                logger.warning("[JobCache.discard] redis error job_id=%s error=%s", job_id, e)
+
+    def on_status_event(self, event: Dict[str, Any]) -> None:
+        """Notification listener: a status event means the stored job changed"""
+        job_id = event.get("job_id")
+        if job_id:
+            self.invalidate(job_id)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit ratio and tier counters"""
+        lookups = self._hits_local + self._hits_redis + self._misses
+        return {
+            "lookups": lookups,
+            "hits_local": self._hits_local,
+            "hits_redis": self._hits_redis,
+            "misses": self._misses,
+            "hit_ratio": ((self._hits_local + self._hits_redis) / lookups) if lookups else 0.0,
+            "stores": self._stores,
+            "stale_skipped": self._stale_skipped,
+            "invalidations": self._invalidations,
+            "redis_enabled": self.redis_enabled,
+            "redis_errors": self._redis_errors,
+            **{f"local_{key}": value for key, value in self._local.get_metrics().items()},
+        }
+
+
+# Process-wide cache shared by request-scoped repositories
+job_cache = JobCache()
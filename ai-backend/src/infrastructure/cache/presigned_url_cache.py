@@ -0,0 +1,54 @@
+"""
+Presigned URL Cache - Reuses signed artifact URLs until shortly before they expire
+"""
+from typing import Any, Dict, Hashable, Optional
+
+from src.config.settings import settings
+from src.infrastructure.cache.lru_cache import LRUCache
+
+# A cached URL is handed out only while it still has at least this much of its lifetime left
+_MIN_REMAINING_SECONDS = 60.0
+_MIN_REMAINING_FRACTION = 0.2
+
+
+class PresignedUrlCache:
+    """Signed URLs keyed by (method, object, expiry, ...), dropped before the signature runs out.
+
+    Repeated listings hand out the same URL (so browsers and CDNs can cache the object) instead
+    of re-signing every artifact on every request. An entry is served only while it has at least
+    ``max(60s, 20% of its lifetime)`` left, so a client always gets a usable window.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._urls: LRUCache[str] = LRUCache(max_entries or settings.presigned_url_cache_max_entries)
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        url = self._urls.get(key)
+        if url is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return url
+
+    def put(self, key: Hashable, url: str, expires_in: float) -> None:
+        reuse_for = expires_in - max(_MIN_REMAINING_SECONDS, expires_in * _MIN_REMAINING_FRACTION)
+        if reuse_for > 0:
+            self._urls.set(key, url, ttl=reuse_for)
+
+    def clear(self) -> None:
+        self._urls.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "lookups": lookups,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": (self._hits / lookups) if lookups else 0.0,
+            **self._urls.get_metrics(),
+        }
+
+
+presigned_url_cache = PresignedUrlCache()
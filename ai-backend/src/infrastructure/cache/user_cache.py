@@ -0,0 +1,81 @@
+"""
+User Cache - Per-process TTL cache of user records keyed by clerk_id
+"""
+import time
+from typing import Any, Dict, Optional
+
+from src.config.settings import settings
+from src.domain.entities import User
+from src.infrastructure.cache.lru_cache import LRUCache
+
+# How long an invalidation is remembered; must outlive any in-flight Mongo read
+_TOMBSTONE_SECONDS = 60.0
+
+
+class UserCache:
+    """Read-through cache for user lookups by clerk_id.
+
+    Entries expire after ``ttl`` seconds. Writes made in this process invalidate immediately;
+    writes made by another API process are visible here after at most ``ttl`` seconds. As in
+    JobCache, a read that started before an invalidation is not stored.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self._max_entries = max_entries or settings.user_cache_max_entries
+        self._ttl = settings.user_cache_ttl_seconds if ttl is None else ttl
+        self._users: LRUCache[User] = LRUCache(self._max_entries)
+        # user id -> clerk_id, so updates addressed by id can find the cached entry
+        self._clerk_ids: LRUCache[str] = LRUCache(self._max_entries)
+        self._tombstones: LRUCache[float] = LRUCache(self._max_entries)
+        # Metrics (mutated only from the event loop thread)
+        self._hits = 0
+        self._misses = 0
+        self._stale_skipped = 0
+        self._invalidations = 0
+
+    def get(self, clerk_id: str) -> Optional[User]:
+        user = self._users.get(clerk_id)
+        if user is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return user
+
+    def put(self, user: User, read_started: Optional[float] = None) -> None:
+        """Store a user read at ``read_started`` (monotonic); None means it came from the write itself"""
+        invalidated_at = self._tombstones.get(user.clerk_id)
+        if read_started is not None and invalidated_at is not None and invalidated_at >= read_started:
+            self._stale_skipped += 1
+            return
+        self._users.set(user.clerk_id, user, ttl=self._ttl)
+        self._clerk_ids.set(str(user.id), user.clerk_id, ttl=self._ttl)
+
+    def invalidate(self, clerk_id: Optional[str] = None, user_id: Optional[str] = None) -> None:
+        """Drop a user by clerk_id and/or by id (whichever the write knows)"""
+        clerk_ids = {clerk_id, self._clerk_ids.pop(user_id) if user_id else None} - {None}
+        now = time.monotonic()
+        for key in clerk_ids:
+            self._users.pop(key)
+            self._tombstones.set(key, now, ttl=_TOMBSTONE_SECONDS)
+        self._invalidations += 1
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._clerk_ids.clear()
+        self._tombstones.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "lookups": lookups,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": (self._hits / lookups) if lookups else 0.0,
+            "stale_skipped": self._stale_skipped,
+            "invalidations": self._invalidations,
+            "ttl_seconds": self._ttl,
+            **self._users.get_metrics(),
+        }
+
+
+user_cache = UserCache()
@@ -0,0 +1,220 @@
+"""
+Index manager - declares the indexes every repository query relies on and creates them idempotently
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from src.domain.entities import ACTIVE_JOB_STATUSES, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Enforces one active job per (user_id, session_id); MongoJobRepository checks for it before relying on it
+ACTIVE_SESSION_INDEX = "active_user_session_unique"
+ACTIVE_STATUS_VALUES = [s.value for s in ACTIVE_JOB_STATUSES]
+
+
+# Keep in sync with the query shapes in src/infrastructure/repositories/*; each listing index
+# ends in (created_at desc, _id desc) to match KEYSET_SORT so pages never need an in-memory sort.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("clerk_id", ASCENDING)], name="clerk_id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    ],
+    "jobs": [
+        # get_by_user_id / get_summaries_by_user_id
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_id_created_at_id",
+        ),
+        # get_by_status
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id",
+        ),
+        # list_jobs
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        # Enforces one active job per (user_id, session_id) and serves get_active_by_user_session.
+        # Only pending/processing jobs with a session are indexed, so the index stays tiny no
+        # matter how much history accumulates.
+        IndexModel(
+            [("user_id", ASCENDING), ("session_id", ASCENDING)],
+            name=ACTIVE_SESSION_INDEX,
+            unique=True,
+            partialFilterExpression={
+                "session_id": {"$type": "string"},
+                "status": {"$in": ACTIVE_STATUS_VALUES},
+            },
+        ),
+    ],
+    # MongoJobStatsRepository.get_stats sums every user's counters for a day (day null = active gauge)
+    "job_counters": [IndexModel([("day", ASCENDING)], name="day")],
+    # Cold tier written by JobArchiver; only read for include_archived listings and id lookups
+    "jobs_archive": [
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_id_created_at_id",
+        ),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    ],
+}
+
+# Collections that need creation options; created before their indexes (which would otherwise
+# create them implicitly with defaults). The archive is rarely read, so it trades CPU for disk.
+COLLECTION_OPTIONS: Dict[str, Dict] = {
+    "jobs_archive": {"storageEngine": {"wiredTiger": {"configString": "block_compressor=zstd"}}},
+}
+
+# Indexes superseded by a declared one: {collection: {obsolete_name: replacement_name}}.
+# The obsolete index is dropped only once its replacement exists.
+OBSOLETE_INDEXES: Dict[str, Dict[str, str]] = {
+    # Left by the original init-mongo.js; the keyset indexes serve the same queries
+    "users": {"created_at_1": "created_at_id"},
+    "jobs": {
+        "active_user_session": ACTIVE_SESSION_INDEX,
+        "user_id_1": "user_id_created_at_id",
+        "user_id_1_created_at_-1": "user_id_created_at_id",
+        "status_1": "status_created_at_id",
+        "created_at_1": "created_at_id",
+        # Nothing filters on job_type
+        "job_type_1": "created_at_id",
+    },
+}
+
+
+async def ensure_indexes(database: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """Create all declared indexes. Existing identical indexes are a no-op on the server.
+
+    An index with the same keys and options under another name (e.g. ``clerk_id_1`` from the
+    old init-mongo.js) is kept instead of failing with IndexOptionsConflict. Indexes are created
+    one at a time so a conflicting definition (e.g. an index with the same name but different
+    options created by hand) is logged without blocking the rest.
+    Returns the declared names created or confirmed per collection.
+    """
+    await _create_collections(database)
+    ensured: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        collection = database[collection_name]
+        existing = await collection.index_information()
+        for model in models:
+            name = model.document["name"]
+            equivalent = _equivalent_index(model, existing)
+            if equivalent is not None and equivalent != name:
+                logger.info(
+                    "[indexes] keeping existing index collection=%s name=%s for %s",
+                    collection_name, equivalent, name,
+                )
+                ensured.setdefault(collection_name, []).append(name)
+                continue
+            try:
+                names = await collection.create_indexes([model])
+                ensured.setdefault(collection_name, []).extend(names)
+            except OperationFailure as e:
+                logger.error(
+                    "[indexes] failed to create index collection=%s name=%s error=%s",
+                    collection_name, model.document.get("name"), e,
+                )
+                if e.code == 11000 and model.document.get("name") == ACTIVE_SESSION_INDEX:
+                    # Sessions left with several active jobs by older releases; until this is fixed
+                    # MongoJobRepository falls back to checking for an active job before inserting
+                    logger.error("[indexes] duplicate active jobs block %s; run `python manage.py dedupe-active-jobs`", ACTIVE_SESSION_INDEX)
+    await _drop_obsolete_indexes(database, ensured)
+    logger.info("[indexes] ensured %s", ensured)
+    return ensured
+
+
+# Options that make two indexes with the same keys behave differently
+_INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+
+def _equivalent_index(model: IndexModel, existing: Dict[str, Dict]) -> Optional[str]:
+    """Name of an existing index with the same keys and options as ``model``, if any."""
+    wanted = model.document
+    keys = list(wanted["key"].items())
+    for name, info in existing.items():
+        if [(field, direction) for field, direction in info["key"]] != keys:
+            continue
+        if all(info.get(option, False) == wanted.get(option, False) for option in _INDEX_OPTIONS):
+            return name
+    return None
+
+
+async def _create_collections(database: AsyncIOMotorDatabase) -> None:
+    for collection_name, options in COLLECTION_OPTIONS.items():
+        try:
+            await database.create_collection(collection_name, **options)
+            logger.info("[indexes] created collection=%s", collection_name)
+        except CollectionInvalid:
+            pass  # already exists
+        except OperationFailure as e:
+            logger.error("[indexes] failed to create collection=%s error=%s", collection_name, e)
+
+
+async def _drop_obsolete_indexes(database: AsyncIOMotorDatabase, ensured: Dict[str, List[str]]) -> None:
+    for collection_name, replaced in OBSOLETE_INDEXES.items():
+        collection = database[collection_name]
+        for obsolete, replacement in replaced.items():
+            if replacement not in ensured.get(collection_name, []):
+                continue
+            try:
+                await collection.drop_index(obsolete)
+                logger.info("[indexes] dropped obsolete index collection=%s name=%s", collection_name, obsolete)
+            except OperationFailure as e:
+                # Already gone (code 27 IndexNotFound) is the steady state
+                if e.code != 27:
+                    logger.error(
+                        "[indexes] failed to drop index collection=%s name=%s error=%s",
+                        collection_name, obsolete, e,
+                    )
+
+
+async def fail_duplicate_active_jobs(database: AsyncIOMotorDatabase, dry_run: bool = False) -> int:
+    """Fail all but the newest active job of every session that has several, so that
+    ``active_user_session_unique`` can be built. Returns the number of jobs failed (or, with
+    ``dry_run``, that would be). Job counters are not adjusted; rebuild them afterwards.
+    """
+    pipeline = [
+        {"$match": {"session_id": {"$type": "string"}, "status": {"$in": ACTIVE_STATUS_VALUES}}},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$group": {"_id": {"user_id": "$user_id", "session_id": "$session_id"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]
+    stale = []
+    async for group in database.jobs.aggregate(pipeline):
+        stale.extend(group["ids"][1:])
+    if dry_run or not stale:
+        return len(stale)
+    now = datetime.now(timezone.utc)
+    for start in range(0, len(stale), 1000):
+        await database.jobs.update_many(
+            {"_id": {"$in": stale[start:start + 1000]}, "status": {"$in": ACTIVE_STATUS_VALUES}},
+            {"$set": {
+                "status": JobStatus.FAILED.value,
+                "error_message": "Superseded by a newer active job in the same session",
+                "completed_at": now,
+                "updated_at": now,
+            }},
+        )
+    logger.info("[indexes] failed duplicate active jobs count=%s", len(stale))
+    return len(stale)
+
+
+def ensure_indexes_in_background(database: AsyncIOMotorDatabase) -> asyncio.Task:
+    """Schedule ensure_indexes without delaying startup; failures are logged, never raised."""
+
+    async def _run() -> Optional[Dict[str, List[str]]]:
+        try:
+            return await ensure_indexes(database)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("[indexes] index creation failed")
+            return None
+
+    return asyncio.create_task(_run(), name="ensure_indexes")
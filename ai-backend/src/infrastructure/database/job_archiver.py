@@ -0,0 +1,114 @@
+"""
+Job Archiver - moves old terminal jobs from the hot `jobs` collection into `jobs_archive`
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
+
+from src.config.settings import settings
+from src.domain.entities import TERMINAL_JOB_STATUSES
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "jobs_archive"
+_DUPLICATE_KEY = 11000
+
+
+class JobArchiver:
+    """Moves completed/failed jobs created more than ``archive_after_days`` ago to the archive tier.
+
+    The archive collection (zstd-compressed) and its indexes are declared in indexes.py.
+
+    Each batch is copied first and deleted second, so a crash in between leaves a job in both
+    tiers (readers de-duplicate) and the next run finishes the move; it is never lost. Runs are
+    idempotent, so several API replicas may archive concurrently. Work per run is bounded by
+    ``batch_size * max_batches`` to keep the load on the primary predictable.
+    """
+
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        archive_after_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None,
+    ):
+        self.database = database
+        self.jobs = database.jobs
+        self.archive = database[ARCHIVE_COLLECTION]
+        self.archive_after_days = settings.job_archive_after_days if archive_after_days is None else archive_after_days
+        self.batch_size = max(1, batch_size or settings.job_archive_batch_size)
+        self.max_batches = max(1, max_batches or settings.job_archive_max_batches)
+        self._runs = 0
+        self._archived_total = 0
+        self._last_run: Dict[str, Any] = {}
+
+    def _query(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.archive_after_days)
+        # Served by the status_created_at_id index
+        return {"status": {"$in": [s.value for s in TERMINAL_JOB_STATUSES]}, "created_at": {"$lt": cutoff}}
+
+    async def count_eligible(self, now: Optional[datetime] = None) -> int:
+        return await self.jobs.count_documents(self._query(now))
+
+    async def archive_once(self, now: Optional[datetime] = None) -> int:
+        """Archive up to ``batch_size * max_batches`` eligible jobs; returns how many were moved"""
+        query = self._query(now)
+        started = time.perf_counter()
+        moved = 0
+        batches = 0
+        while batches < self.max_batches:
+            count = await self._archive_batch(query)
+            if not count:
+                break
+            moved += count
+            batches += 1
+        elapsed = time.perf_counter() - started
+
+        self._runs += 1
+        self._archived_total += moved
+        self._last_run = {"moved": moved, "batches": batches, "seconds": elapsed, "finished_at": time.time()}
+        logger.info("[JobArchiver] archived jobs=%s batches=%s seconds=%.2f", moved, batches, elapsed)
+        return moved
+
+    async def _archive_batch(self, query: Dict[str, Any]) -> int:
+        docs = [doc async for doc in self.jobs.find(query).limit(self.batch_size)]
+        if not docs:
+            return 0
+        try:
+            await self.archive.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Already copied by an interrupted or concurrent run; anything else is a real failure
+            if any(err.get("code") != _DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                raise
+        result = await self.jobs.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}, "status": query["status"]})
+        logger.debug("[JobArchiver] batch copied=%s deleted=%s", len(docs), result.deleted_count)
+        return len(docs)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "archive_after_days": self.archive_after_days,
+            "runs": self._runs,
+            "archived_total": self._archived_total,
+            "last_run": self._last_run,
+        }
+
+
+def archive_in_background(archiver: JobArchiver, interval_seconds: float) -> asyncio.Task:
+    """Run the archiver every ``interval_seconds``; failures are logged, never raised"""
+
+    async def _run() -> None:
+        while True:
+            try:
+                await archiver.archive_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[JobArchiver] archive run failed")
+            await asyncio.sleep(interval_seconds)
+
+    return asyncio.create_task(_run(), name="job_archiver")
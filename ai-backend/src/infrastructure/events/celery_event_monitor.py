@@ -79,13 +79,13 @@ class CeleryEventMonitor:
 
     def _handle_task_started(self, event):
         """Handle task-started event"""
-        logger.info("[CeleryEventMonitor] task-started event received: %s", event.get('uuid'))
+        logger.debug("[CeleryEventMonitor] task-started event received: %s", event.get('uuid'))
         self.state.event(event)
         task = self.state.tasks.get(event['uuid'])
         if task:
-            logger.info("[CeleryEventMonitor] task found: name=%s, args=%s", task.name, task.args)
+            logger.debug("[CeleryEventMonitor] task found: name=%s, args=%s", task.name, task.args)
             if self._is_job_task(task):
-                logger.info("[CeleryEventMonitor] processing job task started")
+                logger.debug("[CeleryEventMonitor] processing job task started")
                 # Schedule the coroutine in the main event loop
                 if self._loop:
                     asyncio.run_coroutine_threadsafe(
@@ -93,28 +93,28 @@ class CeleryEventMonitor:
                         self._loop
                     )
             else:
-                logger.info("[CeleryEventMonitor] not a job task: %s", task.name)
+                logger.debug("[CeleryEventMonitor] not a job task: %s", task.name)
         else:
             logger.warning("[CeleryEventMonitor] task not found in state for uuid=%s", event.get('uuid'))
 
     def _handle_task_succeeded(self, event):
         """Handle task-succeeded event"""
-        logger.info("[CeleryEventMonitor] task-succeeded event received: %s", event.get('uuid'))
+        logger.debug("[CeleryEventMonitor] task-succeeded event received: %s", event.get('uuid'))
         self.state.event(event)
         task = self.state.tasks.get(event['uuid'])
         if task and self._is_job_task(task):
-            logger.info("[CeleryEventMonitor] processing job task succeeded")
+            logger.debug("[CeleryEventMonitor] processing job task succeeded")
             if self._loop:
                 asyncio.run_coroutine_threadsafe(
                     self._notify_job_status(task, 'COMPLETED'),
                     self._loop
                 )
         elif task:
-            logger.info("[CeleryEventMonitor] not a job task succeeded: %s", task.name)
+            logger.debug("[CeleryEventMonitor] not a job task succeeded: %s", task.name)
 
     def _handle_task_failed(self, event):
         """Handle task-failed event"""
-        logger.info("[CeleryEventMonitor] task-failed event received: %s", event.get('uuid'))
+        logger.debug("[CeleryEventMonitor] task-failed event received: %s", event.get('uuid'))
         self.state.event(event)
         task = self.state.tasks.get(event['uuid'])
         if task and self._is_job_task(task):
@@ -127,7 +127,7 @@ class CeleryEventMonitor:
 
     def _handle_task_retried(self, event):
         """Handle task-retried event"""
-        logger.info("[CeleryEventMonitor] task-retried event received: %s", event.get('uuid'))
+        logger.debug("[CeleryEventMonitor] task-retried event received: %s", event.get('uuid'))
         self.state.event(event)
         task = self.state.tasks.get(event['uuid'])
         if task and self._is_job_task(task):
@@ -145,7 +145,7 @@ class CeleryEventMonitor:
     async def _notify_job_status(self, task, status: str, message: str = None):
         """Extract job info from task and notify via WebSocket"""
         try:
-            logger.info("[CeleryEventMonitor] _notify_job_status called: status=%s, task.args=%s", status, task.args)
+            logger.debug("[CeleryEventMonitor] _notify_job_status called: status=%s, task.args=%s", status, task.args)
             
             # Extract job_id and user info from task args
             if not task.args or len(task.args) < 2:
@@ -155,7 +155,7 @@ class CeleryEventMonitor:
             job_id = task.args[0]
             job_data = task.args[1]
             
-            logger.info("[CeleryEventMonitor] extracted job_id=%s, job_data=%s", job_id, job_data)
+            logger.debug("[CeleryEventMonitor] extracted job_id=%s, job_data=%s", job_id, job_data)
             
             # Get user_id and session_id from job_data
             user_id = job_data.get('user_id')
@@ -165,7 +165,7 @@ class CeleryEventMonitor:
                 logger.warning("[CeleryEventMonitor] no user_id in task args for job_id=%s", job_id)
                 return
                 
-            logger.info("[CeleryEventMonitor] notifying WebSocket: user_id=%s, job_id=%s, status=%s, session_id=%s", 
+            logger.debug("[CeleryEventMonitor] notifying WebSocket: user_id=%s, job_id=%s, status=%s, session_id=%s", 
                        user_id, job_id, status, session_id)
                 
             await notify_job_status_update(
@@ -176,7 +176,7 @@ class CeleryEventMonitor:
                 session_id=session_id
             )
             
-            logger.info("[CeleryEventMonitor] WebSocket notification sent successfully")
+            logger.debug("[CeleryEventMonitor] WebSocket notification sent successfully")
             
         except Exception:
             logger.exception("[CeleryEventMonitor] failed to notify job status")
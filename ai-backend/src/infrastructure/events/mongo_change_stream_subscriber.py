@@ -0,0 +1,300 @@
+"""
+Mongo Change Stream Subscriber - Tails status changes on the `jobs` collection and forwards them to WebSockets
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
+
+from src.config.settings import settings
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.events.notification_dispatcher import NotificationDispatcher
+
+logger = logging.getLogger(__name__)
+
+EventListener = Callable[[Dict[str, Any]], None]
+
+RESUME_TOKENS_COLLECTION = "change_stream_tokens"
+_CHANGE_STREAM_HISTORY_LOST = 286
+_RETRY_DELAY_MAX_SECONDS = 30.0
+# Default resume keys are per-host slots held under a lease, renewed while the process runs
+RESUME_SLOT_LEASE_SECONDS = 60.0
+_MAX_RESUME_SLOTS = 64
+
+# Server-side filter and projection: only updates that set `status`, and only the fields an event needs.
+# fullDocument comes from updateLookup (the job's current state), so the status is read from
+# updatedFields, which is exactly what this change wrote.
+CHANGE_STREAM_PIPELINE: List[Dict[str, Any]] = [
+    {"$match": {"operationType": "update", "updateDescription.updatedFields.status": {"$exists": True}}},
+    {"$project": {
+        "documentKey": 1,
+        "wallTime": 1,
+        "updateDescription.updatedFields.status": 1,
+        "updateDescription.updatedFields.error_message": 1,
+        "fullDocument.user_id": 1,
+        "fullDocument.session_id": 1,
+    }},
+]
+
+
+class MongoChangeStreamSubscriber:
+    """Forwards every job status change to WebSockets straight from a `jobs` change stream.
+
+    Unlike the Redis backend this sees updates from any writer (worker, API use cases, manual
+    fixes) without them having to publish. Requires a replica set (a single-node one is enough).
+
+    The resume token is kept in memory for reconnects and saved to ``change_stream_tokens`` at
+    most every ``token_save_interval`` seconds, so a restarted process continues where it left
+    off. Each API process tails its own stream (its sockets need every event), keyed by
+    ``resume_key``. Without one, the process claims the first free ``<hostname>#<n>`` slot, so
+    several workers on one host never share a token and a restarted worker picks up a slot (and
+    its token) released by a stopped one. Slots are leased; a crashed process's slot frees up
+    after RESUME_SLOT_LEASE_SECONDS. If the saved token has fallen off the oplog the stream
+    restarts from now.
+
+    Same interface as RedisNotificationSubscriber: delivery goes through ``NotificationDispatcher``
+    and ``add_listener`` callbacks run inline before an event is queued.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Optional[NotificationDispatcher] = None,
+        database: Optional[AsyncIOMotorDatabase] = None,
+        resume_key: Optional[str] = None,
+        token_save_interval: Optional[float] = None,
+    ):
+        self._database = database
+        self._task: Optional[asyncio.Task] = None
+        self.dispatcher = dispatcher or NotificationDispatcher()
+        self._fixed_resume_key = resume_key or settings.change_stream_resume_key
+        # Without a fixed key, set when start() claims a slot
+        self.resume_key = self._fixed_resume_key
+        self._slot_owner: Optional[str] = None
+        self._lease_task: Optional[asyncio.Task] = None
+        self.token_save_interval = (
+            settings.change_stream_token_save_interval_seconds if token_save_interval is None else token_save_interval
+        )
+        self._listeners: List[EventListener] = []
+        self._resume_token: Optional[Mapping[str, Any]] = None
+        self._token_dirty = False
+        self._token_saved_at = 0.0
+        self._ready = asyncio.Event()
+        # Metrics
+        self._changes = 0
+        self._invalid = 0
+        self._restarts = 0
+        self._history_lost = 0
+
+    def add_listener(self, listener: EventListener) -> None:
+        """Register a synchronous callback for every valid event (must be cheap and non-blocking)"""
+        self._listeners.append(listener)
+
+    def _get_database(self) -> AsyncIOMotorDatabase:
+        if self._database is None:
+            self._database = MongoDB.get_database()
+        return self._database
+
+    async def start(self) -> None:
+        """Load the saved resume token and start tailing the change stream"""
+        if self._task and not self._task.done():
+            return
+        await self.dispatcher.start()
+        if self._fixed_resume_key is None:
+            self.resume_key = await self._claim_resume_slot()
+            self._lease_task = asyncio.create_task(self._keep_lease(), name="change_stream_resume_lease")
+        self._resume_token = await self._load_token()
+        self._ready.clear()
+        self._task = asyncio.create_task(self._run(), name="mongo_change_stream_subscriber")
+        logger.info(
+            "[MongoChangeStreamSubscriber] started resume_key=%s resuming=%s",
+            self.resume_key, self._resume_token is not None,
+        )
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> None:
+        """Wait until the stream is open (events written after this are guaranteed to be seen)"""
+        await asyncio.wait_for(self._ready.wait(), timeout)
+
+    async def stop(self) -> None:
+        """Stop tailing, then persist the last resume token"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.dispatcher.stop()
+        await self._save_token(force=True)
+        await self._release_resume_slot()
+        logger.info("[MongoChangeStreamSubscriber] stopped")
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self._tail()
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == _CHANGE_STREAM_HISTORY_LOST and self._resume_token is not None:
+                    # The saved position is gone from the oplog; missed events cannot be recovered
+                    self._history_lost += 1
+                    logger.warning("[MongoChangeStreamSubscriber] resume token too old, restarting from now")
+                    self._resume_token = None
+                    continue
+                logger.error("[MongoChangeStreamSubscriber] change stream failed code=%s error=%s", e.code, e)
+            except PyMongoError as e:
+                logger.warning("[MongoChangeStreamSubscriber] change stream interrupted error=%s", e)
+            except Exception:
+                logger.exception("[MongoChangeStreamSubscriber] subscriber error")
+            self._ready.clear()
+            self._restarts += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RETRY_DELAY_MAX_SECONDS)
+
+    async def _tail(self) -> None:
+        async with self._get_database().jobs.watch(
+            CHANGE_STREAM_PIPELINE, full_document="updateLookup", start_after=self._resume_token
+        ) as stream:
+            self._ready.set()
+            async for change in stream:
+                self._changes += 1
+                event = self._to_event(change)
+                if event is not None:
+                    self._notify_listeners(event)
+                    await self.dispatcher.submit(event)
+                self._resume_token = stream.resume_token
+                self._token_dirty = True
+                await self._save_token()
+
+    def _to_event(self, change: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Turn a projected change document into a dispatcher event"""
+        fields = change.get("updateDescription", {}).get("updatedFields", {})
+        job = change.get("fullDocument") or {}
+        status = fields.get("status")
+        if not (job.get("user_id") and status):
+            # Job deleted before the lookup, or written without an owner
+            self._invalid += 1
+            return None
+        wall_time = change.get("wallTime")
+        return {
+            "user_id": job["user_id"],
+            "job_id": str(change["documentKey"]["_id"]),
+            "status": status,
+            "session_id": job.get("session_id"),
+            "message": fields.get("error_message"),
+            "published_at": wall_time.replace(tzinfo=timezone.utc).timestamp() if isinstance(wall_time, datetime) else None,
+        }
+
+    def _notify_listeners(self, event: Dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("[MongoChangeStreamSubscriber] listener failed job_id=%s", event.get("job_id"))
+
+    async def _claim_resume_slot(self) -> str:
+        """Lease the first ``<hostname>#<n>`` slot no live process holds"""
+        host = socket.gethostname()
+        self._slot_owner = f"{host}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        collection = self._get_database()[RESUME_TOKENS_COLLECTION]
+        for slot in range(_MAX_RESUME_SLOTS):
+            key = f"{host}#{slot}"
+            now = datetime.now(timezone.utc)
+            try:
+                # Matches a free or expired slot; otherwise the upsert collides with the holder's _id
+                await collection.update_one(
+                    {"_id": key, "$or": [{"owner": None}, {"lease_until": {"$lt": now}}]},
+                    {"$set": {"owner": self._slot_owner, "lease_until": now + timedelta(seconds=RESUME_SLOT_LEASE_SECONDS)}},
+                    upsert=True,
+                )
+                return key
+            except DuplicateKeyError:
+                continue
+            except PyMongoError as e:
+                logger.warning("[MongoChangeStreamSubscriber] could not claim resume slot error=%s", e)
+                break
+        # Nothing to resume from; this process's token is never shared
+        self._slot_owner = None
+        return f"{host}:{os.getpid()}"
+
+    async def _keep_lease(self) -> None:
+        while True:
+            await asyncio.sleep(RESUME_SLOT_LEASE_SECONDS / 3)
+            try:
+                renewed = await self._get_database()[RESUME_TOKENS_COLLECTION].update_one(
+                    self._token_filter(),
+                    {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=RESUME_SLOT_LEASE_SECONDS)}},
+                )
+                if renewed.matched_count == 0:
+                    logger.warning("[MongoChangeStreamSubscriber] lost resume slot %s; its token is no longer saved", self.resume_key)
+                    return
+            except PyMongoError as e:
+                logger.warning("[MongoChangeStreamSubscriber] could not renew resume slot error=%s", e)
+
+    async def _release_resume_slot(self) -> None:
+        if self._lease_task:
+            self._lease_task.cancel()
+            try:
+                await self._lease_task
+            except asyncio.CancelledError:
+                pass
+            self._lease_task = None
+        if self._slot_owner is None:
+            return
+        try:
+            await self._get_database()[RESUME_TOKENS_COLLECTION].update_one(
+                self._token_filter(), {"$set": {"owner": None, "lease_until": None}}
+            )
+        except PyMongoError as e:
+            logger.warning("[MongoChangeStreamSubscriber] could not release resume slot error=%s", e)
+        self._slot_owner = None
+
+    def _token_filter(self) -> Dict[str, Any]:
+        # A claimed slot is only written while this process still holds it
+        if self._slot_owner is None:
+            return {"_id": self.resume_key}
+        return {"_id": self.resume_key, "owner": self._slot_owner}
+
+    async def _load_token(self) -> Optional[Mapping[str, Any]]:
+        try:
+            doc = await self._get_database()[RESUME_TOKENS_COLLECTION].find_one({"_id": self.resume_key})
+        except PyMongoError as e:
+            logger.warning("[MongoChangeStreamSubscriber] could not load resume token error=%s", e)
+            return None
+        return doc.get("token") if doc else None
+
+    async def _save_token(self, force: bool = False) -> None:
+        if not self._token_dirty or self._resume_token is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._token_saved_at < self.token_save_interval:
+            return
+        try:
+            await self._get_database()[RESUME_TOKENS_COLLECTION].update_one(
+                self._token_filter(),
+                {"$set": {"token": self._resume_token, "updated_at": datetime.now(timezone.utc)}},
+                upsert=self._slot_owner is None,
+            )
+            self._token_dirty = False
+            self._token_saved_at = now
+        except PyMongoError as e:
+            logger.warning("[MongoChangeStreamSubscriber] could not save resume token error=%s", e)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Change stream and dispatcher metrics (queue depth, lag, drops)"""
+        return {
+            "backend": "change_stream",
+            "changes": self._changes,
+            "invalid": self._invalid,
+            "restarts": self._restarts,
+            "history_lost": self._history_lost,
+            **self.dispatcher.get_metrics(),
+        }
@@ -0,0 +1,199 @@
+"""
+Notification Dispatcher - Bounded, sharded fan-out of job status events to WebSockets
+"""
+import asyncio
+import logging
+import time
+import zlib
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.domain.services.tracing import record_span, start_span
+from src.infrastructure.metrics import LatencyHistogram, MetricFamily, Sample, histogram_samples
+from src.presentation.websocket.websocket_routes import notify_job_status_update
+
+logger = logging.getLogger(__name__)
+
+# Overload policies applied when a dispatcher queue is full
+OVERLOAD_BLOCK = "block"              # apply backpressure to the reader
+OVERLOAD_DROP_OLDEST = "drop_oldest"  # evict the oldest queued event for that shard
+OVERLOAD_DROP_NEWEST = "drop_newest"  # discard the incoming event
+OVERLOAD_POLICIES = (OVERLOAD_BLOCK, OVERLOAD_DROP_OLDEST, OVERLOAD_DROP_NEWEST)
+
+NotifyCallable = Callable[..., Awaitable[None]]
+
+
+class NotificationDispatcher:
+    """Drains job status events into bounded queues and delivers them through a pool of dispatcher tasks.
+
+    Events are routed to a dispatcher by hashing ``user_id`` so updates for one user are always
+    delivered in the order they were received, while different users are served in parallel.
+    """
+
+    def __init__(
+        self,
+        notify: NotifyCallable = notify_job_status_update,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        overload_policy: Optional[str] = None,
+    ):
+        self._notify = notify
+        self._workers = max(1, workers or settings.notification_dispatchers)
+        self._queue_size = max(1, queue_size or settings.notification_queue_size)
+        self._overload_policy = overload_policy or settings.notification_overload_policy
+        if self._overload_policy not in OVERLOAD_POLICIES:
+            raise ValueError(f"Unsupported overload policy: {self._overload_policy}")
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        # Metrics (mutated only from the event loop thread)
+        self._received = 0
+        self._dispatched = 0
+        self._dropped = 0
+        self._failed = 0
+        self._lag_last = 0.0
+        self._lag_max = 0.0
+        self._lag_total = 0.0
+        self._publish_lag_last: Optional[float] = None
+        # Publisher -> delivery delay (wall clock, so it includes any clock skew between hosts)
+        self._publish_lag = LatencyHistogram()
+
+    async def start(self) -> None:
+        """Create the shard queues and spawn one dispatcher task per shard"""
+        if self._tasks:
+            return
+        self._queues = [asyncio.Queue(maxsize=self._queue_size) for _ in range(self._workers)]
+        self._tasks = [
+            asyncio.create_task(self._run(queue), name=f"notification_dispatcher_{i}")
+            for i, queue in enumerate(self._queues)
+        ]
+        logger.info(
+            "[NotificationDispatcher] started workers=%s queue_size=%s policy=%s",
+            self._workers, self._queue_size, self._overload_policy,
+        )
+
+    async def stop(self) -> None:
+        """Cancel dispatcher tasks; events still queued are discarded"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._queues = []
+        logger.info("[NotificationDispatcher] stopped")
+
+    def _shard_for(self, user_id: str) -> asyncio.Queue:
+        # crc32 is stable across processes, unlike hash() with PYTHONHASHSEED randomisation
+        return self._queues[zlib.crc32(user_id.encode("utf-8")) % len(self._queues)]
+
+    async def submit(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for delivery. Returns False when the event was dropped."""
+        if not self._queues:
+            raise RuntimeError("NotificationDispatcher not started")
+        self._received += 1
+        queue = self._shard_for(event["user_id"])
+        item: Tuple[float, Dict[str, Any]] = (time.monotonic(), event)
+
+        if self._overload_policy == OVERLOAD_BLOCK:
+            await queue.put(item)
+            return True
+
+        if queue.full():
+            self._dropped += 1
+            if self._overload_policy == OVERLOAD_DROP_NEWEST:
+                logger.warning(
+                    "[NotificationDispatcher] queue full, dropping incoming event user_id=%s job_id=%s",
+                    event.get("user_id"), event.get("job_id"),
+                )
+                return False
+            evicted = queue.get_nowait()
+            queue.task_done()
+            logger.warning(
+                "[NotificationDispatcher] queue full, dropping oldest event user_id=%s job_id=%s",
+                evicted[1].get("user_id"), evicted[1].get("job_id"),
+            )
+        queue.put_nowait(item)
+        return True
+
+    async def join(self) -> None:
+        """Wait until every queued event has been processed"""
+        for queue in self._queues:
+            await queue.join()
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            received_at, event = await queue.get()
+            try:
+                self._record_lag(received_at, event.get("published_at"))
+                # Events published by a traced worker continue its trace; the rest are not traced
+                traceparent = event.get("traceparent")
+                if traceparent and isinstance(event.get("published_at"), (int, float)):
+                    record_span("notification.queue_wait", event["published_at"], time.time(), traceparent=traceparent)
+                span = start_span(
+                    "notification.fanout", traceparent=traceparent, job_id=event["job_id"], status=event["status"]
+                ) if traceparent else nullcontext()
+                with span:
+                    await self._notify(
+                        user_id=event["user_id"],
+                        job_id=event["job_id"],
+                        status=event["status"],
+                        message=event.get("message"),
+                        session_id=event.get("session_id"),
+                    )
+                self._dispatched += 1
+            except Exception:
+                self._failed += 1
+                logger.exception(
+                    "[NotificationDispatcher] notify failed user_id=%s job_id=%s status=%s",
+                    event.get("user_id"), event.get("job_id"), event.get("status"),
+                )
+            finally:
+                queue.task_done()
+
+    def _record_lag(self, received_at: float, published_at: Optional[float]) -> None:
+        lag = time.monotonic() - received_at
+        self._lag_last = lag
+        self._lag_total += lag
+        if lag > self._lag_max:
+            self._lag_max = lag
+        if isinstance(published_at, (int, float)):
+            # Wall-clock difference between the publisher and this process
+            self._publish_lag_last = max(0.0, time.time() - published_at)
+            self._publish_lag.observe(self._publish_lag_last)
+
+    def collect(self) -> List[MetricFamily]:
+        """Prometheus families for ``/metrics``"""
+        return [
+            MetricFamily("notifications_received_total", "counter", "Job status events received by this process", [Sample("", {}, self._received)]),
+            MetricFamily("notifications_delivered_total", "counter", "Job status events pushed to WebSockets", [Sample("", {}, self._dispatched)]),
+            MetricFamily("notifications_dropped_total", "counter", "Job status events dropped by the overload policy", [Sample("", {}, self._dropped)]),
+            MetricFamily("notifications_failed_total", "counter", "Job status events whose delivery raised", [Sample("", {}, self._failed)]),
+            MetricFamily("notification_queue_depth", "gauge", "Job status events waiting for delivery", [Sample("", {}, sum(q.qsize() for q in self._queues))]),
+            MetricFamily(
+                "notification_delay_seconds", "histogram", "Publish (worker) to delivery (API) delay",
+                histogram_samples({}, self._publish_lag),
+            ),
+        ]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, lag and throughput counters"""
+        depths = [queue.qsize() for queue in self._queues]
+        completed = self._dispatched + self._failed
+        return {
+            "workers": self._workers,
+            "queue_capacity": self._queue_size * self._workers,
+            "queue_depth": sum(depths),
+            "queue_depth_max_shard": max(depths) if depths else 0,
+            "overload_policy": self._overload_policy,
+            "received": self._received,
+            "dispatched": self._dispatched,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "lag_seconds_last": self._lag_last,
+            "lag_seconds_max": self._lag_max,
+            "lag_seconds_avg": (self._lag_total / completed) if completed else 0.0,
+            "publish_lag_seconds_last": self._publish_lag_last,
+        }
@@ -4,23 +4,38 @@ Redis Notification Subscriber - Listens for job notifications and forwards to We
 import asyncio
 import json
 import logging
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 from redis.asyncio import Redis
 
 from src.config.settings import settings
-from src.presentation.websocket.websocket_routes import notify_job_status_update
+from src.infrastructure.events.notification_dispatcher import NotificationDispatcher
 from src.infrastructure.events.simple_job_notifier import JOB_NOTIFICATION_CHANNEL
 
 logger = logging.getLogger(__name__)
 
+EventListener = Callable[[Dict[str, Any]], None]
+
 
 class RedisNotificationSubscriber:
-    """Subscribes to Redis job notifications and forwards to WebSockets"""
+    """Subscribes to Redis job notifications and forwards to WebSockets.
+
+    The reader only decodes and validates messages; delivery happens on the
+    ``NotificationDispatcher`` pool so a slow socket never stalls the subscription.
+    Listeners registered with ``add_listener`` run inline on the reader for every valid
+    event, before it is queued, so they see events the dispatcher may later drop.
+    """
     
-    def __init__(self):
-        self._redis: Optional[Redis] = None
+    def __init__(self, dispatcher: Optional[NotificationDispatcher] = None, redis: Optional[Redis] = None):
+        self._redis: Optional[Redis] = redis
         self._task: Optional[asyncio.Task] = None
         self._stopping = asyncio.Event()
+        self.dispatcher = dispatcher or NotificationDispatcher()
+        self._invalid = 0
+        self._listeners: List[EventListener] = []
+
+    def add_listener(self, listener: EventListener) -> None:
+        """Register a synchronous callback for every valid event (must be cheap and non-blocking)"""
+        self._listeners.append(listener)
 
     def _get_redis(self) -> Redis:
         if self._redis is None:
@@ -32,6 +47,7 @@ class RedisNotificationSubscriber:
         if self._task and not self._task.done():
             return
         self._stopping.clear()
+        await self.dispatcher.start()
         self._task = asyncio.create_task(self._run(), name="redis_notification_subscriber")
         logger.info("[RedisNotificationSubscriber] started")
 
@@ -44,6 +60,7 @@ class RedisNotificationSubscriber:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        await self.dispatcher.stop()
         if self._redis is not None:
             try:
                 await self._redis.close()
@@ -68,44 +85,15 @@ class RedisNotificationSubscriber:
                 if msg.get("type") != "message":
                     continue
                     
-                data = msg.get("data")
-                if not data:
-                    continue
-                    
+                # One bad message must not end the subscription
                 try:
-                    payload = json.loads(data)
+                    event = self._parse_message(msg.get("data"))
+                    if event is not None:
+                        self._notify_listeners(event)
+                        await self.dispatcher.submit(event)
                 except Exception:
-                    logger.exception("[RedisNotificationSubscriber] invalid payload: %r", data)
-                    continue
-                    
-                if payload.get("type") != "job_status_update":
-                    continue
-                    
-                user_id = payload.get("user_id")
-                job_id = payload.get("job_id")
-                status = payload.get("status")
-                session_id = payload.get("session_id")
-                message = payload.get("message")
-                
-                if not (user_id and job_id and status):
-                    logger.debug("[RedisNotificationSubscriber] missing fields in payload=%s", payload)
-                    continue
-                    
-                try:
-                    await notify_job_status_update(
-                        user_id=user_id,
-                        job_id=job_id,
-                        status=status,
-                        message=message,
-                        session_id=session_id,
-                    )
-                    logger.info("[RedisNotificationSubscriber] forwarded notification: user_id=%s, job_id=%s, status=%s", 
-                               user_id, job_id, status)
-                except Exception:
-                    logger.exception(
-                        "[RedisNotificationSubscriber] notify failed user_id=%s job_id=%s status=%s",
-                        user_id, job_id, status,
-                    )
+                    self._invalid += 1
+                    logger.exception("[RedisNotificationSubscriber] failed to handle message: %r", msg.get("data"))
         except asyncio.CancelledError:
             pass
         except Exception:
@@ -116,3 +104,46 @@ class RedisNotificationSubscriber:
                 await pubsub.close()
             except Exception:
                 pass
+
+    def _notify_listeners(self, event: Dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("[RedisNotificationSubscriber] listener failed job_id=%s", event.get("job_id"))
+
+    def _parse_message(self, data: Any) -> Optional[Dict[str, Any]]:
+        """Decode and validate a pub/sub payload into a dispatcher event"""
+        if not data:
+            return None
+        try:
+            payload = json.loads(data)
+        except Exception:
+            self._invalid += 1
+            logger.exception("[RedisNotificationSubscriber] invalid payload: %r", data)
+            return None
+
+        if not isinstance(payload, dict) or payload.get("type") != "job_status_update":
+            return None
+
+        user_id = payload.get("user_id")
+        job_id = payload.get("job_id")
+        status = payload.get("status")
+        if not all(isinstance(v, str) and v for v in (user_id, job_id, status)):
+            self._invalid += 1
+            logger.debug("[RedisNotificationSubscriber] missing fields in payload=%s", payload)
+            return None
+
+        return {
+            "user_id": user_id,
+            "job_id": job_id,
+            "status": status,
+            "session_id": payload.get("session_id"),
+            "message": payload.get("message"),
+            "published_at": payload.get("published_at"),
+            "traceparent": payload.get("traceparent"),
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Subscriber and dispatcher metrics (queue depth, lag, drops)"""
+        return {"invalid": self._invalid, **self.dispatcher.get_metrics()}
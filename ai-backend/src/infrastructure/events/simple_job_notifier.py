@@ -3,10 +3,13 @@ Simple Job Notifier - Uses Redis pub/sub for worker-to-API communication
 """
 import json
 import logging
+import time
 from typing import Optional
 import redis
 
 from src.config.settings import settings
+from src.domain.services.tracing import start_span
+from src.infrastructure.metrics import job_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +19,21 @@ JOB_NOTIFICATION_CHANNEL = "job_notifications"
 
 class SimpleJobNotifier:
     """Simple job status notifier that uses Redis pub/sub"""
-    
+
+    # Process-wide client; redis-py pools are fork-safe and reconnect lazily
+    _client: Optional[redis.Redis] = None
+
+    @classmethod
+    def use_client(cls, client: Optional[redis.Redis]) -> None:
+        """Override the publishing client (e.g. an in-process stand-in for benchmarks)"""
+        cls._client = client
+
+    @classmethod
+    def _get_client(cls) -> redis.Redis:
+        if cls._client is None:
+            cls._client = redis.from_url(settings.redis_url, decode_responses=True)
+        return cls._client
+
     @staticmethod
     def notify_job_status_sync(
         user_id: str,
@@ -27,25 +44,30 @@ class SimpleJobNotifier:
     ) -> None:
         """Synchronous notification for use in Celery tasks"""
         try:
-            logger.info("[SimpleJobNotifier] notifying: user_id=%s, job_id=%s, status=%s, session_id=%s", 
+            logger.debug("[SimpleJobNotifier] notifying: user_id=%s, job_id=%s, status=%s, session_id=%s", 
                        user_id, job_id, status, session_id)
             
-            # Create Redis client
-            r = redis.from_url(settings.redis_url, decode_responses=True)
-            
-            # Prepare notification payload
-            payload = {
-                "type": "job_status_update",
-                "user_id": user_id,
-                "job_id": job_id,
-                "status": status,
-                "session_id": session_id,
-                "message": message
-            }
+            r = SimpleJobNotifier._get_client()
             
-            # Publish to Redis channel
-            r.publish(JOB_NOTIFICATION_CHANNEL, json.dumps(payload))
-            logger.info("[SimpleJobNotifier] notification published to Redis")
+            with start_span("notification.publish", job_id=job_id, status=status) as span:
+                # Prepare notification payload
+                payload = {
+                    "type": "job_status_update",
+                    "user_id": user_id,
+                    "job_id": job_id,
+                    "status": status,
+                    "session_id": session_id,
+                    "message": message,
+                    "published_at": time.time(),
+                    # The API continues the job's trace when it fans this out to WebSockets
+                    "traceparent": span.traceparent if span is not None else None,
+                }
+
+                # Publish to Redis channel
+                r.publish(JOB_NOTIFICATION_CHANNEL, json.dumps(payload))
+            job_metrics.notifications_published.labels(status).inc()
+            logger.debug("[SimpleJobNotifier] notification published to Redis")
             
         except Exception:
+            job_metrics.notification_publish_failures.inc()
             logger.exception("[SimpleJobNotifier] failed to notify job status sync")
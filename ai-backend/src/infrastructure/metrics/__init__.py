@@ -0,0 +1,29 @@
+from .registry import (
+    CONTENT_TYPE,
+    LATENCY_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    LatencyHistogram,
+    MetricFamily,
+    MetricsRegistry,
+    Sample,
+    histogram_samples,
+    metrics_registry,
+)
+from .http_server import start_metrics_server
+
+__all__ = [
+    "CONTENT_TYPE",
+    "LATENCY_BUCKETS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "LatencyHistogram",
+    "MetricFamily",
+    "MetricsRegistry",
+    "Sample",
+    "histogram_samples",
+    "metrics_registry",
+    "start_metrics_server",
+]
@@ -0,0 +1,58 @@
+"""
+Metrics HTTP Server - Serves /metrics from a daemon thread for processes without an API (Celery workers)
+"""
+import errno
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .registry import CONTENT_TYPE, MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+def _handler_for(registry: MetricsRegistry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Scrapes are not worth a log line each
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(
+    port: int, host: str = "0.0.0.0", attempts: int = 1, registry: Optional[MetricsRegistry] = None
+) -> Optional[ThreadingHTTPServer]:
+    """Serve ``registry`` on the first free port in ``port .. port + attempts - 1``.
+
+    Each prefork pool process keeps its own metrics, so each binds its own port; Prometheus scrapes
+    the range. Returns None (and logs) when no port could be bound; metrics are never worth
+    failing a worker over.
+    """
+    handler = _handler_for(registry or metrics_registry)
+    for candidate in range(port, port + max(1, attempts)):
+        try:
+            server = ThreadingHTTPServer((host, candidate), handler)
+        except OSError as e:
+            if e.errno == errno.EADDRINUSE:
+                continue
+            logger.warning("[start_metrics_server] could not bind port=%s error=%s", candidate, e)
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics_server", daemon=True).start()
+        logger.info("[start_metrics_server] serving /metrics on %s:%s", host, server.server_address[1])
+        return server
+    logger.warning("[start_metrics_server] no free port in %s..%s", port, port + attempts - 1)
+    return None
@@ -1,9 +1,12 @@
 from celery import Celery
 from typing import Dict, Any
 from src.domain.services import QueueService
+from src.domain.services.tracing import start_span
 import logging
 from src.config.settings import settings
+from src.infrastructure.metrics import job_metrics
 from kombu import Queue
+import time
 
 
 # Celery configuration
@@ -74,28 +77,36 @@ class CeleryQueueService(QueueService):
 
     async def enqueue_job(self, job_id: str, job_data: Dict[str, Any]) -> bool:
         """Add job to processing queue"""
+        started = time.perf_counter()
         try:
             from .tasks import process_job
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "[CeleryQueueService.enqueue_job] enqueue job_id=%s keys=%s",
+                    job_id,
+                    list(job_data.keys()) if isinstance(job_data, dict) else type(job_data).__name__,
+                )
+            with start_span("celery.publish", job_id=job_id) as span:
+                # The worker continues the trace from this header (task.request.traceparent)
+                headers = {"traceparent": span.traceparent} if span is not None else None
+                # Explicitly route to the configured queue to avoid any default-queue mismatches
+                result = process_job.apply_async(
+                    args=(job_id, job_data),
+                    queue=settings.celery_queue_name,
+                    soft_time_limit=settings.celery_soft_time_limit,
+                    time_limit=settings.celery_time_limit,
+                    headers=headers,
+                )
             self.logger.debug(
-                "[CeleryQueueService.enqueue_job] enqueue job_id=%s keys=%s",
-                job_id,
-                list(job_data.keys()) if isinstance(job_data, dict) else type(job_data).__name__,
-            )
-            # Explicitly route to the configured queue to avoid any default-queue mismatches
-            result = process_job.apply_async(
-                args=(job_id, job_data),
-                queue=settings.celery_queue_name,
-                soft_time_limit=settings.celery_soft_time_limit,
-                time_limit=settings.celery_time_limit,
-            )
-            self.logger.info(
                 "[CeleryQueueService.enqueue_job] enqueued job_id=%s queue=%s task_id=%s",
                 job_id,
                 settings.celery_queue_name,
                 getattr(result, 'id', None),
             )
+            job_metrics.enqueue_duration.labels("ok").observe(time.perf_counter() - started)
             return True
         except Exception as e:
+            job_metrics.enqueue_duration.labels("error").observe(time.perf_counter() - started)
             self.logger.exception("[CeleryQueueService.enqueue_job] failed job_id=%s error=%s", job_id, e)
             return False
 
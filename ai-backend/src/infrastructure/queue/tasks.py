@@ -1,42 +1,53 @@
 from celery import current_app
 from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 from src.infrastructure.queue.celery_queue_service import celery_app
-from src.application.use_cases import JobUseCases
-from src.infrastructure.repositories import MongoJobRepository
-from src.infrastructure.external.fake_ai_service import FakeAIService
-#from src.infrastructure.storage.s3_storage_service import FakeStorageService
-from src.infrastructure.queue.celery_queue_service import CeleryQueueService
-from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.queue.worker_runtime import WorkerRuntime
 from src.domain.entities import JobStatus
 from src.infrastructure.events.simple_job_notifier import SimpleJobNotifier
+from src.infrastructure.metrics import job_metrics
+from src.domain.services.tracing import current_traceparent, record_span, start_span
 import asyncio
 import logging
+import time
 from src.config.settings import settings
 
 
 @celery_app.task(soft_time_limit=settings.celery_soft_time_limit, time_limit=settings.celery_time_limit)
 def process_job(job_id: str, job_data: dict):
     """Process AI job task - job_data now includes user_id and session_id for event monitoring"""
+    # Set by CeleryQueueService.enqueue_job from its publish span
+    traceparent = process_job.request.get('traceparent')
+    created_at = job_data.get('created_at')
+    if created_at:
+        record_span("job.queue_wait", created_at, time.time(), traceparent=traceparent, job_id=job_id)
+    with start_span("job.task", traceparent=traceparent, job_id=job_id) as span:
+        result = _run_job(job_id, job_data)
+        if span is not None:
+            span.set_attribute("status", result["status"])
+        return result
+
+
+def _run_job(job_id: str, job_data: dict) -> dict:
+    # Assigned before the try: the soft time limit can fire at any point inside it
+    job_type, created_at, started_at = job_data.get('job_type', 'unknown'), job_data.get('created_at'), time.time()
     try:
         logger = logging.getLogger(__name__)
-        logger.info("[tasks.process_job] start job_id=%s user_id=%s session_id=%s", 
+        logger.debug("[tasks.process_job] start job_id=%s user_id=%s session_id=%s", 
                    job_id, job_data.get('user_id'), job_data.get('session_id'))
         
-        # Notify job started
+        job_metrics.observe_job_started(job_type, created_at, started_at)
+
         user_id = job_data.get('user_id')
         session_id = job_data.get('session_id')
-        if user_id:
-            SimpleJobNotifier.notify_job_status_sync(
-                user_id=user_id,
-                job_id=job_id,
-                status='PROCESSING',
-                session_id=session_id
-            )
-        
-        # Run async job processing
-        processed_ok = asyncio.run(_process_job_async(job_id, job_data))
+
+        # Run async job processing; PROCESSING is announced by _process_job_async once it is written
+        processed_ok = WorkerRuntime.get().run(_process_job_async(job_id, job_data, current_traceparent()))
+        job_metrics.observe_job_finished(
+            job_type, 'completed' if processed_ok else 'failed', created_at, started_at, time.time()
+        )
         if processed_ok:
-            logger.info("[tasks.process_job] completed job_id=%s", job_id)
+            logger.debug("[tasks.process_job] completed job_id=%s", job_id)
             # Notify job completed
             if user_id:
                 SimpleJobNotifier.notify_job_status_sync(
@@ -60,9 +71,10 @@ def process_job(job_id: str, job_data: dict):
             return {"status": "failed", "job_id": job_id}
     except SoftTimeLimitExceeded as e:
         logging.warning("[tasks.process_job] soft time limit exceeded job_id=%s limit=%ss", job_id, settings.celery_soft_time_limit)
+        job_metrics.observe_job_finished(job_type, 'timeout', created_at, started_at, time.time())
         # Best-effort mark job as failed due to timeout
         try:
-            asyncio.run(_mark_job_failed_async(job_id, f"Timed out after {settings.celery_soft_time_limit}s"))
+            WorkerRuntime.get().run(_mark_job_failed_async(job_id, f"Timed out after {settings.celery_soft_time_limit}s"))
         except Exception:
             logging.debug("[tasks.process_job] failed to mark job as FAILED on timeout job_id=%s", job_id)
         return {"status": "failed", "job_id": job_id, "error": "soft_time_limit_exceeded"}
@@ -82,40 +94,41 @@ def process_job(job_id: str, job_data: dict):
         return {"status": "failed", "job_id": job_id, "error": str(e)}
 
 
-async def _process_job_async(job_id: str, job_data: dict):
-    """Async job processing logic"""
-    # Fresh DB connection per task to avoid event loop reuse issues
-    logging.debug(
-        "[tasks._process_job_async] connecting MongoDB url=%s db=%s",
-        settings.mongodb_url,
-        settings.database_name,
-    )
-    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
-    try:
-        # Initialize services
-        job_repository = MongoJobRepository()
-        ai_service = FakeAIService()
-        #storage_service = FakeStorageService()
-        queue_service = CeleryQueueService()
-        
-        # Initialize use case
-        job_use_cases = JobUseCases(job_repository, queue_service, ai_service)
+async def _process_job_async(job_id: str, job_data: dict, traceparent=None):
+    """Async job processing logic (runs on the worker runtime loop, with its shared services)"""
+    logging.debug("[tasks._process_job_async] calling JobUseCases.process_job job_id=%s", job_id)
+    user_id = job_data.get('user_id')
 
-        # Process the job
-        logging.debug("[tasks._process_job_async] calling JobUseCases.process_job job_id=%s", job_id)
-        return await job_use_cases.process_job(job_id)
-    finally:
-        await MongoDB.close_mongo_connection()
+    async def notify_processing():
+        # Only after the write: the API drops its cached job on this notification, and a read
+        # racing an earlier notification would re-cache the PENDING document
+        await asyncio.to_thread(
+            SimpleJobNotifier.notify_job_status_sync,
+            user_id=user_id,
+            job_id=job_id,
+            status='PROCESSING',
+            session_id=job_data.get('session_id'),
+        )
+
+    # The runtime loop does not inherit the task thread's context, so the trace is passed explicitly
+    with start_span("job.process", traceparent=traceparent, job_id=job_id):
+        return await WorkerRuntime.get().container.job_use_cases.process_job(
+            job_id, on_processing=notify_processing if user_id else None
+        )
 
 
 async def _mark_job_failed_async(job_id: str, message: str):
     """Best-effort failure marker used by timeout handler."""
-    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
-    try:
-        job_repository = MongoJobRepository()
-        ai_service = FakeAIService()
-        queue_service = CeleryQueueService()
-        job_use_cases = JobUseCases(job_repository, queue_service, ai_service)
-        await job_use_cases.update_job_status(job_id, JobStatus.FAILED, error_message=message)
-    finally:
-        await MongoDB.close_mongo_connection()
+    await WorkerRuntime.get().container.job_use_cases.update_job_status(job_id, JobStatus.FAILED, error_message=message)
+
+
+@worker_process_init.connect
+def _start_runtime(**kwargs) -> None:
+    """Connect and build services when a pool process starts, not on its first task"""
+    WorkerRuntime.get()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_runtime(**kwargs) -> None:
+    WorkerRuntime.shutdown()
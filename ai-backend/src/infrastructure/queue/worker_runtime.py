@@ -0,0 +1,104 @@
+"""
+Worker Runtime - One persistent event loop per Celery worker process, with MongoDB and the container on it
+"""
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional, TypeVar
+
+from src.config.settings import settings
+from src.container import Container, set_container
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.metrics import start_metrics_server
+from src.infrastructure.tracing import configure_tracing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """Runs task coroutines on a long-lived event loop instead of ``asyncio.run`` per task.
+
+    The loop runs in a daemon thread; tasks (from the prefork main thread or any thread of a
+    threads pool) submit coroutines with ``run`` and block until they finish. MongoDB is
+    connected and the service container built once, on that loop, so every task reuses the
+    same Motor pool and services. Create one per process (see ``get``); a forked child builds
+    its own. With ``WORKER_METRICS_PORT`` set, the process also serves its ``/metrics``; with
+    ``TRACE_EXPORTER`` set, it exports its job spans.
+    """
+
+    _instance: Optional["WorkerRuntime"] = None
+    _instance_pid: Optional[int] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        configure_tracing()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="worker_event_loop", daemon=True)
+        self._thread.start()
+        self.container: Container = self.run(self._start())
+        self.metrics_server = (
+            start_metrics_server(settings.worker_metrics_port, attempts=settings.worker_metrics_port_attempts)
+            if settings.worker_metrics_port else None
+        )
+
+    @classmethod
+    def get(cls) -> "WorkerRuntime":
+        """The runtime for this process (rebuilt after fork)"""
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance_pid != os.getpid():
+                cls._instance = WorkerRuntime()
+                cls._instance_pid = os.getpid()
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close this process's runtime, if any"""
+        with cls._instance_lock:
+            instance = cls._instance if cls._instance_pid == os.getpid() else None
+            cls._instance = None
+            cls._instance_pid = None
+        if instance is not None:
+            instance.close()
+
+    async def _start(self) -> Container:
+        await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+        container = Container()
+        set_container(container)
+        logger.info("[WorkerRuntime] started pid=%s", os.getpid())
+        return container
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the runtime loop and wait for its result.
+
+        If the caller is interrupted (e.g. Celery's soft time limit), the coroutine is cancelled too.
+        """
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        if not self.loop.is_running():
+            return
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+        try:
+            self.run(self._stop(), timeout=10)
+        except Exception:
+            logger.exception("[WorkerRuntime] shutdown failed")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+    async def _stop(self) -> Any:
+        await self.container.close()
+        set_container(None)
+        await MongoDB.close_mongo_connection()
@@ -1,7 +1,15 @@
 from .mongo_user_repository import MongoUserRepository
+from .cached_user_repository import CachedUserRepository
 from .mongo_job_repository import MongoJobRepository
+from .cached_job_repository import CachedJobRepository
+from .mongo_job_stats_repository import MongoJobStatsRepository
+from .mongo_artifact_ref_repository import MongoArtifactRefRepository
 
 __all__ = [
     "MongoUserRepository",
-    "MongoJobRepository"
+    "CachedUserRepository",
+    "MongoJobRepository",
+    "CachedJobRepository",
+    "MongoJobStatsRepository",
+    "MongoArtifactRefRepository",
 ]
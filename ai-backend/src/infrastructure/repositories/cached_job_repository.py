@@ -0,0 +1,64 @@
+import time
+from typing import Optional, List, Dict, Any, Sequence
+from src.domain.repositories import JobRepository
+from src.domain.entities import Job, JobCreate, JobUpdate, JobStatus
+from src.infrastructure.cache.job_cache import JobCache
+
+
+class CachedJobRepository(JobRepository):
+    """Serves get_by_id through a JobCache; every other call goes straight to the wrapped repository.
+
+    Writes made through this repository drop the job from both cache tiers. Writes made elsewhere
+    (the worker) are picked up through the status events the cache listens to.
+    """
+
+    def __init__(self, repository: JobRepository, cache: JobCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def create(self, job_data: JobCreate) -> Job:
+        return await self.repository.create(job_data)
+
+    async def get_by_id(self, job_id: str) -> Optional[Job]:
+        job = await self.cache.get(job_id)
+        if job is not None:
+            return job
+        read_started = time.monotonic()
+        job = await self.repository.get_by_id(job_id)
+        if job is not None:
+            await self.cache.put(job, read_started)
+        return job
+
+    async def get_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[Job]:
+        return await self.repository.get_by_user_id(user_id, skip, limit, cursor, include_archived)
+
+    async def get_documents_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[Dict[str, Any]]:
+        return await self.repository.get_documents_by_user_id(user_id, skip, limit, cursor, include_archived)
+
+    async def get_summaries_by_user_id(
+        self, user_id: str, fields: Sequence[str], limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await self.repository.get_summaries_by_user_id(user_id, fields, limit, cursor)
+
+    async def get_active_by_user_session(self, user_id: str, session_id: str) -> Optional[Job]:
+        return await self.repository.get_active_by_user_session(user_id, session_id)
+
+    async def get_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Job]:
+        return await self.repository.get_by_status(status, skip, limit, cursor)
+
+    async def update(self, job_id: str, job_data: JobUpdate) -> Optional[Job]:
+        job = await self.repository.update(job_id, job_data)
+        await self.cache.discard(job_id)
+        return job
+
+    async def delete(self, job_id: str) -> bool:
+        deleted = await self.repository.delete(job_id)
+        await self.cache.discard(job_id)
+        return deleted
+
+    async def list_jobs(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Job]:
+        return await self.repository.list_jobs(skip, limit, cursor)
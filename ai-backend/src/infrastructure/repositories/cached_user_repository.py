@@ -0,0 +1,59 @@
+import time
+from typing import Optional, List, Tuple
+from src.domain.repositories import UserRepository
+from src.domain.entities import User, UserCreate, UserUpdate
+from src.infrastructure.cache.user_cache import UserCache
+
+
+class CachedUserRepository(UserRepository):
+    """Serves clerk_id lookups (and repeat provisioning) from a UserCache; other reads go straight
+    to the wrapped repository.
+
+    Writes made through this repository refresh or drop the cached entry.
+    """
+
+    def __init__(self, repository: UserRepository, cache: UserCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def create(self, user_data: UserCreate) -> User:
+        user = await self.repository.create(user_data)
+        self.cache.invalidate(clerk_id=user.clerk_id)
+        return user
+
+    async def provision(self, user_data: UserCreate) -> Tuple[User, bool]:
+        cached = self.cache.get(user_data.clerk_id)
+        if cached is not None:
+            return cached, False
+        user, created = await self.repository.provision(user_data)
+        self.cache.put(user)
+        return user, created
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return await self.repository.get_by_id(user_id)
+
+    async def get_by_clerk_id(self, clerk_id: str) -> Optional[User]:
+        user = self.cache.get(clerk_id)
+        if user is not None:
+            return user
+        read_started = time.monotonic()
+        user = await self.repository.get_by_clerk_id(clerk_id)
+        if user is not None:
+            self.cache.put(user, read_started)
+        return user
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.repository.get_by_email(email)
+
+    async def update(self, user_id: str, user_data: UserUpdate) -> Optional[User]:
+        user = await self.repository.update(user_id, user_data)
+        self.cache.invalidate(clerk_id=user.clerk_id if user else None, user_id=user_id)
+        return user
+
+    async def delete(self, user_id: str) -> bool:
+        deleted = await self.repository.delete(user_id)
+        self.cache.invalidate(user_id=user_id)
+        return deleted
+
+    async def list_users(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+        return await self.repository.list_users(skip, limit, cursor)
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from src.domain.repositories import ArtifactRefRepository
+from src.infrastructure.database.mongodb import MongoDB
+
+ARTIFACT_REFS_COLLECTION = "artifact_refs"
+
+
+class MongoArtifactRefRepository(ArtifactRefRepository):
+    """Reference counts in `artifact_refs`, one document per artifact (``_id`` = artifact id).
+
+    Every change is a single atomic ``$inc``, so concurrent jobs sharing an artifact never lose a
+    reference. The document is removed only while its count is still zero, so a reference
+    acquired concurrently with the last release keeps it.
+    """
+
+    def __init__(self, database: Optional[AsyncIOMotorDatabase] = None):
+        self.database = database if database is not None else MongoDB.get_database()
+        self.collection = self.database[ARTIFACT_REFS_COLLECTION]
+
+    async def acquire(self, artifact_id: str) -> int:
+        now = datetime.now(timezone.utc)
+        doc = await self.collection.find_one_and_update(
+            {"_id": artifact_id},
+            {"$inc": {"count": 1}, "$set": {"updated_at": now}, "$setOnInsert": {"created_at": now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc["count"]
+
+    async def release(self, artifact_id: str) -> int:
+        doc = await self.collection.find_one_and_update(
+            {"_id": artifact_id, "count": {"$gt": 0}},
+            {"$inc": {"count": -1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return 0
+        if doc["count"] <= 0:
+            await self.collection.delete_one({"_id": artifact_id, "count": {"$lte": 0}})
+            return 0
+        return doc["count"]
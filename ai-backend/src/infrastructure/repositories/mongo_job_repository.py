@@ -1,25 +1,116 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Sequence
 from datetime import datetime, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from src.domain.repositories import JobRepository
-from src.domain.entities import Job, JobCreate, JobUpdate, JobStatus
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from src.domain.repositories import JobRepository, ActiveJobConflictError, JobStatsRepository
+from src.domain.entities import Job, JobCreate, JobUpdate, JobStatus, ACTIVE_JOB_STATUSES
+from src.domain.services import OutputStore
+from src.infrastructure.database.indexes import ACTIVE_SESSION_INDEX
 from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories.pagination import KEYSET_SORT, keyset_filter, merge_keyset_pages
+from src.infrastructure.repositories.mongo_job_stats_repository import MongoJobStatsRepository
 import logging
+import time
+
+# While the unique session index is missing, how often create() looks for it again
+SESSION_INDEX_RECHECK_SECONDS = 60.0
+
+
+def active_session_query(user_id: str, session_id: str) -> dict:
+    """Filter for active jobs in a session; matches the active_user_session_unique partial index."""
+    return {
+        "user_id": user_id,
+        # $type repeats the index's partial filter verbatim so the planner can always use it
+        "session_id": {"$eq": session_id, "$type": "string"},
+        "status": {"$in": [s.value for s in ACTIVE_JOB_STATUSES]},
+    }
 
 
 class MongoJobRepository(JobRepository):
-    def __init__(self):
-        self.database = MongoDB.get_database()
+    def __init__(
+        self,
+        stats: Optional[JobStatsRepository] = None,
+        database: Optional[AsyncIOMotorDatabase] = None,
+        output_store: Optional[OutputStore] = None,
+    ):
+        self.database = database if database is not None else MongoDB.get_database()
         self.collection = self.database.jobs
+        # Cold tier: terminal jobs moved out of `jobs` by JobArchiver
+        self.archive = self.database.jobs_archive
+        # Counters kept in step with every status change made through this repository
+        self.stats = stats if stats is not None else MongoJobStatsRepository(self.database)
+        # Holds the offloaded outputs (output_ref) of jobs; deleted along with the job
+        self.output_store = output_store
+        self._session_index_confirmed = False
+        self._session_index_checked_at: Optional[float] = None
+
+    async def _record_transition(self, user_id: str, old_status: Optional[str], new_status: str) -> None:
+        # The job write already succeeded; a counter failure is repaired by `manage.py rebuild-job-stats`
+        try:
+            await self.stats.record_transition(user_id, old_status, new_status)
+        except Exception as e:
+            logging.exception("[MongoJobRepository] job counter update failed user_id=%s error=%s", user_id, e)
+
+    async def _delete_output(self, job_id: str, output_ref: Dict[str, Any]) -> None:
+        # The job is already gone; a failure leaves an orphaned file, never a dangling reference
+        try:
+            await self.output_store.delete(output_ref)
+        except Exception as e:
+            logging.exception("[MongoJobRepository] output delete failed job_id=%s ref=%s error=%s", job_id, output_ref, e)
+
+    async def _session_index_ready(self) -> bool:
+        """Whether active_user_session_unique exists; rechecked every SESSION_INDEX_RECHECK_SECONDS until it does"""
+        if self._session_index_confirmed:
+            return True
+        now = time.monotonic()
+        if self._session_index_checked_at is not None and now - self._session_index_checked_at < SESSION_INDEX_RECHECK_SECONDS:
+            return False
+        self._session_index_checked_at = now
+        try:
+            index = (await self.collection.index_information()).get(ACTIVE_SESSION_INDEX)
+        except Exception as e:
+            logging.warning("[MongoJobRepository] could not list indexes error=%s", e)
+            return False
+        self._session_index_confirmed = bool(index and index.get("unique"))
+        if not self._session_index_confirmed:
+            logging.warning(
+                "[MongoJobRepository] %s missing; checking for active jobs before each insert "
+                "(see `python manage.py dedupe-active-jobs`)", ACTIVE_SESSION_INDEX,
+            )
+        return self._session_index_confirmed
 
     async def create(self, job_data: JobCreate) -> Job:
         job_dict = job_data.dict()
         job_dict["status"] = JobStatus.PENDING
         job_dict["created_at"] = datetime.now(timezone.utc)
         job_dict["updated_at"] = datetime.now(timezone.utc)
-        
-        result = await self.collection.insert_one(job_dict)
+
+        # The active_user_session_unique partial index rejects a second active job for the session,
+        # so creation is a single write and concurrent requests cannot both succeed. Until that
+        # index exists (it is built in the background, and duplicates left by older releases stop
+        # it), fall back to reading first: racy, but the rule is never silently off.
+        if job_data.session_id and not await self._session_index_ready():
+            existing = await self.get_active_by_user_session(job_data.user_id, job_data.session_id)
+            if existing:
+                raise ActiveJobConflictError(str(existing.id))
+        for _ in range(2):
+            try:
+                result = await self.collection.insert_one(dict(job_dict))
+                break
+            except DuplicateKeyError:
+                existing = await self.get_active_by_user_session(job_data.user_id, job_data.session_id)
+                if existing:
+                    raise ActiveJobConflictError(str(existing.id))
+                # The conflicting job finished in between; retry once
+                logging.debug(
+                    "[MongoJobRepository.create] conflicting job no longer active user_id=%s session_id=%s",
+                    job_data.user_id, job_data.session_id,
+                )
+        else:
+            raise ActiveJobConflictError(None)
         job_dict["_id"] = result.inserted_id
+        await self._record_transition(job_data.user_id, None, JobStatus.PENDING.value)
         
         return Job(**job_dict)
 
@@ -27,6 +118,9 @@ class MongoJobRepository(JobRepository):
         from bson import ObjectId
         try:
             job_doc = await self.collection.find_one({"_id": ObjectId(job_id)})
+            if job_doc is None:
+                # Old terminal jobs live in the archive; ids are unique across both tiers
+                job_doc = await self.archive.find_one({"_id": ObjectId(job_id)})
             if job_doc:
                 logging.debug("[MongoJobRepository.get_by_id] found job id=%s", job_id)
                 return Job(**job_doc)
@@ -36,33 +130,62 @@ class MongoJobRepository(JobRepository):
             logging.exception("[MongoJobRepository.get_by_id] error fetching job id=%s error=%s", job_id, e)
             return None
 
-    async def get_by_user_id(self, user_id: str, skip: int = 0, limit: int = 100) -> List[Job]:
-        cursor = self.collection.find({"user_id": user_id}).skip(skip).limit(limit).sort("created_at", -1)
-        jobs = []
-        async for job_doc in cursor:
-            jobs.append(Job(**job_doc))
-        return jobs
+    async def _find_documents(
+        self, query: dict, skip: int, limit: int, cursor: Optional[str], include_archived: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Keyset page when a cursor is given, otherwise legacy skip/limit in the same order.
+
+        With ``include_archived`` both tiers are read with the same filter and merged, so the
+        page (and its cursor) is identical to one over a single combined collection.
+        """
+        if not include_archived:
+            return await self._find_in(self.collection, query, skip, limit, cursor)
+        offset = 0 if cursor else skip
+        pages = [await self._find_in(tier, query, 0, offset + limit, cursor) for tier in (self.collection, self.archive)]
+        return merge_keyset_pages(*pages)[offset:offset + limit]
+
+    @staticmethod
+    async def _find_in(collection, query: dict, skip: int, limit: int, cursor: Optional[str]) -> List[Dict[str, Any]]:
+        find = collection.find(keyset_filter(query, cursor)).sort(KEYSET_SORT)
+        if not cursor and skip:
+            find = find.skip(skip)
+        return [doc async for doc in find.limit(limit)]
+
+    async def _find_page(
+        self, query: dict, skip: int, limit: int, cursor: Optional[str], include_archived: bool = False
+    ) -> List[Job]:
+        return [Job(**doc) for doc in await self._find_documents(query, skip, limit, cursor, include_archived)]
+
+    async def get_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[Job]:
+        return await self._find_page({"user_id": user_id}, skip, limit, cursor, include_archived)
+
+    async def get_documents_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, include_archived: bool = False
+    ) -> List[Dict[str, Any]]:
+        return await self._find_documents({"user_id": user_id}, skip, limit, cursor, include_archived)
+
+    async def get_summaries_by_user_id(
+        self, user_id: str, fields: Sequence[str], limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        # Projection keeps input/output payloads on the server; _id and created_at drive the cursor
+        projection = {field: 1 for field in fields}
+        projection["created_at"] = 1
+        find = self.collection.find(keyset_filter({"user_id": user_id}, cursor), projection).sort(KEYSET_SORT)
+        return [doc async for doc in find.limit(limit)]
 
     async def get_active_by_user_session(self, user_id: str, session_id: str) -> Optional[Job]:
         """Return the most recent active job (pending/processing) for a user and session."""
         try:
-            cursor = self.collection.find({
-                "user_id": user_id,
-                "session_id": session_id,
-                "status": {"$in": [JobStatus.PENDING, JobStatus.PROCESSING]}
-            }).sort("created_at", -1).limit(1)
-            async for job_doc in cursor:
-                return Job(**job_doc)
-            return None
+            # At most one match: the active_user_session_unique index guarantees it
+            job_doc = await self.collection.find_one(active_session_query(user_id, session_id))
+            return Job(**job_doc) if job_doc else None
         except Exception:
             return None
 
-    async def get_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100) -> List[Job]:
-        cursor = self.collection.find({"status": status}).skip(skip).limit(limit).sort("created_at", -1)
-        jobs = []
-        async for job_doc in cursor:
-            jobs.append(Job(**job_doc))
-        return jobs
+    async def get_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Job]:
+        return await self._find_page({"status": status}, skip, limit, cursor)
 
     async def update(self, job_id: str, job_data: JobUpdate) -> Optional[Job]:
         from bson import ObjectId
@@ -70,28 +193,37 @@ class MongoJobRepository(JobRepository):
             update_dict = {k: v for k, v in job_data.dict().items() if v is not None}
             update_dict["updated_at"] = datetime.now(timezone.utc)
             
-            result = await self.collection.update_one(
+            # The pre-image tells us the status this update replaced, atomically with the write
+            previous = await self.collection.find_one_and_update(
                 {"_id": ObjectId(job_id)},
-                {"$set": update_dict}
+                {"$set": update_dict},
+                projection={"user_id": 1, "status": 1},
+                return_document=ReturnDocument.BEFORE,
             )
-            
-            if result.modified_count:
-                return await self.get_by_id(job_id)
-            return None
+            if previous is None:
+                return None
+            if "status" in update_dict:
+                await self._record_transition(previous["user_id"], previous.get("status"), update_dict["status"])
+            return await self.get_by_id(job_id)
         except:
             return None
 
     async def delete(self, job_id: str) -> bool:
         from bson import ObjectId
         try:
-            result = await self.collection.delete_one({"_id": ObjectId(job_id)})
-            return result.deleted_count > 0
+            deleted = await self.collection.find_one_and_delete(
+                {"_id": ObjectId(job_id)}, projection={"user_id": 1, "status": 1, "output_ref": 1}
+            )
+            if deleted is None:
+                return False
+            if deleted.get("output_ref") and self.output_store is not None:
+                await self._delete_output(job_id, deleted["output_ref"])
+            if deleted.get("status") in [s.value for s in ACTIVE_JOB_STATUSES]:
+                # Only the active gauge goes down; daily counts record what happened
+                await self._record_transition(deleted["user_id"], deleted["status"], "deleted")
+            return True
         except:
             return False
 
-    async def list_jobs(self, skip: int = 0, limit: int = 100) -> List[Job]:
-        cursor = self.collection.find().skip(skip).limit(limit).sort("created_at", -1)
-        jobs = []
-        async for job_doc in cursor:
-            jobs.append(Job(**job_doc))
-        return jobs
+    async def list_jobs(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Job]:
+        return await self._find_page({}, skip, limit, cursor)
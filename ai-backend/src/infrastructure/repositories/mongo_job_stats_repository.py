@@ -0,0 +1,166 @@
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+
+from src.domain.entities import ACTIVE_JOB_STATUSES, TERMINAL_JOB_STATUSES
+from src.domain.repositories import JobStatsRepository
+from src.infrastructure.database.mongodb import MongoDB
+
+# Counter documents, keyed "<user id>|active" (gauge) and "<user id>|<YYYY-MM-DD>" (daily counts).
+# The worker writes the same shapes. There is no shared all-users document (every transition would
+# $inc it); the cross-user view sums the per-user documents at read time.
+COUNTERS_COLLECTION = "job_counters"
+# Owner of the all-users documents older releases kept; ignored on read, removed by ``rebuild``
+ALL_USERS = "*"
+ACTIVE_FIELDS = tuple(s.value for s in ACTIVE_JOB_STATUSES)
+DAILY_FIELDS = ("created",) + tuple(s.value for s in TERMINAL_JOB_STATUSES)
+
+
+def _status_value(status: Any) -> Optional[str]:
+    return getattr(status, "value", status)
+
+
+def _day_of(field: Any) -> Dict[str, Any]:
+    return {"$dateToString": {"format": "%Y-%m-%d", "date": field}}
+
+
+def counter_updates(
+    user_id: str, old_status: Optional[Any], new_status: Any, at: datetime
+) -> Dict[str, Dict[str, int]]:
+    """``$inc`` per counter document for one transition; empty when the status did not change"""
+    old, new = _status_value(old_status), _status_value(new_status)
+    if old == new:
+        return {}
+    active: Dict[str, int] = {}
+    daily: Dict[str, int] = {}
+    if old is None:
+        daily["created"] = 1
+    if old in ACTIVE_FIELDS:
+        active[old] = -1
+    if new in ACTIVE_FIELDS:
+        active[new] = 1
+    elif new in DAILY_FIELDS:
+        daily[new] = 1
+
+    updates: Dict[str, Dict[str, int]] = {}
+    if active:
+        updates[f"{user_id}|active"] = active
+    if daily:
+        updates[f"{user_id}|{at.strftime('%Y-%m-%d')}"] = daily
+    return updates
+
+
+def counter_requests(updates: Dict[str, Dict[str, int]], now: datetime) -> List[UpdateOne]:
+    requests = []
+    for key, inc in updates.items():
+        owner, _, bucket = key.rpartition("|")
+        requests.append(UpdateOne(
+            {"_id": key},
+            {
+                "$inc": inc,
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"user_id": owner, "day": None if bucket == "active" else bucket},
+            },
+            upsert=True,
+        ))
+    return requests
+
+
+class MongoJobStatsRepository(JobStatsRepository):
+    """Job counters in `job_counters`; a user's stats are two ``_id`` lookups regardless of job volume.
+
+    The all-users view sums every user's documents for the day (served by the ``day`` index), so its
+    cost grows with the number of users rather than jobs; it is an admin view, and keeping it off the
+    write path means no single document takes an ``$inc`` for every job in the system.
+
+    Each transition is a single unordered bulk of ``$inc`` upserts, so concurrent writers never
+    lose increments. Counters are not updated in the same transaction as the job itself, so a
+    crash between the two writes can leave them off by one; ``rebuild`` recomputes them.
+    """
+
+    def __init__(self, database: Optional[AsyncIOMotorDatabase] = None):
+        self.database = database if database is not None else MongoDB.get_database()
+        self.collection = self.database[COUNTERS_COLLECTION]
+
+    async def record_transition(
+        self, user_id: str, old_status: Optional[str], new_status: str, at: Optional[datetime] = None
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        updates = counter_updates(user_id, old_status, new_status, at or now)
+        if updates:
+            await self.collection.bulk_write(counter_requests(updates, now), ordered=False)
+
+    async def get_stats(self, user_id: Optional[str], day: date) -> Dict[str, int]:
+        stats = {field: 0 for field in ACTIVE_FIELDS + DAILY_FIELDS}
+        if user_id is None:
+            docs = self.collection.aggregate([
+                # day null is the active gauge
+                {"$match": {"day": {"$in": [None, day.isoformat()]}, "user_id": {"$ne": ALL_USERS}}},
+                {"$group": {"_id": "$day", **{field: {"$sum": f"${field}"} for field in ACTIVE_FIELDS + DAILY_FIELDS}}},
+                {"$set": {"day": "$_id"}},
+            ])
+        else:
+            docs = self.collection.find({"_id": {"$in": [f"{user_id}|active", f"{user_id}|{day.isoformat()}"]}})
+        async for doc in docs:
+            fields = ACTIVE_FIELDS if doc.get("day") is None else DAILY_FIELDS
+            for field in fields:
+                # Not clamped: a negative gauge is drift worth seeing (rebuild-job-stats repairs it)
+                stats[field] = doc.get(field, 0)
+        return stats
+
+    async def rebuild(self) -> int:
+        """Recompute every counter from `jobs` and `jobs_archive`; returns the documents written.
+
+        Increments that land while the rebuild runs may be overwritten; run it when traffic is low
+        (or run it twice).
+        """
+        started = datetime.now(timezone.utc)
+        counters: Dict[str, Dict[str, int]] = {}
+
+        def add(owner: str, bucket: str, field: str, count: int) -> None:
+            doc = counters.setdefault(f"{owner}|{bucket}", {})
+            doc[field] = doc.get(field, 0) + count
+
+        async for row in self._aggregate_both_tiers(
+            [{"$group": {"_id": {"user_id": "$user_id", "day": _day_of("$created_at")}, "n": {"$sum": 1}}}]
+        ):
+            add(row["_id"]["user_id"], row["_id"]["day"], "created", row["n"])
+        async for row in self._aggregate_both_tiers([
+            {"$match": {"status": {"$in": list(DAILY_FIELDS[1:])}}},
+            {"$group": {
+                "_id": {
+                    "user_id": "$user_id",
+                    "status": "$status",
+                    "day": _day_of({"$ifNull": ["$completed_at", "$updated_at"]}),
+                },
+                "n": {"$sum": 1},
+            }},
+        ]):
+            add(row["_id"]["user_id"], row["_id"]["day"], row["_id"]["status"], row["n"])
+        async for row in self.database.jobs.aggregate([
+            {"$match": {"status": {"$in": list(ACTIVE_FIELDS)}}},
+            {"$group": {"_id": {"user_id": "$user_id", "status": "$status"}, "n": {"$sum": 1}}},
+        ]):
+            add(row["_id"]["user_id"], "active", row["_id"]["status"], row["n"])
+
+        now = datetime.now(timezone.utc)
+        requests = []
+        for key, fields in counters.items():
+            owner, _, bucket = key.rpartition("|")
+            names = ACTIVE_FIELDS if bucket == "active" else DAILY_FIELDS
+            doc = {"user_id": owner, "day": None if bucket == "active" else bucket, "updated_at": now}
+            doc.update({name: fields.get(name, 0) for name in names})
+            requests.append(ReplaceOne({"_id": key}, doc, upsert=True))
+        for start in range(0, len(requests), 1000):
+            await self.collection.bulk_write(requests[start:start + 1000], ordered=False)
+        # Anything not rewritten (and not touched by a live transition since) has no jobs left;
+        # this also removes the ALL_USERS documents of older releases
+        removed = await self.collection.delete_many({"updated_at": {"$lt": started}})
+        logging.info("[MongoJobStatsRepository.rebuild] written=%s removed=%s", len(requests), removed.deleted_count)
+        return len(requests)
+
+    def _aggregate_both_tiers(self, pipeline: List[Dict[str, Any]]):
+        return self.database.jobs.aggregate([{"$unionWith": {"coll": "jobs_archive"}}] + pipeline)
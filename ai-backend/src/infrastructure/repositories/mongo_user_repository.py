@@ -1,9 +1,13 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime, timezone
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from src.domain.repositories import UserRepository
 from src.domain.entities import User, UserCreate, UserUpdate
 from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories.pagination import KEYSET_SORT, keyset_filter
 
 
 class MongoUserRepository(UserRepository):
@@ -22,6 +26,40 @@ class MongoUserRepository(UserRepository):
         
         return User(**user_dict)
 
+    async def provision(self, user_data: UserCreate) -> Tuple[User, bool]:
+        now = datetime.now(timezone.utc)
+        for _ in range(2):
+            # Only an insert keeps this call's _id, so it tells "created" apart from "found"
+            new_id = ObjectId()
+            try:
+                # Served by the clerk_id_unique and email_unique indexes
+                user_doc = await self.collection.find_one_and_update(
+                    {"$or": [{"clerk_id": user_data.clerk_id}, {"email": user_data.email}]},
+                    {
+                        "$set": {"clerk_id": user_data.clerk_id},
+                        "$setOnInsert": {
+                            "_id": new_id,
+                            "email": user_data.email,
+                            "name": user_data.name,
+                            "created_at": now,
+                            "updated_at": now,
+                            "is_active": True,
+                        },
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                break
+            except DuplicateKeyError:
+                # A concurrent request inserted the same user, or the clerk_id and email match two
+                # different users; in both cases the clerk_id match wins on the next read
+                user_doc = await self.collection.find_one({"clerk_id": user_data.clerk_id})
+                if user_doc:
+                    return User(**user_doc), False
+        else:
+            raise RuntimeError(f"Could not provision user clerk_id={user_data.clerk_id}")
+        return User(**user_doc), user_doc["_id"] == new_id
+
     async def get_by_id(self, user_id: str) -> Optional[User]:
         from bson import ObjectId
         try:
@@ -63,9 +101,11 @@ class MongoUserRepository(UserRepository):
         except:
             return False
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        cursor = self.collection.find().skip(skip).limit(limit)
+    async def list_users(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+        find = self.collection.find(keyset_filter({}, cursor)).sort(KEYSET_SORT)
+        if not cursor and skip:
+            find = find.skip(skip)
         users = []
-        async for user_doc in cursor:
+        async for user_doc in find.limit(limit):
             users.append(User(**user_doc))
         return users
@@ -0,0 +1,36 @@
+from typing import Any, Dict, List, Optional, Tuple
+from src.domain.repositories.pagination import decode_cursor
+
+
+# Newest first; _id breaks ties between documents created in the same millisecond.
+# Every listing index ends with these two keys in this direction.
+KEYSET_SORT: List[Tuple[str, int]] = [("created_at", -1), ("_id", -1)]
+
+
+def keyset_filter(base: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict ``base`` to documents strictly after the cursor position in KEYSET_SORT order.
+
+    Raises InvalidCursorError for malformed tokens.
+    """
+    if not cursor:
+        return base
+    created_at, object_id = decode_cursor(cursor)
+    return {
+        **base,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": object_id}},
+        ],
+    }
+
+
+def merge_keyset_pages(*pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge document pages that are each in KEYSET_SORT order into one ordered list.
+
+    Documents present in several pages (e.g. mid-archival) are kept once.
+    """
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for page in pages:
+        for doc in page:
+            merged.setdefault(doc["_id"], doc)
+    return sorted(merged.values(), key=lambda doc: (doc["created_at"], doc["_id"]), reverse=True)
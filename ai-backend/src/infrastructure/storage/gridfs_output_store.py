@@ -0,0 +1,47 @@
+from typing import Any, AsyncIterator, Dict, Optional
+import logging
+from bson import ObjectId
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket
+from src.domain.services.output_store import OutputStore, OutputNotFoundError, OUTPUT_CONTENT_TYPE
+from src.infrastructure.database.mongodb import MongoDB
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_BUCKET = "job_outputs"
+
+
+class GridFSOutputStore(OutputStore):
+    """Job outputs in the `job_outputs` GridFS bucket of the application database.
+
+    Reference shape (shared with the worker): {"store": "gridfs", "id": "<file id>", "size": n,
+    "content_type": "..."}.
+    """
+
+    def __init__(self, database: Optional[AsyncIOMotorDatabase] = None):
+        self.bucket = AsyncIOMotorGridFSBucket(database or MongoDB.get_database(), bucket_name=OUTPUT_BUCKET)
+
+    async def save(self, job_id: str, payload: bytes, content_type: str = OUTPUT_CONTENT_TYPE) -> Dict[str, Any]:
+        file_id = await self.bucket.upload_from_stream(
+            f"{job_id}.json", payload, metadata={"job_id": job_id, "content_type": content_type}
+        )
+        logger.debug("[GridFSOutputStore.save] job_id=%s file_id=%s size=%s", job_id, file_id, len(payload))
+        return {"store": "gridfs", "id": str(file_id), "size": len(payload), "content_type": content_type}
+
+    async def stream(self, output_ref: Dict[str, Any]) -> AsyncIterator[bytes]:
+        try:
+            grid_out = await self.bucket.open_download_stream(ObjectId(output_ref["id"]))
+        except NoFile as e:
+            raise OutputNotFoundError(f"Output not found: {output_ref.get('id')}") from e
+        while True:
+            chunk = await grid_out.readchunk()
+            if not chunk:
+                break
+            yield chunk
+
+    async def delete(self, output_ref: Dict[str, Any]) -> bool:
+        try:
+            await self.bucket.delete(ObjectId(output_ref["id"]))
+            return True
+        except NoFile:
+            return False
@@ -0,0 +1,158 @@
+"""
+Local File Storage - Artifacts on a local (or mounted) filesystem, served through signed download URLs
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import tempfile
+import time
+import uuid
+from typing import Optional
+from urllib.parse import urlencode
+
+from src.config.settings import settings
+from src.domain.services import ByteSource, StorageService, iter_chunks
+from src.infrastructure.cache.presigned_url_cache import PresignedUrlCache, presigned_url_cache
+
+logger = logging.getLogger(__name__)
+
+REF_PREFIX = "local://"
+
+
+class InvalidArtifactPathError(ValueError):
+    """Raised for artifact paths that are malformed or point outside the storage root."""
+    pass
+
+
+class LocalFileStorageService(StorageService):
+    """Artifacts under ``root`` in a two-level sharded tree (``ab/cd/<uuid>.<ext>``), so no single
+    directory grows past a few thousand entries.
+
+    Writes go to a temporary file in the target directory and are moved into place with
+    ``os.replace``, so readers only ever see complete files (also across processes sharing the
+    directory). File I/O runs in worker threads. Artifacts are recorded as ``local://<path>``
+    references and handed out as HMAC-signed, expiring URLs under ``base_url`` that the
+    ``/artifacts`` route verifies (see ``artifact_routes``).
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        base_url: Optional[str] = None,
+        signing_key: Optional[str] = None,
+        presigned_url_expires: Optional[int] = None,  # seconds
+        url_cache: Optional[PresignedUrlCache] = None,
+        chunk_size: int = 1024 * 1024,
+    ):
+        self.root = os.path.realpath(root or settings.local_storage_root)
+        self.base_url = (base_url if base_url is not None else settings.local_storage_base_url).rstrip("/")
+        self._signing_key = (signing_key or settings.local_storage_signing_key or settings.jwt_secret_key).encode()
+        self.presigned_url_expires = presigned_url_expires or settings.presigned_url_expires_seconds
+        self.url_cache = url_cache or presigned_url_cache
+        self.chunk_size = chunk_size
+
+    def _new_path(self, file_name: str) -> str:
+        file_id = uuid.uuid4().hex
+        file_extension = file_name.split('.')[-1] if '.' in file_name else ''
+        return f"{file_id[:2]}/{file_id[2:4]}/{file_id}.{file_extension}"
+
+    def resolve(self, path: str) -> str:
+        """Absolute file path for an artifact path; rejects anything escaping the root"""
+        full_path = os.path.realpath(os.path.join(self.root, path))
+        if not full_path.startswith(self.root + os.sep):
+            raise InvalidArtifactPathError(f"Invalid artifact path: {path}")
+        return full_path
+
+    def _path_from_url(self, artifact_url: str) -> Optional[str]:
+        return artifact_url[len(REF_PREFIX):] if artifact_url.startswith(REF_PREFIX) else None
+
+    async def upload_artifact(self, file_content: bytes, file_name: str, content_type: str) -> str:
+        """Write artifact atomically and return its local:// reference"""
+        path = self._new_path(file_name)
+        await asyncio.to_thread(self._write_atomic, self.resolve(path), [file_content])
+        logger.debug("[LocalFileStorageService.upload_artifact] path=%s size=%s", path, len(file_content))
+        return REF_PREFIX + path
+
+    async def upload_artifact_stream(self, source: ByteSource, file_name: str, content_type: str) -> str:
+        """Write artifact chunk by chunk (memory independent of size), then move it into place"""
+        path = self._new_path(file_name)
+        full_path = self.resolve(path)
+        handle, temp_path = await asyncio.to_thread(self._open_temp, full_path)
+        size = 0
+        try:
+            async for chunk in iter_chunks(source, self.chunk_size):
+                await asyncio.to_thread(handle.write, chunk)
+                size += len(chunk)
+            await asyncio.to_thread(self._commit, handle, temp_path, full_path)
+        except BaseException:
+            await asyncio.to_thread(self._discard, handle, temp_path)
+            raise
+        logger.debug("[LocalFileStorageService.upload_artifact_stream] path=%s size=%s", path, size)
+        return REF_PREFIX + path
+
+    def _open_temp(self, full_path: str):
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        return os.fdopen(fd, "wb"), temp_path
+
+    def _commit(self, handle, temp_path: str, full_path: str) -> None:
+        handle.flush()
+        os.fsync(handle.fileno())
+        handle.close()
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, full_path)
+
+    def _discard(self, handle, temp_path: str) -> None:
+        handle.close()
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+
+    def _write_atomic(self, full_path: str, chunks) -> None:
+        handle, temp_path = self._open_temp(full_path)
+        try:
+            for chunk in chunks:
+                handle.write(chunk)
+            self._commit(handle, temp_path, full_path)
+        except BaseException:
+            self._discard(handle, temp_path)
+            raise
+
+    async def delete_artifact(self, artifact_url: str) -> bool:
+        """Delete artifact file"""
+        path = self._path_from_url(artifact_url)
+        if path is None:
+            return False
+        try:
+            await asyncio.to_thread(os.unlink, self.resolve(path))
+            return True
+        except (OSError, InvalidArtifactPathError):
+            return False
+
+    async def generate_presigned_url(self, artifact_url: str, method: str = "GET", expires_in: Optional[int] = None) -> str:
+        """Signed download URL for a local:// reference; other URLs are returned unchanged"""
+        path = self._path_from_url(artifact_url)
+        if path is None:
+            return artifact_url
+        if method != "GET":
+            raise ValueError(f"Unsupported presign method for local storage: {method}")
+        expires_in = expires_in or self.presigned_url_expires
+        cache_key = (self.root, path, method, expires_in)
+        url = self.url_cache.get(cache_key)
+        if url is None:
+            expires = int(time.time()) + expires_in
+            query = urlencode({"expires": expires, "signature": self.sign(path, expires)})
+            url = f"{self.base_url}/artifacts/{path}?{query}"
+            self.url_cache.put(cache_key, url, expires_in)
+        return url
+
+    def sign(self, path: str, expires: int) -> str:
+        return hmac.new(self._signing_key, f"GET\n{path}\n{expires}".encode(), hashlib.sha256).hexdigest()
+
+    def verify(self, path: str, expires: int, signature: str) -> bool:
+        """True if ``signature`` was issued for ``path`` and has not expired"""
+        return expires >= time.time() and hmac.compare_digest(self.sign(path, expires), signature)
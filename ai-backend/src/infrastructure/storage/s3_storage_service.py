@@ -1,92 +1,462 @@
-import boto3
+import asyncio
+import hashlib
+import logging
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
 from botocore.exceptions import ClientError
-from typing import Optional
-from src.domain.services import StorageService
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+from src.config.settings import settings
+from src.domain.repositories import ArtifactRefRepository
+from src.domain.services import ByteSource, StorageService, iter_chunks
+from src.infrastructure.cache.presigned_url_cache import PresignedUrlCache, presigned_url_cache
 import uuid
 import os
 
+logger = logging.getLogger(__name__)
+
+_MIB = 1024 * 1024
+_MIN_PART_SIZE = 5 * _MIB  # S3 rejects smaller parts (except the last one)
+_PRESIGN_METHODS = {"GET": "get_object", "PUT": "put_object"}
+_CONTENT_KEY_PREFIX = "artifacts/sha256/"
+# Hash payloads above this size off the event loop (hashlib releases the GIL)
+_HASH_IN_THREAD_BYTES = 1 * _MIB
+
 
 class S3StorageService(StorageService):
+    """S3 (or S3-compatible, e.g. MinIO) artifact storage on an asyncio-native client.
+
+    Requests go through aiobotocore's aiohttp connection pool (``max_pool_connections`` sockets),
+    so uploads never block the event loop and run concurrently with other coroutines. The client
+    is created on first use and bound to the running event loop; a new loop (e.g. a Celery task
+    using ``asyncio.run``) gets a new client. Bucket existence is checked once per process on
+    first write, not in the constructor.
+
+    Artifacts are recorded as ``s3://<bucket>/<key>`` references; clients get time-limited
+    presigned URLs for them (``generate_presigned_url``), so the bucket can stay private and
+    artifact bytes never pass through the API. Signatures are cached in ``url_cache``.
+
+    With ``content_addressed`` set, objects are keyed by the SHA-256 of their bytes, so identical
+    outputs are stored once: an upload whose content already exists is skipped after a HEAD.
+    ``artifact_refs`` counts the jobs referring to each such object and ``delete_artifact``
+    removes it only when the last reference goes. An upload racing with the last delete of the
+    same content can still lose the object; both are rare enough to accept here.
+    """
+
+    # (endpoint, bucket) pairs already verified in this process
+    _checked_buckets: Set[Tuple[Optional[str], str]] = set()
+
     def __init__(
         self,
         bucket_name: str,
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None,
         region_name: str = "us-east-1",
-        endpoint_url: Optional[str] = None  # For MinIO or other S3-compatible services
+        endpoint_url: Optional[str] = None,  # For MinIO or other S3-compatible services
+        max_pool_connections: int = 50,
+        multipart_part_size: Optional[int] = None,  # bytes
+        multipart_concurrency: Optional[int] = None,
+        presigned_url_expires: Optional[int] = None,  # seconds
+        url_cache: Optional[PresignedUrlCache] = None,
+        content_addressed: Optional[bool] = None,
+        artifact_refs: Optional[ArtifactRefRepository] = None,
     ):
         self.bucket_name = bucket_name
-        
-        # Initialize S3 client
-        self.s3_client = boto3.client(
-            's3',
+        self.content_addressed = settings.s3_content_addressed_keys if content_addressed is None else content_addressed
+        if self.content_addressed and artifact_refs is None:
+            raise ValueError("content_addressed storage needs an artifact_refs repository")
+        self.artifact_refs = artifact_refs
+        self.multipart_part_size = max(
+            _MIN_PART_SIZE, multipart_part_size or settings.s3_multipart_part_size_mb * _MIB
+        )
+        self.multipart_concurrency = max(1, multipart_concurrency or settings.s3_multipart_concurrency)
+        self.presigned_url_expires = presigned_url_expires or settings.presigned_url_expires_seconds
+        self.url_cache = url_cache or presigned_url_cache
+        self.region_name = region_name
+        self.endpoint_url = endpoint_url.rstrip("/") if endpoint_url else None
+        self._client_kwargs = dict(
             aws_access_key_id=aws_access_key_id or os.getenv('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=aws_secret_access_key or os.getenv('AWS_SECRET_ACCESS_KEY'),
             region_name=region_name,
-            endpoint_url=endpoint_url
+            endpoint_url=endpoint_url,
+            config=AioConfig(max_pool_connections=max_pool_connections, retries={"max_attempts": 3, "mode": "standard"}),
         )
-        
-        # Create bucket if it doesn't exist
-        self._ensure_bucket_exists()
+        self._session = get_session()
+        self._client: Any = None
+        self._client_context: Any = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client_lock: Optional[asyncio.Lock] = None
 
-    def _ensure_bucket_exists(self):
-        """Create bucket if it doesn't exist"""
+    async def _get_client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop is loop:
+            return self._client
+        if self._client_lock is None or self._client_loop is not loop:
+            self._client_lock = asyncio.Lock()
+            # A client from another (finished) loop cannot be reused or cleanly closed from here
+            self._client = self._client_context = None
+            self._client_loop = loop
+        async with self._client_lock:
+            if self._client is None:
+                self._client_context = self._session.create_client('s3', **self._client_kwargs)
+                self._client = await self._client_context.__aenter__()
+        return self._client
+
+    async def _ensure_bucket_exists(self, client: Any) -> None:
+        """Create the bucket on first use if it doesn't exist (result cached per process)"""
+        key = (self.endpoint_url, self.bucket_name)
+        if key in self._checked_buckets:
+            return
         try:
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
+            await client.head_bucket(Bucket=self.bucket_name)
         except ClientError as e:
-            error_code = int(e.response['Error']['Code'])
-            if error_code == 404:
-                try:
-                    self.s3_client.create_bucket(Bucket=self.bucket_name)
-                except ClientError:
-                    pass  # Bucket might have been created by another process
+            if e.response['Error']['Code'] not in ('404', 'NoSuchBucket', 'NotFound'):
+                raise
+            create_args = {"Bucket": self.bucket_name}
+            if self.region_name != "us-east-1":
+                create_args["CreateBucketConfiguration"] = {"LocationConstraint": self.region_name}
+            try:
+                await client.create_bucket(**create_args)
+                logger.info("[S3StorageService] created bucket=%s", self.bucket_name)
+            except ClientError as create_error:
+                # Bucket might have been created by another process
+                if create_error.response['Error']['Code'] not in ('BucketAlreadyOwnedByYou', 'BucketAlreadyExists'):
+                    raise
+        self._checked_buckets.add(key)
+
+    def _new_key(self, file_name: str) -> str:
+        file_extension = file_name.split('.')[-1] if '.' in file_name else ''
+        return f"artifacts/{uuid.uuid4()}.{file_extension}"
+
+    def _object_url(self, key: str) -> str:
+        return f"s3://{self.bucket_name}/{key}"
+
+    def _key_from_url(self, artifact_url: str) -> Optional[str]:
+        """Object key of an artifact reference issued by this bucket (also the older https URLs), else None"""
+        prefixes = [f"s3://{self.bucket_name}/", f"https://{self.bucket_name}.s3.amazonaws.com/"]
+        if self.endpoint_url:
+            prefixes.append(f"{self.endpoint_url}/{self.bucket_name}/")
+        for prefix in prefixes:
+            if artifact_url.startswith(prefix):
+                return artifact_url[len(prefix):].split("?", 1)[0]
+        return None
 
     async def upload_artifact(self, file_content: bytes, file_name: str, content_type: str) -> str:
-        """Upload artifact to S3 and return URL"""
+        """Upload artifact to S3 and return its s3:// reference"""
         try:
-            # Generate unique key
-            file_extension = file_name.split('.')[-1] if '.' in file_name else ''
-            unique_key = f"artifacts/{uuid.uuid4()}.{file_extension}"
-            
-            # Upload file
-            self.s3_client.put_object(
+            client = await self._get_client()
+            await self._ensure_bucket_exists(client)
+
+            if self.content_addressed:
+                return await self._put_shared(client, file_content, file_name, content_type, await _sha256(file_content))
+
+            unique_key = self._new_key(file_name)
+
+            await client.put_object(
                 Bucket=self.bucket_name,
                 Key=unique_key,
                 Body=file_content,
                 ContentType=content_type
             )
-            
-            # Generate URL
-            url = f"https://{self.bucket_name}.s3.amazonaws.com/{unique_key}"
-            return url
-            
+            logger.debug("[S3StorageService.upload_artifact] key=%s size=%s", unique_key, len(file_content))
+            return self._object_url(unique_key)
+
         except ClientError as e:
             raise Exception(f"Failed to upload artifact: {str(e)}")
 
+    async def upload_artifact_stream(self, source: ByteSource, file_name: str, content_type: str) -> str:
+        """Stream an artifact to S3 as a multipart upload and return its s3:// reference.
+
+        Parts of ``multipart_part_size`` bytes are filled from a pool of ``multipart_concurrency + 1``
+        buffers and uploaded concurrently; reading pauses while every buffer is in flight, so memory
+        stays at roughly ``(concurrency + 1) * part_size`` whatever the artifact size. A source that
+        fits in one part is sent with a plain PUT. On any failure the upload is aborted so no parts
+        are left billed.
+
+        With content-addressed keys the hash is only known at the end, so a multipart upload goes
+        to a staging key and is then copied server-side to its content key (or dropped if that
+        content is already stored).
+        """
+        try:
+            client = await self._get_client()
+            await self._ensure_bucket_exists(client)
+            parts = _PartReader(
+                iter_chunks(source), self.multipart_part_size, self.multipart_concurrency + 1,
+                hasher=hashlib.sha256() if self.content_addressed else None,
+            )
+
+            buffer = await parts.next()
+            if parts.eof:
+                if self.content_addressed:
+                    return await self._put_shared(client, bytes(buffer), file_name, content_type, parts.hexdigest())
+                key = self._new_key(file_name)
+                await client.put_object(Bucket=self.bucket_name, Key=key, Body=bytes(buffer), ContentType=content_type)
+                logger.debug("[S3StorageService.upload_artifact_stream] key=%s size=%s parts=0", key, len(buffer))
+                return self._object_url(key)
+
+            key = f"artifacts/staging/{uuid.uuid4()}" if self.content_addressed else self._new_key(file_name)
+            part_count = await self._multipart_upload(client, key, content_type, buffer, parts)
+            logger.debug(
+                "[S3StorageService.upload_artifact_stream] key=%s size=%s parts=%s", key, parts.total, part_count
+            )
+            if self.content_addressed:
+                return await self._promote_staged(client, key, file_name, content_type, parts.hexdigest())
+            return self._object_url(key)
+
+        except ClientError as e:
+            raise Exception(f"Failed to upload artifact: {str(e)}")
+
+    async def _multipart_upload(
+        self, client: Any, key: str, content_type: str, buffer: bytearray, parts: "_PartReader"
+    ) -> int:
+        upload = await client.create_multipart_upload(Bucket=self.bucket_name, Key=key, ContentType=content_type)
+        upload_id = upload["UploadId"]
+        etags: Dict[int, str] = {}
+        tasks: Set[asyncio.Task] = set()
+        try:
+            part_number = 0
+            while True:
+                part_number += 1
+                tasks.add(asyncio.create_task(
+                    self._upload_part(client, key, upload_id, part_number, buffer, parts, etags)
+                ))
+                for task in [t for t in tasks if t.done()]:
+                    tasks.discard(task)
+                    task.result()  # surface a failed part before reading further
+                if parts.eof:
+                    break
+                buffer = await parts.next()
+            await asyncio.gather(*tasks)
+            await client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": [{"PartNumber": n, "ETag": etags[n]} for n in sorted(etags)]},
+            )
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+            except ClientError as abort_error:
+                logger.warning("[S3StorageService._multipart_upload] abort failed key=%s error=%s", key, abort_error)
+            raise
+        return part_number
+
+    def _content_key(self, digest: str, file_name: str) -> str:
+        file_extension = file_name.split('.')[-1] if '.' in file_name else ''
+        return f"{_CONTENT_KEY_PREFIX}{digest}.{file_extension}"
+
+    def _ref_id(self, key: str) -> str:
+        return f"{self.bucket_name}/{key}"
+
+    async def _exists(self, client: Any, key: str) -> bool:
+        try:
+            await client.head_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    async def _acquire_shared(self, client: Any, key: str, store) -> None:
+        """Take a reference on a content-addressed key, calling ``store()`` if the object isn't there yet"""
+        ref_id = self._ref_id(key)
+        references = await self.artifact_refs.acquire(ref_id)
+        try:
+            deduplicated = await self._exists(client, key)
+            if not deduplicated:
+                await store()
+        except BaseException:
+            await self.artifact_refs.release(ref_id)
+            raise
+        logger.debug(
+            "[S3StorageService] content key=%s references=%s deduplicated=%s", key, references, deduplicated
+        )
+
+    async def _put_shared(self, client: Any, body: bytes, file_name: str, content_type: str, digest: str) -> str:
+        key = self._content_key(digest, file_name)
+
+        async def store() -> None:
+            await client.put_object(Bucket=self.bucket_name, Key=key, Body=body, ContentType=content_type)
+
+        await self._acquire_shared(client, key, store)
+        return self._object_url(key)
+
+    async def _promote_staged(self, client: Any, staging_key: str, file_name: str, content_type: str, digest: str) -> str:
+        """Move a staged multipart upload to its content key (server-side copy; nothing is re-sent).
+
+        A single CopyObject handles objects up to 5 GB.
+        """
+        key = self._content_key(digest, file_name)
+
+        async def store() -> None:
+            await client.copy_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                CopySource={"Bucket": self.bucket_name, "Key": staging_key},
+                ContentType=content_type,
+                MetadataDirective="REPLACE",
+            )
+
+        try:
+            await self._acquire_shared(client, key, store)
+        finally:
+            await client.delete_object(Bucket=self.bucket_name, Key=staging_key)
+        return self._object_url(key)
+
+    async def _upload_part(
+        self, client: Any, key: str, upload_id: str, part_number: int,
+        buffer: bytearray, parts: "_PartReader", etags: Dict[int, str],
+    ) -> None:
+        try:
+            response = await client.upload_part(
+                Bucket=self.bucket_name, Key=key, UploadId=upload_id, PartNumber=part_number, Body=buffer
+            )
+            etags[part_number] = response["ETag"]
+        finally:
+            parts.release(buffer)
+
+    async def generate_presigned_url(self, artifact_url: str, method: str = "GET", expires_in: Optional[int] = None) -> str:
+        """Presigned GET/PUT URL for an artifact of this bucket; other URLs are returned unchanged.
+
+        Signing is local (no request to S3). A URL signed earlier for the same object, method and
+        lifetime is reused from ``url_cache`` while it still has a usable part of its lifetime left.
+        """
+        key = self._key_from_url(artifact_url)
+        if key is None:
+            return artifact_url
+        expires_in = expires_in or self.presigned_url_expires
+        cache_key = (self.endpoint_url, self.bucket_name, key, method, expires_in)
+        url = self.url_cache.get(cache_key)
+        if url is None:
+            url = await self._sign(method, {"Bucket": self.bucket_name, "Key": key}, expires_in)
+            self.url_cache.put(cache_key, url, expires_in)
+        return url
+
+    async def generate_upload_url(
+        self, file_name: str, content_type: str, expires_in: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """New artifact reference plus a presigned PUT for it (the client must send ``content_type``)"""
+        key = self._new_key(file_name)
+        client = await self._get_client()
+        await self._ensure_bucket_exists(client)
+        url = await self._sign(
+            "PUT",
+            {"Bucket": self.bucket_name, "Key": key, "ContentType": content_type},
+            expires_in or self.presigned_url_expires,
+        )
+        return self._object_url(key), url
+
+    async def _sign(self, method: str, params: Dict[str, Any], expires_in: int) -> str:
+        if method not in _PRESIGN_METHODS:
+            raise ValueError(f"Unsupported presign method: {method}")
+        client = await self._get_client()
+        return await client.generate_presigned_url(_PRESIGN_METHODS[method], Params=params, ExpiresIn=expires_in)
+
     async def delete_artifact(self, artifact_url: str) -> bool:
         """Delete artifact from S3"""
+        key = self._key_from_url(artifact_url)
+        if key is None:
+            return False
+        if key.startswith(_CONTENT_KEY_PREFIX) and self.artifact_refs is not None:
+            remaining = await self.artifact_refs.release(self._ref_id(key))
+            if remaining > 0:
+                logger.debug("[S3StorageService.delete_artifact] key=%s still referenced=%s", key, remaining)
+                return True
         try:
-            # Extract key from URL
-            key = artifact_url.split(f"{self.bucket_name}.s3.amazonaws.com/")[-1]
-            
-            self.s3_client.delete_object(
+            client = await self._get_client()
+            await client.delete_object(
                 Bucket=self.bucket_name,
                 Key=key
             )
             return True
-            
+
         except ClientError:
             return False
 
+    async def close(self) -> None:
+        """Close the pooled client (call from the loop that used it)"""
+        if self._client_context is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client_context.__aexit__(None, None, None)
+        self._client = self._client_context = None
+
+
+async def _sha256(payload: bytes) -> str:
+    if len(payload) > _HASH_IN_THREAD_BYTES:
+        return await asyncio.to_thread(lambda: hashlib.sha256(payload).hexdigest())
+    return hashlib.sha256(payload).hexdigest()
+
+
+class _PartReader:
+    """Cuts a chunk stream into ``part_size`` parts, filling buffers taken from a fixed pool.
+
+    ``next`` waits for a free buffer, so the caller can never hold more than ``pool_size`` parts;
+    uploaders hand buffers back with ``release``.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], part_size: int, pool_size: int, hasher: Any = None):
+        self._chunks = chunks
+        self._hasher = hasher
+        self._part_size = part_size
+        self._pool: "asyncio.Queue[bytearray]" = asyncio.Queue()
+        for _ in range(pool_size):
+            self._pool.put_nowait(bytearray())
+        self._pending = memoryview(b"")
+        self.eof = False
+        self.total = 0
+
+    async def _read(self) -> bool:
+        """Load the next chunk into ``_pending``; False at end of stream"""
+        if self.eof:
+            return False
+        try:
+            self._pending = memoryview(await self._chunks.__anext__())
+        except StopAsyncIteration:
+            self.eof = True
+            return False
+        return True
+
+    async def next(self) -> bytearray:
+        """The next part; ``eof`` is set once it is the last one (shorter, or empty for an empty stream)"""
+        buffer = await self._pool.get()
+        del buffer[:]
+        while len(buffer) < self._part_size:
+            if not self._pending and not await self._read():
+                break
+            take = self._part_size - len(buffer)
+            buffer += self._pending[:take]
+            self._pending = self._pending[take:]
+        if not self._pending:
+            # Peek so a stream ending exactly on a part boundary is flagged now, not one empty part later
+            await self._read()
+        self.total += len(buffer)
+        if self._hasher is not None:
+            # Before the buffer is handed out, so it cannot change while being hashed
+            await asyncio.to_thread(self._hasher.update, buffer)
+        return buffer
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+    def release(self, buffer: bytearray) -> None:
+        self._pool.put_nowait(buffer)
+
 
 class FakeStorageService(StorageService):
     """Fake storage service for development"""
-    
+
     async def upload_artifact(self, file_content: bytes, file_name: str, content_type: str) -> str:
         """Simulate artifact upload"""
         file_id = str(uuid.uuid4())
         return f"https://fake-storage.com/artifacts/{file_id}/{file_name}"
-    
+
+    async def upload_artifact_stream(self, source: ByteSource, file_name: str, content_type: str) -> str:
+        """Simulate a streaming upload (drains the source without keeping it)"""
+        async for _ in iter_chunks(source):
+            pass
+        return await self.upload_artifact(b"", file_name, content_type)
+
     async def delete_artifact(self, artifact_url: str) -> bool:
         """Simulate artifact deletion"""
         return True
@@ -0,0 +1,47 @@
+"""
+Storage Factory - The process-wide artifact StorageService built from settings
+"""
+from typing import Optional
+
+from src.config.settings import settings
+from src.domain.services import StorageService
+from src.infrastructure.repositories import MongoArtifactRefRepository
+from src.infrastructure.storage.local_file_storage_service import LocalFileStorageService
+
+_storage_service: Optional[StorageService] = None
+
+
+def get_storage_service() -> StorageService:
+    """Shared storage backend selected by ``STORAGE_BACKEND`` (one client and connection pool per process)"""
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = _create_storage_service(settings.storage_backend)
+    return _storage_service
+
+
+def _create_storage_service(backend: str) -> StorageService:
+    if backend == "local":
+        return LocalFileStorageService()
+    # Imported here so processes that never touch S3 don't load the client
+    from src.infrastructure.storage.s3_storage_service import FakeStorageService, S3StorageService
+
+    if backend == "fake":
+        return FakeStorageService()
+    if backend != "s3":
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+    return S3StorageService(
+        settings.s3_bucket_name,
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        region_name=settings.s3_region,
+        endpoint_url=settings.s3_endpoint_url,
+        max_pool_connections=settings.s3_max_pool_connections,
+        artifact_refs=MongoArtifactRefRepository() if settings.s3_content_addressed_keys else None,
+    )
+
+
+async def close_storage_service() -> None:
+    global _storage_service
+    if _storage_service is not None:
+        await _storage_service.close()
+        _storage_service = None
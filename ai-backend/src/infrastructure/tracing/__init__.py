@@ -0,0 +1,10 @@
+from .exporters import FileSpanExporter, InMemorySpanExporter, TRACE_EXPORTERS, configure_tracing, format_trace, read_spans
+
+__all__ = [
+    "FileSpanExporter",
+    "InMemorySpanExporter",
+    "TRACE_EXPORTERS",
+    "configure_tracing",
+    "format_trace",
+    "read_spans",
+]
@@ -0,0 +1,150 @@
+"""
+Span Exporters - In-memory and JSON-lines file exporters, and the TRACE_EXPORTER setup
+"""
+import atexit
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from src.config.settings import settings
+from src.domain.services.tracing import Span, SpanExporter, set_span_exporter
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORTERS = ("none", "memory", "file")
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the last ``max_spans`` finished spans (tests, benchmarks, a REPL)"""
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=max(1, max_spans))
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span.to_dict())
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [s for s in list(self._spans) if trace_id is None or s["trace_id"] == trace_id]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one JSON object per span to ``path``; a background thread does the writing.
+
+    API and worker processes can share a file (each line is written with a single ``write``
+    on an append-mode file), so one job's spans from every process end up side by side.
+    Spans beyond ``max_queued`` waiting to be written are dropped rather than blocking.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, max_queued: int = 10000):
+        self.path = path
+        self.max_queued = max_queued
+        self.dropped = 0
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="span_file_exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        if self._queue.qsize() >= self.max_queued:
+            self.dropped += 1
+            return
+        self._queue.put(span.to_dict())
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            lines = [json.dumps(item, default=str)]
+            # Drain whatever else is waiting into the same write
+            while not self._queue.empty():
+                item = self._queue.get()
+                if item is self._STOP:
+                    self._write(lines)
+                    return
+                lines.append(json.dumps(item, default=str))
+            self._write(lines)
+
+    def _write(self, lines: List[str]) -> None:
+        try:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+        except OSError as e:
+            logger.warning("[FileSpanExporter] write failed path=%s error=%s", self.path, e)
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=5)
+        self._file.close()
+
+
+def configure_tracing(exporter: Optional[str] = None) -> Optional[SpanExporter]:
+    """Install the exporter named by ``TRACE_EXPORTER`` (none | memory | file) for this process.
+
+    Call it in each process after fork (the file exporter's writer thread does not survive one).
+    """
+    name = (exporter or settings.trace_exporter).lower()
+    if name not in TRACE_EXPORTERS:
+        raise ValueError(f"Unsupported trace exporter: {name}")
+    if name == "memory":
+        span_exporter: Optional[SpanExporter] = InMemorySpanExporter(settings.trace_memory_max_spans)
+    elif name == "file":
+        span_exporter = FileSpanExporter(settings.trace_file_path)
+        atexit.register(span_exporter.close)
+    else:
+        span_exporter = None
+    previous = set_span_exporter(span_exporter)
+    if previous is not None:
+        previous.close()
+    logger.debug("[configure_tracing] exporter=%s", name)
+    return span_exporter
+
+
+def read_spans(path: str) -> List[Dict[str, Any]]:
+    """Spans written by FileSpanExporter (a partially written last line is skipped)"""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def format_trace(spans: Iterable[Dict[str, Any]]) -> str:
+    """Indented tree of one trace's spans with offsets from the first span, for reading a critical path"""
+    spans = sorted(spans, key=lambda s: s["start"])
+    if not spans:
+        return ""
+    origin = spans[0]["start"]
+    ids = {s["span_id"] for s in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        children.setdefault(parent, []).append(span)
+
+    lines: List[str] = []
+
+    def walk(parent: Optional[str], depth: int) -> None:
+        for span in children.get(parent, []):
+            duration = (span["end"] - span["start"]) * 1000.0
+            attributes = " ".join(f"{k}={v}" for k, v in span["attributes"].items())
+            error = f" error={span['error']}" if span.get("error") else ""
+            lines.append(
+                f"{(span['start'] - origin) * 1000.0:9.1f}ms {duration:9.1f}ms  {'  ' * depth}{span['name']} {attributes}{error}".rstrip()
+            )
+            walk(span["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
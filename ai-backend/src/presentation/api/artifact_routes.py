@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+import anyio
+import logging
+import mimetypes
+import os
+import time
+from src.domain.services import StorageService
+from src.infrastructure.storage.local_file_storage_service import InvalidArtifactPathError, LocalFileStorageService
+from src.infrastructure.storage.storage_factory import get_storage_service
+from src.presentation.api.file_response import RangeFileResponse
+
+router = APIRouter(prefix="/artifacts", tags=["artifacts"])
+
+logger = logging.getLogger(__name__)
+
+
+def get_local_storage(storage: StorageService = Depends(get_storage_service)) -> LocalFileStorageService:
+    """Only the local backend serves artifacts itself; S3 URLs point at the bucket"""
+    if not isinstance(storage, LocalFileStorageService):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return storage
+
+
+@router.api_route("/{path:path}", methods=["GET", "HEAD"])
+async def download_artifact(
+    path: str,
+    expires: int,
+    signature: str,
+    request: Request,
+    storage: LocalFileStorageService = Depends(get_local_storage),
+):
+    """Download an artifact through a signed URL from job responses.
+
+    Supports single `Range` requests (206), so downloads can resume and media can seek.
+    """
+    if not storage.verify(path, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired signature")
+    try:
+        full_path = storage.resolve(path)
+        stat_result = await anyio.to_thread.run_sync(os.stat, full_path)
+    except (InvalidArtifactPathError, FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    logger.debug("[artifact_routes.download_artifact] path=%s range=%s", path, request.headers.get("range"))
+    return RangeFileResponse(
+        full_path,
+        stat_result,
+        mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+        range_header=request.headers.get("range"),
+        # Cacheable by the client for as long as the signature is valid
+        headers={"cache-control": f"private, max-age={max(0, expires - int(time.time()))}"},
+    )
@@ -0,0 +1,109 @@
+"""
+File responses with HTTP Range support.
+
+Starlette's FileResponse (0.27) ignores Range headers, so resumable and seeking clients would
+download whole artifacts. RangeFileResponse serves a single byte range (206) or the whole file
+(200), and hands the file to the server when it supports the ASGI zero-copy extension (sendfile);
+otherwise the file is memory-mapped and sent in slices copied straight from the page cache.
+"""
+import mmap
+import os
+from email.utils import formatdate
+from typing import Mapping, Optional, Tuple
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Raised when a Range header asks for bytes beyond the end of the file."""
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """``(start, end)`` (end exclusive) for a single-range ``bytes=`` header, None to send the whole file.
+
+    Malformed headers and multi-range requests are ignored, as RFC 9110 allows.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiableError(header)
+            return max(0, size - suffix), size
+        start = int(first)
+        end = int(last) + 1 if last else size
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    if end <= start:
+        return None
+    return start, min(end, size)
+
+
+class RangeFileResponse(Response):
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        media_type: str,
+        range_header: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.path = path
+        self.background = None
+        self.media_type = media_type
+        size = stat_result.st_size
+        self.status_code = 200
+        self.start, self.end = 0, size
+        extra = {
+            "accept-ranges": "bytes",
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "etag": f'"{stat_result.st_mtime_ns:x}-{size:x}"',
+        }
+        try:
+            selected = parse_range(range_header, size)
+        except RangeNotSatisfiableError:
+            self.status_code = 416
+            self.start = self.end = 0
+            extra["content-range"] = f"bytes */{size}"
+        else:
+            if selected is not None:
+                self.status_code = 206
+                self.start, self.end = selected
+                extra["content-range"] = f"bytes {self.start}-{self.end - 1}/{size}"
+        self.init_headers({**extra, **(headers or {}), "content-length": str(self.end - self.start)})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        count = self.end - self.start
+        if scope["method"] == "HEAD" or count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        handle = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({"type": ZEROCOPY_EXTENSION, "file": handle, "offset": self.start, "count": count, "more_body": False})
+                return
+            mapped = await anyio.to_thread.run_sync(lambda: mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+            try:
+                position = self.start
+                while position < self.end:
+                    stop = min(position + self.chunk_size, self.end)
+                    # Slicing faults pages in, so it runs off the event loop
+                    body = await anyio.to_thread.run_sync(mapped.__getitem__, slice(position, stop))
+                    position = stop
+                    await send({"type": "http.response.body", "body": body, "more_body": position < self.end})
+            finally:
+                mapped.close()
+        finally:
+            await anyio.to_thread.run_sync(handle.close)
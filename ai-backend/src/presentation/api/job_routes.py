@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import date
 from dataclasses import dataclass
-from src.application.use_cases.job_use_cases import JobUseCases, EnqueueJobError, ActiveJobExistsError
-from src.application.dto import JobCreateRequest, JobResponse
-from src.infrastructure.repositories import MongoJobRepository
-from src.infrastructure.external.fake_ai_service import FakeAIService
-from src.infrastructure.queue.celery_queue_service import CeleryQueueService
+from src.application.use_cases.job_use_cases import JobUseCases, EnqueueJobError, ActiveJobExistsError, InvalidJobFieldsError
+from src.application.dto import JobCreateRequest, JobResponse, JobSummary, JobStatsResponse
+from src.domain.repositories import InvalidCursorError, next_cursor
+from src.domain.services import OutputNotFoundError
+from src.domain.services.tracing import current_span, start_span
+from src.presentation.api.serialization import dumps_job_documents
+from src.container import get_container
 from src.config.auth import get_current_user, security
+from src.config.settings import settings
 import logging
 
 router = APIRouter(prefix="/jobs", tags=["jobs"]) 
@@ -14,11 +19,9 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 logger = logging.getLogger(__name__)
 
 
-def get_job_use_cases() -> JobUseCases:
-    job_repository = MongoJobRepository()
-    queue_service = CeleryQueueService()
-    ai_service = FakeAIService()
-    return JobUseCases(job_repository, queue_service, ai_service)
+async def get_job_use_cases() -> JobUseCases:
+    """Shared use cases from the process container (no per-request construction)"""
+    return get_container().job_use_cases
 
 
 @dataclass
@@ -50,20 +53,30 @@ async def get_owned_job(
 
     return job
 
-@router.post("/", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
+async def trace_job_create():
+    """Root span of a job's trace; listed first in ``dependencies`` so auth is timed inside it"""
+    with start_span("POST /jobs") as span:
+        yield span
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(trace_job_create)])
 async def create_job(
     job_request: JobCreateRequest,
     ctx: JobContext = Depends(get_job_context),
 ):
     """Create and enqueue a new AI job"""
-    logger.debug(
-        "[job_routes.create_job] user_id=%s job_type=%s payload_keys=%s",
-        ctx.user_id,
-        getattr(job_request, "job_type", None),
-        list(getattr(job_request, "input_data", {}).keys()) if getattr(job_request, "input_data", None) else [],
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[job_routes.create_job] user_id=%s job_type=%s payload_keys=%s",
+            ctx.user_id,
+            getattr(job_request, "job_type", None),
+            list(getattr(job_request, "input_data", {}).keys()) if getattr(job_request, "input_data", None) else [],
+        )
     try:
         resp = await ctx.use_cases.create_job(ctx.user_id, job_request)
+        span = current_span()
+        if span is not None:
+            span.set_attribute("job_id", resp.id)
         logger.debug("[job_routes.create_job] created job_id=%s status=%s", resp.id, resp.status)
         return resp
     except ActiveJobExistsError as e:
@@ -85,17 +98,83 @@ async def create_job(
 
 @router.get("/", response_model=List[JobResponse])
 async def get_user_jobs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
     ctx: JobContext = Depends(get_job_context),
 ):
-    """Get current user's jobs"""
-    logger.debug("[job_routes.get_user_jobs] user_id=%s skip=%s limit=%s", ctx.user_id, skip, limit)
-    jobs = await ctx.use_cases.get_user_jobs(ctx.user_id, skip, limit)
+    """Get current user's jobs, newest first.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the next page;
+    cursor pages cost the same regardless of depth (`skip` is ignored when a cursor is given).
+    Jobs finished more than `JOB_ARCHIVE_AFTER_DAYS` ago are archived and only listed with
+    `include_archived=true` (keep passing it with the cursor).
+    """
+    logger.debug(
+        "[job_routes.get_user_jobs] user_id=%s skip=%s limit=%s cursor=%s include_archived=%s",
+        ctx.user_id, skip, limit, cursor, include_archived,
+    )
+    try:
+        if settings.fast_json_responses:
+            # Trusted documents -> bytes; bypasses response_model validation entirely
+            docs = await ctx.use_cases.get_user_job_documents(ctx.user_id, skip, limit, cursor, include_archived)
+            token = next_cursor(docs, limit)
+            headers = {"X-Next-Cursor": token} if token else None
+            logger.debug("[job_routes.get_user_jobs] found=%s fast_path=True", len(docs))
+            return Response(content=dumps_job_documents(docs), media_type="application/json", headers=headers)
+        jobs = await ctx.use_cases.get_user_jobs(ctx.user_id, skip, limit, cursor, include_archived)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    token = next_cursor(jobs, limit)
+    if token:
+        response.headers["X-Next-Cursor"] = token
     logger.debug("[job_routes.get_user_jobs] found=%s", len(jobs))
     return jobs
 
 
+@router.get("/summaries", response_model=List[JobSummary], response_model_exclude_unset=True)
+async def get_user_job_summaries(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    ctx: JobContext = Depends(get_job_context),
+):
+    """Get lightweight summaries of the current user's jobs, newest first.
+
+    `fields` is an optional comma-separated selection (e.g. `status,job_type`); `id` and
+    `created_at` are always included. Fetch full details per job via `GET /jobs/{job_id}`.
+    """
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        summaries = await ctx.use_cases.get_user_job_summaries(ctx.user_id, limit, cursor, selected)
+    except (InvalidCursorError, InvalidJobFieldsError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    token = next_cursor(summaries, limit)
+    if token:
+        response.headers["X-Next-Cursor"] = token
+    return summaries
+
+
+@router.get("/stats", response_model=JobStatsResponse)
+async def get_job_stats(
+    day: Optional[date] = None,
+    all_users: bool = False,
+    ctx: JobContext = Depends(get_job_context),
+):
+    """Job counters: pending/processing now, and created/completed/failed on `day` (UTC, default today).
+
+    Served from materialized counters, so the cost does not grow with job history. `all_users=true`
+    returns totals across users and is limited to `ADMIN_USER_IDS`.
+    """
+    if all_users and ctx.user_id not in {u.strip() for u in settings.admin_user_ids.split(",") if u.strip()}:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    logger.debug("[job_routes.get_job_stats] user_id=%s day=%s all_users=%s", ctx.user_id, day, all_users)
+    return await ctx.use_cases.get_job_stats(None if all_users else ctx.user_id, day)
+
+
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job: JobResponse = Depends(get_owned_job),
@@ -105,4 +184,22 @@ async def get_job(
     return job
 
 
- 
+@router.get("/{job_id}/output")
+async def get_job_output(
+    job: JobResponse = Depends(get_owned_job),
+    ctx: JobContext = Depends(get_job_context),
+):
+    """Stream the job's full output.
+
+    Large outputs are stored out of line and `GET /jobs/{job_id}` only carries a preview
+    (with `output_ref` set); this endpoint returns the complete payload either way.
+    """
+    # Checked here regardless of get_owned_job: the full output is the most sensitive part of a job
+    if job.user_id != ctx.user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    logger.debug("[job_routes.get_job_output] job_id=%s offloaded=%s", job.id, job.output_ref is not None)
+    try:
+        content_type, chunks = await ctx.use_cases.open_job_output(job)
+    except OutputNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return StreamingResponse(chunks, media_type=content_type)
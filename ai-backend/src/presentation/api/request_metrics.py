@@ -0,0 +1,166 @@
+"""
+Request Metrics - Pure ASGI middleware recording per-route latency, in-flight requests and errors
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.settings import settings
+from src.infrastructure.metrics import LatencyHistogram, MetricFamily, Sample, histogram_samples
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _RouteStats:
+    __slots__ = ("latency", "statuses", "errors")
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        # "2xx" -> count
+        self.statuses: Dict[str, int] = {}
+        self.errors = 0
+
+
+class RequestMetrics:
+    """Per ``(method, route template)`` latency histograms and status counts.
+
+    Routes are keyed by their template (``/api/v1/jobs/{job_id}``), never the raw path, so
+    the number of series stays bounded; requests that match no route share ``<unmatched>``.
+    Mutated only from the event loop thread, so recording takes no locks.
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self._templates: Dict[Callable[..., Any], str] = {}
+        self.in_flight = 0
+        self.in_flight_max = 0
+        self.slow = 0
+
+    def route_template(self, scope: Scope) -> str:
+        """Template of the route that handled ``scope`` (the router leaves its endpoint there)"""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        template = self._templates.get(endpoint)
+        if template is None:
+            app = scope.get("app")
+            for route in getattr(app, "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
+                    break
+            else:
+                template = UNMATCHED_ROUTE
+            self._templates[endpoint] = template
+        return template
+
+    def record(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        key = (method, route)
+        stats = self._routes.get(key)
+        if stats is None:
+            stats = self._routes[key] = _RouteStats()
+        stats.latency.observe(seconds)
+        status_class = f"{status_code // 100}xx"
+        stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+        if status_code >= 500:
+            stats.errors += 1
+
+    def collect(self) -> List[MetricFamily]:
+        """Prometheus families for ``/metrics`` (read at scrape time; recording is unaffected)"""
+        requests, durations = [], []
+        for (method, route), stats in self._routes.items():
+            labels = {"method": method, "route": route}
+            requests.extend(Sample("", {**labels, "status": status}, count) for status, count in stats.statuses.items())
+            durations.extend(histogram_samples(labels, stats.latency))
+        return [
+            MetricFamily("http_requests_total", "counter", "HTTP requests by route and status class", requests),
+            MetricFamily("http_request_duration_seconds", "histogram", "HTTP request latency by route", durations),
+            MetricFamily("http_requests_in_flight", "gauge", "HTTP requests being served", [Sample("", {}, self.in_flight)]),
+            MetricFamily("http_slow_requests_total", "counter", "Requests over REQUEST_SLOW_THRESHOLD_MS", [Sample("", {}, self.slow)]),
+        ]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "in_flight_max": self.in_flight_max,
+            "slow": self.slow,
+            "routes": {
+                f"{method} {route}": {
+                    "count": stats.latency.count,
+                    "errors": stats.errors,
+                    "statuses": dict(stats.statuses),
+                    "avg_ms": round(stats.latency.total / stats.latency.count * 1000.0, 3),
+                    "p50_ms": round(stats.latency.quantile(0.5) * 1000.0, 3),
+                    "p95_ms": round(stats.latency.quantile(0.95) * 1000.0, 3),
+                    "p99_ms": round(stats.latency.quantile(0.99) * 1000.0, 3),
+                    "max_ms": round(stats.latency.max * 1000.0, 3),
+                }
+                for (method, route), stats in sorted(self._routes.items(), key=lambda item: (item[0][1], item[0][0]))
+            },
+        }
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """Times every HTTP request into ``RequestMetrics``.
+
+    Written against raw ASGI rather than ``@app.middleware("http")``: it only wraps ``send`` to
+    read the status code, so there is no extra task, body stream or Request/Response object per
+    request. Nothing is logged for normal requests; 5xx responses and requests slower than
+    ``REQUEST_SLOW_THRESHOLD_MS`` are. Unhandled exceptions are only counted here: the app's
+    exception handler, outside this middleware, logs their traceback. WebSocket and lifespan scopes pass
+    straight through. Latency runs until the app returns, i.e. the response has been sent.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Optional[RequestMetrics] = None, slow_threshold_ms: Optional[float] = None):
+        self.app = app
+        self.metrics = metrics or request_metrics
+        threshold = settings.request_slow_threshold_ms if slow_threshold_ms is None else slow_threshold_ms
+        self.slow_threshold = threshold / 1000.0 if threshold > 0 else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status_code = 500
+        failed = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        if metrics.in_flight > metrics.in_flight_max:
+            metrics.in_flight_max = metrics.in_flight
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            # Logged once, by main.global_exception_handler
+            status_code, failed = 500, True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_flight -= 1
+            route = metrics.route_template(scope)
+            metrics.record(scope["method"], route, status_code, elapsed)
+            if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+                metrics.slow += 1
+                logger.warning(
+                    "[RequestMetrics] slow request method=%s route=%s status=%s duration_ms=%.1f",
+                    scope["method"], route, status_code, elapsed * 1000.0,
+                )
+            elif status_code >= 500 and not failed:
+                logger.warning(
+                    "[RequestMetrics] server error method=%s route=%s status=%s duration_ms=%.1f",
+                    scope["method"], route, status_code, elapsed * 1000.0,
+                )
@@ -0,0 +1,35 @@
+"""
+Fast JSON rendering for trusted job documents.
+
+Documents read from our own `jobs` collection already satisfy the JobResponse schema, so the
+hot listing path skips building Job/JobResponse models and FastAPI's response_model validation,
+and encodes the documents directly with orjson (ObjectId and datetime handled natively).
+"""
+from typing import Any, Dict, Iterable, List
+import orjson
+from bson import ObjectId
+from src.application.dto import JobResponse
+
+
+# JobResponse field order, minus "id" which is mapped from "_id"
+_JOB_DOCUMENT_FIELDS = tuple(name for name in JobResponse.model_fields if name != "id")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def job_document_to_response(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a stored job document onto the JobResponse shape without validation."""
+    response = {"id": str(doc["_id"])}
+    for name in _JOB_DOCUMENT_FIELDS:
+        response[name] = doc.get(name)
+    return response
+
+
+def dumps_job_documents(docs: Iterable[Dict[str, Any]]) -> bytes:
+    """Encode stored job documents as a JSON array of JobResponse objects."""
+    payload: List[Dict[str, Any]] = [job_document_to_response(doc) for doc in docs]
+    return orjson.dumps(payload, default=_default)
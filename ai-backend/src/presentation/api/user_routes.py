@@ -1,19 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Security, status, Response
-from typing import List
+from typing import List, Optional
 from fastapi.security import HTTPAuthorizationCredentials
 import logging
 from src.application.use_cases import UserUseCases
 from src.application.dto import UserResponse, UserCreateRequest, UserUpdateRequest
-from src.infrastructure.repositories import MongoUserRepository
+from src.domain.repositories import InvalidCursorError, next_cursor
+from src.container import get_container
 from src.config.auth import get_current_user, security
 
 router = APIRouter(prefix="/users", tags=["users"]) 
 logger = logging.getLogger(__name__)
 
 
-def get_user_use_cases() -> UserUseCases:
-    user_repository = MongoUserRepository()
-    return UserUseCases(user_repository)
+async def get_user_use_cases() -> UserUseCases:
+    """Shared use cases from the process container (no per-request construction)"""
+    return get_container().user_use_cases
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -41,38 +42,12 @@ async def create_user(
         name=user_request.name,
     )
 
-    # Idempotent behavior: if the user already exists, return it with 200 OK
-    existing = await use_cases.get_user_by_clerk_id(derived_request.clerk_id)
-    if existing:
-        logger.info("User already exists | clerk_id=%s", derived_request.clerk_id)
-        response.status_code = status.HTTP_200_OK
-        return existing
-
-    # Check if a user with the same email exists (handles case where user was removed from Clerk but exists in DB)
-    existing_by_email = await use_cases.get_user_by_email(derived_request.email)
-    if existing_by_email:
-        logger.info("User with email exists, updating clerk_id | email=%s | old_clerk_id=%s | new_clerk_id=%s", 
-                   derived_request.email, existing_by_email.clerk_id, derived_request.clerk_id)
-        # Update the existing user's clerk_id
-        update_request = UserUpdateRequest(clerk_id=derived_request.clerk_id)
-        updated_user = await use_cases.update_user(existing_by_email.id, update_request)
-        if updated_user:
-            response.status_code = status.HTTP_200_OK
-            return updated_user
-        else:
-            logger.error("Failed to update clerk_id for existing user | email=%s", derived_request.email)
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-                              detail="Failed to update user clerk_id")
-
-    try:
-        created = await use_cases.create_user(derived_request)
-        logger.info("User created successfully | clerk_id=%s", created.clerk_id)
-        response.status_code = status.HTTP_201_CREATED
-        return created
-    except ValueError as e:
-        msg = str(e)
-        logger.warning("User creation failed: %s", msg)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=msg)
+    # Idempotent: one atomic upsert returns the existing user (200), re-links a user with the same
+    # email to this clerk_id (200; handles a user removed from Clerk but still in the DB), or creates it (201)
+    user, created = await use_cases.provision_user(derived_request)
+    logger.info("User provisioned | clerk_id=%s | created=%s", user.clerk_id, created)
+    response.status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+    return user
 
 
 @router.get("/me", response_model=UserResponse)
@@ -116,10 +91,19 @@ async def update_user(
 
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
     use_cases: UserUseCases = Depends(get_user_use_cases)
 ):
-    """List users"""
-    return await use_cases.list_users(skip, limit)
+    """List users, newest first. Use the `X-Next-Cursor` header as `cursor` for the next page."""
+    try:
+        users = await use_cases.list_users(skip, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    token = next_cursor(users, limit)
+    if token:
+        response.headers["X-Next-Cursor"] = token
+    return users
@@ -3,10 +3,15 @@ from fastapi import WebSocket
 import json
 import asyncio
 
+from src.infrastructure.metrics import MetricFamily, Sample
+
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Metrics (mutated only from the event loop thread)
+        self.messages_sent = 0
+        self.send_failures = 0
 
     async def connect(self, websocket: WebSocket, user_id: str):
         """Connect a WebSocket for a user"""
@@ -32,7 +37,9 @@ class ConnectionManager:
             for connection in self.active_connections[user_id]:
                 try:
                     await connection.send_text(message_str)
+                    self.messages_sent += 1
                 except:
+                    self.send_failures += 1
                     disconnected.append(connection)
             
             # Remove disconnected connections
@@ -48,7 +55,9 @@ class ConnectionManager:
             for connection in connections:
                 try:
                     await connection.send_text(message_str)
+                    self.messages_sent += 1
                 except:
+                    self.send_failures += 1
                     disconnected.append(connection)
             
             # Remove disconnected connections
@@ -63,5 +72,14 @@ class ConnectionManager:
         """Get total number of active connections"""
         return sum(len(connections) for connections in self.active_connections.values())
 
+    def collect(self) -> List[MetricFamily]:
+        """Prometheus families for ``/metrics``"""
+        return [
+            MetricFamily("websocket_connections", "gauge", "Open WebSocket connections", [Sample("", {}, self.get_total_connections())]),
+            MetricFamily("websocket_users", "gauge", "Users with at least one open WebSocket", [Sample("", {}, len(self.active_connections))]),
+            MetricFamily("websocket_messages_sent_total", "counter", "Messages written to WebSockets", [Sample("", {}, self.messages_sent)]),
+            MetricFamily("websocket_send_failures_total", "counter", "WebSocket writes that failed (connection dropped)", [Sample("", {}, self.send_failures)]),
+        ]
+
 
 manager = ConnectionManager()
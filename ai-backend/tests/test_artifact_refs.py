@@ -0,0 +1,49 @@
+"""Artifact reference counts against a real MongoDB.
+
+Needs TEST_MONGODB_URL (e.g. mongodb://localhost:27017); a throwaway database is used.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories import MongoArtifactRefRepository
+
+TEST_MONGODB_URL = os.getenv("TEST_MONGODB_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_MONGODB_URL, reason="TEST_MONGODB_URL not set")
+
+
+def _run(scenario):
+    async def wrapper():
+        name = f"test_artifact_refs_{uuid.uuid4().hex[:8]}"
+        await MongoDB.connect_to_mongo(TEST_MONGODB_URL, name)
+        try:
+            return await scenario(MongoArtifactRefRepository(MongoDB.get_database()))
+        finally:
+            await MongoDB.client.drop_database(name)
+            await MongoDB.close_mongo_connection()
+
+    return asyncio.run(wrapper())
+
+
+def test_concurrent_references_are_all_counted():
+    async def scenario(refs):
+        counts = await asyncio.gather(*(refs.acquire("bucket/a") for _ in range(20)))
+        remaining = [await refs.release("bucket/a") for _ in range(20)]
+        return counts, remaining, await refs.collection.count_documents({})
+
+    counts, remaining, docs = _run(scenario)
+
+    assert sorted(counts) == list(range(1, 21))
+    assert remaining == list(range(19, -1, -1))
+    assert docs == 0
+
+
+def test_releasing_an_unknown_artifact_reports_no_references():
+    async def scenario(refs):
+        return await refs.release("bucket/missing")
+
+    assert _run(scenario) == 0
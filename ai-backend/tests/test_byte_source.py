@@ -0,0 +1,55 @@
+import asyncio
+import io
+
+from src.domain.services import StorageService, iter_chunks
+
+
+class RecordingStorage(StorageService):
+    def __init__(self):
+        self.uploaded = None
+
+    async def upload_artifact(self, file_content, file_name, content_type):
+        self.uploaded = file_content
+        return f"mem://{file_name}"
+
+    async def delete_artifact(self, artifact_url):
+        return True
+
+
+async def _collect(source, chunk_size=4):
+    return [chunk async for chunk in iter_chunks(source, chunk_size)]
+
+
+def test_iter_chunks_reads_sync_file_objects_in_chunk_size_pieces():
+    chunks = asyncio.run(_collect(io.BytesIO(b"0123456789")))
+
+    assert chunks == [b"0123", b"4567", b"89"]
+
+
+def test_iter_chunks_passes_async_iterables_through_and_skips_empty_chunks():
+    async def source():
+        yield b"abc"
+        yield b""
+        yield b"defgh"
+
+    assert asyncio.run(_collect(source())) == [b"abc", b"defgh"]
+
+
+def test_iter_chunks_awaits_async_file_reads():
+    class AsyncFile:
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        async def read(self, size):
+            return self._data.read(size)
+
+    assert asyncio.run(_collect(AsyncFile(b"abcdef"))) == [b"abcd", b"ef"]
+
+
+def test_default_stream_upload_buffers_into_upload_artifact():
+    storage = RecordingStorage()
+
+    url = asyncio.run(storage.upload_artifact_stream(io.BytesIO(b"payload"), "a.bin", "application/octet-stream"))
+
+    assert url == "mem://a.bin"
+    assert storage.uploaded == b"payload"
@@ -0,0 +1,169 @@
+"""Change-stream notification backend.
+
+The end-to-end tests need a replica set (change streams are unavailable on a standalone server):
+
+    docker run -d -p 27018:27017 mongo:7.0 --replSet rs0
+    docker exec <container> mongosh --eval 'rs.initiate()'
+    TEST_MONGODB_REPLSET_URL="mongodb://localhost:27018/?directConnection=true" pytest tests/test_change_stream_subscriber.py
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.events.mongo_change_stream_subscriber import MongoChangeStreamSubscriber
+from src.infrastructure.events.notification_dispatcher import NotificationDispatcher
+
+TEST_MONGODB_REPLSET_URL = os.getenv("TEST_MONGODB_REPLSET_URL")
+requires_replset = pytest.mark.skipif(not TEST_MONGODB_REPLSET_URL, reason="TEST_MONGODB_REPLSET_URL not set")
+
+
+def _subscriber(delivered, database=None):
+    async def fake_notify(user_id, job_id, status, message=None, session_id=None):
+        delivered.append((user_id, job_id, status, message, session_id))
+
+    return MongoChangeStreamSubscriber(
+        dispatcher=NotificationDispatcher(notify=fake_notify, workers=2, queue_size=100),
+        database=database,
+        resume_key="test",
+        token_save_interval=0,
+    )
+
+
+def test_change_is_mapped_to_dispatcher_event():
+    subscriber = _subscriber([])
+    job_id = ObjectId()
+    change = {
+        "documentKey": {"_id": job_id},
+        "wallTime": datetime(2024, 6, 1),
+        "updateDescription": {"updatedFields": {"status": "failed", "error_message": "boom"}},
+        "fullDocument": {"user_id": "u1", "session_id": "s1"},
+    }
+
+    event = subscriber._to_event(change)
+
+    assert event == {
+        "user_id": "u1",
+        "job_id": str(job_id),
+        "status": "failed",
+        "session_id": "s1",
+        "message": "boom",
+        "published_at": 1717200000.0,
+    }
+    assert subscriber._to_event({**change, "fullDocument": None}) is None
+    assert subscriber.get_metrics()["invalid"] == 1
+
+
+class FakeTokens:
+    """The resume-token collection: filters on _id, owner, $or of owner/lease_until; upserts collide on _id"""
+
+    def __init__(self):
+        self.docs = {}
+
+    def _matches(self, doc, query):
+        for key, value in query.items():
+            if key == "$or":
+                if not any(self._matches(doc, clause) for clause in value):
+                    return False
+            elif isinstance(value, dict):
+                if doc.get(key) is None or not doc[key] < value["$lt"]:
+                    return False
+            elif doc.get(key) != value:
+                return False
+        return True
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is not None and self._matches(doc, query):
+            doc.update(update["$set"])
+            return type("Result", (), {"matched_count": 1})()
+        if doc is not None and upsert:
+            raise DuplicateKeyError("E11000")
+        if upsert:
+            self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+        return type("Result", (), {"matched_count": 0})()
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+
+def test_processes_on_one_host_claim_separate_resume_slots(monkeypatch):
+    from src.infrastructure.events import mongo_change_stream_subscriber as module
+
+    monkeypatch.setattr(module.socket, "gethostname", lambda: "api")
+    monkeypatch.setattr(module.settings, "change_stream_resume_key", None)
+    tokens = FakeTokens()
+    database = {module.RESUME_TOKENS_COLLECTION: tokens}
+
+    async def scenario():
+        first, second = MongoChangeStreamSubscriber(database=database), MongoChangeStreamSubscriber(database=database)
+        keys = [await first._claim_resume_slot(), await second._claim_resume_slot()]
+        first.resume_key, second.resume_key = keys
+        first._resume_token, first._token_dirty = {"_data": "1"}, True
+        await first._save_token(force=True)
+        await first._release_resume_slot()
+        # A restarted process takes the released slot and resumes from its token
+        restarted = MongoChangeStreamSubscriber(database=database)
+        restarted.resume_key = await restarted._claim_resume_slot()
+        return keys, restarted.resume_key, await restarted._load_token()
+
+    keys, reclaimed, token = asyncio.run(scenario())
+
+    assert keys == ["api#0", "api#1"]
+    assert reclaimed == "api#0"
+    assert token == {"_data": "1"}
+
+
+def _run(scenario):
+    async def wrapper():
+        name = f"test_change_stream_{uuid.uuid4().hex[:8]}"
+        await MongoDB.connect_to_mongo(TEST_MONGODB_REPLSET_URL, name)
+        try:
+            return await scenario(MongoDB.get_database())
+        finally:
+            await MongoDB.client.drop_database(name)
+            await MongoDB.close_mongo_connection()
+
+    return asyncio.run(wrapper())
+
+
+async def _wait_for(delivered, count, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while len(delivered) < count and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.05)
+
+
+@requires_replset
+def test_status_updates_are_delivered_and_resumed_after_restart():
+    delivered = []
+
+    async def scenario(db):
+        job_id = (await db.jobs.insert_one({"user_id": "u1", "session_id": "s1", "status": "pending"})).inserted_id
+
+        subscriber = _subscriber(delivered, db)
+        await subscriber.start()
+        await subscriber.wait_ready(10)
+        await db.jobs.update_one({"_id": job_id}, {"$set": {"status": "processing"}})
+        await db.jobs.update_one({"_id": job_id}, {"$set": {"updated_at": datetime.utcnow()}})  # not a status change
+        await _wait_for(delivered, 1)
+        await subscriber.stop()
+
+        # Written while no subscriber runs; picked up from the saved resume token
+        await db.jobs.update_one({"_id": job_id}, {"$set": {"status": "failed", "error_message": "boom"}})
+        restarted = _subscriber(delivered, db)
+        await restarted.start()
+        await _wait_for(delivered, 2)
+        await restarted.stop()
+        return str(job_id)
+
+    job_id = _run(scenario)
+
+    assert delivered == [
+        ("u1", job_id, "processing", None, "s1"),
+        ("u1", job_id, "failed", "boom", "s1"),
+    ]
@@ -0,0 +1,43 @@
+import asyncio
+
+from src.container import Container, get_container, set_container
+from src.presentation.api.job_routes import get_job_use_cases
+from src.presentation.api.user_routes import get_user_use_cases
+
+
+def _container():
+    return Container(
+        job_repository=object(),
+        job_stats=object(),
+        user_repository=object(),
+        queue_service=object(),
+        ai_service=object(),
+        output_store=object(),
+        storage_service=object(),
+    )
+
+
+def test_route_dependencies_share_the_container_instances():
+    container = _container()
+    set_container(container)
+    try:
+        first = asyncio.run(get_job_use_cases())
+        second = asyncio.run(get_job_use_cases())
+        users = asyncio.run(get_user_use_cases())
+    finally:
+        set_container(None)
+
+    assert first is second is container.job_use_cases
+    assert users is container.user_use_cases
+    assert first.job_repository is container.job_repository
+    assert first.storage_service is container.storage_service
+
+
+def test_set_container_replaces_the_process_container():
+    original, replacement = _container(), _container()
+    set_container(original)
+    try:
+        set_container(replacement)
+        assert get_container() is replacement
+    finally:
+        set_container(None)
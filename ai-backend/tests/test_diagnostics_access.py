@@ -0,0 +1,38 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.config.auth import require_diagnostics_access
+from src.config.settings import settings
+
+
+def _client(client_host):
+    app = FastAPI()
+
+    @app.get("/stats", dependencies=[Depends(require_diagnostics_access)])
+    async def stats():
+        return {"ok": True}
+
+    async def from_host(scope, receive, send):
+        # The test client always reports itself as "testclient"
+        await app({**scope, "client": (client_host, 50000)}, receive, send)
+
+    return TestClient(from_host)
+
+
+def test_diagnostics_are_served_to_allowed_addresses(monkeypatch):
+    monkeypatch.setattr(settings, "diagnostics_allowed_ips", "127.0.0.1, 10.0.0.0/8")
+    monkeypatch.setattr(settings, "diagnostics_token", None)
+
+    assert _client("127.0.0.1").get("/stats").status_code == 200
+    assert _client("10.1.2.3").get("/stats").status_code == 200
+    assert _client("203.0.113.7").get("/stats").status_code == 403
+
+
+def test_diagnostics_token_admits_other_addresses(monkeypatch):
+    monkeypatch.setattr(settings, "diagnostics_allowed_ips", "")
+    monkeypatch.setattr(settings, "diagnostics_token", "s3cret")
+    client = _client("203.0.113.7")
+
+    assert client.get("/stats", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+    assert client.get("/stats", headers={"Authorization": "Bearer wrong"}).status_code == 403
+    assert client.get("/stats").status_code == 403
@@ -0,0 +1,190 @@
+"""Verifies every repository query shape is served by an index (needs a real MongoDB).
+
+Set TEST_MONGODB_URL (e.g. mongodb://localhost:27017) to run; a throwaway database is used.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from src.domain.repositories.pagination import encode_cursor
+from src.infrastructure.database.indexes import ensure_indexes
+from src.infrastructure.repositories.mongo_job_repository import active_session_query
+from src.infrastructure.repositories.pagination import KEYSET_SORT, keyset_filter
+
+TEST_MONGODB_URL = os.getenv("TEST_MONGODB_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_MONGODB_URL, reason="TEST_MONGODB_URL not set")
+
+CURSOR = encode_cursor(datetime(2024, 1, 1, tzinfo=timezone.utc), ObjectId())
+
+# (collection, filter, sort) for every query the repositories issue
+QUERY_SHAPES = {
+    "jobs.get_by_id": ("jobs", {"_id": ObjectId()}, None),
+    "jobs.get_by_user_id": ("jobs", keyset_filter({"user_id": "u1"}, None), KEYSET_SORT),
+    "jobs.get_by_user_id.cursor": ("jobs", keyset_filter({"user_id": "u1"}, CURSOR), KEYSET_SORT),
+    "jobs.get_by_status": ("jobs", keyset_filter({"status": "pending"}, None), KEYSET_SORT),
+    "jobs.get_by_status.cursor": ("jobs", keyset_filter({"status": "pending"}, CURSOR), KEYSET_SORT),
+    "jobs.list_jobs": ("jobs", keyset_filter({}, None), KEYSET_SORT),
+    "jobs.list_jobs.cursor": ("jobs", keyset_filter({}, CURSOR), KEYSET_SORT),
+    "jobs.get_active_by_user_session": ("jobs", active_session_query("u1", "s1"), None),
+    "jobs_archive.get_by_user_id": ("jobs_archive", keyset_filter({"user_id": "u1"}, None), KEYSET_SORT),
+    "jobs_archive.get_by_user_id.cursor": ("jobs_archive", keyset_filter({"user_id": "u1"}, CURSOR), KEYSET_SORT),
+    "jobs.archive_candidates": (
+        "jobs", {"status": {"$in": ["completed", "failed"]}, "created_at": {"$lt": datetime(2024, 1, 1)}}, None,
+    ),
+    "users.get_by_clerk_id": ("users", {"clerk_id": "c1"}, None),
+    "users.get_by_email": ("users", {"email": "a@b.c"}, None),
+    "users.list_users": ("users", keyset_filter({}, None), KEYSET_SORT),
+    "users.list_users.cursor": ("users", keyset_filter({}, CURSOR), KEYSET_SORT),
+}
+
+
+def _stages(plan):
+    """Yield every stage name in a (possibly nested) winning plan."""
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan"):
+        yield from _stages(plan.get(key))
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+@pytest.fixture(scope="module")
+def database():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import MongoClient
+
+    name = f"test_indexes_{uuid.uuid4().hex[:8]}"
+
+    async def create():
+        client = AsyncIOMotorClient(TEST_MONGODB_URL)
+        try:
+            await ensure_indexes(client[name])
+        finally:
+            client.close()
+
+    asyncio.run(create())
+    sync_client = MongoClient(TEST_MONGODB_URL)
+    db = sync_client[name]
+    # A few documents so the planner has real statistics
+    db.jobs.insert_many([
+        {"user_id": f"u{i % 5}", "session_id": f"s{i % 3}", "status": "completed",
+         "created_at": datetime(2024, 1, 1 + i % 28, tzinfo=timezone.utc)}
+        for i in range(50)
+    ])
+    yield db
+    sync_client.drop_database(name)
+    sync_client.close()
+
+
+@pytest.mark.parametrize("shape", sorted(QUERY_SHAPES))
+def test_query_uses_index(database, shape):
+    collection_name, query, sort = QUERY_SHAPES[shape]
+    find = database[collection_name].find(query)
+    if sort:
+        find = find.sort(sort)
+    plan = find.limit(10).explain()["queryPlanner"]["winningPlan"]
+    stages = set(_stages(plan))
+
+    assert "COLLSCAN" not in stages, f"{shape} scans the collection: {plan}"
+    assert stages & {"IXSCAN", "IDHACK", "EXPRESS_IXSCAN", "EXPRESS_IDHACK"}, f"{shape} uses no index: {plan}"
+    assert "SORT" not in stages, f"{shape} sorts in memory: {plan}"
+
+
+def test_ensure_indexes_is_idempotent(database):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    async def run_twice():
+        client = AsyncIOMotorClient(TEST_MONGODB_URL)
+        try:
+            return await ensure_indexes(client[database.name])
+        finally:
+            client.close()
+
+    ensured = asyncio.run(run_twice())
+    assert "active_user_session_unique" in ensured["jobs"]
+
+
+def test_second_active_job_in_session_is_rejected(database):
+    from pymongo.errors import DuplicateKeyError
+
+    job = {"user_id": "race", "session_id": "s1", "status": "pending", "created_at": datetime.now(timezone.utc)}
+    database.jobs.insert_one(dict(job))
+    with pytest.raises(DuplicateKeyError):
+        database.jobs.insert_one(dict(job, status="processing"))
+    # Terminal jobs and jobs without a session are not constrained
+    database.jobs.insert_one(dict(job, status="completed"))
+    database.jobs.insert_one(dict(job, session_id=None))
+    database.jobs.insert_one(dict(job, session_id=None))
+
+
+def test_duplicate_active_jobs_are_failed_so_the_unique_index_builds():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from src.infrastructure.database.indexes import ACTIVE_SESSION_INDEX, fail_duplicate_active_jobs
+
+    name = f"test_indexes_dups_{uuid.uuid4().hex[:8]}"
+
+    async def scenario():
+        client = AsyncIOMotorClient(TEST_MONGODB_URL)
+        db = client[name]
+        try:
+            # Left by the old read-then-insert check
+            await db.jobs.insert_many([
+                {"user_id": "u1", "session_id": "s1", "status": "pending", "created_at": datetime(2024, 1, day, tzinfo=timezone.utc)}
+                for day in (1, 2, 3)
+            ])
+            blocked = await ensure_indexes(db)
+            failed = await fail_duplicate_active_jobs(db)
+            ensured = await ensure_indexes(db)
+            active = [doc async for doc in db.jobs.find({"status": "pending"})]
+            return blocked, failed, ensured, active
+        finally:
+            await client.drop_database(name)
+            client.close()
+
+    blocked, failed, ensured, active = asyncio.run(scenario())
+
+    assert ACTIVE_SESSION_INDEX not in blocked["jobs"]
+    assert failed == 2
+    assert ACTIVE_SESSION_INDEX in ensured["jobs"]
+    assert [doc["created_at"].day for doc in active] == [3]
+
+
+def test_indexes_from_the_old_init_script_are_reused_or_dropped():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import MongoClient
+
+    name = f"test_indexes_legacy_{uuid.uuid4().hex[:8]}"
+    sync_client = MongoClient(TEST_MONGODB_URL)
+    db = sync_client[name]
+    # What init-mongo.js used to create
+    db.users.create_index([("clerk_id", 1)], unique=True)
+    db.users.create_index([("email", 1)], unique=True)
+    db.users.create_index([("created_at", 1)])
+    db.users.create_index([("created_at", -1), ("_id", -1)])
+    for keys in ([("user_id", 1)], [("status", 1)], [("job_type", 1)], [("created_at", 1)], [("user_id", 1), ("created_at", -1)]):
+        db.jobs.create_index(keys)
+
+    async def run():
+        client = AsyncIOMotorClient(TEST_MONGODB_URL)
+        try:
+            return await ensure_indexes(client[name])
+        finally:
+            client.close()
+
+    try:
+        ensured = asyncio.run(run())
+        users, jobs = set(db.users.index_information()), set(db.jobs.index_information())
+    finally:
+        sync_client.drop_database(name)
+        sync_client.close()
+
+    assert {"clerk_id_unique", "email_unique", "created_at_id"} <= set(ensured["users"])
+    assert users == {"_id_", "clerk_id_1", "email_1", "created_at_-1__id_-1"}
+    assert jobs == {"_id_", "user_id_created_at_id", "status_created_at_id", "created_at_id", "active_user_session_unique"}
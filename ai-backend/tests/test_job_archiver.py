@@ -0,0 +1,108 @@
+"""Archival and cross-tier reads against a real MongoDB.
+
+Set TEST_MONGODB_URL (e.g. mongodb://localhost:27017) to run; a throwaway database is used.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from src.domain.repositories import next_cursor
+from src.infrastructure.database.job_archiver import JobArchiver
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories import MongoJobRepository
+
+TEST_MONGODB_URL = os.getenv("TEST_MONGODB_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_MONGODB_URL, reason="TEST_MONGODB_URL not set")
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _doc(status: str, age_days: int, user_id: str = "u1") -> dict:
+    created = NOW - timedelta(days=age_days)
+    return {
+        "_id": ObjectId(),
+        "user_id": user_id,
+        "session_id": None,
+        "job_type": "text_generation",
+        "status": status,
+        "input_data": {"prompt": "hi"},
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def _run(scenario):
+    async def wrapper():
+        name = f"test_archiver_{uuid.uuid4().hex[:8]}"
+        await MongoDB.connect_to_mongo(TEST_MONGODB_URL, name)
+        try:
+            return await scenario(MongoDB.get_database())
+        finally:
+            await MongoDB.client.drop_database(name)
+            await MongoDB.close_mongo_connection()
+
+    return asyncio.run(wrapper())
+
+
+def test_archives_only_old_terminal_jobs_in_batches():
+    docs = [_doc("completed", 60) for _ in range(5)] + [
+        _doc("failed", 45),
+        _doc("processing", 90),  # still active, however old
+        _doc("completed", 3),    # too recent
+    ]
+
+    async def scenario(db):
+        await db.jobs.insert_many(docs)
+        archiver = JobArchiver(db, archive_after_days=30, batch_size=2, max_batches=10)
+        moved = await archiver.archive_once(now=NOW)
+        again = await archiver.archive_once(now=NOW)
+        return moved, again, await db.jobs.count_documents({}), await db.jobs_archive.count_documents({}), archiver.get_metrics()
+
+    moved, again, hot, cold, metrics = _run(scenario)
+
+    assert (moved, again) == (6, 0)
+    assert (hot, cold) == (2, 6)
+    assert metrics["last_run"]["batches"] == 0
+    assert metrics["archived_total"] == 6
+
+
+def test_interrupted_archive_is_completed_without_duplicates():
+    doc = _doc("completed", 60)
+
+    async def scenario(db):
+        await db.jobs.insert_one(doc)
+        await db.jobs_archive.insert_one(doc)  # copied, then crashed before the delete
+        await JobArchiver(db, archive_after_days=30).archive_once(now=NOW)
+        return await db.jobs.count_documents({}), await db.jobs_archive.count_documents({})
+
+    assert _run(scenario) == (0, 1)
+
+
+def test_repository_reads_across_tiers():
+    old = [_doc("completed", 60 + i) for i in range(3)]
+    recent = [_doc("completed", i) for i in range(3)]
+
+    async def scenario(db):
+        await db.jobs.insert_many(old + recent)
+        await JobArchiver(db, archive_after_days=30).archive_once(now=NOW)
+        repo = MongoJobRepository()
+
+        hot_only = await repo.get_by_user_id("u1")
+        archived_job = await repo.get_by_id(str(old[0]["_id"]))
+        first = await repo.get_documents_by_user_id("u1", limit=4, include_archived=True)
+        rest = await repo.get_documents_by_user_id("u1", limit=4, cursor=next_cursor(first, 4), include_archived=True)
+        skipped = await repo.get_by_user_id("u1", skip=2, limit=2, include_archived=True)
+        return hot_only, archived_job, first, rest, skipped
+
+    hot_only, archived_job, first, rest, skipped = _run(scenario)
+
+    expected = [doc["_id"] for doc in recent + old]
+    assert [job.id for job in hot_only] == [doc["_id"] for doc in recent]
+    assert archived_job is not None and archived_job.id == old[0]["_id"]
+    assert [doc["_id"] for doc in first + rest] == expected
+    assert [job.id for job in skipped] == expected[2:4]
@@ -0,0 +1,218 @@
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+
+from src.domain.entities import Job, JobStatus, JobType, JobUpdate
+from src.infrastructure.cache import JobCache, LRUCache
+from src.infrastructure.events.notification_dispatcher import NotificationDispatcher
+from src.infrastructure.events.redis_notification_subscriber import RedisNotificationSubscriber
+from src.infrastructure.repositories import CachedJobRepository
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for the shared tier"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class CountingJobRepository:
+    """Inner repository that records database reads"""
+
+    def __init__(self, *jobs: Job):
+        self.jobs = {str(job.id): job for job in jobs}
+        self.reads = 0
+        self.before_read = None
+
+    async def get_by_id(self, job_id):
+        self.reads += 1
+        if self.before_read:
+            self.before_read()
+        job = self.jobs.get(job_id)
+        return job.model_copy() if job else None
+
+    async def update(self, job_id, job_data):
+        self.jobs[job_id] = self.jobs[job_id].model_copy(update={"status": job_data.status})
+        return self.jobs[job_id]
+
+
+def _job(status: JobStatus) -> Job:
+    return Job(
+        _id=ObjectId(),
+        user_id="u1",
+        job_type=JobType.TEXT_GENERATION,
+        status=status,
+        input_data={"prompt": "hi"},
+        created_at=datetime(2024, 1, 1),
+    )
+
+
+def _cache(redis=None, **kwargs) -> JobCache:
+    kwargs.setdefault("redis_ttl", 60 if redis is not None else 0)
+    return JobCache(max_entries=100, active_ttl=30, redis=redis, **kwargs)
+
+
+def test_terminal_job_is_served_from_memory_after_first_read():
+    job = _job(JobStatus.COMPLETED)
+    inner = CountingJobRepository(job)
+    repo = CachedJobRepository(inner, _cache())
+
+    async def scenario():
+        return [await repo.get_by_id(str(job.id)) for _ in range(10)]
+
+    results = asyncio.run(scenario())
+
+    assert inner.reads == 1
+    assert all(r.id == job.id for r in results)
+    metrics = repo.cache.get_metrics()
+    assert metrics["hits_local"] == 9
+    assert metrics["misses"] == 1
+    assert metrics["hit_ratio"] == 0.9
+
+
+def test_terminal_job_is_shared_through_redis():
+    job = _job(JobStatus.FAILED)
+    redis = FakeRedis()
+    first = CachedJobRepository(CountingJobRepository(job), _cache(redis))
+    second_inner = CountingJobRepository(job)
+    second = CachedJobRepository(second_inner, _cache(redis))
+
+    async def scenario():
+        await first.get_by_id(str(job.id))
+        return await second.get_by_id(str(job.id))
+
+    result = asyncio.run(scenario())
+
+    assert second_inner.reads == 0
+    assert result.status == JobStatus.FAILED
+    assert result.id == job.id
+    assert second.cache.get_metrics()["hits_redis"] == 1
+
+
+def test_active_job_is_kept_until_status_event():
+    job = _job(JobStatus.PROCESSING)
+    redis = FakeRedis()
+    inner = CountingJobRepository(job)
+    cache = _cache(redis)
+    repo = CachedJobRepository(inner, cache)
+    job_id = str(job.id)
+
+    async def scenario():
+        await repo.get_by_id(job_id)
+        await repo.get_by_id(job_id)
+        # Worker completes the job and publishes the event
+        inner.jobs[job_id] = inner.jobs[job_id].model_copy(update={"status": JobStatus.COMPLETED})
+        cache.on_status_event({"user_id": "u1", "job_id": job_id, "status": "completed"})
+        return await repo.get_by_id(job_id)
+
+    result = asyncio.run(scenario())
+
+    assert inner.reads == 2
+    assert result.status == JobStatus.COMPLETED
+    # Active jobs never reach the shared tier
+    assert len(redis.data) == 1
+
+
+def test_read_racing_an_invalidation_is_not_stored():
+    job = _job(JobStatus.PENDING)
+    inner = CountingJobRepository(job)
+    cache = _cache()
+    repo = CachedJobRepository(inner, cache)
+    job_id = str(job.id)
+    # The status event lands while the (now stale) document is in flight
+    inner.before_read = lambda: cache.on_status_event({"job_id": job_id})
+
+    async def scenario():
+        await repo.get_by_id(job_id)
+        inner.before_read = None
+        await repo.get_by_id(job_id)
+
+    asyncio.run(scenario())
+
+    assert inner.reads == 2
+    assert cache.get_metrics()["stale_skipped"] == 1
+
+
+def test_update_through_repository_discards_both_tiers():
+    job = _job(JobStatus.COMPLETED)
+    redis = FakeRedis()
+    inner = CountingJobRepository(job)
+    repo = CachedJobRepository(inner, _cache(redis))
+    job_id = str(job.id)
+
+    async def scenario():
+        await repo.get_by_id(job_id)
+        await repo.update(job_id, JobUpdate(status=JobStatus.FAILED))
+        return await repo.get_by_id(job_id)
+
+    result = asyncio.run(scenario())
+
+    assert inner.reads == 2
+    assert result.status == JobStatus.FAILED
+
+
+def test_polling_an_active_job_rarely_reaches_mongo():
+    job = _job(JobStatus.PENDING)
+    inner = CountingJobRepository(job)
+    cache = _cache()
+    repo = CachedJobRepository(inner, cache)
+    job_id = str(job.id)
+
+    async def scenario():
+        # 200 polls across the job's lifetime with two status transitions
+        for i in range(200):
+            if i in (50, 150):
+                status = JobStatus.PROCESSING if i == 50 else JobStatus.COMPLETED
+                inner.jobs[job_id] = inner.jobs[job_id].model_copy(update={"status": status})
+                cache.on_status_event({"job_id": job_id, "status": status.value})
+            job_seen = await repo.get_by_id(job_id)
+        return job_seen
+
+    last = asyncio.run(scenario())
+
+    assert last.status == JobStatus.COMPLETED
+    assert inner.reads == 3
+    assert cache.get_metrics()["hit_ratio"] > 0.9
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_metrics()["evictions"] == 1
+
+
+def test_lru_entry_ttl_expires():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1, ttl=0)
+
+    assert cache.get("a") is None
+    assert cache.get_metrics()["expirations"] == 1
+
+
+def test_subscriber_listeners_see_events_before_dispatch():
+    seen = []
+    subscriber = RedisNotificationSubscriber(dispatcher=NotificationDispatcher(workers=1))
+    subscriber.add_listener(lambda event: 1 / 0)  # a failing listener must not block the others
+    subscriber.add_listener(lambda event: seen.append(event["job_id"]))
+
+    event = subscriber._parse_message('{"type": "job_status_update", "user_id": "u1", "job_id": "j1", "status": "completed"}')
+    subscriber._notify_listeners(event)
+
+    assert seen == ["j1"]
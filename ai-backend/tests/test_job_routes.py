@@ -1,10 +1,14 @@
-from datetime import datetime
+from datetime import date, datetime
 from fastapi import FastAPI, Depends
 from fastapi.testclient import TestClient
 import pytest
+from bson import ObjectId
 
 from src.presentation.api.job_routes import router as job_router, get_job_context, JobContext
-from src.application.dto import JobResponse
+from src.config.settings import settings
+from src.application.dto import JobResponse, JobStatsResponse
+from src.domain.repositories import decode_cursor
+from src.domain.services import OutputNotFoundError
 
 
 class FakeJobUseCases:
@@ -14,6 +18,34 @@ class FakeJobUseCases:
     async def get_job_by_id(self, job_id: str):
         return self.jobs_by_id.get(job_id)
 
+    async def get_job_stats(self, user_id, day=None):
+        return JobStatsResponse(user_id=user_id, day=day or date(2024, 1, 1), processing=1 if user_id else 7)
+
+    async def open_job_output(self, job):
+        if job.output_data is None:
+            raise OutputNotFoundError(f"Job {job.id} has no output")
+
+        async def chunks():
+            yield b'{"generated_text":'
+            yield b'"full"}'
+
+        return "application/json", chunks()
+
+    async def get_user_jobs(self, user_id: str, skip: int = 0, limit: int = 100, cursor=None, include_archived=False):
+        if cursor:
+            decode_cursor(cursor)
+        jobs = [j for j in self.jobs_by_id.values() if j.user_id == user_id]
+        return jobs[:limit]
+
+    async def get_user_job_documents(self, user_id: str, skip: int = 0, limit: int = 100, cursor=None, include_archived=False):
+        jobs = await self.get_user_jobs(user_id, skip, limit, cursor)
+        docs = []
+        for job in jobs:
+            doc = job.model_dump()
+            doc["_id"] = ObjectId(doc.pop("id"))
+            docs.append(doc)
+        return docs
+
 
 @pytest.fixture
 def test_app_owned():
@@ -104,3 +136,95 @@ def test_get_job_missing_returns_404(test_app_not_found):
     resp = client.get("/api/v1/jobs/j-does-not-exist")
     assert resp.status_code == 404
     assert resp.json()["detail"] == "Job not found"
+
+
+def _job(job_id: str, user_id: str = "user1") -> JobResponse:
+    return JobResponse(
+        id=job_id,
+        user_id=user_id,
+        job_type="text_generation",
+        status="completed",
+        input_data={"prompt": "hi"},
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+    )
+
+
+def _list_app(jobs):
+    app = FastAPI()
+    fake_uc = FakeJobUseCases({j.id: j for j in jobs})
+    app.dependency_overrides[get_job_context] = lambda: JobContext(user_id="user1", use_cases=fake_uc)
+    app.include_router(job_router, prefix="/api/v1")
+    return app
+
+
+@pytest.fixture(params=[True, False], ids=["fast_json", "validated"])
+def serialization_mode(request, monkeypatch):
+    monkeypatch.setattr(settings, "fast_json_responses", request.param)
+    return request.param
+
+
+def test_list_jobs_sets_next_cursor_on_full_page(serialization_mode):
+    ids = ["65f000000000000000000001", "65f000000000000000000002"]
+    client = TestClient(_list_app([_job(i) for i in ids]))
+
+    resp = client.get("/api/v1/jobs/?limit=2")
+    assert resp.status_code == 200
+    assert str(decode_cursor(resp.headers["X-Next-Cursor"])[1]) == ids[-1]
+
+    last_page = client.get("/api/v1/jobs/?limit=5")
+    assert "X-Next-Cursor" not in last_page.headers
+
+
+def test_list_jobs_fast_path_matches_validated_response(monkeypatch):
+    ids = ["65f000000000000000000001", "65f000000000000000000002"]
+    client = TestClient(_list_app([_job(i) for i in ids]))
+
+    monkeypatch.setattr(settings, "fast_json_responses", False)
+    validated = client.get("/api/v1/jobs/")
+    monkeypatch.setattr(settings, "fast_json_responses", True)
+    fast = client.get("/api/v1/jobs/")
+
+    assert fast.status_code == validated.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == validated.json()
+
+
+def test_list_jobs_rejects_malformed_cursor(serialization_mode):
+    client = TestClient(_list_app([]))
+    resp = client.get("/api/v1/jobs/?cursor=garbage")
+    assert resp.status_code == 400
+
+
+def test_get_job_output_streams_full_payload():
+    job = _job("j1").model_copy(update={"output_data": {"generated_text": "fu…"}, "output_ref": {"store": "gridfs", "id": "f1"}})
+    client = TestClient(_list_app([job]))
+
+    resp = client.get("/api/v1/jobs/j1/output")
+    assert resp.status_code == 200
+    assert resp.json() == {"generated_text": "full"}
+
+    missing = TestClient(_list_app([_job("j2")])).get("/api/v1/jobs/j2/output")
+    assert missing.status_code == 404
+
+
+def test_get_job_output_of_another_user_returns_403():
+    job = _job("j1", user_id="user2").model_copy(update={"output_data": {"generated_text": "secret"}})
+    client = TestClient(_list_app([job]))
+
+    resp = client.get("/api/v1/jobs/j1/output")
+    assert resp.status_code == 403
+
+
+def test_job_stats_for_user_and_admin(monkeypatch):
+    client = TestClient(_list_app([]))
+
+    mine = client.get("/api/v1/jobs/stats?day=2024-06-01")
+    assert mine.status_code == 200
+    assert mine.json()["user_id"] == "user1" and mine.json()["day"] == "2024-06-01"
+
+    assert client.get("/api/v1/jobs/stats?all_users=true").status_code == 403
+    monkeypatch.setattr(settings, "admin_user_ids", "admin, user1")
+    everyone = client.get("/api/v1/jobs/stats?all_users=true")
+    assert everyone.status_code == 200
+    assert everyone.json()["user_id"] is None and everyone.json()["processing"] == 7
@@ -0,0 +1,88 @@
+"""Job counters: transition arithmetic, plus recording and rebuilding against a real MongoDB.
+
+The Mongo tests need TEST_MONGODB_URL (e.g. mongodb://localhost:27017); a throwaway database is used.
+"""
+import asyncio
+import os
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories import MongoJobStatsRepository
+from src.infrastructure.repositories.mongo_job_stats_repository import counter_updates
+
+TEST_MONGODB_URL = os.getenv("TEST_MONGODB_URL")
+requires_mongo = pytest.mark.skipif(not TEST_MONGODB_URL, reason="TEST_MONGODB_URL not set")
+
+AT = datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+DAY = date(2024, 6, 1)
+
+
+def test_lifecycle_transitions_net_out_the_active_gauge():
+    totals = {}
+    for old, new in ((None, "pending"), ("pending", "processing"), ("processing", "completed")):
+        for key, inc in counter_updates("u1", old, new, AT).items():
+            for field, value in inc.items():
+                totals.setdefault(key, {}).setdefault(field, 0)
+                totals[key][field] += value
+
+    assert totals["u1|2024-06-01"] == {"created": 1, "completed": 1}
+    assert totals["u1|active"] == {"pending": 0, "processing": 0}
+    # No shared all-users document takes every job's writes
+    assert set(totals) == {"u1|active", "u1|2024-06-01"}
+
+
+def test_unchanged_status_is_not_counted():
+    assert counter_updates("u1", "failed", "failed", AT) == {}
+    assert counter_updates("u1", "processing", "deleted", AT) == {"u1|active": {"processing": -1}}
+
+
+def _run(scenario):
+    async def wrapper():
+        name = f"test_job_stats_{uuid.uuid4().hex[:8]}"
+        await MongoDB.connect_to_mongo(TEST_MONGODB_URL, name)
+        try:
+            return await scenario(MongoDB.get_database())
+        finally:
+            await MongoDB.client.drop_database(name)
+            await MongoDB.close_mongo_connection()
+
+    return asyncio.run(wrapper())
+
+
+@requires_mongo
+def test_rebuild_matches_recorded_counters():
+    def job(status, user_id="u1"):
+        return {
+            "_id": ObjectId(), "user_id": user_id, "status": status,
+            "created_at": AT, "updated_at": AT, "completed_at": AT if status in ("completed", "failed") else None,
+        }
+
+    async def scenario(db):
+        stats = MongoJobStatsRepository(db)
+        docs = [job("completed"), job("failed"), job("processing"), job("pending", "u2")]
+        for doc in docs:
+            await stats.record_transition(doc["user_id"], None, "pending", AT)
+            if doc["status"] != "pending":
+                await stats.record_transition(doc["user_id"], "pending", "processing", AT)
+            if doc["status"] in ("completed", "failed"):
+                await stats.record_transition(doc["user_id"], "processing", doc["status"], AT)
+        await db.jobs.insert_many(docs[1:])
+        await db.jobs_archive.insert_one(docs[0])
+        recorded = (await stats.get_stats("u1", DAY), await stats.get_stats(None, DAY))
+        await db.job_counters.insert_one({"_id": "gone|2020-01-01", "created": 5, "updated_at": AT})
+        # All-users totals kept by older releases are ignored on read and dropped by rebuild
+        await db.job_counters.insert_one({"_id": "*|active", "user_id": "*", "day": None, "pending": 99, "updated_at": AT})
+        await stats.rebuild()
+        rebuilt = (await stats.get_stats("u1", DAY), await stats.get_stats(None, DAY))
+        return recorded, rebuilt, await db.job_counters.count_documents({"_id": {"$in": ["gone|2020-01-01", "*|active"]}})
+
+    recorded, rebuilt, stale = _run(scenario)
+
+    assert recorded[0] == {"pending": 0, "processing": 1, "created": 3, "completed": 1, "failed": 1}
+    assert recorded[1]["created"] == 4 and recorded[1]["pending"] == 1
+    assert rebuilt == recorded
+    assert stale == 0
@@ -0,0 +1,316 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from src.application.dto import JobCreateRequest
+from src.application.use_cases.job_use_cases import JobUseCases, InvalidJobFieldsError, ActiveJobExistsError
+from src.domain.entities import Job, JobStatus
+from src.domain.repositories import ActiveJobConflictError
+from src.domain.services import OutputStore, OutputNotFoundError, StorageService
+
+
+class FakeJobRepository:
+    """In-memory stand-in for the parts of JobRepository the use cases touch."""
+
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+        self.projections = []
+
+    async def create(self, job_data):
+        await asyncio.sleep(0)  # let concurrent creations interleave, as real inserts would
+        # Mirrors the active_user_session_unique index
+        for doc in self.docs:
+            if (
+                job_data.session_id is not None
+                and (doc["user_id"], doc["session_id"]) == (job_data.user_id, job_data.session_id)
+                and doc["status"] in ("pending", "processing")
+            ):
+                raise ActiveJobConflictError(str(doc["_id"]))
+        doc = _doc(job_data.user_id, session_id=job_data.session_id, status="pending", input_data=job_data.input_data)
+        self.docs.append(doc)
+        return Job(**doc)
+
+    async def get_by_id(self, job_id):
+        for doc in self.docs:
+            if str(doc["_id"]) == job_id:
+                return Job(**doc)
+        return None
+
+    async def update(self, job_id, update_data):
+        for doc in self.docs:
+            if str(doc["_id"]) == job_id:
+                doc.update(update_data.model_dump(exclude_unset=True))
+                return Job(**doc)
+        return None
+
+    async def get_summaries_by_user_id(self, user_id, fields, limit=100, cursor=None):
+        self.projections.append(list(fields))
+        keep = set(fields) | {"_id", "created_at"}
+        return [
+            {k: v for k, v in doc.items() if k in keep}
+            for doc in self.docs
+            if doc["user_id"] == user_id
+        ][:limit]
+
+
+def _doc(user_id="user1", **extra):
+    doc = {
+        "_id": ObjectId(),
+        "user_id": user_id,
+        "session_id": "s1",
+        "job_type": "text_generation",
+        "status": "completed",
+        "input_data": {"prompt": "x" * 1000},
+        "output_data": {"generated_text": "y" * 1000},
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+    }
+    doc.update(extra)
+    return doc
+
+
+class FakeQueueService:
+    def __init__(self):
+        self.enqueued = []
+        self.payloads = []
+
+    async def enqueue_job(self, job_id, job_data):
+        self.enqueued.append(job_id)
+        self.payloads.append(job_data)
+        return True
+
+
+class FakeOutputStore(OutputStore):
+    def __init__(self):
+        self.files = {}
+
+    async def save(self, job_id, payload, content_type="application/json"):
+        self.files[job_id] = payload
+        return {"store": "memory", "id": job_id, "size": len(payload), "content_type": content_type}
+
+    async def stream(self, output_ref):
+        if output_ref["id"] not in self.files:
+            raise OutputNotFoundError(output_ref["id"])
+        payload = self.files[output_ref["id"]]
+        for start in range(0, len(payload), 100):
+            yield payload[start:start + 100]
+
+    async def delete(self, output_ref):
+        return self.files.pop(output_ref["id"], None) is not None
+
+
+class SigningStorage(StorageService):
+    """Signs its own s3:// references; counts signatures."""
+
+    def __init__(self, fail=False):
+        self.signed = 0
+        self.fail = fail
+
+    async def upload_artifact(self, file_content, file_name, content_type):
+        return f"s3://bucket/{file_name}"
+
+    async def delete_artifact(self, artifact_url):
+        return True
+
+    async def generate_presigned_url(self, artifact_url, method="GET", expires_in=None):
+        if not artifact_url.startswith("s3://bucket/"):
+            return artifact_url
+        if self.fail:
+            raise RuntimeError("no credentials")
+        self.signed += 1
+        return f"https://signed.example/{artifact_url[len('s3://bucket/'):]}?sig=1"
+
+
+def _use_cases(repo, queue_service=None, output_store=None, storage_service=None):
+    return JobUseCases(
+        repo,
+        queue_service=queue_service,
+        ai_service=None,
+        output_store=output_store,
+        output_inline_max_bytes=256,
+        output_preview_chars=20,
+        storage_service=storage_service,
+    )
+
+
+async def _read_output(use_cases, job):
+    content_type, chunks = await use_cases.open_job_output(job)
+    return content_type, b"".join([chunk async for chunk in chunks])
+
+
+def test_concurrent_creates_in_one_session_yield_one_job():
+    repo = FakeJobRepository()
+    queue = FakeQueueService()
+    use_cases = _use_cases(repo, queue)
+    request = JobCreateRequest(job_type="text_generation", input_data={"prompt": "hi"}, session_id="s1")
+
+    async def scenario():
+        return await asyncio.gather(*(use_cases.create_job("user1", request) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    created = [r for r in results if not isinstance(r, Exception)]
+    conflicts = [r for r in results if isinstance(r, ActiveJobExistsError)]
+    assert len(created) == 1
+    assert len(conflicts) == 4
+    assert {c.existing_job_id for c in conflicts} == {created[0].id}
+    assert queue.enqueued == [created[0].id]
+
+
+def test_jobs_without_session_are_not_limited():
+    repo = FakeJobRepository()
+    use_cases = _use_cases(repo, FakeQueueService())
+    request = JobCreateRequest(job_type="text_generation", input_data={"prompt": "hi"}, session_id="")
+
+    async def scenario():
+        return [await use_cases.create_job("user1", request) for _ in range(2)]
+
+    first, second = asyncio.run(scenario())
+
+    assert first.id != second.id
+    assert first.session_id is None
+
+
+def test_enqueue_payload_carries_created_at_for_latency_metrics():
+    queue = FakeQueueService()
+    use_cases = _use_cases(FakeJobRepository(), queue)
+
+    job = asyncio.run(use_cases.create_job("user1", JobCreateRequest(job_type="text_generation", input_data={"prompt": "hi"})))
+
+    assert queue.payloads[0]["created_at"] == job.created_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+def test_summaries_use_default_projection():
+    repo = FakeJobRepository([_doc(), _doc(user_id="other")])
+
+    summaries = asyncio.run(_use_cases(repo).get_user_job_summaries("user1"))
+
+    assert len(summaries) == 1
+    dumped = summaries[0].model_dump(exclude_unset=True)
+    assert "input_data" not in repo.projections[0]
+    assert set(dumped) == {"id", "created_at", "session_id", "job_type", "status", "updated_at", "started_at", "completed_at"}
+
+
+def test_summaries_respect_field_selection():
+    repo = FakeJobRepository([_doc()])
+
+    summaries = asyncio.run(_use_cases(repo).get_user_job_summaries("user1", fields=["status"]))
+
+    assert summaries[0].model_dump(exclude_unset=True, mode="json") == {
+        "id": summaries[0].id,
+        "created_at": "2024-01-01T00:00:00",
+        "status": "completed",
+    }
+
+
+def test_summaries_accept_id_in_field_selection():
+    repo = FakeJobRepository([_doc()])
+
+    summaries = asyncio.run(_use_cases(repo).get_user_job_summaries("user1", fields=["id", "status"]))
+
+    assert set(summaries[0].model_dump(exclude_unset=True)) == {"id", "created_at", "status"}
+    assert repo.projections == [["status"]]
+
+
+def test_summaries_reject_payload_fields():
+    repo = FakeJobRepository([_doc()])
+
+    with pytest.raises(InvalidJobFieldsError):
+        asyncio.run(_use_cases(repo).get_user_job_summaries("user1", fields=["status", "output_data"]))
+    assert repo.projections == []
+
+
+def test_large_output_is_offloaded_with_preview():
+    doc = _doc(status="processing", output_data=None)
+    store = FakeOutputStore()
+    use_cases = _use_cases(FakeJobRepository([doc]), output_store=store)
+    output = {"generated_text": "y" * 1000, "tokens_used": 150}
+
+    async def scenario():
+        job = await use_cases.update_job_status(str(doc["_id"]), JobStatus.COMPLETED, output_data=output)
+        return job, await _read_output(use_cases, job)
+
+    job, (content_type, payload) = asyncio.run(scenario())
+
+    assert job.output_ref["size"] == len(payload) > 256
+    assert job.output_data == {"generated_text": "y" * 20 + "…", "tokens_used": 150}
+    assert content_type == "application/json"
+    assert json.loads(payload) == output
+
+
+def test_small_output_stays_inline():
+    doc = _doc(status="processing", output_data=None)
+    store = FakeOutputStore()
+    use_cases = _use_cases(FakeJobRepository([doc]), output_store=store)
+
+    async def scenario():
+        job = await use_cases.update_job_status(str(doc["_id"]), JobStatus.COMPLETED, output_data={"text": "short"})
+        return job, await _read_output(use_cases, job)
+
+    job, (_, payload) = asyncio.run(scenario())
+
+    assert job.output_ref is None and store.files == {}
+    assert json.loads(payload) == {"text": "short"}
+
+
+def test_processing_is_announced_only_after_it_is_written():
+    doc = _doc(status="pending", output_data=None)
+    repo = FakeJobRepository([doc])
+    use_cases = _use_cases(repo)
+    seen = []
+
+    class FakeAIService:
+        async def generate(self, job_type, input_data):
+            return {"output_data": {"text": "done"}}
+
+    async def on_processing():
+        seen.append(doc["status"])
+
+    use_cases.ai_service = FakeAIService()
+    assert asyncio.run(use_cases.process_job(str(doc["_id"]), on_processing=on_processing)) is True
+
+    assert seen == [JobStatus.PROCESSING]
+    assert doc["status"] == JobStatus.COMPLETED
+
+
+def test_missing_output_raises_before_streaming():
+    doc = _doc(output_data={"text": "preview"}, output_ref={"store": "memory", "id": "gone"})
+    use_cases = _use_cases(FakeJobRepository([doc]), output_store=FakeOutputStore())
+    job = use_cases._to_response(Job(**doc))
+
+    with pytest.raises(OutputNotFoundError):
+        asyncio.run(use_cases.open_job_output(job))
+
+
+def test_artifact_references_are_returned_as_signed_urls():
+    doc = _doc()
+    repo = FakeJobRepository([doc])
+    storage = SigningStorage()
+    use_cases = _use_cases(repo, storage_service=storage)
+
+    job = asyncio.run(use_cases.update_job_status(str(doc["_id"]), JobStatus.COMPLETED, artifact_url="s3://bucket/a.png"))
+    summaries = asyncio.run(use_cases.get_user_job_summaries("user1", fields=["status", "artifact_url"]))
+
+    assert job.artifact_url == "https://signed.example/a.png?sig=1"
+    assert summaries[0].artifact_url == "https://signed.example/a.png?sig=1"
+    # The stored reference is never replaced by a signed URL
+    assert doc["artifact_url"] == "s3://bucket/a.png"
+
+
+def test_foreign_and_unsignable_artifact_urls_pass_through():
+    doc = _doc(artifact_url="https://fake-storage.com/artifacts/x.png")
+    repo = FakeJobRepository([doc])
+
+    summaries = asyncio.run(
+        _use_cases(repo, storage_service=SigningStorage()).get_user_job_summaries("user1", fields=["artifact_url"])
+    )
+    job = asyncio.run(
+        _use_cases(repo, storage_service=SigningStorage(fail=True))
+        .update_job_status(str(doc["_id"]), JobStatus.COMPLETED, artifact_url="s3://bucket/b.png")
+    )
+
+    assert summaries[0].artifact_url == "https://fake-storage.com/artifacts/x.png"
+    assert job.artifact_url == "s3://bucket/b.png"
@@ -0,0 +1,116 @@
+import asyncio
+import os
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infrastructure.cache import PresignedUrlCache
+from src.infrastructure.storage.local_file_storage_service import LocalFileStorageService
+from src.infrastructure.storage.storage_factory import get_storage_service
+from src.presentation.api.artifact_routes import router as artifact_router
+from src.presentation.api.file_response import RangeNotSatisfiableError, parse_range
+
+PAYLOAD = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalFileStorageService(
+        root=str(tmp_path), base_url="http://testserver", signing_key="k", url_cache=PresignedUrlCache(10)
+    )
+
+
+@pytest.fixture
+def client(storage):
+    app = FastAPI()
+    app.include_router(artifact_router)
+    app.dependency_overrides[get_storage_service] = lambda: storage
+    return TestClient(app)
+
+
+def _files(root):
+    return sorted(os.path.relpath(os.path.join(d, f), root) for d, _, files in os.walk(root) for f in files)
+
+
+def _signed_path(storage, ref):
+    url = urlsplit(asyncio.run(storage.generate_presigned_url(ref)))
+    return f"{url.path}?{url.query}"
+
+
+def test_uploads_land_in_a_sharded_tree_without_temp_files(storage):
+    async def chunks():
+        yield PAYLOAD[:100]
+        yield PAYLOAD[100:]
+
+    ref = asyncio.run(storage.upload_artifact(PAYLOAD, "a.bin", "application/octet-stream"))
+    streamed = asyncio.run(storage.upload_artifact_stream(chunks(), "b.bin", "application/octet-stream"))
+
+    paths = _files(storage.root)
+    assert sorted([ref[len("local://"):], streamed[len("local://"):]]) == paths
+    assert all(len(path.split(os.sep)) == 3 for path in paths)
+    with open(storage.resolve(streamed[len("local://"):]), "rb") as f:
+        assert f.read() == PAYLOAD
+
+
+def test_failed_stream_leaves_nothing_behind(storage):
+    async def broken():
+        yield PAYLOAD
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(storage.upload_artifact_stream(broken(), "c.bin", "application/octet-stream"))
+
+    assert _files(storage.root) == []
+
+
+def test_delete_removes_the_file(storage):
+    ref = asyncio.run(storage.upload_artifact(PAYLOAD, "a.bin", "application/octet-stream"))
+
+    assert asyncio.run(storage.delete_artifact(ref)) is True
+    assert asyncio.run(storage.delete_artifact(ref)) is False
+    assert _files(storage.root) == []
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=10-19", 100) == (10, 20)
+    assert parse_range("bytes=90-", 100) == (90, 100)
+    assert parse_range("bytes=-10", 100) == (90, 100)
+    assert parse_range("bytes=50-500", 100) == (50, 100)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("items=0-1", 100) is None
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range("bytes=100-", 100)
+
+
+def test_signed_download_serves_whole_file_and_ranges(storage, client):
+    ref = asyncio.run(storage.upload_artifact(PAYLOAD, "a.bin", "application/octet-stream"))
+    path = _signed_path(storage, ref)
+
+    full = client.get(path)
+    partial = client.get(path, headers={"Range": "bytes=10-19"})
+    unsatisfiable = client.get(path, headers={"Range": "bytes=5000-"})
+
+    assert full.status_code == 200 and full.content == PAYLOAD
+    assert full.headers["accept-ranges"] == "bytes"
+    assert partial.status_code == 206 and partial.content == PAYLOAD[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(PAYLOAD)}"
+    assert unsatisfiable.status_code == 416
+
+
+def test_download_rejects_bad_signatures_and_paths(storage, client):
+    ref = asyncio.run(storage.upload_artifact(PAYLOAD, "a.bin", "application/octet-stream"))
+    other = asyncio.run(storage.upload_artifact(PAYLOAD, "b.bin", "application/octet-stream"))
+    path = _signed_path(storage, ref)
+    escaping = "../../etc/passwd"
+    expires = 2 ** 40
+
+    forged = client.get(path.replace(ref[len("local://"):], other[len("local://"):]))
+    traversal = client.get(f"/artifacts/{escaping}?expires={expires}&signature={storage.sign(escaping, expires)}")
+    expired = client.get(f"/artifacts/{ref[len('local://'):]}?expires=1&signature={storage.sign(ref[len('local://'):], 1)}")
+
+    assert forged.status_code == 403
+    assert traversal.status_code == 404
+    assert expired.status_code == 403
@@ -0,0 +1,76 @@
+import io
+import logging
+import time
+
+import pytest
+
+from src.config import logging_config
+from src.config.logging_config import SamplingFilter, configure_logging, get_logging_metrics, parse_levels, stop_logging
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging_config._root_handler = None
+
+
+def _record(lineno: int, level: int = logging.DEBUG) -> logging.LogRecord:
+    return logging.LogRecord("test", level, "/app/hot.py", lineno, "tick", None, None)
+
+
+def test_sampling_limits_each_call_site_and_reports_skipped(monkeypatch):
+    sampler = SamplingFilter(per_second=2)
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    passed = [sampler.filter(_record(10)) for _ in range(5)]
+    other_site = sampler.filter(_record(11))
+    now[0] += 1.0
+    resumed = _record(10)
+
+    assert passed == [True, True, False, False, False]
+    assert other_site is True
+    assert sampler.filter(resumed) is True
+    assert resumed.getMessage() == "tick [+3 sampled out]"
+    assert sampler.dropped == 3
+
+
+def test_sampling_never_drops_above_max_level():
+    sampler = SamplingFilter(per_second=1)
+
+    assert all(sampler.filter(_record(10, logging.WARNING)) for _ in range(5))
+
+
+def test_parse_levels():
+    assert parse_levels("uvicorn=info, pymongo=WARNING,,bad") == {"uvicorn": logging.INFO, "pymongo": logging.WARNING}
+
+
+def test_queued_records_are_written_by_the_listener(restore_logging):
+    stream = io.StringIO()
+    configure_logging(level="DEBUG", logger_levels="test.noisy=WARNING", sample_per_second=0, stream=stream, fmt="%(levelname)s %(name)s %(message)s")
+
+    logging.getLogger("test.app").debug("job_id=%s", "j1")
+    logging.getLogger("test.noisy").info("hidden")
+    stop_logging()
+
+    assert stream.getvalue() == "DEBUG test.app job_id=j1\n"
+    assert get_logging_metrics()["dropped_queue_full"] == 0
+
+
+def test_full_queue_drops_instead_of_blocking(restore_logging):
+    stream = io.StringIO()
+    configure_logging(level="INFO", sample_per_second=0, queue_size=2, stream=stream)
+    stop_logging()  # nothing drains the queue now
+
+    for i in range(5):
+        logging.getLogger("test.app").info("record %s", i)
+
+    assert get_logging_metrics()["dropped_queue_full"] == 3
@@ -0,0 +1,69 @@
+import urllib.request
+
+import pytest
+
+from src.infrastructure.metrics import MetricFamily, MetricsRegistry, Sample, start_metrics_server
+from src.infrastructure.metrics.job_metrics import JOB_BUCKETS
+
+
+def test_counters_and_histograms_render_in_prometheus_text_format():
+    registry = MetricsRegistry()
+    published = registry.counter("notifications_published_total", "Published", ("status",))
+    wait = registry.histogram("job_queue_wait_seconds", "Queue wait", ("job_type",), buckets=(0.1, 1.0))
+
+    published.labels("completed").inc()
+    published.labels("completed").inc(2)
+    wait.labels("text_generation").observe(0.5)
+    wait.labels("text_generation").observe(3.0)
+
+    assert registry.render().splitlines() == [
+        "# HELP notifications_published_total Published",
+        "# TYPE notifications_published_total counter",
+        'notifications_published_total{status="completed"} 3',
+        "# HELP job_queue_wait_seconds Queue wait",
+        "# TYPE job_queue_wait_seconds histogram",
+        'job_queue_wait_seconds_bucket{job_type="text_generation",le="0.1"} 0',
+        'job_queue_wait_seconds_bucket{job_type="text_generation",le="1.0"} 1',
+        'job_queue_wait_seconds_bucket{job_type="text_generation",le="+Inf"} 2',
+        'job_queue_wait_seconds_sum{job_type="text_generation"} 3.5',
+        'job_queue_wait_seconds_count{job_type="text_generation"} 2',
+    ]
+
+
+def test_collectors_are_read_at_scrape_time_and_labels_escaped():
+    registry = MetricsRegistry()
+    live = {"sockets": 1}
+    registry.add_collector(lambda: [
+        MetricFamily("websocket_connections", "gauge", "Open sockets", [Sample("", {"route": 'a"b'}, live["sockets"])]),
+    ])
+
+    live["sockets"] = 4
+
+    assert 'websocket_connections{route="a\\"b"} 4' in registry.render()
+
+
+def test_registering_a_name_twice_returns_the_same_metric_or_fails_on_mismatch():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ("job_type",))
+
+    assert registry.counter("jobs_total", "Jobs", ("job_type",)) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("jobs_total", "Jobs", ("job_type",))
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+
+def test_metrics_server_serves_the_registry():
+    registry = MetricsRegistry()
+    registry.histogram("job_processing_seconds", "Processing", ("job_type", "status"), JOB_BUCKETS).labels("text_generation", "completed").observe(2.0)
+    server = start_metrics_server(0, host="127.0.0.1", registry=registry)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert 'job_processing_seconds_count{job_type="text_generation",status="completed"} 1' in body
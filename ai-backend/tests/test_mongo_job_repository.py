@@ -0,0 +1,116 @@
+import asyncio
+
+from bson import ObjectId
+
+from src.domain.entities import JobCreate
+from src.domain.repositories import ActiveJobConflictError
+from src.infrastructure.database.indexes import ACTIVE_SESSION_INDEX
+from src.infrastructure.repositories.mongo_job_repository import MongoJobRepository
+
+
+class FakeCollection:
+    """Insert-only jobs collection without the unique session index unless ``indexed``"""
+
+    def __init__(self, indexed=False):
+        self.docs = []
+        self.indexed = indexed
+        self.index_checks = 0
+
+    async def index_information(self):
+        self.index_checks += 1
+        return {"_id_": {}, ACTIVE_SESSION_INDEX: {"unique": True}} if self.indexed else {"_id_": {}}
+
+    async def find_one(self, query):
+        for doc in self.docs:
+            if doc["user_id"] == query["user_id"] and doc["session_id"] == query["session_id"]["$eq"] \
+                    and doc["status"] in query["status"]["$in"]:
+                return doc
+        return None
+
+    async def insert_one(self, doc):
+        doc["_id"] = ObjectId()
+        self.docs.append(doc)
+        return type("Result", (), {"inserted_id": doc["_id"]})()
+
+    async def find_one_and_delete(self, query, projection=None):
+        for doc in self.docs:
+            if doc["_id"] == query["_id"]:
+                self.docs.remove(doc)
+                return doc
+        return None
+
+
+class FakeStats:
+    async def record_transition(self, *args):
+        pass
+
+
+class FakeOutputStore:
+    def __init__(self):
+        self.deleted = []
+
+    async def delete(self, output_ref):
+        self.deleted.append(output_ref)
+        return True
+
+
+def _repository(collection, output_store=None):
+    database = {"jobs": collection, "jobs_archive": FakeCollection()}
+    return MongoJobRepository(stats=FakeStats(), database=type("Database", (), database)(), output_store=output_store)
+
+
+def _job(session_id="s1"):
+    return JobCreate(user_id="u1", session_id=session_id, job_type="text_generation", input_data={"prompt": "hi"})
+
+
+def test_create_checks_for_an_active_job_while_the_unique_index_is_missing():
+    collection = FakeCollection()
+    repository = _repository(collection)
+
+    async def scenario():
+        first = await repository.create(_job())
+        try:
+            await repository.create(_job())
+        except ActiveJobConflictError as e:
+            return first, e.existing_job_id
+        return first, None
+
+    first, conflict = asyncio.run(scenario())
+
+    assert conflict == str(first.id)
+    assert len(collection.docs) == 1
+    # The index is looked up once and then rechecked only periodically
+    assert collection.index_checks == 1
+
+
+def test_create_relies_on_the_index_once_it_exists():
+    collection = FakeCollection(indexed=True)
+    repository = _repository(collection)
+
+    async def scenario():
+        for _ in range(2):
+            await repository.create(_job())
+
+    asyncio.run(scenario())
+
+    # The fake has no unique index to reject the second insert, so both land: no pre-read was made
+    assert len(collection.docs) == 2
+    assert collection.index_checks == 1
+
+
+def test_delete_removes_the_offloaded_output():
+    collection = FakeCollection()
+    store = FakeOutputStore()
+    repository = _repository(collection, store)
+    output_ref = {"store": "gridfs", "id": str(ObjectId())}
+
+    async def scenario():
+        offloaded = await repository.create(_job())
+        inline = await repository.create(_job(session_id=None))
+        collection.docs[0].update(status="completed", output_ref=output_ref)
+        collection.docs[1].update(status="completed", output_ref=None)
+        return [await repository.delete(str(job.id)) for job in (offloaded, inline)]
+
+    assert asyncio.run(scenario()) == [True, True]
+    assert store.deleted == [output_ref]
+    assert collection.docs == []
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from src.infrastructure.database.mongo_metrics import MongoMetricsListener
+
+ADDRESS = ("db", 27017)
+
+
+def _command(name, request_id, duration_micros=0, **command):
+    return SimpleNamespace(
+        command={name: command.pop("target", 1), **command},
+        command_name=name,
+        connection_id=ADDRESS,
+        request_id=request_id,
+        duration_micros=duration_micros,
+    )
+
+
+def test_pool_checkout_wait_and_usage():
+    listener = MongoMetricsListener()
+    event = SimpleNamespace(address=ADDRESS, connection_id=1, reason="timeout")
+
+    listener.connection_created(event)
+    listener.connection_created(event)
+    for _ in range(2):
+        listener.connection_check_out_started(event)
+        listener.connection_checked_out(event)
+    listener.connection_checked_in(event)
+    listener.connection_check_out_started(event)
+    listener.connection_check_out_failed(event)
+
+    pool = listener.get_metrics()["pools"]["db:27017"]
+    assert (pool["open"], pool["in_use"], pool["in_use_max"]) == (2, 1, 2)
+    assert pool["checkout_wait"]["count"] == 2
+    assert pool["checkout_failures"] == {"timeout": 1}
+
+
+def test_pool_stats_survive_until_the_last_client_closes():
+    listener = MongoMetricsListener()
+    event = SimpleNamespace(address=ADDRESS, connection_id=1)
+
+    # Two clients (e.g. motor and the status writer) with a connection each to the same server
+    for _ in range(2):
+        listener.pool_created(event)
+        listener.connection_created(event)
+    listener.connection_closed(event)
+    listener.pool_closed(event)
+
+    pool = listener.get_metrics()["pools"]["db:27017"]
+    assert (pool["pools"], pool["open"]) == (1, 1)
+
+    listener.connection_closed(event)
+    listener.pool_closed(event)
+    assert listener.get_metrics()["pools"] == {}
+
+
+def test_command_latency_per_collection():
+    listener = MongoMetricsListener()
+
+    listener.started(_command("find", 1, target="jobs"))
+    listener.started(_command("getMore", 2, target=123, collection="jobs"))
+    listener.started(_command("ping", 3))
+    listener.succeeded(_command("find", 1, duration_micros=4000))
+    listener.failed(_command("getMore", 2, duration_micros=1000))
+    listener.succeeded(_command("ping", 3, duration_micros=500))
+    listener.succeeded(_command("find", 99, duration_micros=1))  # never started: ignored
+
+    commands = listener.get_metrics()["commands"]
+    assert commands["jobs.find"] == {"count": 1, "avg_ms": 4.0, "max_ms": 4.0, "failures": 0}
+    assert commands["jobs.getMore"]["failures"] == 1
+    assert set(commands) == {"jobs.find", "jobs.getMore", "-.ping"}
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.events.notification_dispatcher import NotificationDispatcher
+from src.infrastructure.events.redis_notification_subscriber import RedisNotificationSubscriber
+
+
+def _event(user_id: str, job_id: str, status: str = "processing") -> dict:
+    return {"user_id": user_id, "job_id": job_id, "status": status}
+
+
+def test_dispatch_preserves_per_user_order():
+    delivered = []
+
+    async def fake_notify(user_id, job_id, status, message=None, session_id=None):
+        # Yield so dispatchers interleave; per-user order must still hold
+        await asyncio.sleep(0)
+        delivered.append((user_id, job_id))
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(notify=fake_notify, workers=4, queue_size=100)
+        await dispatcher.start()
+        for i in range(20):
+            for user in ("u1", "u2", "u3"):
+                await dispatcher.submit(_event(user, f"{user}-{i}"))
+        await dispatcher.join()
+        metrics = dispatcher.get_metrics()
+        await dispatcher.stop()
+        return metrics
+
+    metrics = asyncio.run(scenario())
+
+    assert metrics["dispatched"] == 60
+    assert metrics["queue_depth"] == 0
+    for user in ("u1", "u2", "u3"):
+        jobs = [job for u, job in delivered if u == user]
+        assert jobs == [f"{user}-{i}" for i in range(20)]
+
+
+@pytest.mark.parametrize(
+    "policy,expected",
+    [("drop_oldest", ["j2", "j3"]), ("drop_newest", ["j1", "j2"])],
+)
+def test_overload_policy_bounds_queue(policy, expected):
+    delivered = []
+
+    async def fake_notify(user_id, job_id, status, message=None, session_id=None):
+        delivered.append(job_id)
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(notify=fake_notify, workers=1, queue_size=2, overload_policy=policy)
+        await dispatcher.start()
+        # Submit without yielding so the dispatcher cannot drain in between
+        for job_id in ("j1", "j2", "j3"):
+            await dispatcher.submit(_event("u1", job_id))
+        depth = dispatcher.get_metrics()["queue_depth"]
+        await dispatcher.join()
+        metrics = dispatcher.get_metrics()
+        await dispatcher.stop()
+        return depth, metrics
+
+    depth, metrics = asyncio.run(scenario())
+
+    assert depth == 2
+    assert metrics["dropped"] == 1
+    assert delivered == expected
+
+
+def test_subscriber_rejects_malformed_payloads():
+    subscriber = RedisNotificationSubscriber(dispatcher=NotificationDispatcher(workers=1))
+
+    assert subscriber._parse_message("not json") is None
+    assert subscriber._parse_message('{"type": "job_status_update", "user_id": "u1"}') is None
+    assert subscriber._parse_message('{"type": "other"}') is None
+    assert subscriber._parse_message('{"type": "job_status_update", "user_id": 7, "job_id": "j1", "status": "completed"}') is None
+    event = subscriber._parse_message(
+        '{"type": "job_status_update", "user_id": "u1", "job_id": "j1", "status": "completed", "published_at": 1.5}'
+    )
+    assert event["job_id"] == "j1"
+    assert event["published_at"] == 1.5
+    assert subscriber.get_metrics()["invalid"] == 3
+
+
+class _FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def subscribe(self, channel):
+        pass
+
+    async def unsubscribe(self, channel):
+        pass
+
+    async def close(self):
+        pass
+
+    async def listen(self):
+        for data in self.messages:
+            yield {"type": "message", "data": data}
+
+
+class _FakeRedis:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def pubsub(self):
+        return _FakePubSub(self.messages)
+
+
+def test_subscriber_survives_a_message_that_fails_to_dispatch():
+    delivered = []
+
+    class FailingDispatcher(NotificationDispatcher):
+        async def submit(self, event):
+            if event["job_id"] == "boom":
+                raise RuntimeError("dispatch failed")
+            delivered.append(event["job_id"])
+            return True
+
+    def payload(job_id):
+        return '{"type": "job_status_update", "user_id": "u1", "job_id": "%s", "status": "completed"}' % job_id
+
+    subscriber = RedisNotificationSubscriber(
+        dispatcher=FailingDispatcher(workers=1),
+        redis=_FakeRedis([payload("j1"), payload("boom"), payload("j2")]),
+    )
+    asyncio.run(subscriber._run())
+
+    assert delivered == ["j1", "j2"]
+    assert subscriber.get_metrics()["invalid"] == 1
@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+from src.domain.repositories.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+from src.infrastructure.repositories.pagination import keyset_filter, merge_keyset_pages
+
+
+def test_cursor_round_trip_truncates_to_mongo_precision():
+    oid = ObjectId()
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    decoded_at, decoded_id = decode_cursor(encode_cursor(created_at, oid))
+
+    assert decoded_id == oid
+    assert decoded_at == datetime(2024, 5, 1, 12, 30, 15, 123000, tzinfo=timezone.utc)
+
+
+def test_naive_datetimes_are_treated_as_utc():
+    oid = ObjectId()
+    naive = datetime(2024, 5, 1, 12, 0, 0)
+
+    assert encode_cursor(naive, oid) == encode_cursor(naive.replace(tzinfo=timezone.utc), str(oid))
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", "MTIzOm5vdC1hbi1vaWQ"])
+def test_invalid_cursor_raises(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token)
+
+
+def test_next_cursor_only_for_full_pages():
+    items = [SimpleNamespace(id=str(ObjectId()), created_at=datetime(2024, 1, 1)) for _ in range(3)]
+
+    assert next_cursor(items, limit=5) is None
+    assert next_cursor([], limit=5) is None
+    assert decode_cursor(next_cursor(items, limit=3))[1] == ObjectId(items[-1].id)
+
+
+def test_keyset_filter_breaks_ties_on_id():
+    oid = ObjectId()
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    query = keyset_filter({"user_id": "u1"}, encode_cursor(created_at, oid))
+
+    assert query["user_id"] == "u1"
+    assert query["$or"] == [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": oid}},
+    ]
+    assert keyset_filter({"user_id": "u1"}, None) == {"user_id": "u1"}
+
+
+def test_merge_keyset_pages_orders_and_deduplicates():
+    ids = sorted(ObjectId() for _ in range(4))
+    same_time = datetime(2024, 1, 2)
+    hot = [{"_id": ids[3], "created_at": same_time}, {"_id": ids[0], "created_at": datetime(2024, 1, 1)}]
+    cold = [{"_id": ids[2], "created_at": same_time}, {"_id": ids[0], "created_at": datetime(2024, 1, 1)}]
+
+    merged = merge_keyset_pages(hot, cold)
+
+    assert [doc["_id"] for doc in merged] == [ids[3], ids[2], ids[0]]
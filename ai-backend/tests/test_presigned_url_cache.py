@@ -0,0 +1,28 @@
+import time
+
+from src.infrastructure.cache.presigned_url_cache import PresignedUrlCache
+
+
+def test_urls_are_reused_then_dropped_before_expiry(monkeypatch):
+    cache = PresignedUrlCache(max_entries=10)
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    cache.put("k", "https://signed/1", expires_in=3600)
+    now[0] += 2800
+    reused = cache.get("k")
+    # Less than 20% of the lifetime left: a client must get a fresh signature
+    now[0] += 100
+    expired = cache.get("k")
+
+    assert reused == "https://signed/1"
+    assert expired is None
+    assert cache.get_metrics()["hits"] == 1
+
+
+def test_short_lived_urls_are_not_cached():
+    cache = PresignedUrlCache(max_entries=10)
+
+    cache.put("k", "https://signed/1", expires_in=60)
+
+    assert cache.get("k") is None
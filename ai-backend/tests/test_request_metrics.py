@@ -0,0 +1,73 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infrastructure.metrics import LatencyHistogram
+from src.presentation.api.request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+
+def make_client(metrics: RequestMetrics, slow_threshold_ms: float = 0) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return {"id": job_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics, slow_threshold_ms=slow_threshold_ms)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_requests_are_recorded_per_route_template():
+    metrics = RequestMetrics()
+    client = make_client(metrics)
+
+    client.get("/jobs/a")
+    client.get("/jobs/b")
+    client.get("/missing")
+
+    routes = metrics.get_metrics()["routes"]
+    assert routes["GET /jobs/{job_id}"]["count"] == 2
+    assert routes["GET /jobs/{job_id}"]["statuses"] == {"2xx": 2}
+    assert routes["GET <unmatched>"]["statuses"] == {"4xx": 1}
+    assert metrics.in_flight == 0
+    assert metrics.in_flight_max == 1
+
+
+def test_unhandled_exception_counts_as_error_without_middleware_logging(caplog):
+    metrics = RequestMetrics()
+    client = make_client(metrics)
+
+    with caplog.at_level(logging.WARNING, logger="src.presentation.api.request_metrics"):
+        assert client.get("/boom").status_code == 500
+
+    assert metrics.get_metrics()["routes"]["GET /boom"]["errors"] == 1
+    # The app's exception handler owns the traceback; the middleware adds no second error line
+    assert caplog.records == []
+
+
+def test_only_slow_requests_are_logged(caplog):
+    metrics = RequestMetrics()
+    fast, slow = make_client(metrics, slow_threshold_ms=60_000), make_client(RequestMetrics(), slow_threshold_ms=0.000001)
+
+    with caplog.at_level(logging.DEBUG, logger="src.presentation.api.request_metrics"):
+        fast.get("/jobs/a")
+        assert caplog.records == []
+        slow.get("/jobs/a")
+
+    assert "slow request method=GET route=/jobs/{job_id} status=200" in caplog.records[0].getMessage()
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = LatencyHistogram(bounds=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 90 + [0.05] * 9 + [3.0]:
+        histogram.observe(seconds)
+
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.95) == 0.1
+    assert histogram.quantile(1.0) == 3.0
+    assert histogram.cumulative() == [(0.01, 90), (0.1, 99), (1.0, 99), (float("inf"), 100)]
@@ -0,0 +1,191 @@
+"""S3 storage against an S3-compatible stand-in (MinIO, moto server, ...).
+
+    docker run -d -p 9000:9000 minio/minio server /data
+    TEST_S3_ENDPOINT_URL=http://localhost:9000 AWS_ACCESS_KEY_ID=minioadmin AWS_SECRET_ACCESS_KEY=minioadmin \\
+        pytest tests/test_s3_storage_service.py
+"""
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+
+TEST_S3_ENDPOINT_URL = os.getenv("TEST_S3_ENDPOINT_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_S3_ENDPOINT_URL, reason="TEST_S3_ENDPOINT_URL not set")
+
+
+def _service(**kwargs):
+    from src.infrastructure.storage.s3_storage_service import S3StorageService
+
+    return S3StorageService(f"test-{uuid.uuid4().hex[:12]}", endpoint_url=TEST_S3_ENDPOINT_URL, **kwargs)
+
+
+def test_concurrent_uploads_do_not_block_the_loop():
+    service = _service(max_pool_connections=8)
+    payload = os.urandom(256 * 1024)
+
+    async def scenario():
+        stalls = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                stalls.append(now - last)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        try:
+            urls = await asyncio.gather(*(service.upload_artifact(payload, f"out{i}.bin", "application/octet-stream") for i in range(16)))
+            client = await service._get_client()
+            bodies = []
+            for url in urls:
+                obj = await client.get_object(Bucket=service.bucket_name, Key=service._key_from_url(url))
+                async with obj["Body"] as stream:
+                    bodies.append(await stream.read())
+            deleted = [await service.delete_artifact(url) for url in urls]
+            return urls, bodies, deleted, max(stalls)
+        finally:
+            tick.cancel()
+            await service.close()
+
+    urls, bodies, deleted, max_stall = asyncio.run(scenario())
+
+    assert len(set(urls)) == 16 and all(body == payload for body in bodies)
+    assert all(deleted)
+    # Blocking uploads would hold the loop for whole requests
+    assert max_stall < 0.5
+
+
+def _collect(service, url):
+    async def read():
+        client = await service._get_client()
+        obj = await client.get_object(Bucket=service.bucket_name, Key=service._key_from_url(url))
+        async with obj["Body"] as stream:
+            return await stream.read()
+
+    return read()
+
+
+def test_stream_upload_uses_multipart_parts():
+    service = _service(multipart_part_size=5 * 1024 * 1024, multipart_concurrency=2)
+    payload = os.urandom(11 * 1024 * 1024 + 17)
+
+    async def chunks():
+        for start in range(0, len(payload), 300 * 1024):
+            yield payload[start:start + 300 * 1024]
+
+    async def chunks_of(data):
+        yield data
+
+    async def scenario():
+        try:
+            url = await service.upload_artifact_stream(chunks(), "big.bin", "application/octet-stream")
+            small_url = await service.upload_artifact_stream(chunks_of(b"tiny"), "small.bin", "application/octet-stream")
+            return await _collect(service, url), await _collect(service, small_url)
+        finally:
+            await service.close()
+
+    body, small = asyncio.run(scenario())
+
+    assert body == payload
+    assert small == b"tiny"
+
+
+def test_failed_stream_upload_is_aborted():
+    service = _service(multipart_part_size=5 * 1024 * 1024, multipart_concurrency=2)
+
+    async def broken():
+        for _ in range(12):
+            yield os.urandom(1024 * 1024)
+        raise RuntimeError("source failed")
+
+    async def scenario():
+        try:
+            with pytest.raises(RuntimeError):
+                await service.upload_artifact_stream(broken(), "broken.bin", "application/octet-stream")
+            client = await service._get_client()
+            return await client.list_multipart_uploads(Bucket=service.bucket_name)
+        finally:
+            await service.close()
+
+    uploads = asyncio.run(scenario())
+
+    assert not uploads.get("Uploads")
+
+
+def test_presigned_urls_grant_access_and_are_reused():
+    import urllib.request
+
+    service = _service()
+
+    async def scenario():
+        try:
+            ref = await service.upload_artifact(b"signed bytes", "a.txt", "text/plain")
+            first = await service.generate_presigned_url(ref, expires_in=600)
+            second = await service.generate_presigned_url(ref, expires_in=600)
+            new_ref, put_url = await service.generate_upload_url("b.txt", "text/plain", expires_in=600)
+            return ref, first, second, new_ref, put_url
+        finally:
+            await service.close()
+
+    ref, first, second, new_ref, put_url = asyncio.run(scenario())
+    request = urllib.request.Request(put_url, data=b"direct", method="PUT", headers={"Content-Type": "text/plain"})
+    urllib.request.urlopen(request).close()
+
+    assert ref.startswith(f"s3://{service.bucket_name}/")
+    assert first == second
+    with urllib.request.urlopen(first) as response:
+        assert response.read() == b"signed bytes"
+    assert asyncio.run(_collect(service, new_ref)) == b"direct"
+
+
+class _MemoryRefs:
+    def __init__(self):
+        self.counts = {}
+
+    async def acquire(self, artifact_id):
+        self.counts[artifact_id] = self.counts.get(artifact_id, 0) + 1
+        return self.counts[artifact_id]
+
+    async def release(self, artifact_id):
+        remaining = max(0, self.counts.get(artifact_id, 0) - 1)
+        if remaining:
+            self.counts[artifact_id] = remaining
+        else:
+            self.counts.pop(artifact_id, None)
+        return remaining
+
+
+def test_content_addressed_uploads_share_one_object_until_the_last_delete():
+    service = _service(content_addressed=True, artifact_refs=_MemoryRefs(), multipart_part_size=5 * 1024 * 1024)
+    payload = os.urandom(6 * 1024 * 1024)
+
+    async def chunks():
+        yield payload
+
+    async def scenario():
+        try:
+            first = await service.upload_artifact(payload, "out.bin", "application/octet-stream")
+            second = await service.upload_artifact_stream(chunks(), "out.bin", "application/octet-stream")
+            client = await service._get_client()
+            listed = await client.list_objects_v2(Bucket=service.bucket_name)
+            key = service._key_from_url(first)
+            await service.delete_artifact(first)
+            after_one = await service._exists(client, key)
+            await service.delete_artifact(second)
+            after_both = await service._exists(client, key)
+            return first, second, [obj["Key"] for obj in listed.get("Contents", [])], after_one, after_both
+        finally:
+            await service.close()
+
+    first, second, keys, after_one, after_both = asyncio.run(scenario())
+
+    assert first == second
+    # The staged multipart upload was removed after promotion
+    assert keys == [service._key_from_url(first)]
+    assert after_one is True
+    assert after_both is False
@@ -0,0 +1,30 @@
+from celery.exceptions import SoftTimeLimitExceeded
+
+from src.infrastructure.queue import tasks
+
+
+class FakeRuntime:
+    def __init__(self):
+        self.ran = []
+
+    def run(self, coro):
+        self.ran.append(coro.cr_code.co_name)
+        coro.close()
+
+
+def test_soft_time_limit_before_processing_starts_still_fails_the_job(monkeypatch):
+    runtime = FakeRuntime()
+    timed_out = []
+
+    def observe_job_started(*args):
+        raise SoftTimeLimitExceeded()
+
+    monkeypatch.setattr(tasks.WorkerRuntime, "get", classmethod(lambda cls: runtime))
+    monkeypatch.setattr(tasks.job_metrics, "observe_job_started", observe_job_started)
+    monkeypatch.setattr(tasks.job_metrics, "observe_job_finished", lambda job_type, outcome, *args: timed_out.append((job_type, outcome)))
+
+    result = tasks._run_job("j1", {"job_type": "text_generation", "user_id": "u1"})
+
+    assert result["error"] == "soft_time_limit_exceeded"
+    assert timed_out == [("text_generation", "timeout")]
+    assert runtime.ran == ["_mark_job_failed_async"]
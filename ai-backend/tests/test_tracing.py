@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from src.domain.services.tracing import current_traceparent, record_span, set_span_exporter, start_span
+from src.infrastructure.events.notification_dispatcher import NotificationDispatcher
+from src.infrastructure.tracing import FileSpanExporter, InMemorySpanExporter, format_trace, read_spans
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    previous = set_span_exporter(exporter)
+    yield exporter
+    set_span_exporter(previous)
+
+
+def test_spans_nest_and_continue_a_remote_traceparent(exporter):
+    with start_span("POST /jobs") as root:
+        with start_span("celery.publish", job_id="j1"):
+            header = current_traceparent()
+
+    # Another process picks the trace up from the header
+    record_span("job.queue_wait", root.start, root.start + 0.5, traceparent=header)
+    with pytest.raises(RuntimeError):
+        with start_span("job.task", traceparent=header):
+            raise RuntimeError("boom")
+
+    spans = {s["name"]: s for s in exporter.spans(root.trace_id)}
+    assert set(spans) == {"POST /jobs", "celery.publish", "job.queue_wait", "job.task"}
+    assert spans["celery.publish"]["parent_id"] == spans["POST /jobs"]["span_id"]
+    assert spans["job.task"]["parent_id"] == spans["celery.publish"]["span_id"]
+    assert spans["job.queue_wait"]["duration_ms"] == pytest.approx(500.0)
+    assert spans["job.task"]["error"] == "RuntimeError: boom"
+    assert current_traceparent() is None
+
+
+def test_without_an_exporter_nothing_is_traced():
+    previous = set_span_exporter(None)
+    try:
+        with start_span("POST /jobs") as span:
+            assert span is None
+            assert current_traceparent() is None
+        assert record_span("job.queue_wait", 0.0, 1.0, traceparent="00-" + "a" * 32 + "-" + "b" * 16 + "-01") is None
+    finally:
+        set_span_exporter(previous)
+
+
+def test_dispatcher_continues_the_publishers_trace(exporter):
+    seen = []
+
+    async def fake_notify(user_id, job_id, status, message=None, session_id=None):
+        seen.append(current_traceparent())
+
+    async def run():
+        dispatcher = NotificationDispatcher(notify=fake_notify, workers=1, queue_size=10)
+        await dispatcher.start()
+        with start_span("notification.publish") as publish:
+            event = {"user_id": "u1", "job_id": "j1", "status": "COMPLETED", "traceparent": publish.traceparent}
+        await dispatcher.submit(event)
+        await dispatcher.submit({"user_id": "u1", "job_id": "j2", "status": "COMPLETED"})
+        await dispatcher.join()
+        await dispatcher.stop()
+        return publish
+
+    publish = asyncio.run(run())
+
+    fanout = [s for s in exporter.spans() if s["name"] == "notification.fanout"]
+    assert len(fanout) == 1
+    assert fanout[0]["parent_id"] == publish.span_id
+    assert seen[0].split("-")[2] == fanout[0]["span_id"]
+    # Events without a traceparent are not traced
+    assert seen[1] is None
+
+
+def test_file_exporter_round_trips_and_formats_a_trace(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = FileSpanExporter(str(path))
+    previous = set_span_exporter(exporter)
+    try:
+        with start_span("POST /jobs") as root:
+            with start_span("job.insert"):
+                pass
+            record_span("job.queue_wait", root.start, root.start + 0.25, job_id="j1")
+    finally:
+        set_span_exporter(previous)
+        exporter.close()
+
+    spans = read_spans(str(path))
+    assert [s["name"] for s in spans] == ["job.insert", "job.queue_wait", "POST /jobs"]
+
+    lines = format_trace(spans).splitlines()
+    assert [line.split("ms", 2)[2].strip() for line in lines] == ["POST /jobs", "job.queue_wait job_id=j1", "job.insert"]
+    assert lines[0].split()[0] == "0.0ms"
@@ -0,0 +1,127 @@
+"""User cache and provisioning.
+
+The provisioning test needs TEST_MONGODB_URL (e.g. mongodb://localhost:27017); a throwaway database is used.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from src.domain.entities import User, UserCreate, UserUpdate
+from src.infrastructure.cache.user_cache import UserCache
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories import CachedUserRepository, MongoUserRepository
+
+TEST_MONGODB_URL = os.getenv("TEST_MONGODB_URL")
+
+
+class FakeUserRepository:
+    def __init__(self, users=()):
+        self.users = {user.clerk_id: user for user in users}
+        self.reads = 0
+
+    async def get_by_clerk_id(self, clerk_id):
+        self.reads += 1
+        await asyncio.sleep(0)
+        return self.users.get(clerk_id)
+
+    async def provision(self, user_data):
+        self.reads += 1
+        created = user_data.clerk_id not in self.users
+        if created:
+            self.users[user_data.clerk_id] = User(clerk_id=user_data.clerk_id, email=user_data.email)
+        return self.users[user_data.clerk_id], created
+
+    async def update(self, user_id, user_data):
+        for clerk_id, user in list(self.users.items()):
+            if str(user.id) == user_id:
+                updated = user.model_copy(update=user_data.model_dump(exclude_none=True))
+                del self.users[clerk_id]
+                self.users[updated.clerk_id] = updated
+                return updated
+        return None
+
+
+def test_clerk_lookups_are_served_from_cache_until_updated():
+    user = User(clerk_id="c1", email="a@example.com", name="Ann")
+    repo = FakeUserRepository([user])
+    cached = CachedUserRepository(repo, UserCache(max_entries=10, ttl=60))
+
+    async def scenario():
+        first = await cached.get_by_clerk_id("c1")
+        again = await cached.get_by_clerk_id("c1")
+        provisioned, created = await cached.provision(UserCreate(clerk_id="c1", email="a@example.com"))
+        await cached.update(str(user.id), UserUpdate(name="Anne"))
+        after_update = await cached.get_by_clerk_id("c1")
+        return first, again, provisioned, created, after_update
+
+    first, again, provisioned, created, after_update = asyncio.run(scenario())
+
+    assert first.name == again.name == provisioned.name == "Ann" and not created
+    assert after_update.name == "Anne"
+    assert repo.reads == 2
+
+
+def test_read_racing_an_update_is_not_cached():
+    user = User(clerk_id="c1", email="a@example.com")
+    cache = UserCache(max_entries=10, ttl=60)
+    cached = CachedUserRepository(FakeUserRepository([user]), cache)
+
+    async def scenario():
+        read = asyncio.create_task(cached.get_by_clerk_id("c1"))
+        await asyncio.sleep(0)  # read is in flight
+        cache.invalidate(clerk_id="c1")
+        await read
+
+    asyncio.run(scenario())
+
+    assert cache.get("c1") is None
+    assert cache.get_metrics()["stale_skipped"] == 1
+
+
+@pytest.mark.skipif(not TEST_MONGODB_URL, reason="TEST_MONGODB_URL not set")
+def test_provision_creates_returns_and_relinks():
+    async def scenario():
+        name = f"test_users_{uuid.uuid4().hex[:8]}"
+        await MongoDB.connect_to_mongo(TEST_MONGODB_URL, name)
+        try:
+            await MongoDB.get_database().users.create_index("clerk_id", unique=True)
+            await MongoDB.get_database().users.create_index("email", unique=True)
+            repo = MongoUserRepository()
+            created = await repo.provision(UserCreate(clerk_id="c1", email="a@example.com", name="Ann"))
+            existing = await repo.provision(UserCreate(clerk_id="c1", email="a@example.com"))
+            relinked = await repo.provision(UserCreate(clerk_id="c2", email="a@example.com"))
+            return created, existing, relinked, await MongoDB.get_database().users.count_documents({})
+        finally:
+            await MongoDB.client.drop_database(name)
+            await MongoDB.close_mongo_connection()
+
+    (user, was_created), (same, again_created), (relinked, relink_created), count = asyncio.run(scenario())
+
+    assert was_created and not again_created and not relink_created
+    assert user.id == same.id == relinked.id and user.name == "Ann"
+    assert relinked.clerk_id == "c2"
+    assert count == 1
+
+
+@pytest.mark.skipif(not TEST_MONGODB_URL, reason="TEST_MONGODB_URL not set")
+def test_concurrent_provisions_report_one_creation():
+    async def scenario():
+        name = f"test_users_{uuid.uuid4().hex[:8]}"
+        await MongoDB.connect_to_mongo(TEST_MONGODB_URL, name)
+        try:
+            await MongoDB.get_database().users.create_index("clerk_id", unique=True)
+            await MongoDB.get_database().users.create_index("email", unique=True)
+            repo = MongoUserRepository()
+            return await asyncio.gather(*(
+                repo.provision(UserCreate(clerk_id="c1", email="a@example.com")) for _ in range(5)
+            ))
+        finally:
+            await MongoDB.client.drop_database(name)
+            await MongoDB.close_mongo_connection()
+
+    results = asyncio.run(scenario())
+
+    assert [created for _, created in results].count(True) == 1
+    assert len({user.id for user, _ in results}) == 1
@@ -0,0 +1,195 @@
+"""
+Logging setup: records are queued by the calling thread and formatted and written by a background thread
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .settings import settings
+
+DEFAULT_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock ``prepare`` renders the message (and traceback) in the logging thread so records
+    can be pickled; ours never leave the process, so the record is queued as is. Arguments are
+    therefore rendered slightly later: log values, not objects that are mutated right after.
+    The queue is an unbounded ``SimpleQueue`` (far cheaper per put than ``queue.Queue``) capped
+    at ``max_size`` here: beyond it the record is dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: "queue.SimpleQueue[logging.LogRecord]", max_size: int):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.max_size and self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class SamplingFilter(logging.Filter):
+    """Passes at most ``per_second`` records per call site per second at or below ``max_level``.
+
+    Meant for chatty DEBUG logs on hot paths: the first records of a burst get through, the rest
+    are dropped cheaply before they are queued, and the next record that passes from that call
+    site carries ``[+N sampled out]``. Records above ``max_level`` always pass.
+    """
+
+    def __init__(self, per_second: float, max_level: int = logging.DEBUG):
+        super().__init__()
+        self.per_second = per_second
+        self.max_level = max_level
+        self._lock = threading.Lock()
+        # call site -> (window start, passed in window, dropped since last pass)
+        self._sites: Dict[Tuple[str, int], List[float]] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or self.per_second <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [now, 0, 0]
+            if now - site[0] >= 1.0:
+                site[0], site[1] = now, 0
+            if site[1] >= self.per_second:
+                site[2] += 1
+                self.dropped += 1
+                return False
+            site[1] += 1
+            skipped, site[2] = site[2], 0
+        if skipped:
+            record.msg = f"{record.msg} [+{skipped} sampled out]"
+        return True
+
+
+_lock = threading.Lock()
+_root_handler: Optional[_DeferredQueueHandler] = None
+_sampler: Optional[SamplingFilter] = None
+_listeners: List[logging.handlers.QueueListener] = []
+# logger name -> (queue handler installed, the handlers it replaced)
+_moved: Dict[str, Tuple[_DeferredQueueHandler, List[logging.Handler]]] = {}
+_fork_hook_registered = False
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """``"uvicorn=INFO,pymongo=WARNING"`` -> {logger name: level}"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+def _start_listener(log_queue: "queue.SimpleQueue[logging.LogRecord]", handlers: List[logging.Handler]) -> None:
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def _restart_listeners_after_fork() -> None:
+    # Listener threads do not survive fork; the child gets fresh ones on the same queues
+    old = list(_listeners)
+    _listeners.clear()
+    for listener in old:
+        _start_listener(listener.queue, list(listener.handlers))
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener threads"""
+    with _lock:
+        for listener in _listeners:
+            listener.stop()
+        _listeners.clear()
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    logger_levels: Optional[str] = None,
+    sample_per_second: Optional[float] = None,
+    queue_size: Optional[int] = None,
+    stream=None,
+    fmt: str = DEFAULT_FORMAT,
+) -> None:
+    """Route all logging through an in-memory queue drained by a background thread.
+
+    The root logger gets the queue handler (with the sampling filter) and writes to ``stream``
+    (stderr) from the listener thread. Loggers that keep their own handlers (``LOG_QUEUED_LOGGERS``,
+    e.g. a library that installs its own) have them moved behind a queue too. Levels come from ``LOG_LEVEL``
+    and ``LOG_LEVELS``. Safe to call again (e.g. on reload): the previous setup is replaced.
+    """
+    global _root_handler, _sampler, _fork_hook_registered
+    stop_logging()
+    with _lock:
+        root = logging.getLogger()
+        if _root_handler is not None:
+            root.removeHandler(_root_handler)
+        else:
+            # Replace whatever basicConfig/uvicorn put on the root logger
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+        for name, (queue_handler, original) in _moved.items():
+            logger = logging.getLogger(name)
+            logger.removeHandler(queue_handler)
+            for handler in original:
+                logger.addHandler(handler)
+        _moved.clear()
+
+        root.setLevel(logging.getLevelName((level or settings.log_level or ("DEBUG" if settings.debug else "INFO")).upper()))
+        for name, logger_level in parse_levels(settings.log_levels if logger_levels is None else logger_levels).items():
+            logging.getLogger(name).setLevel(logger_level)
+
+        size = settings.log_queue_size if queue_size is None else queue_size
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(logging.Formatter(fmt))
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _root_handler = _DeferredQueueHandler(log_queue, size)
+        _sampler = SamplingFilter(settings.log_sample_per_second if sample_per_second is None else sample_per_second)
+        _root_handler.addFilter(_sampler)
+        root.addHandler(_root_handler)
+        _start_listener(log_queue, [output])
+
+        for name in [n.strip() for n in settings.log_queued_loggers.split(",") if n.strip()]:
+            logger = logging.getLogger(name)
+            own = list(logger.handlers)
+            if not own:
+                continue
+            own_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            for handler in own:
+                logger.removeHandler(handler)
+            queue_handler = _DeferredQueueHandler(own_queue, size)
+            logger.addHandler(queue_handler)
+            _moved[name] = (queue_handler, own)
+            _start_listener(own_queue, own)
+
+        if not _fork_hook_registered:
+            os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+            atexit.register(stop_logging)
+            _fork_hook_registered = True
+
+
+def get_logging_metrics() -> Dict[str, int]:
+    return {
+        "queued": sum(listener.queue.qsize() for listener in _listeners),
+        "dropped_queue_full": (_root_handler.dropped if _root_handler else 0)
+        + sum(queue_handler.dropped for queue_handler, _ in _moved.values()),
+        "sampled_out": _sampler.dropped if _sampler else 0,
+    }
@@ -7,6 +7,14 @@ class Settings(BaseSettings):
     # Database
     mongodb_url: str = Field(..., validation_alias=AliasChoices("MONGODB_URL", "mongodb_url"))
     database_name: str = Field("ai_backend", validation_alias=AliasChoices("DATABASE_NAME", "database_name"))
+    # Connection pool and wire compression (keyword options override the same options in MONGODB_URL).
+    # Pool limits apply per client, and a worker process runs several (motor, the status writer,
+    # GridFS), so each process may open up to about three times MONGO_MAX_POOL_SIZE connections.
+    mongo_max_pool_size: int = Field(10, validation_alias=AliasChoices("MONGO_MAX_POOL_SIZE", "mongo_max_pool_size"))  # per client
+    mongo_min_pool_size: int = Field(0, validation_alias=AliasChoices("MONGO_MIN_POOL_SIZE", "mongo_min_pool_size"))
+    mongo_max_idle_time_ms: Optional[int] = Field(None, validation_alias=AliasChoices("MONGO_MAX_IDLE_TIME_MS", "mongo_max_idle_time_ms"))  # None keeps idle connections
+    mongo_wait_queue_timeout_ms: Optional[int] = Field(None, validation_alias=AliasChoices("MONGO_WAIT_QUEUE_TIMEOUT_MS", "mongo_wait_queue_timeout_ms"))  # fail fast when the pool is exhausted
+    mongo_compressors: str = Field("", validation_alias=AliasChoices("MONGO_COMPRESSORS", "mongo_compressors"))  # e.g. "zstd,zlib"; zstd needs the zstandard package
     
     # Redis/Queue
     redis_url: str = Field(..., validation_alias=AliasChoices("REDIS_URL", "redis_url"))
@@ -25,8 +33,33 @@ class Settings(BaseSettings):
     s3_region: str = Field("us-east-1", validation_alias=AliasChoices("S3_REGION", "s3_region"))
     s3_endpoint_url: Optional[str] = Field(None, validation_alias=AliasChoices("S3_ENDPOINT_URL", "s3_endpoint_url"))  # For MinIO
     
+    # Write-behind job status updates (see JobStatusWriter)
+    status_flush_interval_ms: float = Field(5.0, validation_alias=AliasChoices("STATUS_FLUSH_INTERVAL_MS", "status_flush_interval_ms"))
+    status_flush_max_batch: int = Field(500, validation_alias=AliasChoices("STATUS_FLUSH_MAX_BATCH", "status_flush_max_batch"))
+    
+    # Publish status updates on Redis; turn off when the API uses NOTIFICATION_BACKEND=change_stream
+    publish_status_notifications: bool = Field(True, validation_alias=AliasChoices("PUBLISH_STATUS_NOTIFICATIONS", "publish_status_notifications"))
+    
+    # Each pool process serves /metrics on the first free port from WORKER_METRICS_PORT (0 = off)
+    worker_metrics_port: int = Field(0, validation_alias=AliasChoices("WORKER_METRICS_PORT", "worker_metrics_port"))
+    worker_metrics_port_attempts: int = Field(16, validation_alias=AliasChoices("WORKER_METRICS_PORT_ATTEMPTS", "worker_metrics_port_attempts"))  # one port per pool process
+    # Tracing (see domain/services/tracing.py): spans continue the API's trace from the task's traceparent header
+    trace_exporter: str = Field("none", validation_alias=AliasChoices("TRACE_EXPORTER", "trace_exporter"))  # none | memory | file
+    trace_file_path: str = Field("traces.jsonl", validation_alias=AliasChoices("TRACE_FILE_PATH", "trace_file_path"))  # JSON lines; API and workers can share it
+    trace_memory_max_spans: int = Field(10000, validation_alias=AliasChoices("TRACE_MEMORY_MAX_SPANS", "trace_memory_max_spans"))
+    
+    # Outputs larger than this (JSON bytes) are stored in GridFS; the job keeps a preview and output_ref (0 disables)
+    output_inline_max_bytes: int = Field(16384, validation_alias=AliasChoices("OUTPUT_INLINE_MAX_BYTES", "output_inline_max_bytes"))
+    output_preview_chars: int = Field(512, validation_alias=AliasChoices("OUTPUT_PREVIEW_CHARS", "output_preview_chars"))
+    
     # Debug flag for worker
     debug: bool = Field(True, validation_alias=AliasChoices("DEBUG", "debug"))
+    # Logging (see config/logging_config.py): formatting and output happen on a background thread
+    log_level: Optional[str] = Field(None, validation_alias=AliasChoices("LOG_LEVEL", "log_level"))  # default: DEBUG when DEBUG=true, else INFO
+    log_levels: str = Field("celery=INFO,pymongo=WARNING,botocore=WARNING", validation_alias=AliasChoices("LOG_LEVELS", "log_levels"))  # per-logger overrides, "name=LEVEL,..."
+    log_sample_per_second: float = Field(20.0, validation_alias=AliasChoices("LOG_SAMPLE_PER_SECOND", "log_sample_per_second"))  # max DEBUG records per call site per second; 0 = no sampling
+    log_queue_size: int = Field(10000, validation_alias=AliasChoices("LOG_QUEUE_SIZE", "log_queue_size"))  # records beyond this are dropped, never block
+    log_queued_loggers: str = Field("", validation_alias=AliasChoices("LOG_QUEUED_LOGGERS", "log_queued_loggers"))  # loggers with their own handlers to move off-thread too
     
     # Pydantic v2 settings config
     model_config = SettingsConfigDict(
@@ -0,0 +1,95 @@
+"""
+Worker Container - Per-process services and a persistent event loop shared by every task
+"""
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Optional, TypeVar
+
+from src.config.settings import settings
+from src.infrastructure.database.status_writer import JobStatusWriter
+from src.infrastructure.events.simple_job_notifier import SimpleJobNotifier
+from src.infrastructure.metrics import start_metrics_server
+from src.infrastructure.tracing import configure_tracing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerContainer:
+    """Long-lived services for one worker process, built once instead of per task.
+
+    Holds an event loop running in a daemon thread (tasks submit coroutines with ``run`` rather
+    than paying for ``asyncio.run`` and fresh clients every job), the notifier with its single
+    Redis connection pool on that loop, and the process's JobStatusWriter. Safe to use from any
+    pool thread. Create one per process (see ``get``); a forked child builds its own. With
+    ``WORKER_METRICS_PORT`` set, the process also serves its ``/metrics``; with ``TRACE_EXPORTER``
+    set, it exports its job spans.
+    """
+
+    _instance: Optional["WorkerContainer"] = None
+    _instance_pid: Optional[int] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        configure_tracing()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="worker_event_loop", daemon=True)
+        self._thread.start()
+        self.status_writer = JobStatusWriter.get()
+        self.notifier: Optional[SimpleJobNotifier] = SimpleJobNotifier() if settings.publish_status_notifications else None
+        self.metrics_server = (
+            start_metrics_server(settings.worker_metrics_port, attempts=settings.worker_metrics_port_attempts)
+            if settings.worker_metrics_port else None
+        )
+        logger.info("[WorkerContainer] started pid=%s", os.getpid())
+
+    @classmethod
+    def get(cls) -> "WorkerContainer":
+        """The container for this process (rebuilt after fork)"""
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance_pid != os.getpid():
+                cls._instance = WorkerContainer()
+                cls._instance_pid = os.getpid()
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close this process's container, if any"""
+        with cls._instance_lock:
+            instance = cls._instance if cls._instance_pid == os.getpid() else None
+            cls._instance = None
+            cls._instance_pid = None
+        if instance is not None:
+            instance.close()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the shared loop and wait for its result.
+
+        If the caller is interrupted (e.g. Celery's soft time limit), the coroutine is cancelled too.
+        """
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        if not self.loop.is_running():
+            return
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+        if self.notifier is not None:
+            try:
+                self.run(self.notifier.close(), timeout=5)
+            except Exception:
+                logger.exception("[WorkerContainer] notifier close failed")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
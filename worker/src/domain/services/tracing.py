@@ -0,0 +1,165 @@
+"""
+Tracing - Lightweight spans carried in contextvars and propagated as W3C ``traceparent`` strings
+"""
+import contextvars
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed operation. ``start``/``end`` are Unix seconds so spans from different processes line up."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attributes", "error")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        start: Optional[float] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start = time.time() if start is None else start
+        self.end: Optional[float] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end is None else (self.end - self.start) * 1000.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanExporter(ABC):
+    """Receives every finished span; must not block (it is called on the traced code's thread)"""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+_exporter: Optional[SpanExporter] = None
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+
+
+def set_span_exporter(exporter: Optional[SpanExporter]) -> Optional[SpanExporter]:
+    """Install the process's exporter (None turns tracing off); returns the previous one"""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+def parse_traceparent(traceparent: Optional[str]) -> Optional[Tuple[str, str]]:
+    """``00-<trace id>-<parent span id>-<flags>`` -> (trace id, parent span id); None if malformed"""
+    if not traceparent:
+        return None
+    parts = traceparent.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """Header value for the active span, to hand to another process (None when not tracing)"""
+    span = _current.get()
+    return span.traceparent if span is not None else None
+
+
+def _parent(traceparent: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(trace id, parent span id) from ``traceparent`` if valid, else the active span; (None, None) if neither"""
+    remote = parse_traceparent(traceparent)
+    if remote is not None:
+        return remote
+    parent = _current.get()
+    if parent is not None:
+        return parent.trace_id, parent.span_id
+    return None, None
+
+
+def _finish(span: Span, end: Optional[float] = None) -> None:
+    span.end = time.time() if end is None else end
+    exporter = _exporter
+    if exporter is None:
+        return
+    try:
+        exporter.export(span)
+    except Exception:
+        logger.exception("[tracing] exporter failed span=%s", span.name)
+
+
+@contextmanager
+def start_span(name: str, traceparent: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the active span, or of ``traceparent`` when given.
+
+    Without an exporter this yields None and does nothing else, so call sites can stay in place
+    with tracing off. A new trace starts when there is no parent. Exceptions are recorded on
+    the span and re-raised.
+    """
+    if _exporter is None:
+        yield None
+        return
+    trace_id, parent_id = _parent(traceparent)
+    span = Span(name, trace_id or os.urandom(16).hex(), parent_id, attributes=attributes)
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        _finish(span)
+
+
+def record_span(
+    name: str, start: float, end: float, traceparent: Optional[str] = None, **attributes: Any
+) -> Optional[Span]:
+    """Export a span whose timing is already known (e.g. queue wait, from created_at to pickup)"""
+    if _exporter is None:
+        return None
+    trace_id, parent_id = _parent(traceparent)
+    if trace_id is None:
+        return None
+    span = Span(name, trace_id, parent_id, start=start, attributes=attributes)
+    _finish(span, end)
+    return span
@@ -0,0 +1,191 @@
+"""
+Index manager - declares the indexes every repository query relies on and creates them idempotently
+"""
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from src.domain.entities.job import ACTIVE_JOB_STATUSES
+from src.infrastructure.database.mongodb import client_options
+
+logger = logging.getLogger(__name__)
+
+
+# Mirrors ai-backend/src/infrastructure/database/indexes.py, which documents the query shapes.
+# Whichever service starts first creates them; creation is idempotent.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("clerk_id", ASCENDING)], name="clerk_id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    ],
+    "jobs": [
+        # get_by_user_id / get_summaries_by_user_id
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_id_created_at_id",
+        ),
+        # get_by_status
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id",
+        ),
+        # list_jobs
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        # Enforces one active job per (user_id, session_id) and serves get_active_by_user_session.
+        # Only pending/processing jobs with a session are indexed, so the index stays tiny no
+        # matter how much history accumulates.
+        IndexModel(
+            [("user_id", ASCENDING), ("session_id", ASCENDING)],
+            name="active_user_session_unique",
+            unique=True,
+            partialFilterExpression={
+                "session_id": {"$type": "string"},
+                "status": {"$in": [s.value for s in ACTIVE_JOB_STATUSES]},
+            },
+        ),
+    ],
+    # MongoJobStatsRepository.get_stats sums every user's counters for a day (day null = active gauge)
+    "job_counters": [IndexModel([("day", ASCENDING)], name="day")],
+    # Cold tier written by JobArchiver; only read for include_archived listings and id lookups
+    "jobs_archive": [
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_id_created_at_id",
+        ),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    ],
+}
+
+# Collections that need creation options; created before their indexes (which would otherwise
+# create them implicitly with defaults). The archive is rarely read, so it trades CPU for disk.
+COLLECTION_OPTIONS: Dict[str, Dict] = {
+    "jobs_archive": {"storageEngine": {"wiredTiger": {"configString": "block_compressor=zstd"}}},
+}
+
+# Indexes superseded by a declared one: {collection: {obsolete_name: replacement_name}}.
+# The obsolete index is dropped only once its replacement exists.
+OBSOLETE_INDEXES: Dict[str, Dict[str, str]] = {
+    # Left by the original init-mongo.js; the keyset indexes serve the same queries
+    "users": {"created_at_1": "created_at_id"},
+    "jobs": {
+        "active_user_session": "active_user_session_unique",
+        "user_id_1": "user_id_created_at_id",
+        "user_id_1_created_at_-1": "user_id_created_at_id",
+        "status_1": "status_created_at_id",
+        "created_at_1": "created_at_id",
+        # Nothing filters on job_type
+        "job_type_1": "created_at_id",
+    },
+}
+
+
+async def ensure_indexes(database: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """Create all declared indexes. Existing identical indexes are a no-op on the server.
+
+    An index with the same keys and options under another name (e.g. ``clerk_id_1`` from the
+    old init-mongo.js) is kept instead of failing with IndexOptionsConflict. Indexes are created
+    one at a time so a conflicting definition (e.g. an index with the same name but different
+    options created by hand) is logged without blocking the rest.
+    Returns the declared names created or confirmed per collection.
+    """
+    await _create_collections(database)
+    ensured: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        collection = database[collection_name]
+        existing = await collection.index_information()
+        for model in models:
+            name = model.document["name"]
+            equivalent = _equivalent_index(model, existing)
+            if equivalent is not None and equivalent != name:
+                logger.info(
+                    "[indexes] keeping existing index collection=%s name=%s for %s",
+                    collection_name, equivalent, name,
+                )
+                ensured.setdefault(collection_name, []).append(name)
+                continue
+            try:
+                names = await collection.create_indexes([model])
+                ensured.setdefault(collection_name, []).extend(names)
+            except OperationFailure as e:
+                logger.error(
+                    "[indexes] failed to create index collection=%s name=%s error=%s",
+                    collection_name, model.document.get("name"), e,
+                )
+    await _drop_obsolete_indexes(database, ensured)
+    logger.info("[indexes] ensured %s", ensured)
+    return ensured
+
+
+# Options that make two indexes with the same keys behave differently
+_INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+
+def _equivalent_index(model: IndexModel, existing: Dict[str, Dict]) -> Optional[str]:
+    """Name of an existing index with the same keys and options as ``model``, if any."""
+    wanted = model.document
+    keys = list(wanted["key"].items())
+    for name, info in existing.items():
+        if [(field, direction) for field, direction in info["key"]] != keys:
+            continue
+        if all(info.get(option, False) == wanted.get(option, False) for option in _INDEX_OPTIONS):
+            return name
+    return None
+
+
+async def _create_collections(database: AsyncIOMotorDatabase) -> None:
+    for collection_name, options in COLLECTION_OPTIONS.items():
+        try:
+            await database.create_collection(collection_name, **options)
+            logger.info("[indexes] created collection=%s", collection_name)
+        except CollectionInvalid:
+            pass  # already exists
+        except OperationFailure as e:
+            logger.error("[indexes] failed to create collection=%s error=%s", collection_name, e)
+
+
+async def _drop_obsolete_indexes(database: AsyncIOMotorDatabase, ensured: Dict[str, List[str]]) -> None:
+    for collection_name, replaced in OBSOLETE_INDEXES.items():
+        collection = database[collection_name]
+        for obsolete, replacement in replaced.items():
+            if replacement not in ensured.get(collection_name, []):
+                continue
+            try:
+                await collection.drop_index(obsolete)
+                logger.info("[indexes] dropped obsolete index collection=%s name=%s", collection_name, obsolete)
+            except OperationFailure as e:
+                # Already gone (code 27 IndexNotFound) is the steady state
+                if e.code != 27:
+                    logger.error(
+                        "[indexes] failed to drop index collection=%s name=%s error=%s",
+                        collection_name, obsolete, e,
+                    )
+
+
+
+def ensure_indexes_in_background(connection_string: str, database_name: str) -> threading.Thread:
+    """Run ensure_indexes on a daemon thread so the worker starts consuming without waiting for
+    index builds. The thread uses its own client and event loop; failures are logged, never raised.
+    """
+
+    async def _run() -> None:
+        client = AsyncIOMotorClient(connection_string, **client_options())
+        try:
+            await ensure_indexes(client[database_name])
+        finally:
+            client.close()
+
+    def _target() -> None:
+        try:
+            asyncio.run(_run())
+        except Exception:
+            logger.exception("[indexes] index creation failed")
+
+    thread = threading.Thread(target=_target, name="ensure_indexes", daemon=True)
+    thread.start()
+    return thread
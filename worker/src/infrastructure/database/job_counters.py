@@ -0,0 +1,67 @@
+"""
+Job Counters - per-user job counters in `job_counters`, same document shapes as the API's MongoJobStatsRepository
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from src.domain.entities.job import ACTIVE_JOB_STATUSES, TERMINAL_JOB_STATUSES
+
+# Keys are "<user id>|active" (gauge) and "<user id>|<YYYY-MM-DD>" (daily counts); the API sums users for totals
+COUNTERS_COLLECTION = "job_counters"
+ACTIVE_FIELDS = tuple(s.value for s in ACTIVE_JOB_STATUSES)
+DAILY_FIELDS = ("created",) + tuple(s.value for s in TERMINAL_JOB_STATUSES)
+
+
+def counter_updates(
+    user_id: str, old_status: Optional[Any], new_status: Any, at: datetime
+) -> Dict[str, Dict[str, int]]:
+    """``$inc`` per counter document for one transition; empty when the status did not change"""
+    old, new = getattr(old_status, "value", old_status), getattr(new_status, "value", new_status)
+    if old == new:
+        return {}
+    active: Dict[str, int] = {}
+    daily: Dict[str, int] = {}
+    if old is None:
+        daily["created"] = 1
+    if old in ACTIVE_FIELDS:
+        active[old] = -1
+    if new in ACTIVE_FIELDS:
+        active[new] = 1
+    elif new in DAILY_FIELDS:
+        daily[new] = 1
+
+    updates: Dict[str, Dict[str, int]] = {}
+    if active:
+        updates[f"{user_id}|active"] = active
+    if daily:
+        updates[f"{user_id}|{at.strftime('%Y-%m-%d')}"] = daily
+    return updates
+
+
+def merge_counter_updates(target: Dict[str, Dict[str, int]], updates: Dict[str, Dict[str, int]]) -> None:
+    """Add ``updates`` into ``target`` so several transitions become one ``$inc`` per document"""
+    for key, inc in updates.items():
+        merged = target.setdefault(key, {})
+        for field, value in inc.items():
+            merged[field] = merged.get(field, 0) + value
+
+
+def counter_requests(updates: Dict[str, Dict[str, int]], now: datetime) -> List[UpdateOne]:
+    requests = []
+    for key, inc in updates.items():
+        inc = {field: value for field, value in inc.items() if value}
+        if not inc:
+            continue
+        owner, _, bucket = key.rpartition("|")
+        requests.append(UpdateOne(
+            {"_id": key},
+            {
+                "$inc": inc,
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"user_id": owner, "day": None if bucket == "active" else bucket},
+            },
+            upsert=True,
+        ))
+    return requests
@@ -0,0 +1,201 @@
+"""
+Mongo Metrics - pymongo driver-event listener for connection pool and command latency
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+
+class _Timing:
+    __slots__ = ("count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class _PoolStats:
+    __slots__ = ("pools", "open", "in_use", "in_use_max", "checkout_failures", "wait")
+
+    def __init__(self) -> None:
+        # Live pools for this server, one per client; stats are kept until the last one closes
+        self.pools = 0
+        self.open = 0
+        self.in_use = 0
+        self.in_use_max = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.wait = _Timing()
+
+
+class MongoMetricsListener(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    """Aggregates driver events into pool saturation and per-collection command latency.
+
+    Per server, summed over every client in the process (each has its own pool): open
+    connections, connections in use (current and peak), checkout wait time and checkout failures
+    by reason (``timeout`` means the wait queue timed out: the pool is too small).
+    Per ``<collection>.<command>``: count, failures, average and peak latency.
+
+    Registered on every client through ``event_listeners``; handlers run on driver threads and
+    only update counters under a lock. If ``report_interval`` is set, a summary is logged at INFO
+    at most that often (for processes without a ``/stats`` endpoint).
+    """
+
+    def __init__(self, report_interval: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pools: Dict[str, _PoolStats] = {}
+        self._commands: Dict[str, _Timing] = {}
+        self._command_failures: Dict[str, int] = {}
+        self._inflight: Dict[Tuple[Any, int], str] = {}
+        self.report_interval = report_interval
+        self._last_report = time.monotonic()
+
+    def _pool(self, address) -> _PoolStats:
+        key = "%s:%s" % address
+        stats = self._pools.get(key)
+        if stats is None:
+            stats = self._pools[key] = _PoolStats()
+        return stats
+
+    # Connection pool events
+
+    def pool_created(self, event) -> None:
+        with self._lock:
+            self._pool(event.address).pools += 1
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        # Another client's pool for the same server may still be running
+        with self._lock:
+            key = "%s:%s" % event.address
+            pool = self._pools.get(key)
+            if pool is not None:
+                pool.pools -= 1
+                if pool.pools <= 0:
+                    del self._pools[key]
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self._pool(event.address).open += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.open = max(0, pool.open - 1)
+
+    def connection_check_out_started(self, event) -> None:
+        # Started and checked-out events for one checkout are published on the same thread
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_check_out_failed(self, event) -> None:
+        self._local.checkout_started = None
+        with self._lock:
+            failures = self._pool(event.address).checkout_failures
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event) -> None:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use += 1
+            pool.in_use_max = max(pool.in_use_max, pool.in_use)
+            if started is not None:
+                pool.wait.add((time.perf_counter() - started) * 1000.0)
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use = max(0, pool.in_use - 1)
+
+    # Command events
+
+    def started(self, event) -> None:
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        collection = target if isinstance(target, str) else "-"
+        with self._lock:
+            self._inflight[(event.connection_id, event.request_id)] = f"{collection}.{event.command_name}"
+
+    def succeeded(self, event) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event) -> None:
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool) -> None:
+        with self._lock:
+            key = self._inflight.pop((event.connection_id, event.request_id), None)
+            if key is None:
+                return
+            timing = self._commands.get(key)
+            if timing is None:
+                timing = self._commands[key] = _Timing()
+            timing.add(event.duration_micros / 1000.0)
+            if failed:
+                self._command_failures[key] = self._command_failures.get(key, 0) + 1
+        self._maybe_report()
+
+    def _maybe_report(self) -> None:
+        if not self.report_interval:
+            return
+        now = time.monotonic()
+        if now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+        metrics = self.get_metrics()
+        logger.info("[MongoMetrics] pools=%s", metrics["pools"])
+        slowest = sorted(metrics["commands"].items(), key=lambda item: item[1]["max_ms"], reverse=True)[:5]
+        logger.info("[MongoMetrics] slowest_commands=%s", dict(slowest))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pools": {
+                    address: {
+                        "pools": pool.pools,
+                        "open": pool.open,
+                        "in_use": pool.in_use,
+                        "in_use_max": pool.in_use_max,
+                        "checkout_wait": pool.wait.to_dict(),
+                        "checkout_failures": dict(pool.checkout_failures),
+                    }
+                    for address, pool in self._pools.items()
+                },
+                "commands": {
+                    key: {**timing.to_dict(), "failures": self._command_failures.get(key, 0)}
+                    for key, timing in sorted(self._commands.items())
+                },
+            }
+
+
+# The worker has no /stats endpoint, so summaries go to the log
+mongo_metrics = MongoMetricsListener(report_interval=60.0)
@@ -1,8 +1,26 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+from typing import Any, Dict, Optional
 import os
 import logging
 import asyncio
+from src.config.settings import settings
+from src.infrastructure.database.mongo_metrics import mongo_metrics
+
+
+def client_options() -> Dict[str, Any]:
+    """Pool, compression and monitoring options shared by every Mongo client in this process"""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "event_listeners": [mongo_metrics],
+    }
+    if settings.mongo_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongo_max_idle_time_ms
+    if settings.mongo_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongo_wait_queue_timeout_ms
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    return options
 
 
 class MongoDB:
@@ -15,7 +33,7 @@ class MongoDB:
     async def connect_to_mongo(cls, connection_string: str, database_name: str):
         """Create database connection"""
         logging.debug("[MongoDB] connecting url=%s db=%s", connection_string, database_name)
-        cls.client = AsyncIOMotorClient(connection_string)
+        cls.client = AsyncIOMotorClient(connection_string, **client_options())
         cls.database = cls.client[database_name]
         cls._pid = os.getpid()
         try:
@@ -0,0 +1,306 @@
+"""
+Job Status Writer - Write-behind, coalescing job status updates flushed with unordered bulk writes
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.config.settings import settings
+from src.infrastructure.database.mongodb import client_options
+from src.infrastructure.database.job_counters import COUNTERS_COLLECTION, counter_requests, merge_counter_updates
+
+logger = logging.getLogger(__name__)
+
+# Batching/latency summary is logged at INFO at most this often
+_REPORT_INTERVAL_SECONDS = 60.0
+
+
+class JobNotFoundError(LookupError):
+    """The job an update was submitted for does not exist"""
+
+
+# Set on every write with a fresh ObjectId so a short matched_count can be traced to the updates that applied
+WRITE_ID_FIELD = "status_write_id"
+
+
+class _PendingUpdate:
+    __slots__ = ("fields", "futures", "counters", "expected_status")
+
+    def __init__(self, expected_status: Optional[str]) -> None:
+        self.fields: Dict[str, Any] = {}
+        self.futures: List[Future] = []
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.expected_status = expected_status
+
+
+class JobStatusWriter:
+    """Buffers job ``$set`` updates for a few milliseconds and writes them in one unordered bulk_write.
+
+    Updates for the same job that arrive within one window are merged in submission order into a
+    single ``UpdateOne``, and batches are flushed one at a time from a single thread, so per-job
+    ordering is preserved while different jobs share a round-trip. ``submit`` returns a Future that
+    resolves once the update is durable; callers publish notifications only after it resolves. An
+    update for a job that does not exist fails its Future with JobNotFoundError.
+
+    A transition submitted with ``expected_status`` is written only if the job is still in that
+    status, and its counters are applied only then; otherwise its Future resolves to False. Celery
+    redelivers tasks (``task_acks_late``), so a redelivered task replaying PENDING -> PROCESSING ->
+    COMPLETED neither rewinds the job nor counts it twice. Coalesced updates share the first
+    submission's guard.
+
+    Uses a synchronous pymongo client on its own thread so it is independent of the short-lived
+    event loops Celery tasks create with ``asyncio.run``. Create one per process (see ``get``).
+    """
+
+    _instance: Optional["JobStatusWriter"] = None
+    _instance_pid: Optional[int] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        collection=None,
+        flush_interval: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ):
+        self._collection = collection
+        self._client: Optional[MongoClient] = None
+        self._flush_interval = (settings.status_flush_interval_ms / 1000.0) if flush_interval is None else flush_interval
+        self._max_batch = max(1, max_batch or settings.status_flush_max_batch)
+        self._pending: Dict[str, _PendingUpdate] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        # Metrics (guarded by self._cond)
+        self._submitted = 0
+        self._coalesced = 0
+        self._written = 0
+        self._skipped = 0
+        self._errors = 0
+        self._batches = 0
+        self._batch_size_last = 0
+        self._batch_size_max = 0
+        self._flush_last = 0.0
+        self._flush_max = 0.0
+        self._flush_total = 0.0
+        self._last_report = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="job_status_writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> "JobStatusWriter":
+        """Process-wide writer; recreated after fork because pymongo clients are not fork-safe"""
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance_pid != os.getpid():
+                cls._instance = JobStatusWriter()
+                cls._instance_pid = os.getpid()
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Flush and stop the process-wide writer if one was created in this process"""
+        with cls._instance_lock:
+            instance = cls._instance if cls._instance_pid == os.getpid() else None
+            cls._instance = None
+            cls._instance_pid = None
+        if instance is not None:
+            instance.close()
+
+    def _get_collection(self):
+        if self._collection is None:
+            self._client = MongoClient(settings.mongodb_url, **client_options())
+            self._collection = self._client[settings.database_name].jobs
+        return self._collection
+
+    def submit(
+        self,
+        job_id: str,
+        fields: Dict[str, Any],
+        counters: Optional[Dict[str, Dict[str, int]]] = None,
+        expected_status: Optional[str] = None,
+    ) -> Future:
+        """Queue ``$set`` fields for a job; the Future resolves to True once they are written.
+
+        With ``expected_status`` the write only applies while the job has that status; the Future
+        resolves to False when it did not. ``counters`` (see job_counters.counter_updates) are
+        applied only for updates that were written, merged with the rest of the batch into one
+        ``$inc`` per counter document.
+        """
+        ObjectId(job_id)  # reject malformed ids here so they cannot fail a whole batch
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("JobStatusWriter is closed")
+            pending = self._pending.get(job_id)
+            if pending is None:
+                pending = self._pending[job_id] = _PendingUpdate(expected_status)
+            else:
+                self._coalesced += 1
+            pending.fields.update(fields)
+            if counters:
+                merge_counter_updates(pending.counters, counters)
+            pending.futures.append(future)
+            self._submitted += 1
+            if len(self._pending) >= self._max_batch or len(self._pending) == 1:
+                self._cond.notify()
+        return future
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush everything still buffered, then stop the writer thread"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        logger.info("[JobStatusWriter] closed metrics=%s", self.get_metrics())
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # Give concurrent jobs a short window to join this batch
+                deadline = time.monotonic() + self._flush_interval
+                while len(self._pending) < self._max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending
+                self._pending = {}
+            self._flush(batch)
+
+    def _flush(self, batch: Dict[str, _PendingUpdate]) -> None:
+        job_ids = list(batch)
+        write_ids = [ObjectId() for _ in job_ids]
+        requests = []
+        for job_id, write_id in zip(job_ids, write_ids):
+            pending = batch[job_id]
+            query: Dict[str, Any] = {"_id": ObjectId(job_id)}
+            if pending.expected_status is not None:
+                query["status"] = pending.expected_status
+            requests.append(UpdateOne(query, {"$set": {**pending.fields, WRITE_ID_FIELD: write_id}}))
+        failed: Dict[int, Exception] = {}
+        skipped: Set[int] = set()
+        count = True
+        matched = 0
+        started = time.perf_counter()
+        try:
+            matched = self._get_collection().bulk_write(requests, ordered=False).matched_count
+        except BulkWriteError as e:
+            matched = e.details.get("nMatched", 0)
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = RuntimeError(error.get("errmsg", "write error"))
+        except Exception as e:
+            failed = {i: e for i in range(len(job_ids))}
+        if matched < len(job_ids) - len(failed):
+            # Some updates matched nothing: the job is missing, or no longer in the expected status
+            unmatched = self._find_unmatched(job_ids, write_ids, failed)
+            if unmatched is None:
+                # Outcome unknown: report the updates as written, but leave counters to rebuild-job-stats
+                count = False
+            else:
+                missing, skipped = unmatched
+                failed.update(missing)
+        elapsed = time.perf_counter() - started
+
+        with self._cond:
+            self._batches += 1
+            self._written += len(job_ids) - len(failed) - len(skipped)
+            self._skipped += len(skipped)
+            self._errors += len(failed)
+            self._batch_size_last = len(job_ids)
+            self._batch_size_max = max(self._batch_size_max, len(job_ids))
+            self._flush_last = elapsed
+            self._flush_max = max(self._flush_max, elapsed)
+            self._flush_total += elapsed
+        logger.debug(
+            "[JobStatusWriter] flushed batch_size=%s failed=%s skipped=%s seconds=%.4f",
+            len(job_ids), len(failed), len(skipped), elapsed,
+        )
+        if time.monotonic() - self._last_report >= _REPORT_INTERVAL_SECONDS:
+            self._last_report = time.monotonic()
+            logger.info("[JobStatusWriter] metrics=%s", self.get_metrics())
+        if failed:
+            logger.error("[JobStatusWriter] %s of %s updates failed first_error=%s", len(failed), len(job_ids), next(iter(failed.values())))
+
+        if count:
+            self._flush_counters([
+                batch[job_id].counters for index, job_id in enumerate(job_ids) if index not in failed and index not in skipped
+            ])
+
+        for index, job_id in enumerate(job_ids):
+            error = failed.get(index)
+            for future in batch[job_id].futures:
+                if error is None:
+                    future.set_result(index not in skipped)
+                else:
+                    future.set_exception(error)
+
+    def _find_unmatched(
+        self, job_ids: List[str], write_ids: List[ObjectId], failed: Dict[int, Exception]
+    ) -> Optional[Tuple[Dict[int, Exception], Set[int]]]:
+        """Sort the updates that matched nothing into (index -> JobNotFoundError, indexes of stale transitions)"""
+        candidates = {ObjectId(job_id): index for index, job_id in enumerate(job_ids) if index not in failed}
+        try:
+            found = {
+                doc["_id"]: doc.get(WRITE_ID_FIELD)
+                for doc in self._get_collection().find({"_id": {"$in": list(candidates)}}, {WRITE_ID_FIELD: 1})
+            }
+        except Exception as e:
+            logger.error("[JobStatusWriter] could not look up unmatched updates error=%s", e)
+            return None
+        missing: Dict[int, Exception] = {}
+        skipped: Set[int] = set()
+        for oid, index in candidates.items():
+            if oid not in found:
+                missing[index] = JobNotFoundError(f"Job {oid} not found")
+            elif found[oid] != write_ids[index]:
+                skipped.add(index)
+        return missing, skipped
+
+    def _flush_counters(self, counters: List[Dict[str, Dict[str, int]]]) -> None:
+        merged: Dict[str, Dict[str, int]] = {}
+        for updates in counters:
+            merge_counter_updates(merged, updates)
+        requests = counter_requests(merged, datetime.now(timezone.utc))
+        if not requests:
+            return
+        try:
+            self._get_collection().database[COUNTERS_COLLECTION].bulk_write(requests, ordered=False)
+        except Exception as e:
+            # Job writes are already durable; the API's rebuild-job-stats command repairs drift
+            logger.error("[JobStatusWriter] job counter update failed documents=%s error=%s", len(requests), e)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Batching and flush latency counters"""
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "submitted": self._submitted,
+                "coalesced": self._coalesced,
+                "written": self._written,
+                "skipped": self._skipped,
+                "errors": self._errors,
+                "batches": self._batches,
+                "batch_size_last": self._batch_size_last,
+                "batch_size_max": self._batch_size_max,
+                "batch_size_avg": (self._written + self._skipped + self._errors) / self._batches if self._batches else 0.0,
+                "flush_seconds_last": self._flush_last,
+                "flush_seconds_max": self._flush_max,
+                "flush_seconds_avg": self._flush_total / self._batches if self._batches else 0.0,
+            }
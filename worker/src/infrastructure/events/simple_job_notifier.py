@@ -3,11 +3,14 @@ Simple Job Notifier - Uses Redis pub/sub for worker-to-API communication
 """
 import json
 import logging
+import time
 from typing import Optional
 import redis
 from redis.asyncio import Redis
 
 from src.config.settings import settings
+from src.domain.services.tracing import start_span
+from src.infrastructure.metrics import job_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +19,19 @@ JOB_NOTIFICATION_CHANNEL = "job_notifications"
 
 
 class SimpleJobNotifier:
-    """Simple job status notifier that uses Redis pub/sub"""
+    """Simple job status notifier that uses Redis pub/sub.
+
+    An instance keeps one async Redis client, created on first use and bound to that event loop;
+    share the instance (see WorkerContainer) instead of creating one per notification.
+    """
+
+    def __init__(self) -> None:
+        self._redis: Optional[Redis] = None
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
     
     @staticmethod
     def notify_job_status_sync(
@@ -28,27 +43,33 @@ class SimpleJobNotifier:
     ) -> None:
         """Synchronous notification for use in Celery tasks"""
         try:
-            logger.info("[SimpleJobNotifier] notifying: user_id=%s, job_id=%s, status=%s, session_id=%s", 
+            logger.debug("[SimpleJobNotifier] notifying: user_id=%s, job_id=%s, status=%s, session_id=%s", 
                        user_id, job_id, status, session_id)
             
             # Create Redis client
             r = redis.from_url(settings.redis_url, decode_responses=True)
             
-            # Prepare notification payload
-            payload = {
-                "type": "job_status_update",
-                "user_id": user_id,
-                "job_id": job_id,
-                "status": status,
-                "session_id": session_id,
-                "message": message
-            }
-            
-            # Publish to Redis channel
-            r.publish(JOB_NOTIFICATION_CHANNEL, json.dumps(payload))
-            logger.info("[SimpleJobNotifier] notification published to Redis")
+            with start_span("notification.publish", job_id=job_id, status=status) as span:
+                # Prepare notification payload
+                payload = {
+                    "type": "job_status_update",
+                    "user_id": user_id,
+                    "job_id": job_id,
+                    "status": status,
+                    "session_id": session_id,
+                    "message": message,
+                    "published_at": time.time(),
+                    # The API continues the job's trace when it fans this out to WebSockets
+                    "traceparent": span.traceparent if span is not None else None,
+                }
+
+                # Publish to Redis channel
+                r.publish(JOB_NOTIFICATION_CHANNEL, json.dumps(payload))
+            job_metrics.notifications_published.labels(status).inc()
+            logger.debug("[SimpleJobNotifier] notification published to Redis")
             
         except Exception:
+            job_metrics.notification_publish_failures.inc()
             logger.exception("[SimpleJobNotifier] failed to notify job status sync")
 
     async def notify_job_status_update(
@@ -61,26 +82,32 @@ class SimpleJobNotifier:
     ) -> None:
         """Async notification for use in worker tasks"""
         try:
-            logger.info("[SimpleJobNotifier] async notifying: user_id=%s, job_id=%s, status=%s, session_id=%s", 
+            logger.debug("[SimpleJobNotifier] async notifying: user_id=%s, job_id=%s, status=%s, session_id=%s", 
                        user_id, job_id, status, session_id)
             
-            # Create async Redis client
-            r = Redis.from_url(settings.redis_url, decode_responses=True)
-            
-            # Prepare notification payload
-            payload = {
-                "type": "job_status_update",
-                "user_id": user_id,
-                "job_id": job_id,
-                "status": status,
-                "session_id": session_id,
-                "message": message
-            }
+            if self._redis is None:
+                self._redis = Redis.from_url(settings.redis_url, decode_responses=True)
+            r = self._redis
             
-            # Publish to Redis channel
-            await r.publish(JOB_NOTIFICATION_CHANNEL, json.dumps(payload))
-            await r.close()
-            logger.info("[SimpleJobNotifier] async notification published to Redis")
+            with start_span("notification.publish", job_id=job_id, status=status) as span:
+                # Prepare notification payload
+                payload = {
+                    "type": "job_status_update",
+                    "user_id": user_id,
+                    "job_id": job_id,
+                    "status": status,
+                    "session_id": session_id,
+                    "message": message,
+                    "published_at": time.time(),
+                    # The API continues the job's trace when it fans this out to WebSockets
+                    "traceparent": span.traceparent if span is not None else None,
+                }
+
+                # Publish to Redis channel
+                await r.publish(JOB_NOTIFICATION_CHANNEL, json.dumps(payload))
+            job_metrics.notifications_published.labels(status).inc()
+            logger.debug("[SimpleJobNotifier] async notification published to Redis")
             
         except Exception:
+            job_metrics.notification_publish_failures.inc()
             logger.exception("[SimpleJobNotifier] failed to notify job status async")
\ No newline at end of file
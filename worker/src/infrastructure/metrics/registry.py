@@ -0,0 +1,272 @@
+"""
+Metrics Registry - In-process counters, gauges and histograms rendered in the Prometheus text format
+"""
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Histogram bucket upper bounds in seconds: Prometheus' defaults plus 1ms and 2.5ms for cached routes
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cumulative counts are derived on read)"""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        # One slot per bound plus +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (the max for the +Inf bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """[(upper bound, observations <= bound)], ending with +Inf"""
+        out, seen = [], 0
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            seen += count
+            out.append((bound, seen))
+        return out
+
+
+class Sample(NamedTuple):
+    suffix: str
+    labels: Dict[str, str]
+    value: float
+
+
+class MetricFamily(NamedTuple):
+    name: str
+    type: str  # counter | gauge | histogram
+    help: str
+    samples: List[Sample]
+
+
+def histogram_samples(labels: Dict[str, str], histogram: LatencyHistogram) -> List[Sample]:
+    """``_bucket``/``_sum``/``_count`` samples for one labelled histogram"""
+    samples = [
+        Sample("_bucket", {**labels, "le": "+Inf" if math.isinf(bound) else repr(bound)}, count)
+        for bound, count in histogram.cumulative()
+    ]
+    samples.append(Sample("_sum", labels, histogram.total))
+    samples.append(Sample("_count", labels, histogram.count))
+    return samples
+
+
+class _Family:
+    """A metric and its labelled children; children are created on first use and never removed"""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Family):
+    type = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value(self._lock)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def collect(self) -> MetricFamily:
+        return MetricFamily(self.name, self.type, self.help, [
+            Sample("", dict(zip(self.labelnames, key)), child.value) for key, child in self._items()
+        ])
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("histogram", "_lock")
+
+    def __init__(self, lock: threading.Lock, bounds: Tuple[float, ...]):
+        self.histogram = LatencyHistogram(bounds)
+        self._lock = lock
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.histogram.observe(seconds)
+
+
+class Histogram(_Family):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._lock, self.buckets)
+
+    def observe(self, seconds: float) -> None:
+        self.labels().observe(seconds)
+
+    def collect(self) -> MetricFamily:
+        samples: List[Sample] = []
+        for key, child in self._items():
+            with self._lock:
+                samples.extend(histogram_samples(dict(zip(self.labelnames, key)), child.histogram))
+        return MetricFamily(self.name, self.type, self.help, samples)
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered for a Prometheus scrape.
+
+    Two kinds of sources:
+
+    * Families created here (``counter``/``gauge``/``histogram``) for values recorded at the point
+      they happen (enqueue latency, job durations). An update takes one uncontended lock per family.
+    * Collectors: callables that turn counters a component already keeps (request metrics, the
+      notification dispatcher, the WebSocket manager) into families at scrape time, so those hot
+      paths pay nothing extra.
+    """
+
+    def __init__(self) -> None:
+        self._families: Dict[str, _Family] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _register(self, family: _Family) -> _Family:
+        with self._lock:
+            existing = self._families.get(family.name)
+            if existing is not None:
+                if type(existing) is not type(family) or existing.labelnames != family.labelnames:
+                    raise ValueError(f"metric {family.name} already registered with a different type or labels")
+                return existing
+            self._families[family.name] = family
+            return family
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def remove_collector(self, collector: Collector) -> None:
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            families, collectors = list(self._families.values()), list(self._collectors)
+        out = [family.collect() for family in families]
+        for collector in collectors:
+            out.extend(collector())
+        return out
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape_help(family.help)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for sample in family.samples:
+                lines.append(f"{family.name}{sample.suffix}{_format_labels(sample.labels)} {_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '%s="%s"' % (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value))
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+metrics_registry = MetricsRegistry()
@@ -76,11 +76,12 @@ class CeleryQueueService(QueueService):
         """Add job to processing queue"""
         try:
             from .worker_tasks import process_job
-            self.logger.debug(
-                "[CeleryQueueService.enqueue_job] enqueue job_id=%s keys=%s",
-                job_id,
-                list(job_data.keys()) if isinstance(job_data, dict) else type(job_data).__name__,
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "[CeleryQueueService.enqueue_job] enqueue job_id=%s keys=%s",
+                    job_id,
+                    list(job_data.keys()) if isinstance(job_data, dict) else type(job_data).__name__,
+                )
             # Explicitly route to the configured queue to avoid any default-queue mismatches
             result = process_job.apply_async(
                 args=(job_id, job_data),
@@ -4,16 +4,21 @@ Worker tasks for AI job processing
 import asyncio
 import json
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Dict, Any
-from bson import ObjectId
+from bson.errors import InvalidId
 
 from celery import current_task
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 from .celery_queue_service import celery_app
-from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.status_writer import JobNotFoundError, JobStatusWriter
+from src.infrastructure.database.job_counters import counter_updates
+from src.infrastructure.storage.output_store import delete_output, offload_output
+from src.infrastructure.metrics import job_metrics
+from src.domain.services.tracing import record_span, start_span
 from src.domain.entities.job import Job, JobStatus
-from src.infrastructure.events.simple_job_notifier import SimpleJobNotifier
-from src.config.settings import settings
+from src.container import WorkerContainer
 
 logger = logging.getLogger(__name__)
 
@@ -23,91 +28,121 @@ def process_job(self, job_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Process AI job - main Celery task
     """
-    logger.info("[process_job] START job_id=%s task_id=%s", job_id, self.request.id)
+    logger.debug("[process_job] START job_id=%s task_id=%s", job_id, self.request.id)
+    # Set by the API's CeleryQueueService.enqueue_job from its publish span
+    traceparent = self.request.get("traceparent")
+    if job_data.get("created_at"):
+        record_span("job.queue_wait", job_data["created_at"], time.time(), traceparent=traceparent, job_id=job_id)
     
     try:
-        # Run async processing in sync context
-        result = asyncio.run(_process_job_async(job_id, job_data))
-        logger.info("[process_job] COMPLETED job_id=%s result_keys=%s", job_id, list(result.keys()) if result else None)
+        # Run async processing on the process's persistent loop
+        result = WorkerContainer.get().run(_process_job_async(job_id, job_data, traceparent))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[process_job] COMPLETED job_id=%s result_keys=%s", job_id, list(result.keys()) if result else None)
         return result
     except Exception as e:
         logger.exception("[process_job] FAILED job_id=%s error=%s", job_id, e)
         # Update job status to failed
         try:
-            asyncio.run(_update_job_status(job_id, JobStatus.FAILED, error_message=str(e)))
+            WorkerContainer.get().run(_update_job_status(job_id, JobStatus.FAILED, job_data, error_message=str(e)))
         except Exception as update_error:
             logger.exception("[process_job] Failed to update job status job_id=%s error=%s", job_id, update_error)
         raise
 
 
-async def _process_job_async(job_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
+async def _process_job_async(job_id: str, job_data: Dict[str, Any], traceparent: str = None) -> Dict[str, Any]:
     """
-    Async implementation of job processing
+    Async implementation of job processing, traced as a child of the API's publish span.
+    The container's loop does not inherit the task thread's context, so the trace is passed explicitly.
     """
+    with start_span("job.process", traceparent=traceparent, job_id=job_id):
+        return await _run_job(job_id, job_data)
+
+
+async def _run_job(job_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
     logger.debug("[_process_job_async] START job_id=%s", job_id)
-    
-    # Ensure database connection
-    await MongoDB.ensure_connection(settings.mongodb_url, settings.database_name)
+    job_type, created_at = job_data.get("job_type", "unknown"), job_data.get("created_at")
+    started_at = time.time()
+    job_metrics.observe_job_started(job_type, created_at, started_at)
     
     # Update job status to processing
-    await _update_job_status(job_id, JobStatus.PROCESSING, started_at=datetime.utcnow())
+    await _update_job_status(
+        job_id, JobStatus.PROCESSING, job_data, previous_status=JobStatus.PENDING, started_at=datetime.utcnow()
+    )
     
     try:
-        # Simulate AI processing (replace with actual AI service call)
-        await asyncio.sleep(2)  # Simulate processing time
+        with start_span("ai.generate", job_id=job_id, job_type=job_type):
+            # Simulate AI processing (replace with actual AI service call)
+            await asyncio.sleep(2)  # Simulate processing time
+
+            # Mock result based on job type
+            job_type = job_data.get("job_type", "text_generation")
+            if job_type == "text_generation":
+                result = {
+                    "generated_text": f"AI generated text for prompt: {job_data.get('input_data', {}).get('prompt', 'default prompt')}",
+                    "model_used": "mock-gpt-4",
+                    "tokens_used": 150
+                }
+            elif job_type == "image_generation":
+                result = {
+                    "image_url": "https://example.com/generated-image.jpg",
+                    "model_used": "mock-dalle-3",
+                    "resolution": "1024x1024"
+                }
+            else:
+                result = {
+                    "output": f"Processed {job_type}",
+                    "model_used": "mock-model"
+                }
         
-        # Mock result based on job type
-        job_type = job_data.get("job_type", "text_generation")
-        if job_type == "text_generation":
-            result = {
-                "generated_text": f"AI generated text for prompt: {job_data.get('input_data', {}).get('prompt', 'default prompt')}",
-                "model_used": "mock-gpt-4",
-                "tokens_used": 150
-            }
-        elif job_type == "image_generation":
-            result = {
-                "image_url": "https://example.com/generated-image.jpg",
-                "model_used": "mock-dalle-3",
-                "resolution": "1024x1024"
-            }
-        else:
-            result = {
-                "output": f"Processed {job_type}",
-                "model_used": "mock-model"
-            }
+        # Large outputs go to GridFS; the job document and the Celery result keep only a preview
+        output_data, output_ref = await asyncio.to_thread(offload_output, job_id, result)
         
         # Update job status to completed
         await _update_job_status(
             job_id, 
             JobStatus.COMPLETED, 
-            output_data=result,
+            job_data,
+            previous_status=JobStatus.PROCESSING,
+            output_data=output_data,
+            output_ref=output_ref,
             completed_at=datetime.utcnow()
         )
         
-        logger.info("[_process_job_async] SUCCESS job_id=%s", job_id)
-        return result
+        job_metrics.observe_job_finished(job_type, "completed", created_at, started_at, time.time())
+        logger.debug("[_process_job_async] SUCCESS job_id=%s offloaded=%s", job_id, output_ref is not None)
+        return {**output_data, "output_ref": output_ref} if output_ref else output_data
         
     except Exception as e:
         logger.exception("[_process_job_async] ERROR job_id=%s error=%s", job_id, e)
-        await _update_job_status(job_id, JobStatus.FAILED, error_message=str(e))
+        job_metrics.observe_job_finished(job_type, "failed", created_at, started_at, time.time())
+        await _update_job_status(
+            job_id, JobStatus.FAILED, job_data, previous_status=JobStatus.PROCESSING, error_message=str(e)
+        )
         raise
 
 
 async def _update_job_status(
     job_id: str, 
     status: JobStatus, 
+    job_data: Dict[str, Any],
+    previous_status: JobStatus = None,
     output_data: Dict[str, Any] = None,
+    output_ref: Dict[str, Any] = None,
     error_message: str = None,
     started_at: datetime = None,
     completed_at: datetime = None
-) -> None:
+) -> bool:
     """
-    Update job status in database and send notification
+    Update job status through the write-behind status writer and send notification.
+
+    With ``previous_status`` the write is a guarded transition: it applies (and moves the job
+    counters) only if the job is still in that status, so a redelivered task cannot rewind a job or
+    count it twice. Returns False when nothing was written; no notification is sent then, and an
+    ``output_ref`` uploaded for the write is deleted. The repeated FAILED write in process_job's
+    fallback passes no previous status and is unguarded.
     """
     try:
-        db = MongoDB.get_database()
-        jobs_collection = db.jobs
-        
         # Prepare update data
         update_data = {
             "status": status.value,
@@ -116,6 +151,8 @@ async def _update_job_status(
         
         if output_data is not None:
             update_data["output_data"] = output_data
+        if output_ref is not None:
+            update_data["output_ref"] = output_ref
         if error_message is not None:
             update_data["error_message"] = error_message
         if started_at is not None:
@@ -123,39 +160,74 @@ async def _update_job_status(
         if completed_at is not None:
             update_data["completed_at"] = completed_at
         
-        # Update job in database - convert string job_id to ObjectId
-        try:
-            object_id = ObjectId(job_id)
-        except Exception as e:
-            logger.error("[_update_job_status] Invalid job_id format job_id=%s error=%s", job_id, e)
-            return
-            
-        result = await jobs_collection.update_one(
-            {"_id": object_id},
-            {"$set": update_data}
-        )
+        counters = None
+        if previous_status is not None and job_data.get("user_id"):
+            counters = counter_updates(job_data["user_id"], previous_status, status, datetime.now(timezone.utc))
         
-        if result.matched_count == 0:
-            logger.warning("[_update_job_status] Job not found job_id=%s", job_id)
-            return
+        # Wait until the update is durable so subscribers never observe a status before Mongo does
+        container = WorkerContainer.get()
+        with start_span("job.status_write", job_id=job_id, status=status.value):
+            try:
+                future = container.status_writer.submit(
+                    job_id, update_data, counters, expected_status=previous_status.value if previous_status else None
+                )
+            except InvalidId as e:
+                logger.error("[_update_job_status] Invalid job_id format job_id=%s error=%s", job_id, e)
+                await _discard_output(job_id, output_ref)
+                return False
+            try:
+                applied = await asyncio.wrap_future(future)
+            except JobNotFoundError:
+                # Nothing was written, so there is nothing to announce or count
+                logger.warning("[_update_job_status] job not found job_id=%s status=%s", job_id, status.value)
+                await _discard_output(job_id, output_ref)
+                return False
+        if not applied:
+            # Typically a redelivered task replaying a transition that already happened
+            logger.info(
+                "[_update_job_status] skipped stale transition job_id=%s %s->%s",
+                job_id, previous_status.value, status.value,
+            )
+            await _discard_output(job_id, output_ref)
+            return False
         
-        # Get updated job for notification
-        job_doc = await jobs_collection.find_one({"_id": object_id})
-        if not job_doc:
-            logger.warning("[_update_job_status] Job not found after update job_id=%s", job_id)
-            return
-        
-        # Send notification
-        notifier = SimpleJobNotifier()
-        await notifier.notify_job_status_update(
-            user_id=job_doc.get("user_id"),
-            job_id=str(job_doc.get("_id")),
-            status=status.value,
-            session_id=job_doc.get("session_id"),
-            message=error_message
-        )
+        # user_id/session_id travel in the task payload, so no read-back is needed
+        if container.notifier is not None:
+            await container.notifier.notify_job_status_update(
+                user_id=job_data.get("user_id"),
+                job_id=job_id,
+                status=status.value,
+                session_id=job_data.get("session_id"),
+                message=error_message
+            )
         
         logger.debug("[_update_job_status] Updated job_id=%s status=%s", job_id, status.value)
+        return True
         
     except Exception as e:
-        logger.exception("[_update_job_status] Failed to update job_id=%s status=%s error=%s", job_id, status.value, e)
\ No newline at end of file
+        logger.exception("[_update_job_status] Failed to update job_id=%s status=%s error=%s", job_id, status.value, e)
+        return False
+
+
+async def _discard_output(job_id: str, output_ref: Dict[str, Any] = None) -> None:
+    """Delete an output uploaded for a status write that was not applied; nothing references it"""
+    if output_ref is None:
+        return
+    try:
+        await asyncio.to_thread(delete_output, output_ref)
+    except Exception as e:
+        logger.exception("[_discard_output] failed to delete output job_id=%s ref=%s error=%s", job_id, output_ref, e)
+
+
+@worker_process_init.connect
+def _start_container(**kwargs) -> None:
+    """Build the process's services when a pool process starts, not on its first task"""
+    WorkerContainer.get()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _flush_status_writer(**kwargs) -> None:
+    """Stop the container, then flush buffered status updates before the (child) process exits"""
+    WorkerContainer.shutdown()
+    JobStatusWriter.shutdown()
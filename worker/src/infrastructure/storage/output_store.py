@@ -0,0 +1,74 @@
+"""
+Output Store - moves large job outputs into the `job_outputs` GridFS bucket read by the API
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import gridfs
+from bson import ObjectId
+from gridfs.errors import NoFile
+from pymongo import MongoClient
+
+from src.config.settings import settings
+from src.infrastructure.database.mongodb import client_options
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_BUCKET = "job_outputs"
+OUTPUT_CONTENT_TYPE = "application/json"
+
+_bucket: Optional[gridfs.GridFSBucket] = None
+_bucket_pid: Optional[int] = None
+_bucket_lock = threading.Lock()
+
+
+def _get_bucket() -> gridfs.GridFSBucket:
+    """Process-wide bucket on a synchronous client; recreated after fork"""
+    global _bucket, _bucket_pid
+    with _bucket_lock:
+        if _bucket is None or _bucket_pid != os.getpid():
+            client = MongoClient(settings.mongodb_url, **client_options())
+            _bucket = gridfs.GridFSBucket(client[settings.database_name], bucket_name=OUTPUT_BUCKET)
+            _bucket_pid = os.getpid()
+        return _bucket
+
+
+def preview_output(value: Any, max_chars: int) -> Any:
+    """Same shape as ``value`` with long strings cut to ``max_chars`` and long lists to 10 items"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars] + "…"
+    if isinstance(value, dict):
+        return {key: preview_output(item, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [preview_output(item, max_chars) for item in value[:10]]
+    return value
+
+
+def offload_output(job_id: str, output_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Return ``(output_data, output_ref)`` to persist: the payload itself when small, else a preview and a reference.
+
+    Blocking; call it off the event loop. The reference shape matches the API's GridFSOutputStore.
+    """
+    if not output_data or settings.output_inline_max_bytes <= 0:
+        return output_data, None
+    payload = json.dumps(output_data, separators=(",", ":"), default=str).encode("utf-8")
+    if len(payload) <= settings.output_inline_max_bytes:
+        return output_data, None
+    file_id = _get_bucket().upload_from_stream(
+        f"{job_id}.json", payload, metadata={"job_id": job_id, "content_type": OUTPUT_CONTENT_TYPE}
+    )
+    logger.debug("[offload_output] job_id=%s file_id=%s size=%s", job_id, file_id, len(payload))
+    output_ref = {"store": "gridfs", "id": str(file_id), "size": len(payload), "content_type": OUTPUT_CONTENT_TYPE}
+    return preview_output(output_data, settings.output_preview_chars), output_ref
+
+
+def delete_output(output_ref: Dict[str, Any]) -> bool:
+    """Remove an offloaded output; False if it was already gone. Blocking; call it off the event loop."""
+    try:
+        _get_bucket().delete(ObjectId(output_ref["id"]))
+        return True
+    except NoFile:
+        return False
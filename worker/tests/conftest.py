@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+# Add project root to sys.path so "import src..." works in tests
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Settings require these; nothing connects to them in the tests
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
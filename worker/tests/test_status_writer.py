@@ -0,0 +1,194 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from src.infrastructure.database.job_counters import counter_updates
+from src.infrastructure.database.status_writer import JobNotFoundError, JobStatusWriter
+
+AT = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, matched_count):
+        self.matched_count = matched_count
+
+
+class FakeCollection:
+    """Enough of a pymongo collection for JobStatusWriter: UpdateOne bulk writes and ``_id`` lookups"""
+
+    def __init__(self, docs=(), fail_ids=()):
+        self.docs = {doc["_id"]: dict(doc) for doc in docs}
+        self.fail_ids = set(fail_ids)
+        self.batches = []
+        self.counter_batches = []
+        self.database = {"job_counters": _CounterCollection(self.counter_batches)}
+        self.lock = threading.Lock()
+
+    def bulk_write(self, requests, ordered=True):
+        with self.lock:
+            self.batches.append(requests)
+            matched, errors = 0, []
+            for index, request in enumerate(requests):
+                job_id = request._filter["_id"]
+                if job_id in self.fail_ids:
+                    errors.append({"index": index, "code": 121, "errmsg": "Document failed validation"})
+                    continue
+                doc = self.docs.get(job_id)
+                if doc is None or any(doc.get(k) != v for k, v in request._filter.items() if k != "_id"):
+                    continue
+                doc.update(request._doc["$set"])
+                matched += 1
+            if errors:
+                raise BulkWriteError({"writeErrors": errors, "nMatched": matched})
+            return FakeResult(matched)
+
+    def find(self, query, projection):
+        return [
+            {"_id": oid, **{field: self.docs[oid].get(field) for field in projection}}
+            for oid in query["_id"]["$in"] if oid in self.docs
+        ]
+
+
+class _CounterCollection:
+    def __init__(self, batches):
+        self.batches = batches
+
+    def bulk_write(self, requests, ordered=True):
+        self.batches.append({r._filter["_id"]: r._doc["$inc"] for r in requests})
+
+
+def _job(status="pending"):
+    return {"_id": ObjectId(), "user_id": "u1", "status": status}
+
+
+def test_updates_for_one_job_in_a_window_are_coalesced():
+    job = _job()
+    collection = FakeCollection([job])
+    writer = JobStatusWriter(collection, flush_interval=0.2, max_batch=100)
+    job_id = str(job["_id"])
+
+    first = writer.submit(job_id, {"status": "processing", "started_at": AT})
+    second = writer.submit(job_id, {"status": "completed"})
+    first.result(5), second.result(5)
+    writer.close()
+
+    assert len(collection.batches) == 1 and len(collection.batches[0]) == 1
+    assert collection.docs[job["_id"]]["status"] == "completed"
+    assert collection.docs[job["_id"]]["started_at"] == AT
+    assert writer.get_metrics()["coalesced"] == 1
+
+
+def test_bulk_write_errors_fail_only_their_updates():
+    good, bad = _job(), _job()
+    collection = FakeCollection([good, bad], fail_ids=[bad["_id"]])
+    writer = JobStatusWriter(collection, flush_interval=0.2, max_batch=100)
+
+    ok = writer.submit(str(good["_id"]), {"status": "failed"}, counter_updates("u1", "pending", "failed", AT))
+    failed = writer.submit(str(bad["_id"]), {"status": "failed"}, counter_updates("u2", "pending", "failed", AT))
+    ok.result(5)
+    with pytest.raises(RuntimeError, match="failed validation"):
+        failed.result(5)
+    writer.close()
+
+    # Only the successful update's counters are applied
+    counted = {key for batch in collection.counter_batches for key in batch}
+    assert {"u1|active", "u1|2024-06-01"} <= counted
+    assert not any(key.startswith("u2|") for key in counted)
+    assert writer.get_metrics()["errors"] == 1
+
+
+def test_update_for_a_missing_job_fails_with_job_not_found():
+    job = _job()
+    collection = FakeCollection([job])
+    writer = JobStatusWriter(collection, flush_interval=0.2, max_batch=100)
+    missing = str(ObjectId())
+
+    found = writer.submit(str(job["_id"]), {"status": "processing"})
+    lost = writer.submit(missing, {"status": "processing"}, counter_updates("u1", "pending", "processing", AT))
+    assert found.result(5) is True
+    with pytest.raises(JobNotFoundError):
+        lost.result(5)
+    writer.close()
+
+    assert collection.counter_batches == []
+
+
+def test_close_drains_buffered_updates():
+    job = _job()
+    collection = FakeCollection([job])
+    # A window far longer than the test: only close() can flush it
+    writer = JobStatusWriter(collection, flush_interval=60, max_batch=100)
+
+    future = writer.submit(str(job["_id"]), {"status": "completed"})
+    writer.close()
+
+    assert future.done() and future.result() is True
+    assert collection.docs[job["_id"]]["status"] == "completed"
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.submit(str(job["_id"]), {"status": "failed"})
+
+
+def _transition(writer, job, old, new):
+    """What worker_tasks._update_job_status submits for one guarded transition"""
+    return writer.submit(str(job["_id"]), {"status": new}, counter_updates("u1", old, new, AT), expected_status=old)
+
+
+def _counted(collection):
+    totals = {}
+    for batch in collection.counter_batches:
+        for key, inc in batch.items():
+            for field, value in inc.items():
+                totals.setdefault(key, {}).setdefault(field, 0)
+                totals[key][field] += value
+    return totals
+
+
+def test_redelivered_task_neither_rewinds_nor_recounts_a_finished_job():
+    job = _job("pending")
+    collection = FakeCollection([job])
+    writer = JobStatusWriter(collection, flush_interval=0, max_batch=100)
+
+    first_run = [_transition(writer, job, "pending", "processing").result(5)]
+    first_run.append(_transition(writer, job, "processing", "completed").result(5))
+    # Celery redelivers the task (acks_late) and it replays the same transitions
+    redelivery = [_transition(writer, job, "pending", "processing").result(5)]
+    redelivery.append(_transition(writer, job, "processing", "completed").result(5))
+    writer.close()
+
+    assert first_run == [True, True]
+    assert redelivery == [False, False]
+    assert collection.docs[job["_id"]]["status"] == "completed"
+    assert _counted(collection)["u1|active"] == {"pending": -1, "processing": 0}
+    assert _counted(collection)["u1|2024-06-01"] == {"completed": 1}
+    assert writer.get_metrics()["skipped"] == 2
+
+
+def test_redelivery_after_a_lost_worker_finishes_the_job_once():
+    # The first delivery's worker died while the job was processing
+    job = _job("processing")
+    collection = FakeCollection([job])
+    writer = JobStatusWriter(collection, flush_interval=0, max_batch=100)
+
+    started = _transition(writer, job, "pending", "processing").result(5)
+    finished = _transition(writer, job, "processing", "completed").result(5)
+    writer.close()
+
+    assert (started, finished) == (False, True)
+    assert _counted(collection)["u1|active"] == {"processing": -1}
+    assert _counted(collection)["u1|2024-06-01"] == {"completed": 1}
+
+
+def test_coalesced_transitions_share_the_first_guard():
+    job = _job("completed")
+    collection = FakeCollection([job])
+    writer = JobStatusWriter(collection, flush_interval=0.2, max_batch=100)
+
+    futures = [_transition(writer, job, "pending", "processing"), _transition(writer, job, "processing", "completed")]
+    results = [f.result(5) for f in futures]
+    writer.close()
+
+    assert results == [False, False]
+    assert collection.counter_batches == []
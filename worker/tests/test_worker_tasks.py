@@ -0,0 +1,50 @@
+import asyncio
+
+from bson import ObjectId
+
+from src.domain.entities.job import JobStatus
+from src.infrastructure.database.status_writer import JobStatusWriter
+from src.infrastructure.queue import worker_tasks
+from tests.test_status_writer import FakeCollection
+
+OUTPUT_REF = {"store": "gridfs", "id": str(ObjectId()), "size": 1, "content_type": "application/json"}
+
+
+class FakeContainer:
+    notifier = None
+
+    def __init__(self, writer):
+        self.status_writer = writer
+
+
+def _complete(monkeypatch, job):
+    collection = FakeCollection([job])
+    writer = JobStatusWriter(collection, flush_interval=0, max_batch=100)
+    deleted = []
+    monkeypatch.setattr(worker_tasks.WorkerContainer, "get", classmethod(lambda cls: FakeContainer(writer)))
+    monkeypatch.setattr(worker_tasks, "delete_output", deleted.append)
+    try:
+        applied = asyncio.run(worker_tasks._update_job_status(
+            str(job["_id"]), JobStatus.COMPLETED, {"user_id": "u1"},
+            previous_status=JobStatus.PROCESSING, output_data={"preview": "…"}, output_ref=OUTPUT_REF,
+        ))
+    finally:
+        writer.close()
+    return applied, deleted, collection.docs[job["_id"]]
+
+
+def test_output_of_an_applied_completion_is_kept(monkeypatch):
+    applied, deleted, doc = _complete(monkeypatch, {"_id": ObjectId(), "user_id": "u1", "status": "processing"})
+
+    assert applied is True
+    assert deleted == []
+    assert doc["output_ref"] == OUTPUT_REF
+
+
+def test_output_of_a_stale_completion_is_deleted(monkeypatch):
+    # A redelivered task re-ran a job that an earlier delivery already completed
+    applied, deleted, doc = _complete(monkeypatch, {"_id": ObjectId(), "user_id": "u1", "status": "completed"})
+
+    assert applied is False
+    assert deleted == [OUTPUT_REF]
+    assert "output_ref" not in doc
@@ -7,7 +7,9 @@ import sys
 import asyncio
 from src.infrastructure.queue.celery_queue_service import celery_app
 from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.indexes import ensure_indexes_in_background
 from src.config.settings import settings
+from src.config.logging_config import configure_logging
 import logging
 
 # Add src to Python path
@@ -21,18 +23,22 @@ async def init_database():
 
 if __name__ == '__main__':
     # Configure logging
-    if settings.debug:
-        logging.basicConfig(level=logging.DEBUG, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
-        logging.debug("[worker] Debug logging configured")
+    # Pool processes inherit the queue handler; their listener threads are restarted after fork
+    configure_logging()
+    logging.debug("[worker] Logging configured")
 
     # Initialize database connection
     asyncio.run(init_database())
+    # Index builds on a large collection can take minutes; consume jobs meanwhile
+    ensure_indexes_in_background(settings.mongodb_url, settings.database_name)
 
     # Prepare Celery worker argv (no explicit -Q; use app config)
     argv = [
         "worker",
         "-l", "INFO" if not settings.debug else "DEBUG",
         "--concurrency", os.getenv("CELERY_CONCURRENCY", "1"),
+        # "threads" lets concurrent jobs in one process share status-write batches
+        "--pool", os.getenv("CELERY_POOL", "prefork"),
         # Explicitly bind worker to the configured queue
         "-Q", getattr(celery_app.conf, "task_default_queue", settings.celery_queue_name),
         # Fair scheduling across queues (when multiple)